@@ -2,7 +2,8 @@
 
 import { useEffect, useState, useCallback, useRef } from "react";
 import { useRouter } from "next/navigation";
-import { fetchResult, submitSurvey } from "@/lib/api";
+import { ApiError, fetchResult, submitSurvey, subscribeAnalysisStatus } from "@/lib/api";
+import type { CareerCard } from "@/types/result";
 
 /**
  * Loading Screen — DISTRICT Ω Analysis System
@@ -18,20 +19,32 @@ const LOADING_MESSAGES = [
 ];
 
 const POLL_INTERVAL_MS = 2000;
+// WebSocket 푸시 수신 중에는 연결 직전 완료 등 누락 대비용으로만 드물게 폴링
+const PUSH_SAFETY_POLL_INTERVAL_MS = 10000;
 const TIMEOUT_MS = 30000;
 
+/** 조합 공식 "[직업] + [스킬] = [새 직업]"에서 새 직업명만 추출 */
+function targetRole(card: CareerCard): string {
+  const match = card.combo_formula.match(/=\s*\[([^\]]+)\]\s*$/);
+  return match ? match[1] : card.combo_formula;
+}
+
 export default function LoadingScreen() {
   const router = useRouter();
   const [messageIndex, setMessageIndex] = useState(0);
   const [timedOut, setTimedOut] = useState(false);
   const [failed, setFailed] = useState(false);
   const [retrying, setRetrying] = useState(false);
+  // 분석 중 먼저 저장된 템플릿 커리어 카드 (개인화 전 미리보기)
+  const [previewCards, setPreviewCards] = useState<CareerCard[]>([]);
   const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const timeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const messageRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const unsubscribeRef = useRef<(() => void) | null>(null);
 
   /** Clear all timers/polling */
   const clearAllTimers = useCallback(() => {
+    if (unsubscribeRef.current) { unsubscribeRef.current(); unsubscribeRef.current = null; }
     if (pollRef.current) { clearInterval(pollRef.current); pollRef.current = null; }
     if (timeoutRef.current) { clearTimeout(timeoutRef.current); timeoutRef.current = null; }
     if (messageRef.current) { clearInterval(messageRef.current); messageRef.current = null; }
@@ -45,17 +58,38 @@ export default function LoadingScreen() {
       if (data.status === "completed") {
         sessionStorage.setItem("result_data", JSON.stringify(data));
         router.push("/result");
+      } else if (data.status === "analyzing" && data.career_cards?.length) {
+        setPreviewCards(data.career_cards);
       } else if (data.status === "error") {
         setFailed(true);
         if (pollRef.current) clearInterval(pollRef.current);
       }
-    } catch { /* continue polling */ }
-  }, [router]);
+    } catch (err) {
+      // 410: 서버가 재시도를 모두 소진한 terminal 실패 → 폴링 중단
+      if (err instanceof ApiError && err.status === 410) {
+        setFailed(true);
+        clearAllTimers();
+      }
+      /* 그 외에는 continue polling */
+    }
+  }, [router, clearAllTimers]);
 
-  /** 폴링 + 타임아웃 시작 */
+  /** 폴링 + 타임아웃 시작 (WebSocket 푸시가 가능하면 푸시 우선) */
   const startPolling = useCallback(() => {
     pollResult();
-    pollRef.current = setInterval(pollResult, POLL_INTERVAL_MS);
+    unsubscribeRef.current = subscribeAnalysisStatus(
+      () => { pollResult(); },
+      () => {
+        // 푸시 연결이 끊기면 일반 폴링으로 폴백
+        unsubscribeRef.current = null;
+        if (pollRef.current) clearInterval(pollRef.current);
+        pollRef.current = setInterval(pollResult, POLL_INTERVAL_MS);
+      }
+    );
+    pollRef.current = setInterval(
+      pollResult,
+      unsubscribeRef.current ? PUSH_SAFETY_POLL_INTERVAL_MS : POLL_INTERVAL_MS
+    );
     timeoutRef.current = setTimeout(() => { setTimedOut(true); }, TIMEOUT_MS);
     messageRef.current = setInterval(() => {
       setMessageIndex((prev) => (prev + 1) % LOADING_MESSAGES.length);
@@ -132,6 +166,20 @@ export default function LoadingScreen() {
           {LOADING_MESSAGES[messageIndex]}
         </p>
 
+        {/* 템플릿 커리어 카드 미리보기 */}
+        {previewCards.length > 0 && (
+          <ul className="flex flex-col gap-1 animate-fade-in" aria-label="Career card preview">
+            {previewCards.map((card) => (
+              <li
+                key={card.card_index}
+                className="neon-text-yellow font-[family-name:var(--font-mono)] text-sm tracking-wide"
+              >
+                ▸ TARGET_ROLE: {targetRole(card)}
+              </li>
+            ))}
+          </ul>
+        )}
+
         {/* 진행 바 */}
         <div className="loading-bar-track">
           <div className="loading-bar-fill" />
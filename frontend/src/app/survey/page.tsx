@@ -2,7 +2,7 @@
 
 import { useState, useCallback, useEffect, type FormEvent } from "react";
 import { useRouter } from "next/navigation";
-import { submitSurvey, ApiError } from "@/lib/api";
+import { submitSurvey, submitSurveyDraft, ApiError } from "@/lib/api";
 import { TagInput, serializeTags } from "@/components/ui/TagInput";
 
 /**
@@ -31,6 +31,9 @@ const INITIAL_FORM: FormData = {
 
 const REQUIRED_TEXT_FIELDS: TextFieldKey[] = ["name", "job_title", "age_group"];
 
+/** 입력이 멈춘 뒤 사전 분석 초안을 보내기까지 대기 시간 (ms) */
+const DRAFT_DEBOUNCE_MS = 1500;
+
 export default function SurveyPage() {
   const router = useRouter();
   const [form, setForm] = useState<FormData>(INITIAL_FORM);
@@ -46,6 +49,22 @@ export default function SurveyPage() {
     }
   }, [router]);
 
+  // 직업·스킬 입력이 멈추면 사전 분석 초안 전송 (제출 전까지 서버가 미리 분석)
+  useEffect(() => {
+    if (submitting || !form.job_title.trim() || form.skills.length === 0) return;
+    const timer = setTimeout(() => {
+      const skillsStr = serializeTags(form.skills);
+      void submitSurveyDraft({
+        name: form.name,
+        job_title: form.job_title,
+        age_group: form.age_group,
+        strengths: skillsStr,
+        hobbies: skillsStr,
+      });
+    }, DRAFT_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [form, submitting]);
+
   const handleChange = useCallback((key: TextFieldKey, value: string) => {
     setForm((prev) => ({ ...prev, [key]: value }));
     setErrors((prev) => {
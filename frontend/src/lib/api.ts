@@ -13,6 +13,9 @@ import type {
 // 환경 변수 기반 API 엔드포인트 설정 (끝 슬래시 제거)
 const API_BASE_URL = (process.env.NEXT_PUBLIC_API_URL ?? "").replace(/\/+$/, "");
 
+// 분석 완료 푸시용 WebSocket 엔드포인트 (미설정 시 폴링만 사용)
+const WS_URL = (process.env.NEXT_PUBLIC_WS_URL ?? "").replace(/\/+$/, "");
+
 // 최대 재시도 횟수
 const MAX_RETRIES = 2;
 // 재시도 간 대기 시간 (ms)
@@ -138,6 +141,40 @@ export async function submitSurvey(
   return parseResponse<SurveyResponse>(res);
 }
 
+export interface SurveyDraftResponse {
+  session_id: string;
+  speculation: "retrieval" | "generation" | null;
+}
+
+/**
+ * POST /survey/draft — 작성 중인 설문으로 사전 분석 시작
+ * 최선 노력 요청이므로 재시도하지 않고, 실패해도 최종 제출에는 영향이 없다.
+ */
+export async function submitSurveyDraft(
+  data: Partial<SurveyPayload>
+): Promise<SurveyDraftResponse | null> {
+  const sessionId = getSessionId();
+  if (!sessionId) return null;
+
+  try {
+    const res = await fetch(`${API_BASE_URL}/survey/draft`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        session_id: sessionId,
+        name: data.name?.trim() ?? "",
+        job_title: data.job_title?.trim() ?? "",
+        age_group: data.age_group?.trim() ?? "",
+        strengths: data.strengths?.trim() ?? "",
+        hobbies: data.hobbies?.trim() ?? "",
+      }),
+    });
+    return res.ok ? ((await res.json()) as SurveyDraftResponse) : null;
+  } catch {
+    return null;
+  }
+}
+
 // ── 결과 조회 API (Req 7.1) ──
 
 /** GET /result/{sid} — 분석 결과 조회 */
@@ -154,6 +191,48 @@ export async function fetchResult(): Promise<ResultData> {
   return parseResponse<ResultData>(res);
 }
 
+/** WebSocket 분석 상태 푸시 메시지 */
+export interface AnalysisStatusMessage {
+  type: "analysis_status";
+  session_id: string;
+  status: "completed" | "error" | "failed";
+}
+
+/**
+ * 분석 완료 푸시 구독 — WebSocket으로 completed/error 알림을 한 번 받는다.
+ * WebSocket을 사용할 수 없으면 null을 반환하며, 호출 측은 폴링으로 폴백한다.
+ * 반환값은 구독 해제 함수.
+ */
+export function subscribeAnalysisStatus(
+  onMessage: (message: AnalysisStatusMessage) => void,
+  onClose: () => void
+): (() => void) | null {
+  const sessionId = getSessionId();
+  if (!WS_URL || !sessionId || typeof WebSocket === "undefined") return null;
+
+  const socket = new WebSocket(
+    `${WS_URL}?session_id=${encodeURIComponent(sessionId)}`
+  );
+  let closedByClient = false;
+
+  socket.onmessage = (event) => {
+    try {
+      const message = JSON.parse(event.data) as AnalysisStatusMessage;
+      if (message.type === "analysis_status") onMessage(message);
+    } catch {
+      /* 알 수 없는 메시지는 무시 */
+    }
+  };
+  socket.onclose = () => {
+    if (!closedByClient) onClose();
+  };
+
+  return () => {
+    closedByClient = true;
+    socket.close();
+  };
+}
+
 // ── 방명록 API (Req 8.1, 8.2, 8.3) ──
 
 export interface GuestbookPostPayload {
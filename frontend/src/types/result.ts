@@ -24,9 +24,11 @@ export interface CareerCard {
 
 export interface ResultData {
   session_id: string;
-  status: "analyzing" | "completed" | "error";
+  status: "analyzing" | "completed" | "error" | "failed";
   remaining_years?: number;
   remaining_years_reason?: string;
   skill_risks?: SkillRisk[];
   career_cards?: CareerCard[];
+  /** 텍스트 필드 응답 언어 (Accept-Language 기준, 번역 실패 시 "en") */
+  language?: string;
 }
@@ -19,10 +19,15 @@ const storageStack = new StorageStack(app, "CareerDoomsdayStorageStack", {
   description: "Career Doomsday Clock — DynamoDB tables and S3 bucket",
 });
 
+// 예: python -m benchmarks.wef_facts로 wef/facts.bin을 올린 뒤 cdk deploy -c wefFacts=true (기본 끔)
+const wefFacts = String(app.node.tryGetContext("wefFacts") ?? "false") === "true";
+
 const bedrockStack = new BedrockStack(app, "CareerDoomsdayBedrockStack", {
   env,
   description: "Career Doomsday Clock — Bedrock Knowledge Base and Agent",
   kbBucket: storageStack.kbBucket,
+  bulkInferenceBucket: storageStack.bulkInferenceBucket,
+  wefFacts,
 });
 bedrockStack.addDependency(storageStack);
 
@@ -33,9 +38,42 @@ const apiStack = new ApiStack(app, "CareerDoomsdayApiStack", {
   skillGraphTable: storageStack.skillGraphTable,
   careerCardsTable: storageStack.careerCardsTable,
   guestbookTable: storageStack.guestbookTable,
+  connectionsTable: storageStack.connectionsTable,
+  checkpointTable: storageStack.checkpointTable,
+  stateTable: storageStack.stateTable,
+  translationCacheTable: storageStack.translationCacheTable,
+  analysisCacheTable: storageStack.analysisCacheTable,
+  analysisRecordsTable: storageStack.analysisRecordsTable,
   kbBucket: storageStack.kbBucket,
+  modelArtifactsBucket: storageStack.modelArtifactsBucket,
   bedrockAgentId: bedrockStack.agentId,
   bedrockAgentAliasId: bedrockStack.agentAliasId,
+  knowledgeBaseId: bedrockStack.knowledgeBaseId,
+  // 예: cdk deploy -c bedrockEndpoints='[{"name":"usw2","agent_alias_id":"...","region":"us-west-2"}]'
+  bedrockEndpoints: app.node.tryGetContext("bedrockEndpoints") ?? "",
+  translationModelId:
+    app.node.tryGetContext("translationModelId") ??
+    "us.anthropic.claude-3-5-haiku-20241022-v1:0",
+  // 예: cdk deploy -c experimentId=exp-concise -c experimentVariants='[{"variant_id":"control"},{"variant_id":"concise","prompt_version":"v2-concise"}]'
+  experimentId: app.node.tryGetContext("experimentId") ?? "default",
+  experimentVariants: app.node.tryGetContext("experimentVariants") ?? "",
+  // 예: -c experimentVariants='[{"variant_id":"control","weight":0.5},{"variant_id":"tool","generation_mode":"tool","weight":0.5}]'
+  structuredOutputModelId:
+    app.node.tryGetContext("structuredOutputModelId") ??
+    "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
+  // 예: cdk deploy -c sessionTokenBudget=300000 (0이면 무제한)
+  sessionTokenBudget: Number(app.node.tryGetContext("sessionTokenBudget") ?? 200000),
+  // 예: cdk deploy -c semanticReuseThreshold=0.9 (기본 0: 의미 기반 재사용 끔)
+  semanticReuseThreshold: Number(app.node.tryGetContext("semanticReuseThreshold") ?? 0),
+  // 예: cdk deploy -c contextTokenBudget=600 (기본 0: 압축 끔)
+  contextTokenBudget: Number(app.node.tryGetContext("contextTokenBudget") ?? 0),
+  // 예: cdk deploy -c microBatchSize=8 -c microBatchLingerSeconds=2 (기본 0: 묶음 생성 끔)
+  microBatchSize: Number(app.node.tryGetContext("microBatchSize") ?? 0),
+  microBatchLingerSeconds: Number(app.node.tryGetContext("microBatchLingerSeconds") ?? 2),
+  microBatchModelId:
+    app.node.tryGetContext("microBatchModelId") ??
+    "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
+  wefFacts,
 });
 apiStack.addDependency(bedrockStack);
 
@@ -43,4 +81,5 @@ new FrontendStack(app, "CareerDoomsdayFrontendStack", {
   env,
   description: "Career Doomsday Clock — Amplify frontend hosting",
   apiUrl: apiStack.api.url,
+  webSocketUrl: apiStack.webSocketStage.url,
 });
@@ -3,7 +3,13 @@ import * as dynamodb from "aws-cdk-lib/aws-dynamodb";
 import * as s3 from "aws-cdk-lib/aws-s3";
 import * as lambda from "aws-cdk-lib/aws-lambda";
 import * as apigateway from "aws-cdk-lib/aws-apigateway";
+import * as apigwv2 from "aws-cdk-lib/aws-apigatewayv2";
+import * as apigwv2Integrations from "aws-cdk-lib/aws-apigatewayv2-integrations";
 import * as logs from "aws-cdk-lib/aws-logs";
+import * as sqs from "aws-cdk-lib/aws-sqs";
+import * as lambdaEventSources from "aws-cdk-lib/aws-lambda-event-sources";
+import * as events from "aws-cdk-lib/aws-events";
+import * as targets from "aws-cdk-lib/aws-events-targets";
 import { Construct } from "constructs";
 
 export interface ApiStackProps extends cdk.StackProps {
@@ -11,13 +17,46 @@ export interface ApiStackProps extends cdk.StackProps {
   skillGraphTable: dynamodb.Table;
   careerCardsTable: dynamodb.Table;
   guestbookTable: dynamodb.Table;
+  connectionsTable: dynamodb.Table;
+  checkpointTable: dynamodb.Table;
+  stateTable: dynamodb.Table;
+  translationCacheTable: dynamodb.Table;
+  analysisCacheTable: dynamodb.Table;
+  analysisRecordsTable: dynamodb.Table;
   kbBucket: s3.Bucket;
+  /** 오프라인 학습 모델 아티팩트 버킷 (what-if 대리 모델) */
+  modelArtifactsBucket: s3.Bucket;
   bedrockAgentId: string;
   bedrockAgentAliasId: string;
+  knowledgeBaseId: string;
+  /** 다중 엔드포인트 설정 JSON (비어 있으면 단일 Agent alias 사용) */
+  bedrockEndpoints?: string;
+  /** 결과 번역용 모델 (inference profile ID, 비어 있으면 정규 언어로만 응답) */
+  translationModelId?: string;
+  /** 프롬프트/모델 실험 ID와 변형 설정 JSON (비어 있으면 기준 변형만) */
+  experimentId?: string;
+  experimentVariants?: string;
+  /** generation_mode="tool" 실험 변형이 쓰는 도구 호출 강제 모델 (inference profile ID, 비어 있으면 Agent 경로) */
+  structuredOutputModelId?: string;
+  /** 세션당 토큰 예산 (재시도/사전 분석/부분 재분석 누적). 초과하면 오케스트레이션을 중단한다 (0이면 무제한) */
+  sessionTokenBudget?: number;
+  /** 정확 일치 캐시 미스 뒤 의미 기반 재사용 유사도 하한 (0이면 끔) */
+  semanticReuseThreshold?: number;
+  /** 검색 결과를 직업/스킬 관련 문장·표 행으로 줄여 붙일 토큰 예산 (0이면 원문 청크 그대로) */
+  contextTokenBudget?: number;
+  /** 버스트 대비 묶음 생성: 한 요청에 묶을 최대 설문 수 (1 이하이면 큐 없이 단건 호출) */
+  microBatchSize?: number;
+  /** 묶음을 채우기 위해 기다리는 최대 시간(초, SQS maxBatchingWindow) */
+  microBatchLingerSeconds?: number;
+  /** 묶음 생성 모델 (inference profile ID) */
+  microBatchModelId?: string;
+  /** WEF 사실 테이블(wef/facts.bin)을 올린 뒤에만 켠다. Agent 액션 그룹과 같은 값이어야 한다 */
+  wefFacts?: boolean;
 }
 
 export class ApiStack extends cdk.Stack {
   public readonly api: apigateway.RestApi;
+  public readonly webSocketStage: apigwv2.WebSocketStage;
 
   constructor(scope: Construct, id: string, props: ApiStackProps) {
     super(scope, id, props);
@@ -26,6 +65,11 @@ export class ApiStack extends cdk.Stack {
     const commonRuntime = lambda.Runtime.PYTHON_3_14;
     const commonMemory = 256;
     const commonTimeout = cdk.Duration.seconds(30);
+    // Bedrock 서킷 브레이커 설정: analyze와 sweeper가 같은 값으로 공유 회로 상태를 판단한다
+    const breakerEnvironment = {
+      BREAKER_FAILURE_THRESHOLD: "5",
+      BREAKER_COOLDOWN_SECONDS: "60",
+    };
 
     // ── Lambda Layer 정의 ──
     const commonLayer = new lambda.LayerVersion(this, "CommonLayer", {
@@ -51,7 +95,7 @@ export class ApiStack extends cdk.Stack {
       removalPolicy: cdk.RemovalPolicy.DESTROY, // 개발 환경용
     });
 
-    // ── Lambda 함수 6개 정의 ──
+    // ── Lambda 함수 정의 ──
 
     const surveyHandler = new lambda.Function(this, "SurveyHandler", {
       runtime: commonRuntime,
@@ -89,9 +133,41 @@ export class ApiStack extends cdk.Stack {
         CAREER_CARDS_TABLE_NAME: props.careerCardsTable.tableName,
         BEDROCK_AGENT_ID: props.bedrockAgentId,
         BEDROCK_AGENT_ALIAS_ID: props.bedrockAgentAliasId,
+        KNOWLEDGE_BASE_ID: props.knowledgeBaseId,
+        CHECKPOINT_TABLE_NAME: props.checkpointTable.tableName,
+        STATE_TABLE_NAME: props.stateTable.tableName,
+        ANALYSIS_CACHE_TABLE_NAME: props.analysisCacheTable.tableName,
+        ANALYSIS_RECORDS_TABLE_NAME: props.analysisRecordsTable.tableName,
+        ...breakerEnvironment,
+        // 같은 프로필 동시 분석 합치기: 리더 임대 = analyze 타임아웃 (스위퍼 stuck 기준 300초보다 짧게)
+        SINGLE_FLIGHT_LEASE_SECONDS: "180",
+        BEDROCK_ENDPOINTS: props.bedrockEndpoints ?? "",
+        EXPERIMENT_ID: props.experimentId ?? "default",
+        EXPERIMENT_VARIANTS: props.experimentVariants ?? "",
+        SESSION_TOKEN_BUDGET: String(props.sessionTokenBudget ?? 200000),
+        STRUCTURED_OUTPUT_MODEL_ID: props.structuredOutputModelId ?? "",
+        // 의미 기반 재사용 인덱스 (python -m benchmarks.semantic_reuse_eval --build로 생성)
+        // 참고 자료 압축 (python -m benchmarks.context_compression으로 예산별 크기 확인)
+        CONTEXT_TOKEN_BUDGET: String(props.contextTokenBudget ?? 0),
+        SEMANTIC_REUSE_THRESHOLD: String(props.semanticReuseThreshold ?? 0),
+        SEMANTIC_INDEX_BUCKET: props.modelArtifactsBucket.bucketName,
+        SEMANTIC_INDEX_KEY: "analysis/semantic.ivf",
+        // 템플릿 카드 로드맵을 사용자 스킬에 맞추는 전환 그래프 (python -m benchmarks.transition_graph로 생성)
+        TRANSITION_GRAPH_BUCKET: props.modelArtifactsBucket.bucketName,
+        TRANSITION_GRAPH_KEY: "roadmap/transition.graph",
+        CONNECTIONS_TABLE_NAME: props.connectionsTable.tableName,
+        WEBSOCKET_CALLBACK_URL: "", // WebSocket 스테이지 생성 후 아래에서 설정
       },
     });
 
+    // Agent RETURN_CONTROL 액션 그룹에 답하는 WEF 사실 테이블 (python -m benchmarks.wef_facts로 생성)
+    // 아티팩트가 없으면 모든 조회가 found=false라 오케스트레이션 턴만 늘어나므로 -c wefFacts=true일 때만 켠다
+    if (props.wefFacts) {
+      analyzeHandler.addEnvironment("WEF_FACTS_BUCKET", props.modelArtifactsBucket.bucketName);
+      analyzeHandler.addEnvironment("WEF_FACTS_KEY", "wef/facts.bin");
+      props.modelArtifactsBucket.grantRead(analyzeHandler, "wef/*");
+    }
+
     // Bedrock Agent 호출 권한 부여
     analyzeHandler.addToRolePolicy(
       new cdk.aws_iam.PolicyStatement({
@@ -115,6 +191,8 @@ export class ApiStack extends cdk.Stack {
           `arn:aws:bedrock:us-east-1::foundation-model/*`,
           `arn:aws:bedrock:us-east-2::foundation-model/*`,
           `arn:aws:bedrock:us-west-1::foundation-model/*`,
+          // BEDROCK_ENDPOINTS로 지정한 다른 리전의 Agent alias
+          `arn:aws:bedrock:*:${this.account}:agent-alias/*`,
         ],
       })
     );
@@ -125,6 +203,94 @@ export class ApiStack extends cdk.Stack {
       analyzeHandler.functionName
     );
 
+    // ── 묶음 생성 큐 (microBatchSize > 1일 때만): survey → SQS → analyze 묶음 모드 ──
+    const microBatchSize = props.microBatchSize ?? 0;
+    if (microBatchSize > 1) {
+      const analysisQueue = new sqs.Queue(this, "AnalysisQueue", {
+        // analyze 타임아웃(180초)의 6배: 처리 중인 메시지가 다시 보이지 않도록
+        visibilityTimeout: cdk.Duration.seconds(6 * 180),
+        retentionPeriod: cdk.Duration.hours(1),
+      });
+      analyzeHandler.addEventSource(
+        new lambdaEventSources.SqsEventSource(analysisQueue, {
+          batchSize: microBatchSize,
+          maxBatchingWindow: cdk.Duration.seconds(props.microBatchLingerSeconds ?? 2),
+          reportBatchItemFailures: true,
+        })
+      );
+      analyzeHandler.addEnvironment("MICRO_BATCH_MODEL_ID", props.microBatchModelId ?? "");
+      analyzeHandler.addEnvironment("MICRO_BATCH_SIZE", String(microBatchSize));
+      // 묶음에서 빠진 세션을 단건 경로로 넘기는 자기 호출 (함수 ARN 직접 참조는 순환 의존)
+      analyzeHandler.addToRolePolicy(
+        new cdk.aws_iam.PolicyStatement({
+          actions: ["lambda:InvokeFunction"],
+          resources: [`arn:aws:lambda:${this.region}:${this.account}:function:*AnalyzeHandler*`],
+        })
+      );
+      analysisQueue.grantSendMessages(surveyHandler);
+      surveyHandler.addEnvironment("ANALYSIS_QUEUE_URL", analysisQueue.queueUrl);
+    }
+
+    const surveyDraftHandler = new lambda.Function(this, "SurveyDraftHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/survey_draft"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: commonTimeout,
+      logGroup: new logs.LogGroup(this, "SurveyDraftHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "설문 초안 기반 사전 분석 트리거",
+      environment: {
+        SURVEY_TABLE_NAME: props.surveyTable.tableName,
+        ANALYZE_FUNCTION_NAME: analyzeHandler.functionName,
+        MAX_SPECULATIONS: "3",
+      },
+    });
+
+    const surveyAmendHandler = new lambda.Function(this, "SurveyAmendHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/survey_amend"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: commonTimeout,
+      logGroup: new logs.LogGroup(this, "SurveyAmendHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "완료된 세션의 직업/스킬 수정과 부분 재분석 트리거",
+      environment: {
+        SURVEY_TABLE_NAME: props.surveyTable.tableName,
+        ANALYZE_FUNCTION_NAME: analyzeHandler.functionName,
+        AMEND_MATERIAL_RATIO: "0.5",
+      },
+    });
+
+    const whatifHandler = new lambda.Function(this, "WhatifHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/whatif"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: commonTimeout,
+      logGroup: new logs.LogGroup(this, "WhatifHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "대리 모델 기반 what-if 즉시 추정 (Agent 호출 없음)",
+      environment: {
+        SURVEY_TABLE_NAME: props.surveyTable.tableName,
+        SKILL_GRAPH_TABLE_NAME: props.skillGraphTable.tableName,
+        ANALYSIS_RECORDS_TABLE_NAME: props.analysisRecordsTable.tableName,
+        // python -m benchmarks.train_surrogate --bucket <이 버킷>으로 올린 모델
+        SURROGATE_BUCKET: props.modelArtifactsBucket.bucketName,
+        SURROGATE_KEY: "surrogate/model.json",
+      },
+    });
+
     const resultHandler = new lambda.Function(this, "ResultHandler", {
       runtime: commonRuntime,
       code: lambda.Code.fromAsset("../lambda/functions/result"),
@@ -141,9 +307,23 @@ export class ApiStack extends cdk.Stack {
         SURVEY_TABLE_NAME: props.surveyTable.tableName,
         SKILL_GRAPH_TABLE_NAME: props.skillGraphTable.tableName,
         CAREER_CARDS_TABLE_NAME: props.careerCardsTable.tableName,
+        TRANSLATION_CACHE_TABLE_NAME: props.translationCacheTable.tableName,
+        ANALYSIS_RECORDS_TABLE_NAME: props.analysisRecordsTable.tableName,
+        TRANSLATION_MODEL_ID: props.translationModelId ?? "",
       },
     });
 
+    // 결과 번역 모델 호출 권한 (정규 언어 이외의 Accept-Language 요청)
+    resultHandler.addToRolePolicy(
+      new cdk.aws_iam.PolicyStatement({
+        actions: ["bedrock:InvokeModel"],
+        resources: [
+          `arn:aws:bedrock:${this.region}:${this.account}:inference-profile/*`,
+          `arn:aws:bedrock:*::foundation-model/*`,
+        ],
+      })
+    );
+
     const guestbookPostHandler = new lambda.Function(
       this,
       "GuestbookPostHandler",
@@ -220,21 +400,159 @@ export class ApiStack extends cdk.Stack {
       },
     });
 
+    const guestbookSimilarHandler = new lambda.Function(this, "GuestbookSimilarHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/guestbook_similar"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: commonTimeout,
+      logGroup: new logs.LogGroup(this, "GuestbookSimilarHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "직업/스킬이 비슷한 방명록 검색 (S3 IVF 인덱스 mmap)",
+      environment: {
+        GUESTBOOK_TABLE_NAME: props.guestbookTable.tableName,
+        GUESTBOOK_INDEX_BUCKET: props.modelArtifactsBucket.bucketName,
+        GUESTBOOK_INDEX_KEY: "guestbook/index.ivf",
+        INDEX_REFRESH_SECONDS: "60",
+        SIMILAR_NPROBE: "8",
+      },
+    });
+
+    // 방명록 스트림 → 유사 프로필 인덱스 점진 추가. 인덱스 파일 하나를 고쳐 쓰므로 동시 실행은 1개
+    const guestbookIndexer = new lambda.Function(this, "GuestbookIndexer", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/guestbook_indexer"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: 512,
+      // 항목 수가 두 배가 될 때 중심 재학습이 함께 돈다
+      timeout: cdk.Duration.seconds(120),
+      reservedConcurrentExecutions: 1,
+      logGroup: new logs.LogGroup(this, "GuestbookIndexerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "방명록 유사 프로필 인덱스 점진 갱신 (DynamoDB 스트림)",
+      environment: {
+        GUESTBOOK_INDEX_BUCKET: props.modelArtifactsBucket.bucketName,
+        GUESTBOOK_INDEX_KEY: "guestbook/index.ivf",
+      },
+    });
+    guestbookIndexer.addEventSource(
+      new lambdaEventSources.DynamoEventSource(props.guestbookTable, {
+        startingPosition: lambda.StartingPosition.LATEST,
+        batchSize: 100,
+        maxBatchingWindow: cdk.Duration.seconds(10),
+        retryAttempts: 5,
+        filters: [lambda.FilterCriteria.filter({ eventName: lambda.FilterRule.isEqual("INSERT") })],
+      })
+    );
+
+    const wsConnectHandler = new lambda.Function(this, "WsConnectHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/ws_connect"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: commonTimeout,
+      logGroup: new logs.LogGroup(this, "WsConnectHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "WebSocket 연결 등록 (session_id → connection_id)",
+      environment: {
+        CONNECTIONS_TABLE_NAME: props.connectionsTable.tableName,
+      },
+    });
+
+    const wsDisconnectHandler = new lambda.Function(this, "WsDisconnectHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/ws_disconnect"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: commonTimeout,
+      logGroup: new logs.LogGroup(this, "WsDisconnectHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "WebSocket 연결 해제",
+      environment: {
+        CONNECTIONS_TABLE_NAME: props.connectionsTable.tableName,
+      },
+    });
+
+    const sweeperHandler = new lambda.Function(this, "SweeperHandler", {
+      runtime: commonRuntime,
+      code: lambda.Code.fromAsset("../lambda/functions/sweeper"),
+      handler: "handler.handler",
+      layers: [commonLayer],
+      memorySize: commonMemory,
+      timeout: cdk.Duration.seconds(60),
+      logGroup: new logs.LogGroup(this, "SweeperHandlerLogs", {
+        retention: logs.RetentionDays.ONE_WEEK,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+      }),
+      description: "멈춘/실패한 분석 세션 재시도 및 terminal 처리",
+      environment: {
+        SURVEY_TABLE_NAME: props.surveyTable.tableName,
+        ANALYZE_FUNCTION_NAME: analyzeHandler.functionName,
+        CONNECTIONS_TABLE_NAME: props.connectionsTable.tableName,
+        STATE_TABLE_NAME: props.stateTable.tableName,
+        ...breakerEnvironment,
+        WEBSOCKET_CALLBACK_URL: "", // WebSocket 스테이지 생성 후 아래에서 설정
+        SWEEP_STUCK_THRESHOLD_SECONDS: "300",
+        SWEEP_BASE_BACKOFF_SECONDS: "30",
+        SWEEP_MAX_ATTEMPTS: "3",
+      },
+    });
+
+    // 1분마다 스위프 실행
+    new events.Rule(this, "SweeperSchedule", {
+      schedule: events.Schedule.rate(cdk.Duration.minutes(1)),
+      targets: [new targets.LambdaFunction(sweeperHandler)],
+    });
+
     // ── IAM 최소 권한 부여 ──
 
     // survey_handler: survey 테이블 읽기/쓰기 + analyze_handler 비동기 호출
     props.surveyTable.grantReadWriteData(surveyHandler);
     analyzeHandler.grantInvoke(surveyHandler);
 
+    // survey_draft_handler: survey 테이블 읽기/쓰기 + analyze_handler 사전 분석 호출
+    props.surveyTable.grantReadWriteData(surveyDraftHandler);
+    analyzeHandler.grantInvoke(surveyDraftHandler);
+
+    // survey_amend_handler: survey 테이블 읽기/쓰기 + analyze_handler 호출 (부분 재분석)
+    props.surveyTable.grantReadWriteData(surveyAmendHandler);
+    analyzeHandler.grantInvoke(surveyAmendHandler);
+
+    // whatif_handler: 세션/분석 결과 읽기 + 대리 모델 아티팩트 읽기
+    props.surveyTable.grantReadData(whatifHandler);
+    props.skillGraphTable.grantReadData(whatifHandler);
+    props.analysisRecordsTable.grantReadData(whatifHandler);
+    props.modelArtifactsBucket.grantRead(whatifHandler, "surrogate/*");
+
     // analyze_handler: survey, skill_graph, career_cards 테이블 읽기/쓰기
     props.surveyTable.grantReadWriteData(analyzeHandler);
     props.skillGraphTable.grantReadWriteData(analyzeHandler);
     props.careerCardsTable.grantReadWriteData(analyzeHandler);
-
-    // result_handler: survey, skill_graph, career_cards 테이블 읽기
+    props.checkpointTable.grantReadWriteData(analyzeHandler);
+    props.stateTable.grantReadWriteData(analyzeHandler);
+    props.analysisCacheTable.grantReadData(analyzeHandler);
+    props.modelArtifactsBucket.grantRead(analyzeHandler, "analysis/*");
+    props.modelArtifactsBucket.grantRead(analyzeHandler, "roadmap/*");
+    props.analysisRecordsTable.grantReadWriteData(analyzeHandler);
+
+    // result_handler: survey, skill_graph, career_cards, 공유 분석 레코드 읽기 + 번역 캐시 읽기/쓰기
     props.surveyTable.grantReadData(resultHandler);
+    props.analysisRecordsTable.grantReadData(resultHandler);
     props.skillGraphTable.grantReadData(resultHandler);
     props.careerCardsTable.grantReadData(resultHandler);
+    props.translationCacheTable.grantReadWriteData(resultHandler);
 
     // guestbook_post_handler: guestbook 테이블 읽기/쓰기 (중복 등록 체크 + 저장)
     props.guestbookTable.grantReadWriteData(guestbookPostHandler);
@@ -248,6 +566,24 @@ export class ApiStack extends cdk.Stack {
     // ranking_handler: guestbook 테이블 읽기
     props.guestbookTable.grantReadData(rankingHandler);
 
+    // guestbook_similar_handler / guestbook_indexer: 유사 프로필 인덱스 읽기 / 읽기·쓰기
+    props.guestbookTable.grantReadData(guestbookSimilarHandler);
+    props.modelArtifactsBucket.grantRead(guestbookSimilarHandler, "guestbook/*");
+    props.modelArtifactsBucket.grantReadWrite(guestbookIndexer, "guestbook/*");
+
+    // ws_connect/ws_disconnect: 연결 레지스트리 읽기/쓰기
+    props.connectionsTable.grantReadWriteData(wsConnectHandler);
+    props.connectionsTable.grantReadWriteData(wsDisconnectHandler);
+
+    // analyze_handler: 연결 레지스트리 조회 + 끊긴 연결 정리
+    props.connectionsTable.grantReadWriteData(analyzeHandler);
+
+    // sweeper_handler: survey 테이블 읽기/쓰기 + analyze_handler 재호출 + 연결 레지스트리
+    props.surveyTable.grantReadWriteData(sweeperHandler);
+    analyzeHandler.grantInvoke(sweeperHandler);
+    props.connectionsTable.grantReadWriteData(sweeperHandler);
+    props.stateTable.grantReadData(sweeperHandler);
+
     // ── API Gateway REST API ──
 
     this.api = new apigateway.RestApi(this, "CareerDoomsdayApi", {
@@ -280,6 +616,27 @@ export class ApiStack extends cdk.Stack {
       new apigateway.LambdaIntegration(surveyHandler)
     );
 
+    // POST /survey/draft
+    const surveyDraftResource = surveyResource.addResource("draft");
+    surveyDraftResource.addMethod(
+      "POST",
+      new apigateway.LambdaIntegration(surveyDraftHandler)
+    );
+
+    // POST /survey/amend
+    const surveyAmendResource = surveyResource.addResource("amend");
+    surveyAmendResource.addMethod(
+      "POST",
+      new apigateway.LambdaIntegration(surveyAmendHandler)
+    );
+
+    // POST /whatif
+    const whatifResource = this.api.root.addResource("whatif");
+    whatifResource.addMethod(
+      "POST",
+      new apigateway.LambdaIntegration(whatifHandler)
+    );
+
     // GET /result/{sid}
     const resultResource = this.api.root.addResource("result");
     const resultSidResource = resultResource.addResource("{sid}");
@@ -299,6 +656,13 @@ export class ApiStack extends cdk.Stack {
       new apigateway.LambdaIntegration(guestbookGetHandler)
     );
 
+    // GET /guestbook/similar
+    const guestbookSimilarResource = guestbookResource.addResource("similar");
+    guestbookSimilarResource.addMethod(
+      "GET",
+      new apigateway.LambdaIntegration(guestbookSimilarHandler)
+    );
+
     // POST /guestbook/{id}/reaction
     const guestbookIdResource = guestbookResource.addResource("{id}");
     const reactionResource = guestbookIdResource.addResource("reaction");
@@ -314,11 +678,53 @@ export class ApiStack extends cdk.Stack {
       new apigateway.LambdaIntegration(rankingHandler)
     );
 
+    // ── API Gateway WebSocket API (분석 완료 푸시) ──
+
+    const webSocketApi = new apigwv2.WebSocketApi(this, "CareerDoomsdayWebSocketApi", {
+      apiName: "Career Doomsday Clock WebSocket API",
+      description: "분석 완료 푸시용 WebSocket API",
+      connectRouteOptions: {
+        integration: new apigwv2Integrations.WebSocketLambdaIntegration(
+          "WsConnectIntegration",
+          wsConnectHandler
+        ),
+      },
+      disconnectRouteOptions: {
+        integration: new apigwv2Integrations.WebSocketLambdaIntegration(
+          "WsDisconnectIntegration",
+          wsDisconnectHandler
+        ),
+      },
+    });
+
+    this.webSocketStage = new apigwv2.WebSocketStage(this, "WebSocketProdStage", {
+      webSocketApi,
+      stageName: "prod",
+      autoDeploy: true,
+    });
+
+    // analyze_handler: Management API로 완료 알림 푸시
+    analyzeHandler.addEnvironment(
+      "WEBSOCKET_CALLBACK_URL",
+      this.webSocketStage.callbackUrl
+    );
+    this.webSocketStage.grantManagementApiAccess(analyzeHandler);
+    sweeperHandler.addEnvironment(
+      "WEBSOCKET_CALLBACK_URL",
+      this.webSocketStage.callbackUrl
+    );
+    this.webSocketStage.grantManagementApiAccess(sweeperHandler);
+
     // ── 출력 ──
 
     new cdk.CfnOutput(this, "ApiUrl", {
       value: this.api.url,
       description: "API Gateway 엔드포인트 URL",
     });
+
+    new cdk.CfnOutput(this, "WebSocketUrl", {
+      value: this.webSocketStage.url,
+      description: "WebSocket API 엔드포인트 URL",
+    });
   }
 }
@@ -10,11 +10,15 @@ import * as path from "path";
 
 export interface BedrockStackProps extends cdk.StackProps {
   kbBucket: s3.Bucket;
+  bulkInferenceBucket: s3.Bucket;
+  /** WEF 수치 조회 액션 그룹과 지시문을 켠다 (사실 테이블 wef/facts.bin을 올린 뒤에만) */
+  wefFacts?: boolean;
 }
 
 export class BedrockStack extends cdk.Stack {
   public readonly agentId: string;
   public readonly agentAliasId: string;
+  public readonly knowledgeBaseId: string;
 
   constructor(scope: Construct, id: string, props: BedrockStackProps) {
     super(scope, id, props);
@@ -287,12 +291,67 @@ export class BedrockStack extends cdk.Stack {
       ],
     }));
 
+    // ── Batch Inference IAM Role (benchmarks/bulk_precompute.py가 작업 제출 시 전달) ──
+    const bulkInferenceRole = new iam.Role(this, "BulkInferenceRole", {
+      assumedBy: new iam.ServicePrincipal("bedrock.amazonaws.com", {
+        conditions: { StringEquals: { "aws:SourceAccount": accountId } },
+      }),
+      description: "Bedrock batch inference (model invocation job) role",
+    });
+
+    props.bulkInferenceBucket.grantReadWrite(bulkInferenceRole);
+
+    bulkInferenceRole.addToPolicy(new iam.PolicyStatement({
+      actions: ["bedrock:InvokeModel", "bedrock:GetInferenceProfile"],
+      resources: [
+        `arn:aws:bedrock:*:${accountId}:inference-profile/*`,
+        `arn:aws:bedrock:*::foundation-model/*`,
+      ],
+    }));
+
     agentRole.addToPolicy(new iam.PolicyStatement({
       actions: ["bedrock:Retrieve"],
       resources: [`arn:aws:bedrock:${region}:${accountId}:knowledge-base/*`],
     }));
 
     // ── Bedrock Agent ──
+    // WEF 수치 조회: RETURN_CONTROL이라 analyze Lambda가 mmap 사실 테이블로 직접 답한다 (services/agent_actions.py)
+    // 사실 테이블이 없으면 모든 호출이 found=false라 턴만 늘어나므로 -c wefFacts=true일 때만 붙인다
+    const wefFacts = props.wefFacts ?? false;
+    const wefInstruction = wefFacts ? [
+      "## WEF Figures",
+      "For exact Future of Jobs figures, call get_job_outlook with the user's job and get_skill_outlook with each listed skill.",
+      "Make all of these calls together in a single turn.",
+      "These functions return structured figures with their report source and do not count toward the Knowledge Base search limit.",
+      "Prefer these figures over numbers found in Knowledge Base passages; use the Knowledge Base only for qualitative context.",
+      "If a function returns found=false, fall back to the Knowledge Base or general knowledge.",
+      "",
+    ] : [];
+    const wefActionGroups = wefFacts ? [{
+      ActionGroupName: "wef_facts",
+      Description: "Exact Future of Jobs Report 2025 figures for a job or a skill",
+      ActionGroupExecutor: { CustomControl: "RETURN_CONTROL" },
+      ActionGroupState: "ENABLED",
+      FunctionSchema: {
+        Functions: [
+          {
+            Name: "get_job_outlook",
+            Description: "Net growth, displacement and related WEF figures for a job title",
+            Parameters: {
+              job: { Type: "string", Description: "Job title as given by the user", Required: true },
+            },
+          },
+          {
+            Name: "get_skill_outlook",
+            Description: "Growth ranking and related WEF figures for a skill",
+            Parameters: {
+              skill: { Type: "string", Description: "Skill name as given by the user", Required: true },
+            },
+          },
+        ],
+      },
+    }] : [];
+
     const agentInstruction = [
       "You are the AI Tribunal of Career Doomsday Clock.",
       "You analyze user career data and deliver verdicts in a cold, dystopian tone.",
@@ -301,7 +360,7 @@ export class BedrockStack extends cdk.Stack {
       "## Mission",
       "1. Predict D-Day: years until the user's job is substantially replaced by AI.",
       "2. Analyze 3-5 key skills with AI replacement probability and time horizon.",
-      "3. Suggest exactly 3 future career cards based on the user's current skills.",
+      "3. Personalize the 3 pre-selected career cards listed in the user input.",
       "",
       "## Knowledge Base Usage",
       "Search the Knowledge Base to ground your analysis in real data.",
@@ -311,18 +370,16 @@ export class BedrockStack extends cdk.Stack {
       "After completing your searches, proceed directly to generating the final response. Do NOT search again.",
       "If a user-provided skill is not covered in the Knowledge Base search results, use your general knowledge to analyze it. Do not search again for missing skills.",
       "",
+      ...wefInstruction,
       "## Input Interpretation Guidelines",
       "1. If the user's input contains typos in job titles or skill names, auto-correct to the closest valid term.",
       "   Examples: '개발ㅈ' → '개발자', 'Pytohn' → 'Python', '데이타분석' → '데이터 분석'",
       "2. If the user's job title or skills are unrealistic or nonsensical (e.g. 'space pirate', 'breathing'),",
       "   interpret them as the closest realistic equivalent and proceed with analysis.",
-      "3. career_cards must recommend creative, future-oriented roles that are realistically achievable",
-      "   — emerging jobs or evolved forms of existing ones",
-      "   (e.g. 'AI Ethics Consultant', 'Prompt Engineer', 'Digital Twin Designer', 'AI-Human Collaboration Coordinator').",
-      "   Exclude entirely fictional roles (e.g. 'Space Wizard').",
+      "3. Career cards are pre-selected from a template library and listed under 'Career Cards' in the user input.",
+      "   Do not invent new roles, combo formulas, or roadmaps. Only write a short reason explaining",
+      "   why each listed card fits this specific user's job and skills.",
       "4. dday_reason must be 1-2 sentences summarizing the core basis for the D-Day prediction.",
-      "5. Each roadmap step duration must be between 1 month and 12 months.",
-      "   The total roadmap must be between 6 months and 3 years.",
       "",
       "## Output Format",
       "Your entire response must be a raw JSON object starting with { and ending with }.",
@@ -343,19 +400,15 @@ export class BedrockStack extends cdk.Stack {
       '  ],',
       '  "career_cards": [',
       '    {',
-      '      "card_index": "<0, 1, or 2>",',
-      '      "combo_formula": "[current job] + [relevant skills] = [new job title]",',
-      '      "reason": "<recommendation rationale>",',
-      '      "roadmap": [',
-      '        { "step": "<step description>", "duration": "<e.g. 3 months>" }',
-      '      ]',
+      '      "card_index": "<index of the listed card: 0, 1, or 2>",',
+      '      "reason": "<1-2 sentence rationale personalized to the user>"',
       '    }',
       '  ]',
       '}',
       "",
       "## Rules",
       "- skill_risks must include ALL skills the user listed without exception. For non-technical skills (e.g. hobbies, physical activities, soft skills), analyze them seriously in a professional context — evaluate how AI or automation could impact the professional application of that skill. For example, 'yoga' could be analyzed as a fitness instruction skill facing competition from AI-powered virtual coaching apps. Maintain the same dystopian tone and analytical rigor as technical skills.",
-      "- career_cards: exactly 3 items.",
+      "- career_cards: exactly 3 items, one per listed Career Card, containing only card_index and reason.",
       "- Output must be valid JSON only. No markdown, no code fences, no explanatory text.",
       "- Knowledge Base searches: maximum 2 queries total.",
     ].join("\n");
@@ -375,6 +428,7 @@ export class BedrockStack extends cdk.Stack {
           Description: "Future of Jobs Report 2025 data",
           KnowledgeBaseState: "ENABLED",
         }],
+        ActionGroups: wefActionGroups,
       },
     });
     agent.node.addDependency(agentRole);
@@ -392,9 +446,10 @@ export class BedrockStack extends cdk.Stack {
     // ── Outputs ──
     this.agentId = agent.getAtt("AgentId").toString();
     this.agentAliasId = agentAlias.getAtt("AgentAliasId").toString();
+    this.knowledgeBaseId = knowledgeBase.getAtt("KnowledgeBaseId").toString();
 
     new cdk.CfnOutput(this, "KnowledgeBaseId", {
-      value: knowledgeBase.getAtt("KnowledgeBaseId").toString(),
+      value: this.knowledgeBaseId,
       description: "Bedrock Knowledge Base ID",
     });
 
@@ -408,6 +463,11 @@ export class BedrockStack extends cdk.Stack {
       description: "Bedrock Agent Alias ID",
     });
 
+    new cdk.CfnOutput(this, "BulkInferenceRoleArn", {
+      value: bulkInferenceRole.roleArn,
+      description: "Bedrock batch inference service role ARN",
+    });
+
     new cdk.CfnOutput(this, "OSSCollectionEndpoint", {
       value: ossCollection.attrCollectionEndpoint,
       description: "OpenSearch Serverless collection endpoint",
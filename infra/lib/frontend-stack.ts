@@ -7,6 +7,8 @@ import { Construct } from "constructs";
 export interface FrontendStackProps extends cdk.StackProps {
   /** API Gateway 엔드포인트 URL */
   apiUrl: string;
+  /** WebSocket API 엔드포인트 URL (분석 완료 푸시) */
+  webSocketUrl: string;
 }
 
 export class FrontendStack extends cdk.Stack {
@@ -60,6 +62,10 @@ export class FrontendStack extends cdk.Stack {
           name: "NEXT_PUBLIC_API_URL",
           value: props.apiUrl,
         },
+        {
+          name: "NEXT_PUBLIC_WS_URL",
+          value: props.webSocketUrl,
+        },
         {
           name: "AMPLIFY_MONOREPO_APP_ROOT",
           value: "frontend",
@@ -9,7 +9,15 @@ export class StorageStack extends cdk.Stack {
   public readonly skillGraphTable: dynamodb.Table;
   public readonly careerCardsTable: dynamodb.Table;
   public readonly guestbookTable: dynamodb.Table;
+  public readonly connectionsTable: dynamodb.Table;
+  public readonly checkpointTable: dynamodb.Table;
+  public readonly stateTable: dynamodb.Table;
+  public readonly translationCacheTable: dynamodb.Table;
+  public readonly analysisCacheTable: dynamodb.Table;
+  public readonly analysisRecordsTable: dynamodb.Table;
   public readonly kbBucket: s3.Bucket;
+  public readonly bulkInferenceBucket: s3.Bucket;
+  public readonly modelArtifactsBucket: s3.Bucket;
 
   constructor(scope: Construct, id: string, props?: cdk.StackProps) {
     super(scope, id, props);
@@ -22,6 +30,14 @@ export class StorageStack extends cdk.Stack {
       removalPolicy: cdk.RemovalPolicy.DESTROY,
     });
 
+    // GSI for survey: 세션 스위퍼가 status별로 오래된 세션을 조회
+    this.surveyTable.addGlobalSecondaryIndex({
+      indexName: "status-created_at-index",
+      partitionKey: { name: "status", type: dynamodb.AttributeType.STRING },
+      sortKey: { name: "created_at", type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.ALL,
+    });
+
     this.skillGraphTable = new dynamodb.Table(this, "SkillGraphTable", {
       partitionKey: { name: "session_id", type: dynamodb.AttributeType.STRING },
       sortKey: { name: "skill_name", type: dynamodb.AttributeType.STRING },
@@ -41,6 +57,8 @@ export class StorageStack extends cdk.Stack {
       sortKey: { name: "created_at", type: dynamodb.AttributeType.STRING },
       billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
       removalPolicy: cdk.RemovalPolicy.DESTROY,
+      // 새 항목을 유사 프로필 인덱스에 점진 추가 (guestbook_indexer)
+      stream: dynamodb.StreamViewType.NEW_IMAGE,
     });
 
     // GSI for guestbook: query all entries sorted by created_at (newest first)
@@ -58,6 +76,61 @@ export class StorageStack extends cdk.Stack {
       projectionType: dynamodb.ProjectionType.KEYS_ONLY,
     });
 
+    // WebSocket 연결 레지스트리: session_id → connection_id (TTL로 자동 정리)
+    this.connectionsTable = new dynamodb.Table(this, "ConnectionsTable", {
+      partitionKey: { name: "session_id", type: dynamodb.AttributeType.STRING },
+      sortKey: { name: "connection_id", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      timeToLiveAttribute: "expires_at",
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // GSI for connections: $disconnect 시 connection_id로 역조회
+    this.connectionsTable.addGlobalSecondaryIndex({
+      indexName: "connection_id-index",
+      partitionKey: { name: "connection_id", type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.ALL,
+    });
+
+    // 분석 단계 체크포인트: 재시도 시 완료된 단계(retrieval/generation/저장) 건너뛰기
+    this.checkpointTable = new dynamodb.Table(this, "AnalysisCheckpointTable", {
+      partitionKey: { name: "session_id", type: dynamodb.AttributeType.STRING },
+      sortKey: { name: "stage", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      timeToLiveAttribute: "expires_at",
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // 시스템 공유 상태 (서킷 브레이커 등 컨테이너 간 공유가 필요한 작은 항목)
+    this.stateTable = new dynamodb.Table(this, "SystemStateTable", {
+      partitionKey: { name: "state_key", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // 분석 결과 번역 캐시: (텍스트 해시, 언어) 단위로 번역문 재사용
+    this.translationCacheTable = new dynamodb.Table(this, "TranslationCacheTable", {
+      partitionKey: { name: "text_hash", type: dynamodb.AttributeType.STRING },
+      sortKey: { name: "language", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      timeToLiveAttribute: "expires_at",
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // 대량 사전 분석 캐시: 직업/스킬 조합 해시 단위로 배치 추론 결과 재사용
+    this.analysisCacheTable = new dynamodb.Table(this, "AnalysisCacheTable", {
+      partitionKey: { name: "cache_key", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // 공유 분석 레코드: 내용 해시 주소의 불변 결과 (세션은 survey.analysis_ref로 가리킴)
+    this.analysisRecordsTable = new dynamodb.Table(this, "AnalysisRecordsTable", {
+      partitionKey: { name: "record_id", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
     // ── S3 Bucket for Knowledge Base source files ──
 
     this.kbBucket = new s3.Bucket(this, "KnowledgeBaseBucket", {
@@ -67,6 +140,27 @@ export class StorageStack extends cdk.Stack {
       autoDeleteObjects: true,
     });
 
+    // ── S3 Bucket for Bedrock batch inference input/output JSONL ──
+
+    this.bulkInferenceBucket = new s3.Bucket(this, "BulkInferenceBucket", {
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      encryption: s3.BucketEncryption.S3_MANAGED,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      autoDeleteObjects: true,
+      // 결과는 analysis_cache 테이블에 적재되므로 입출력 파일은 오래 보관하지 않는다
+      lifecycleRules: [{ expiration: cdk.Duration.days(14) }],
+    });
+
+    // ── S3 Bucket for model/index artifacts (what-if 대리 모델, 방명록 유사 프로필 인덱스) ──
+
+    this.modelArtifactsBucket = new s3.Bucket(this, "ModelArtifactsBucket", {
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      encryption: s3.BucketEncryption.S3_MANAGED,
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      autoDeleteObjects: true,
+      versioned: true,
+    });
+
     // Deploy PDF files from pdfdata/ to S3 bucket
     new s3deploy.BucketDeployment(this, "DeployPdfData", {
       sources: [s3deploy.Source.asset("../pdfdata")],
@@ -0,0 +1 @@
+"""오프라인 벤치마크 스크립트 (moto DynamoDB + 재생/스텁 Bedrock 백엔드)."""
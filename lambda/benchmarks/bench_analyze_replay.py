@@ -0,0 +1,63 @@
+"""녹화 스트림 재생으로 analyze_handler 종단 지연 시간을 측정한다.
+
+실제 Bedrock 대신 ReplayAgentRuntime이 녹화된 트레이스/청크를 원본 간격(× time_scale)으로
+다시 내보내고, 파싱과 저장은 moto DynamoDB에 대해 실제 핸들러 코드로 수행한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.bench_analyze_replay --runs 20 --time-scale 0.01
+"""
+
+import argparse
+import time
+
+from benchmarks.common import DEFAULT_RECORDING, moto_analysis_tables, patched_analyze_module, summarize
+
+EVENT = {
+    "name": "벤치마크",
+    "job_title": "소프트웨어 개발자",
+    "age_group": "30대",
+    "strengths": "Python, JavaScript, React, AWS, Docker",
+    "hobbies": "Python, JavaScript, React, AWS, Docker",
+}
+
+
+def run(recording: str, runs: int, time_scale: float, chunk_chars: int) -> None:
+    from services.trace_replay import ReplayAgentRuntime
+
+    runtime = ReplayAgentRuntime.from_file(recording, time_scale=time_scale, chunk_chars=chunk_chars)
+    with moto_analysis_tables() as ddb, patched_analyze_module({"bedrock_agent_runtime": runtime}) as module:
+        survey = ddb.Table("survey")
+
+        totals, overheads = [], []
+        for i in range(runs):
+            session_id = f"bench-{i}"
+            survey.put_item(Item={"session_id": session_id, "status": "analyzing"})
+            start = time.perf_counter()
+            module.handler({"session_id": session_id, **EVENT}, None)
+            total = time.perf_counter() - start
+
+            status = survey.get_item(Key={"session_id": session_id})["Item"]["status"]
+            if status != "completed":
+                raise SystemExit(f"분석 실패: session_id={session_id}, status={status}")
+            totals.append(total)
+            overheads.append(total - runtime.duration_seconds)
+
+    print(f"recording={recording} events={len(runtime.events)} "
+          f"time_scale={time_scale} replay={runtime.duration_seconds:.3f}s")
+    print(summarize("end-to-end", totals))
+    print(summarize("parse+persist (end-to-end - replay)", overheads))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", default=str(DEFAULT_RECORDING))
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--time-scale", type=float, default=0.0,
+                        help="원본 간격 배율 (1.0=원본 속도, 0=대기 없음)")
+    parser.add_argument("--chunk-chars", type=int, default=256)
+    args = parser.parse_args()
+    run(args.recording, args.runs, args.time_scale, args.chunk_chars)
+
+
+if __name__ == "__main__":
+    main()
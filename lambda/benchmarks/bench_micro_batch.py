@@ -0,0 +1,124 @@
+"""묶음 생성(micro-batching)의 처리량과 세션별 지연을 배치 크기·대기 시간별로 비교한다.
+
+포아송 도착으로 버스트를 만들고, SQS 이벤트 소스와 같은 규칙(배치가 가득 차거나 첫 메시지 이후
+linger가 지나면 전달)으로 묶음을 만든 뒤, 실제 analyze 핸들러의 큐 경로(moto DynamoDB,
+FakeBatchModelRuntime)를 실행해 처리 시간을 잰다. 동시 소비자 수(--concurrency)는
+스로틀 한도를 흉내 내며, 시뮬레이션 시계로 처리량과 세션별 지연(도착 → 저장 완료)을 계산한다.
+모델 지연은 공유 오버헤드 + 프로필 수 비례 출력 시간으로 흉내 낸다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.bench_micro_batch --sessions 64 --rate 8 --sizes 1,4,8 --lingers 0.5,2
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import List, Tuple
+
+from benchmarks.common import moto_analysis_tables, patched_analyze_module, summarize
+from benchmarks.bench_analyze_replay import EVENT
+
+
+def poisson_arrivals(count: int, rate: float, seed: int) -> List[float]:
+    rng = random.Random(seed)
+    t, arrivals = 0.0, []
+    for _ in range(count):
+        t += rng.expovariate(rate)
+        arrivals.append(t)
+    return arrivals
+
+
+def form_batches(arrivals: List[float], size: int, linger: float) -> List[Tuple[float, List[int]]]:
+    """(전달 시각, 세션 인덱스 목록). 배치가 size에 도달하거나 첫 메시지 후 linger가 지나면 전달한다."""
+    batches, current, opened = [], [], 0.0
+    for i, t in enumerate(arrivals):
+        if current and t > opened + linger:
+            batches.append((opened + linger, current))
+            current = []
+        if not current:
+            opened = t
+        current.append(i)
+        if len(current) >= size:
+            batches.append((t, current))
+            current = []
+    if current:
+        batches.append((opened + linger, current))
+    return batches
+
+
+def simulate(module, ddb, model, arrivals, size, linger, concurrency, label):
+    """묶음마다 핸들러를 실행하고 (세션별 지연, 처리량, 모델 요청 수)를 반환한다."""
+    survey = ddb.Table("survey")
+    workers = [0.0] * concurrency
+    latencies, finish = [], 0.0
+    calls_before = len(model.calls)
+    for flush_at, members in form_batches(arrivals, size, linger):
+        records = []
+        for i in members:
+            session_id = f"{label}-{i}"
+            survey.put_item(Item={"session_id": session_id, "status": "analyzing"})
+            records.append({"messageId": session_id, "attributes": {},
+                            "body": json.dumps({"session_id": session_id, **EVENT})})
+        start = time.perf_counter()
+        module.handler({"Records": records}, None)
+        duration = time.perf_counter() - start
+
+        w = min(range(concurrency), key=workers.__getitem__)
+        end = max(flush_at, workers[w]) + duration
+        workers[w] = end
+        finish = max(finish, end)
+        latencies.extend(end - arrivals[i] for i in members)
+    return latencies, len(arrivals) / (finish - arrivals[0]), len(model.calls) - calls_before
+
+
+def run(sessions: int, rate: float, sizes: List[int], lingers: List[float], concurrency: int,
+        overhead_ms: float, per_profile_ms: float, seed: int) -> None:
+    from tests.helpers import FakeBatchModelRuntime
+
+    arrivals = poisson_arrivals(sessions, rate, seed)
+    model = FakeBatchModelRuntime(overhead_seconds=overhead_ms / 1000, per_profile_seconds=per_profile_ms / 1000)
+    print(f"sessions={sessions} rate={rate}/s concurrency={concurrency} "
+          f"model=overhead {overhead_ms:.0f}ms + {per_profile_ms:.0f}ms/profile")
+    with moto_analysis_tables() as ddb:
+        import functions.analyze.handler as module
+
+        overrides = {
+            "bedrock_runtime": model,
+            "MICRO_BATCH_MODEL_ID": "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
+            "KNOWLEDGE_BASE_ID": "",
+            "FUNCTION_NAME": "",
+            "STATE_TABLE_NAME": "",
+        }
+        with patched_analyze_module(overrides):
+            for size in sizes:
+                for linger in lingers if size > 1 else [0.0]:
+                    module.MICRO_BATCH_SIZE = size
+                    label = f"b{size}-l{linger}"
+                    latencies, throughput, requests = simulate(
+                        module, ddb, model, arrivals, size, linger, concurrency, label
+                    )
+                    tokens = model.shared_input_tokens * requests + model.per_profile_input_tokens * sessions
+                    print(f"\nsize={size} linger={linger}s requests={requests} "
+                          f"throughput={throughput:.2f} sessions/s input_tokens/session={tokens // sessions}")
+                    print(summarize("  per-session latency", latencies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--rate", type=float, default=8.0, help="평균 도착률 (세션/초)")
+    parser.add_argument("--sizes", default="1,4,8", help="비교할 배치 크기 (쉼표 구분)")
+    parser.add_argument("--lingers", default="0.5,2", help="비교할 최대 대기 시간(초, 쉼표 구분)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 소비자 수 (스로틀 한도 근사)")
+    parser.add_argument("--overhead-ms", type=float, default=150.0, help="요청당 공유 오버헤드 (프롬프트 처리)")
+    parser.add_argument("--per-profile-ms", type=float, default=60.0, help="프로필당 출력 생성 시간")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.sessions, args.rate, [int(s) for s in args.sizes.split(",")],
+        [float(s) for s in args.lingers.split(",")], args.concurrency,
+        args.overhead_ms, args.per_profile_ms, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""스트리밍 저장 파이프라인 유무에 따른 analyze_handler 종단 지연 시간을 비교한다.
+
+녹화 스트림 재생(ReplayAgentRuntime, 최종 응답 스트리밍 모드)으로 같은 응답을 받으면서
+STREAMING_PERSIST를 끄고/켜서 측정한다. moto 쓰기는 실제 DynamoDB보다 훨씬 빠르므로
+저장 함수 호출마다 --write-latency-ms 만큼 지연을 주입해 저장 시간이 스트리밍 뒤에
+얼마나 숨는지 본다. tail은 (종단 시간 - 재생 시간), 즉 스트림이 끝난 뒤 남는 시간이다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.bench_streaming_pipeline --runs 5 --time-scale 0.1 --write-latency-ms 80
+"""
+
+import argparse
+import time
+
+from benchmarks.common import DEFAULT_RECORDING, moto_analysis_tables, patched_analyze_module, summarize
+from benchmarks.bench_analyze_replay import EVENT
+
+
+def _with_latency(fn, latency_seconds: float):
+    def wrapped(*args, **kwargs):
+        time.sleep(latency_seconds)
+        return fn(*args, **kwargs)
+    return wrapped
+
+
+def measure(runtime, streaming: bool, runs: int, write_latency: float):
+    with moto_analysis_tables() as ddb:
+        # 핸들러 모듈의 boto3 리소스가 moto 안에서 만들어지도록 여기서 import한다
+        import functions.analyze.handler as module
+
+        overrides = {
+            "bedrock_agent_runtime": runtime,
+            "STREAMING_PERSIST": streaming,
+            "_save_skill_risks": _with_latency(module._save_skill_risks, write_latency),
+            "_save_career_cards": _with_latency(module._save_career_cards, write_latency),
+        }
+        with patched_analyze_module(overrides):
+            totals, tails = _measure_runs(ddb, module, runtime, streaming, runs)
+    return totals, tails
+
+
+def _measure_runs(ddb, module, runtime, streaming: bool, runs: int):
+    """세션을 runs번 분석하고 (종단 시간, tail) 목록을 반환한다."""
+    survey = ddb.Table("survey")
+    totals, tails = [], []
+    for i in range(runs):
+        session_id = f"bench-{'stream' if streaming else 'batch'}-{i}"
+        survey.put_item(Item={"session_id": session_id, "status": "analyzing"})
+        start = time.perf_counter()
+        module.handler({"session_id": session_id, **EVENT}, None)
+        total = time.perf_counter() - start
+
+        status = survey.get_item(Key={"session_id": session_id})["Item"]["status"]
+        if status != "completed":
+            raise SystemExit(f"분석 실패: session_id={session_id}, status={status}")
+        totals.append(total)
+        tails.append(total - runtime.duration_seconds)
+    return totals, tails
+
+
+def run(recording: str, runs: int, time_scale: float, chunk_chars: int, write_latency_ms: float) -> None:
+    from services.trace_replay import ReplayAgentRuntime
+
+    runtime = ReplayAgentRuntime.from_file(recording, time_scale=time_scale, chunk_chars=chunk_chars)
+    print(f"recording={recording} time_scale={time_scale} replay={runtime.duration_seconds:.3f}s "
+          f"write_latency={write_latency_ms:.0f}ms")
+    for streaming in (False, True):
+        totals, tails = measure(runtime, streaming, runs, write_latency_ms / 1000)
+        label = "streaming" if streaming else "batch"
+        print(summarize(f"{label} end-to-end", totals))
+        print(summarize(f"{label} tail (end-to-end - replay)", tails))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", default=str(DEFAULT_RECORDING))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--time-scale", type=float, default=0.1,
+                        help="원본 간격 배율 (1.0=원본 속도, 0=대기 없음)")
+    parser.add_argument("--chunk-chars", type=int, default=64)
+    parser.add_argument("--write-latency-ms", type=float, default=80.0,
+                        help="저장 함수 호출마다 주입할 지연 (DynamoDB 왕복 근사)")
+    args = parser.parse_args()
+    run(args.recording, args.runs, args.time_scale, args.chunk_chars, args.write_latency_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""자주 들어오는 직업/스킬/연령대 조합을 Bedrock 배치 추론으로 미리 분석해 분석 캐시에 채운다.
+
+services.bulk_inference의 흐름(JSONL 업로드 → 작업 제출 → 완료 폴링 → 출력 스트림 적재)을 실행한다.
+조합은 survey 테이블에서 가장 많이 들어온 순서(--survey-table)나 JSONL 파일
+(한 줄에 {"job_title", "strengths", "age_group"}, --combinations)로 고른다.
+캐시 키에 프롬프트 버전이 들어가므로 --prompt-version은 analyze 실험 변형의 prompt_version과 맞춘다.
+--local이면 moto S3/DynamoDB와 FakeBatchJobRunner로 같은 흐름을 실행하고 적재 중 최대 메모리를 출력한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.bulk_precompute --survey-table <survey> --limit 5000 \\
+        --bucket <bulk 버킷> --role-arn <배치 추론 역할 ARN> --cache-table <analysis_cache>
+    python -m benchmarks.bulk_precompute --local 5000
+"""
+
+import argparse
+import json
+import re
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmarks import common  # noqa: F401  (레이어 경로 설정)
+
+DEFAULT_MODEL_ID = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
+_RECORD_ID = re.compile(r"### User session_id: (\S+)")
+
+
+def load_combinations(args) -> List[Any]:
+    import boto3
+
+    from services.bulk_inference import top_combinations
+    from services.prompt_templates import DEFAULT_PROMPT_VERSION
+
+    prompt_version = args.prompt_version or DEFAULT_PROMPT_VERSION
+    if args.combinations:
+        with open(args.combinations, encoding="utf-8") as f:
+            rows = (json.loads(line) for line in f if line.strip())
+            return top_combinations(rows, args.limit, prompt_version)
+
+    table = boto3.resource("dynamodb").Table(args.survey_table)
+
+    def scan() -> Iterator[Dict[str, Any]]:
+        kwargs: Dict[str, Any] = {"ProjectionExpression": "job_title, strengths, age_group"}
+        while True:
+            page = table.scan(**kwargs)
+            yield from page.get("Items", [])
+            if "LastEvaluatedKey" not in page:
+                return
+            kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+    return top_combinations(scan(), args.limit, prompt_version)
+
+
+def references_for(agent_runtime: Any, knowledge_base_id: str, cache: Dict[str, List[Dict[str, str]]], job_title: str):
+    """직업별 Knowledge Base 검색 결과 (같은 직업의 조합은 검색을 공유한다)."""
+    from services.agent_stream import retrieve_references
+
+    if not knowledge_base_id:
+        return []
+    key = job_title.lower().strip()
+    if key not in cache:
+        cache[key] = retrieve_references(agent_runtime, knowledge_base_id, f"{job_title} job outlook and AI automation risk")
+    return cache[key]
+
+
+def run_bulk(s3: Any, bedrock: Any, cache_table: Any, combos: List[Any], bucket: str, prefix: str,
+             role_arn: str, model_id: str, poll_seconds: float,
+             agent_runtime: Any = None, knowledge_base_id: str = "") -> Any:
+    from services.bulk_inference import (
+        AnalysisCache,
+        build_record,
+        iter_output_records,
+        job_output_prefix,
+        submit_job,
+        wait_for_job,
+        write_input_jsonl,
+    )
+
+    job_name = "bulk-analysis-" + datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    input_uri = f"s3://{bucket}/{prefix}input/{job_name}.jsonl"
+    output_uri = f"s3://{bucket}/{prefix}output/"
+    kb_cache: Dict[str, List[Dict[str, str]]] = {}
+
+    records = (
+        build_record(c, references_for(agent_runtime, knowledge_base_id, kb_cache, c.job_title)) for c in combos
+    )
+    count = write_input_jsonl(s3, input_uri, records)
+    job_arn = submit_job(bedrock, job_name, role_arn, model_id, input_uri, output_uri)
+    job = wait_for_job(bedrock, job_arn, poll_seconds=poll_seconds)
+    out_bucket, out_prefix = job_output_prefix(output_uri, job_arn)
+    stats = AnalysisCache(cache_table).ingest(
+        iter_output_records(s3, out_bucket, out_prefix), model_id, profiles={c.cache_key: c for c in combos}
+    )
+    print(f"job={job_arn} status={job['status']} input_records={count} "
+          f"cached={stats.cached} failed={stats.failed}")
+    return stats
+
+
+def sample_response(model_input: Dict[str, Any]) -> str:
+    """로컬 실행용 응답: 요청한 recordId에 대한 분석 배열 (tests.helpers.SAMPLE_ANALYSIS 형식)."""
+    from tests.helpers import SAMPLE_ANALYSIS
+
+    record_id = _RECORD_ID.search(model_input["messages"][0]["content"]).group(1)
+    return json.dumps([{"session_id": record_id, **SAMPLE_ANALYSIS}], ensure_ascii=False)
+
+
+def run_local(count: int) -> None:
+    import boto3
+    from moto import mock_aws
+
+    from services.bulk_inference import Combination
+    from tests.helpers import FakeBatchJobRunner, create_analysis_tables
+
+    jobs = ["개발자", "디자이너", "마케터", "회계사", "간호사", "교사", "데이터 분석가", "영업 관리자"]
+    skills = ["Python", "SQL", "Communication", "Excel", "Figma", "Leadership", "Writing", "Statistics"]
+    combos = [
+        Combination(jobs[i % len(jobs)], ", ".join(skills[(i + k) % len(skills)] for k in range(1 + i % 4)) + f", 스킬{i}")
+        for i in range(count)
+    ]
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="bulk")
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        runner = FakeBatchJobRunner(s3, sample_response)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        run_bulk(s3, runner, ddb.Table("analysis_cache"), combos, "bulk", "bulk/",
+                 "arn:aws:iam::000000000000:role/bulk", DEFAULT_MODEL_ID, poll_seconds=0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"combinations={count} duration={time.perf_counter() - start:.1f}s peak_memory={peak / 1e6:.1f}MB")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--local", type=int, default=0, help="moto + FakeBatchJobRunner로 N개 조합을 실행")
+    parser.add_argument("--survey-table", help="조합을 고를 survey DynamoDB 테이블 이름")
+    parser.add_argument("--combinations", help="조합 JSONL 파일 ({job_title, strengths, age_group} 한 줄씩)")
+    parser.add_argument("--limit", type=int, default=5000, help="사전 분석할 상위 조합 수")
+    parser.add_argument("--bucket", help="배치 입출력 S3 버킷")
+    parser.add_argument("--prefix", default="bulk/", help="배치 입출력 S3 접두사")
+    parser.add_argument("--role-arn", help="Bedrock 배치 추론 서비스 역할 ARN")
+    parser.add_argument("--model-id", default=DEFAULT_MODEL_ID)
+    parser.add_argument("--prompt-version", default="", help="프롬프트 템플릿 버전 (기본: analyze 기본 버전)")
+    parser.add_argument("--cache-table", help="analysis_cache DynamoDB 테이블 이름")
+    parser.add_argument("--knowledge-base-id", default="", help="직업별 참고 자료를 붙일 Knowledge Base ID")
+    parser.add_argument("--poll-seconds", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    if args.local:
+        run_local(args.local)
+        return
+    if not (args.survey_table or args.combinations) or not (args.bucket and args.role_arn and args.cache_table):
+        parser.error("--survey-table 또는 --combinations, 그리고 --bucket/--role-arn/--cache-table이 필요합니다")
+
+    import boto3
+
+    combos = load_combinations(args)
+    if not combos:
+        raise SystemExit("사전 분석할 조합이 없습니다")
+    run_bulk(
+        boto3.client("s3"), boto3.client("bedrock"), boto3.resource("dynamodb").Table(args.cache_table),
+        combos, args.bucket, args.prefix, args.role_arn, args.model_id, args.poll_seconds,
+        agent_runtime=boto3.client("bedrock-agent-runtime"), knowledge_base_id=args.knowledge_base_id,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""장애 주입 시나리오별 analyze 회복력(성공률, 지연 백분위수) 측정.
+
+FaultInjectingRuntime으로 스로틀/느린 첫 바이트/스트림 도중 오류/잘린 JSON을 주입하고
+회복력 설정(엔드포인트 전환, 스위퍼 재시도, 서킷 브레이커)별로 analyze_handler를
+moto DynamoDB에 대해 실행한다. 주입된 대기와 스위퍼 백오프는 가상 시계로 계산하므로
+실제 실행은 빠르다. 지연 시간 = 실제 처리 시간 + 가상 대기 시간 (세션 단위, 재시도 포함).
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.chaos_analyze --sessions 50
+"""
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from benchmarks.common import DEFAULT_RECORDING, moto_analysis_tables, patched_analyze_module, percentile
+
+EVENT = {
+    "name": "카오스",
+    "job_title": "소프트웨어 개발자",
+    "age_group": "30대",
+    "strengths": "Python, JavaScript, React, AWS, Docker",
+    "hobbies": "Python, JavaScript, React, AWS, Docker",
+}
+
+
+class VirtualClock:
+    """실제 단조 시계 + 주입된 대기 시간을 더한 가상 시계."""
+
+    def __init__(self) -> None:
+        self.offset = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.offset += seconds
+
+    def __call__(self) -> float:
+        return time.monotonic() + self.offset
+
+
+@dataclass
+class Resilience:
+    """회복력 설정."""
+
+    name: str
+    endpoints: int = 1
+    max_attempts: int = 1
+    sweeper_retries: int = 0
+    breaker: bool = False
+
+
+def scenarios() -> Dict[str, "FaultProfile"]:
+    """analyze_logs*.txt의 장애 유형을 바탕으로 한 시나리오."""
+    from services.fault_injection import DIST_LOGNORMAL, FaultProfile, LatencyDistribution
+
+    def profile(**kwargs) -> FaultProfile:
+        base = {
+            "first_byte": LatencyDistribution(DIST_LOGNORMAL, value=20.0, sigma=0.3),
+            "inter_chunk": LatencyDistribution(DIST_LOGNORMAL, value=0.3, sigma=0.5),
+            "read_timeout_seconds": 120.0,
+        }
+        base.update(kwargs)
+        return FaultProfile(**base)
+
+    return {
+        "healthy": profile(),
+        "throttled": profile(throttle_rate=0.3),
+        "slow_first_byte": profile(first_byte=LatencyDistribution(DIST_LOGNORMAL, value=70.0, sigma=0.6)),
+        "mid_stream_error": profile(mid_stream_error_rate=0.25),
+        "truncated_json": profile(truncation_rate=0.2),
+        "mixed": profile(throttle_rate=0.1, mid_stream_error_rate=0.1, truncation_rate=0.1,
+                         first_byte=LatencyDistribution(DIST_LOGNORMAL, value=40.0, sigma=0.6)),
+    }
+
+
+RESILIENCE_SETTINGS = [
+    Resilience("baseline"),
+    Resilience("failover", endpoints=2, max_attempts=2),
+    Resilience("failover+sweeper", endpoints=2, max_attempts=2, sweeper_retries=2),
+    Resilience("failover+sweeper+breaker", endpoints=2, max_attempts=2, sweeper_retries=2, breaker=True),
+]
+
+
+def run_setting(profile, setting: Resilience, sessions: int, seed: int) -> Dict[str, object]:
+    """시나리오 하나를 회복력 설정 하나로 실행한다."""
+    from services.circuit_breaker import CircuitBreaker
+    from services.endpoint_balancer import Endpoint, EndpointBalancer
+    from services.fault_injection import FaultInjectingRuntime
+    from services.sweeper import SweepConfig, backoff_seconds
+    from services.trace_replay import ReplayAgentRuntime
+
+    clock = VirtualClock()
+    recording = ReplayAgentRuntime.from_file(str(DEFAULT_RECORDING), time_scale=0)
+    runtimes = {
+        f"sim-{i}": FaultInjectingRuntime(inner=recording, profile=profile, seed=seed + i, sleep=clock.sleep)
+        for i in range(setting.endpoints)
+    }
+    balancer = EndpointBalancer(
+        [Endpoint(name=region, agent_id="A", agent_alias_id="B", region=region) for region in runtimes],
+        max_attempts=setting.max_attempts,
+        clock=clock,
+    )
+    breaker = CircuitBreaker("bedrock-chaos", failure_threshold=5 if setting.breaker else 10 ** 9,
+                             cooldown_seconds=60, clock=clock)
+    sweep_config = SweepConfig()
+
+    overrides = {"endpoint_balancer": balancer, "bedrock_breaker": breaker, "_regional_clients": runtimes}
+    with moto_analysis_tables() as ddb, patched_analyze_module(overrides) as module:
+        survey = ddb.Table("survey")
+
+        latencies: List[float] = []
+        successes = 0
+        for i in range(sessions):
+            session_id = f"chaos-{i}"
+            survey.put_item(Item={"session_id": session_id, "status": "analyzing"})
+            start = clock()
+            for attempt in range(setting.sweeper_retries + 1):
+                if attempt:
+                    # 스위퍼 재시도는 백오프 대기 후 실행된다
+                    clock.sleep(backoff_seconds(attempt - 1, sweep_config))
+                module.handler({"session_id": session_id, **EVENT}, None)
+                if survey.get_item(Key={"session_id": session_id})["Item"]["status"] == "completed":
+                    successes += 1
+                    break
+            latencies.append(clock() - start)
+
+    injected: Dict[str, int] = {}
+    for runtime in runtimes.values():
+        for kind, count in runtime.injected.items():
+            injected[kind] = injected.get(kind, 0) + count
+    return {
+        "success_rate": successes / sessions,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "injected": injected,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenario", action="append", help="실행할 시나리오 (기본: 전체)")
+    args = parser.parse_args()
+    # 주입된 오류마다 남는 핸들러 예외 로그는 결과 표를 가리므로 끈다
+    logging.disable(logging.CRITICAL)
+
+    selected = {name: p for name, p in scenarios().items() if not args.scenario or name in args.scenario}
+    print(f"{'scenario':<18} {'resilience':<26} {'success':>8} {'p50':>8} {'p95':>8} {'p99':>8}  injected")
+    for scenario_name, profile in selected.items():
+        for setting in RESILIENCE_SETTINGS:
+            r = run_setting(profile, setting, args.sessions, args.seed)
+            injected = ",".join(f"{k}={v}" for k, v in r["injected"].items() if v) or "-"
+            print(f"{scenario_name:<18} {setting.name:<26} {r['success_rate']:>7.0%} "
+                  f"{r['p50']:>7.1f}s {r['p95']:>7.1f}s {r['p99']:>7.1f}s  {injected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""벤치마크 공용 유틸리티 (경로 설정, moto 테이블, 지연 시간 통계)."""
+
+import math
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+LAMBDA_ROOT = Path(__file__).resolve().parent.parent
+REPO_ROOT = LAMBDA_ROOT.parent
+DEFAULT_RECORDING = REPO_ROOT / "bedrock-agent-tracing-file.txt"
+
+for p in [str(LAMBDA_ROOT), str(LAMBDA_ROOT / "layers" / "common" / "python")]:
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+# 실제 AWS 호출 방지 (moto 전용)
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+# 핸들러 [TIMING] 로그가 결과 출력을 가리지 않도록 기본값을 낮춘다
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@contextmanager
+def moto_analysis_tables() -> Iterator[object]:
+    """moto DynamoDB에 analyze 테이블을 만들고 리소스를 반환한다."""
+    import boto3
+    from moto import mock_aws
+
+    from tests.helpers import create_analysis_tables
+
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        yield ddb
+
+
+@contextmanager
+def patched_analyze_module(overrides: Dict[str, object]) -> Iterator[object]:
+    """analyze 핸들러 모듈의 테이블 이름·클라이언트 등 모듈 속성을 교체하고, 끝나면 되돌린다."""
+    import functions.analyze.handler as module
+
+    attrs = {
+        "SURVEY_TABLE_NAME": "survey",
+        "SKILL_GRAPH_TABLE_NAME": "skill_graph",
+        "CAREER_CARDS_TABLE_NAME": "career_cards",
+        "CHECKPOINT_TABLE_NAME": "analysis_checkpoints",
+        **overrides,
+    }
+    originals = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield module
+    finally:
+        for name, value in originals.items():
+            setattr(module, name, value)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 방식 백분위수."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(label: str, latencies: List[float]) -> str:
+    """지연 시간 목록을 한 줄 요약 문자열로 만든다."""
+    return (
+        f"{label}: n={len(latencies)} "
+        f"p50={percentile(latencies, 50):.3f}s p95={percentile(latencies, 95):.3f}s "
+        f"p99={percentile(latencies, 99):.3f}s max={max(latencies, default=0.0):.3f}s"
+    )
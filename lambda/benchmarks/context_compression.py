@@ -0,0 +1,67 @@
+"""참고 자료 압축 단계의 컨텍스트 크기 감소와 압축 지연 시간을 측정한다.
+
+녹화 스트림(bedrock-agent-tracing-file.txt)의 실제 Knowledge Base 검색 결과를
+여러 직업/스킬 프로필과 토큰 예산으로 services.context_compression에 통과시켜
+원문/압축 후 추정 토큰 수, 압축률, 압축 1회 지연 시간(마이크로초)을 출력한다.
+첫 토큰까지의 시간 변화는 Bedrock 호출이 필요하므로 배포 후 [TIMING] 로그와
+사용량 집계(input_tokens)로 확인한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.context_compression --budgets 300,600,1000 --repeat 200
+"""
+
+import argparse
+from typing import Dict, List, Optional
+
+from benchmarks import common
+from benchmarks.common import DEFAULT_RECORDING
+
+PROFILES = [
+    ("소프트웨어 개발자", ["Python", "JavaScript", "AWS"]),
+    ("데이터 분석가", ["SQL", "Excel", "Statistics"]),
+    ("Accountant", ["Excel", "Communication"]),
+    ("UX 디자이너", ["Figma", "Communication"]),
+    ("간호사", ["Communication", "Writing"]),
+]
+
+
+def recorded_references(recording: str) -> List[Dict[str, str]]:
+    from services.agent_stream import collect_agent_stream
+    from services.trace_replay import ReplayAgentRuntime
+
+    runtime = ReplayAgentRuntime.from_file(recording, time_scale=0)
+    return collect_agent_stream(runtime.invoke_agent(inputText="")["completion"]).retrieved_references
+
+
+def run(recording: str, budgets: List[int], repeat: int) -> None:
+    from services.context_compression import compress_references
+
+    references = recorded_references(recording)
+    print(f"recording={recording} references={len(references)}")
+    print(f"{'budget':>6} {'input_tok':>9} {'output_tok':>10} {'ratio':>6} {'kept':>9} {'p50_us':>7} {'p99_us':>7}")
+    for budget in budgets:
+        outputs, kept, latencies = [], [], []
+        input_tokens = 0
+        for job_title, skills in PROFILES:
+            for _ in range(repeat):
+                _, stats = compress_references(references, job_title, skills, budget)
+                latencies.append(stats.elapsed_us)
+            input_tokens = stats.input_tokens
+            outputs.append(stats.output_tokens)
+            kept.append(f"{stats.kept}/{stats.units}")
+        mean_output = sum(outputs) / len(outputs)
+        print(f"{budget:>6} {input_tokens:>9} {mean_output:>10.0f} {mean_output / input_tokens:>6.2f} "
+              f"{kept[0]:>9} {common.percentile(latencies, 50):>7.0f} {common.percentile(latencies, 99):>7.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", default=str(DEFAULT_RECORDING))
+    parser.add_argument("--budgets", default="300,600,1000", help="쉼표로 구분한 토큰 예산")
+    parser.add_argument("--repeat", type=int, default=100, help="프로필당 반복 횟수 (지연 시간 분포용)")
+    args = parser.parse_args(argv)
+    run(args.recording, [int(b) for b in args.budgets.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
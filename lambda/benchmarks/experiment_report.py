@@ -0,0 +1,161 @@
+"""프롬프트/모델 실험 변형별 지표를 신뢰구간과 함께 비교한다.
+
+survey 항목의 experiment 속성(services.experiments.record_run이 기록)을 모아
+변형별 지연 시간·토큰·출력 크기 평균(95% 신뢰구간), 파싱 실패율(Wilson 구간),
+기준 변형 대비 평균 차이(Welch 근사 구간)를 출력한다.
+차이 구간이 0을 포함하지 않을 때만 "유의"로 표시한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.experiment_report --table <survey 테이블 이름> --experiment exp-2026-10
+    python -m benchmarks.experiment_report --input survey_export.jsonl
+"""
+
+import argparse
+import json
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Z_95 = 1.96
+
+MEAN_METRICS = ("latency_ms", "input_tokens", "output_tokens", "output_chars")
+
+
+@dataclass
+class Interval:
+    """점추정값과 신뢰구간."""
+
+    value: float
+    low: float
+    high: float
+
+    def excludes_zero(self) -> bool:
+        return self.low > 0 or self.high < 0
+
+    def __str__(self) -> str:
+        return f"{self.value:.1f} [{self.low:.1f}, {self.high:.1f}]"
+
+
+def _mean_var(values: List[float]) -> Tuple[float, float]:
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return mean, var
+
+
+def mean_interval(values: List[float], z: float = Z_95) -> Interval:
+    """평균과 정규 근사 신뢰구간."""
+    if not values:
+        return Interval(0.0, 0.0, 0.0)
+    mean, var = _mean_var(values)
+    half = z * math.sqrt(var / len(values))
+    return Interval(mean, mean - half, mean + half)
+
+
+def wilson_interval(successes: int, n: int, z: float = Z_95) -> Interval:
+    """비율의 Wilson 점수 구간 (표본이 작거나 비율이 0/1에 가까워도 안정적)."""
+    if n == 0:
+        return Interval(0.0, 0.0, 0.0)
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return Interval(p, max(0.0, center - half), min(1.0, center + half))
+
+
+def diff_interval(treatment: List[float], control: List[float], z: float = Z_95) -> Interval:
+    """평균 차이(treatment - control)의 Welch 근사 신뢰구간."""
+    if not treatment or not control:
+        return Interval(0.0, 0.0, 0.0)
+    mean_t, var_t = _mean_var(treatment)
+    mean_c, var_c = _mean_var(control)
+    diff = mean_t - mean_c
+    half = z * math.sqrt(var_t / len(treatment) + var_c / len(control))
+    return Interval(diff, diff - half, diff + half)
+
+
+def group_runs(items: Iterable[Dict[str, Any]], experiment_id: Optional[str] = None) -> Dict[str, List[Dict[str, float]]]:
+    """survey 항목을 변형별 실행 지표 목록으로 묶는다."""
+    groups: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+    for item in items:
+        run = item.get("experiment")
+        if not run or (experiment_id and run.get("experiment_id") != experiment_id):
+            continue
+        groups[run["variant_id"]].append({
+            key: float(run.get(key, 0)) for key in (*MEAN_METRICS, "parse_failed")
+        })
+    return dict(groups)
+
+
+def build_report(groups: Dict[str, List[Dict[str, float]]], control: str = "control") -> List[Dict[str, Any]]:
+    """변형별 요약과 기준 변형 대비 차이를 계산한다."""
+    baseline = groups.get(control, [])
+    rows = []
+    for variant_id in sorted(groups, key=lambda v: (v != control, v)):
+        runs = groups[variant_id]
+        row: Dict[str, Any] = {"variant_id": variant_id, "n": len(runs)}
+        for metric in MEAN_METRICS:
+            values = [r[metric] for r in runs]
+            row[metric] = mean_interval(values)
+            if variant_id != control and baseline:
+                row[f"{metric}_diff"] = diff_interval(values, [r[metric] for r in baseline])
+        row["parse_failure_rate"] = wilson_interval(int(sum(r["parse_failed"] for r in runs)), len(runs))
+        rows.append(row)
+    return rows
+
+
+def load_items(table_name: Optional[str], input_path: Optional[str]) -> List[Dict[str, Any]]:
+    """DynamoDB survey 테이블 스캔 또는 JSON/JSON Lines 내보내기 파일에서 항목을 읽는다."""
+    if input_path:
+        with open(input_path, encoding="utf-8") as f:
+            text = f.read().strip()
+        if text.startswith("["):
+            return json.loads(text)
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    import boto3
+
+    table = boto3.resource("dynamodb").Table(table_name)
+    items: List[Dict[str, Any]] = []
+    kwargs: Dict[str, Any] = {"FilterExpression": "attribute_exists(experiment)"}
+    while True:
+        resp = table.scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        if "LastEvaluatedKey" not in resp:
+            return items
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def print_report(rows: List[Dict[str, Any]], control: str) -> None:
+    print(f"{'variant':<16} {'n':>5}  {'latency_ms':<28} {'output_tokens':<26} {'parse_fail':<22}")
+    for row in rows:
+        rate = row["parse_failure_rate"]
+        print(f"{row['variant_id']:<16} {row['n']:>5}  {str(row['latency_ms']):<28} "
+              f"{str(row['output_tokens']):<26} {rate.value:.1%} [{rate.low:.1%}, {rate.high:.1%}]")
+    for row in rows:
+        if row["variant_id"] == control or "latency_ms_diff" not in row:
+            continue
+        print(f"\n{row['variant_id']} - {control}:")
+        for metric in MEAN_METRICS:
+            diff = row[f"{metric}_diff"]
+            print(f"  {metric:<14} {str(diff):<30} {'유의' if diff.excludes_zero() else '-'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--table", help="survey DynamoDB 테이블 이름 (스캔)")
+    source.add_argument("--input", help="survey 항목 JSON 배열 또는 JSON Lines 파일")
+    parser.add_argument("--experiment", help="비교할 experiment_id (기본: 전체)")
+    parser.add_argument("--control", default="control", help="기준 변형 ID")
+    args = parser.parse_args()
+
+    groups = group_runs(load_items(args.table, args.input), args.experiment)
+    if not groups:
+        raise SystemExit("experiment 지표가 기록된 세션이 없습니다")
+    print_report(build_report(groups, args.control), args.control)
+
+
+if __name__ == "__main__":
+    main()
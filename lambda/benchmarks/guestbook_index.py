@@ -0,0 +1,120 @@
+"""방명록 유사 프로필 IVF 인덱스 전체 빌드와 재현율/지연 시간 벤치마크.
+
+빌드: guestbook 테이블을 스캔해 services.guestbook_index 형식으로 S3에 올린다
+(점진 추가는 guestbook_indexer가 맡고, 이 명령은 처음 만들 때나 중심을 새로 학습할 때 쓴다).
+--bench N이면 합성 항목 N개로 인덱스를 만들고 nprobe별 recall@k(전수 비교 대비),
+mmap 검색 지연 시간, 점진 추가 지연 시간을 출력한다.
+재현율은 동점 프로필이 많으므로 전수 비교 k번째 점수 이상인 결과를 맞은 것으로 센다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.guestbook_index --table <guestbook> --bucket <모델 버킷>
+    python -m benchmarks.guestbook_index --bench 5000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks import common
+
+JOBS = ["백엔드 개발자", "프론트엔드 개발자", "서버 개발자", "데이터 분석가", "데이터 엔지니어", "UX 디자이너",
+        "그래픽 디자이너", "마케터", "퍼포먼스 마케터", "회계사", "세무사", "간호사", "교사", "영업 관리자", "PM"]
+SKILLS = ["Python", "Java", "Spring", "SQL", "React", "Communication", "Excel", "Figma", "Photoshop",
+          "Leadership", "Writing", "Statistics", "Kubernetes", "Negotiation", "Accounting", "Teaching"]
+
+
+def synthetic_entries(count: int, seed: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [{
+        "entry_id": f"e{i}", "created_at": f"2026-01-01T00:00:{i:06d}",
+        "job_title": rng.choice(JOBS), "skills": ", ".join(rng.sample(SKILLS, rng.randint(1, 4))),
+    } for i in range(count)]
+
+
+def run_bench(count: int, queries: int, k: int) -> None:
+    from services.guestbook_index import embed_entry, entry_key
+    from services.ivf_index import IVFIndex, MmapIVFIndex, exact_search
+    from services.profile_embedding import DEFAULT_DIM
+
+    entries = [(entry_key(item), embed_entry(item)) for item in synthetic_entries(count)]
+    start = time.perf_counter()
+    index = IVFIndex.build(entries, DEFAULT_DIM)
+    build_s = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), "index.ivf")
+    with open(path, "wb") as f:
+        f.write(index.to_bytes())
+    start = time.perf_counter()
+    mapped = MmapIVFIndex(path)
+    open_ms = (time.perf_counter() - start) * 1000
+    print(f"entries={count} nlist={index.nlist} build={build_s:.1f}s file={os.path.getsize(path) / 1e6:.1f}MB "
+          f"mmap_open={open_ms:.2f}ms")
+
+    qs = [embed_entry(item) for item in synthetic_entries(queries, seed=29)]
+    truth = [exact_search(entries, q, k) for q in qs]
+    for nprobe in (1, 2, 4, 8, 16):
+        if nprobe > index.nlist:
+            break
+        latencies, hits = [], 0
+        for q, exact in zip(qs, truth):
+            t0 = time.perf_counter()
+            found = mapped.search(q, k, nprobe)
+            latencies.append(time.perf_counter() - t0)
+            kth = exact[-1][0] - 1e-6
+            hits += sum(1 for score, _ in found if score >= kth)
+        print(f"nprobe={nprobe:<2} recall@{k}={hits / (k * len(qs)):.3f} {common.summarize('search', latencies)}")
+
+    extra = synthetic_entries(200, seed=31)
+    start = time.perf_counter()
+    for item in extra:
+        index.add(entry_key({**item, "entry_id": "n" + item["entry_id"]}), embed_entry(item))
+    print(f"incremental add: {(time.perf_counter() - start) / len(extra) * 1000:.2f}ms/entry "
+          f"needs_rebuild={index.needs_rebuild()}")
+    mapped.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services.guestbook_index import DEFAULT_INDEX_KEY
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bench", type=int, default=0, help="합성 항목 N개로 재현율/지연 시간 측정")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--table", help="guestbook DynamoDB 테이블 이름")
+    parser.add_argument("--bucket", help="인덱스를 올릴 S3 버킷")
+    parser.add_argument("--key", default=DEFAULT_INDEX_KEY)
+    parser.add_argument("--nlist", type=int, default=0, help="중심 수 (0이면 sqrt(항목 수))")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        run_bench(args.bench, args.queries, args.k)
+        return
+    if not (args.table and args.bucket):
+        parser.error("--table과 --bucket이 필요합니다 (또는 --bench N)")
+
+    import boto3
+
+    from services.guestbook_index import embed_entry, entry_key, save_index
+    from services.ivf_index import IVFIndex
+    from services.profile_embedding import DEFAULT_DIM
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    kwargs: Dict[str, Any] = {"ProjectionExpression": "entry_id, created_at, job_title, skills"}
+    entries = []
+    while True:
+        page = table.scan(**kwargs)
+        entries.extend((entry_key(item), embed_entry(item)) for item in page.get("Items", []))
+        if "LastEvaluatedKey" not in page:
+            break
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+    index = IVFIndex.build(entries, DEFAULT_DIM, nlist=args.nlist or None)
+    size = save_index(boto3.client("s3"), args.bucket, args.key, index, overwrite=True)
+    print(f"entries={len(index)} nlist={index.nlist} uploaded s3://{args.bucket}/{args.key} ({size / 1e6:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""의미 기반 분석 재사용 인덱스 빌드와 적중률/품질 차이 평가.
+
+빌드: analysis_cache 테이블에서 원문 직업/스킬이 있는 항목을 스캔해
+services.semantic_reuse 인덱스를 S3에 올린다 (analyze가 ETag가 바뀔 때 다시 받는다).
+
+평가: 완료된 과거 세션을 session_id 해시로 기준/보류 집합으로 나누고, 기준 집합을 캐시로 보고
+보류 세션마다 정확 일치 → 가장 가까운 기준 세션 순으로 찾는다. 임계값별로
+    - hit_rate: 정확 일치 + 유사도 임계값 이상 이웃 비율 (reused: 그 행에서 결과를 재사용한 세션 수)
+    - years_mae: 재사용한 remaining_years와 실제 값의 평균 절대 차이
+    - prob_mae: 정규화한 이름이 같은 스킬의 replacement_prob 평균 절대 차이
+    - coverage: 보류 세션 스킬 중 재사용 결과에 같은 이름으로 있는 비율
+을 출력한다. exact 행은 같은 조합끼리의 차이(모델 자체의 흔들림)로, 임계값 행과 비교하는 기준선이다.
+--local N이면 직업/스킬 동의어가 섞인 합성 세션 N개로 평가한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.semantic_reuse_eval --build --cache-table <analysis_cache> --bucket <모델 버킷>
+    python -m benchmarks.semantic_reuse_eval --survey-table <survey> --skill-table <skill_graph> \\
+        --records-table <analysis_records> --thresholds 0.8,0.85,0.9,0.95
+    python -m benchmarks.semantic_reuse_eval --local 3000
+"""
+
+import argparse
+import random
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from benchmarks.train_surrogate import scan
+
+# 기준 D-Day → 같은 직업의 여러 표기
+JOB_SYNONYMS = {
+    14: ["백엔드 개발자", "서버 개발자", "Backend engineer", "Server developer", "백엔드 엔지니어"],
+    10: ["데이터 분석가", "Data analyst", "데이터 애널리스트"],
+    9: ["UX 디자이너", "UI/UX 디자이너", "Product designer"],
+    7: ["마케터", "마케팅 담당자", "Marketing manager"],
+    18: ["간호사", "Registered nurse", "병동 간호사"],
+    15: ["교사", "초등 교사", "Teacher"],
+    4: ["회계사", "Accountant", "세무 회계 담당"],
+}
+# 기준 대체 확률 → 같은 스킬의 여러 표기
+SKILL_SYNONYMS = {
+    35: ["Python", "python3", "Python 프로그래밍"],
+    55: ["SQL", "MySQL"],
+    85: ["Excel", "엑셀"],
+    20: ["Communication", "커뮤니케이션"],
+    60: ["Figma", "피그마"],
+    16: ["Leadership", "리더십"],
+    70: ["Writing", "글쓰기"],
+    45: ["Statistics", "통계"],
+    25: ["Kubernetes", "k8s"],
+    18: ["Negotiation", "협상"],
+}
+
+
+@dataclass
+class HistoricalSession:
+    """평가용 완료 세션 (skills: 정규화 스킬명 → replacement_prob)."""
+
+    session_id: str
+    job_title: str
+    strengths: str
+    remaining_years: Optional[float]
+    skills: Dict[str, float] = field(default_factory=dict)
+
+
+def load_sessions(
+    survey_items: Iterable[Dict[str, Any]],
+    skill_items: Iterable[Dict[str, Any]],
+    load_record: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+) -> List[HistoricalSession]:
+    """완료된 survey 항목과 skill_graph 행을 세션 단위로 묶는다 (공유 레코드는 load_record로 읽는다)."""
+    from services.amendment import normalize_skill
+
+    sessions: Dict[str, HistoricalSession] = {}
+    refs: Dict[str, str] = {}
+    for item in survey_items:
+        if item.get("status") != "completed" or not item.get("job_title"):
+            continue
+        remaining = item.get("remaining_years")
+        sessions[item["session_id"]] = HistoricalSession(
+            item["session_id"], item["job_title"], item.get("strengths", ""),
+            float(remaining) if remaining is not None else None,
+        )
+        if item.get("analysis_ref"):
+            refs[item["session_id"]] = item["analysis_ref"]
+    for row in skill_items:
+        session = sessions.get(row.get("session_id"))
+        if session and session.session_id not in refs and row.get("replacement_prob") is not None:
+            session.skills[normalize_skill(row["skill_name"])] = float(row["replacement_prob"])
+    for session_id, ref in refs.items():
+        record = load_record(ref) if load_record else None
+        if not record:
+            del sessions[session_id]
+            continue
+        session = sessions[session_id]
+        session.skills = {normalize_skill(r["skill_name"]): float(r["replacement_prob"])
+                          for r in record.get("skill_risks", [])}
+        if record.get("remaining_years") is not None:
+            session.remaining_years = float(record["remaining_years"])
+    return list(sessions.values())
+
+
+def split_holdout(sessions: Sequence[HistoricalSession], fraction: float):
+    """session_id 해시로 (기준, 보류) 집합을 나눈다 (실행마다 같은 분할)."""
+    reference, heldout = [], []
+    for session in sessions:
+        bucket = zlib.crc32(session.session_id.encode("utf-8")) % 1000
+        (heldout if bucket < fraction * 1000 else reference).append(session)
+    return reference, heldout
+
+
+@dataclass
+class _Outcome:
+    similarity: float
+    years_error: Optional[float]
+    prob_errors: List[float]
+    covered: int
+    total: int
+
+
+def _compare(actual: HistoricalSession, reused: HistoricalSession, similarity: float) -> _Outcome:
+    years_error = None
+    if actual.remaining_years is not None and reused.remaining_years is not None:
+        years_error = abs(actual.remaining_years - reused.remaining_years)
+    prob_errors = [abs(prob - reused.skills[name]) for name, prob in actual.skills.items() if name in reused.skills]
+    return _Outcome(similarity, years_error, prob_errors, len(prob_errors), len(actual.skills))
+
+
+def _summary_row(label: str, outcomes: Sequence[_Outcome], exact_hits: int, total: int) -> Dict[str, Any]:
+    years = [o.years_error for o in outcomes if o.years_error is not None]
+    probs = [e for o in outcomes for e in o.prob_errors]
+    skills = sum(o.total for o in outcomes)
+    return {
+        "label": label,
+        "hit_rate": round((exact_hits + len(outcomes)) / total, 3) if total else 0.0,
+        "reused": len(outcomes),
+        "years_mae": round(sum(years) / len(years), 3) if years else None,
+        "prob_mae": round(sum(probs) / len(probs), 3) if probs else None,
+        "coverage": round(sum(o.covered for o in outcomes) / skills, 3) if skills else None,
+    }
+
+
+def evaluate(
+    reference: Sequence[HistoricalSession],
+    heldout: Sequence[HistoricalSession],
+    thresholds: Sequence[float],
+    nprobe: int = 8,
+) -> List[Dict[str, Any]]:
+    """보류 세션에 기준 세션 결과를 재사용했을 때의 임계값별 적중률과 품질 차이."""
+    from services.bulk_inference import combination_key
+    from services.ivf_index import IVFIndex
+    from services.profile_embedding import DEFAULT_DIM, embed_profile
+    from services.semantic_reuse import nearest
+
+    by_id = {s.session_id: s for s in reference}
+    by_combo = {combination_key(s.job_title, s.strengths): s for s in reference}
+    index = IVFIndex.build([(s.session_id, embed_profile(s.job_title, s.strengths, DEFAULT_DIM)) for s in reference],
+                           DEFAULT_DIM)
+
+    exact: List[_Outcome] = []
+    semantic: List[_Outcome] = []
+    for session in heldout:
+        same = by_combo.get(combination_key(session.job_title, session.strengths))
+        if same is not None:
+            exact.append(_compare(session, same, 1.0))
+            continue
+        match = nearest(index, session.job_title, session.strengths, nprobe)
+        if match is not None:
+            semantic.append(_compare(session, by_id[match.cache_key], match.similarity))
+
+    rows = [_summary_row("exact", exact, 0, len(heldout))]
+    rows[0]["hit_rate"] = round(len(exact) / len(heldout), 3) if heldout else 0.0
+    for threshold in sorted(thresholds):
+        reused = [o for o in semantic if o.similarity >= threshold]
+        rows.append(_summary_row(f">={threshold:.2f}", reused, len(exact), len(heldout)))
+    return rows
+
+
+def synthetic_sessions(count: int, seed: int = 13) -> List[HistoricalSession]:
+    """직업/스킬 표기를 동의어 중에서 고른 합성 세션 (같은 직업/스킬이면 기준 값이 같다)."""
+    from services.amendment import normalize_skill
+
+    rng = random.Random(seed)
+    sessions = []
+    for i in range(count):
+        base_years, names = rng.choice(list(JOB_SYNONYMS.items()))
+        picked = rng.sample(list(SKILL_SYNONYMS.items()), rng.randint(2, 4))
+        skills = [(rng.choice(variants), risk) for risk, variants in picked]
+        avg_risk = sum(risk for _, risk in skills) / len(skills)
+        sessions.append(HistoricalSession(
+            f"sid-{i}", rng.choice(names), ", ".join(name for name, _ in skills),
+            max(base_years - (avg_risk - 45) / 10 + rng.gauss(0, 1), 0),
+            {normalize_skill(name): min(max(risk + rng.gauss(0, 5), 0), 100) for name, risk in skills},
+        ))
+    return sessions
+
+
+def print_rows(rows: Sequence[Dict[str, Any]]) -> None:
+    for row in rows:
+        print(f"{row['label']:<7} hit_rate={row['hit_rate']:.3f} reused={row['reused']:<5} "
+              f"years_mae={row['years_mae']} prob_mae={row['prob_mae']} coverage={row['coverage']}")
+
+
+def run_build(args) -> None:
+    import boto3
+
+    from services.semantic_reuse import build_index
+
+    table = boto3.resource("dynamodb").Table(args.cache_table)
+    start = time.perf_counter()
+    index = build_index(scan(table, "cache_key, job_title, strengths"), nlist=args.nlist or None)
+    body = index.to_bytes()
+    boto3.client("s3").put_object(Bucket=args.bucket, Key=args.key, Body=body,
+                                  ContentType="application/octet-stream")
+    print(f"entries={len(index)} nlist={index.nlist} build={time.perf_counter() - start:.1f}s "
+          f"uploaded s3://{args.bucket}/{args.key} ({len(body) / 1e6:.1f}MB)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services.semantic_reuse import DEFAULT_INDEX_KEY, DEFAULT_NPROBE
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--build", action="store_true", help="analysis_cache로 인덱스를 빌드해 업로드")
+    parser.add_argument("--cache-table", help="analysis_cache DynamoDB 테이블 이름")
+    parser.add_argument("--bucket", help="인덱스를 올릴 S3 버킷")
+    parser.add_argument("--key", default=DEFAULT_INDEX_KEY)
+    parser.add_argument("--nlist", type=int, default=0, help="중심 수 (0이면 sqrt(항목 수))")
+    parser.add_argument("--survey-table", help="survey DynamoDB 테이블 이름")
+    parser.add_argument("--skill-table", help="skill_graph DynamoDB 테이블 이름")
+    parser.add_argument("--records-table", help="analysis_records 테이블 (공유 레코드 세션 포함)")
+    parser.add_argument("--local", type=int, default=0, help="합성 세션 N개로 평가")
+    parser.add_argument("--holdout", type=float, default=0.2, help="보류 집합 비율")
+    parser.add_argument("--thresholds", default="0.7,0.8,0.85,0.9,0.95")
+    parser.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    args = parser.parse_args(argv)
+
+    if args.build:
+        if not (args.cache_table and args.bucket):
+            parser.error("--build에는 --cache-table과 --bucket이 필요합니다")
+        run_build(args)
+        return
+
+    if args.local:
+        sessions = synthetic_sessions(args.local)
+    elif args.survey_table and args.skill_table:
+        import boto3
+
+        ddb = boto3.resource("dynamodb")
+        load_record = None
+        if args.records_table:
+            from services.analysis_records import AnalysisRecordStore
+
+            load_record = AnalysisRecordStore(ddb.Table(args.records_table)).get
+        sessions = load_sessions(
+            scan(ddb.Table(args.survey_table),
+                 "session_id, #s, job_title, strengths, remaining_years, analysis_ref", {"#s": "status"}),
+            scan(ddb.Table(args.skill_table), "session_id, skill_name, replacement_prob"),
+            load_record,
+        )
+    else:
+        parser.error("--build, --local N 또는 --survey-table/--skill-table 중 하나가 필요합니다")
+
+    reference, heldout = split_holdout(sessions, args.holdout)
+    thresholds = [float(t) for t in args.thresholds.split(",") if t.strip()]
+    start = time.perf_counter()
+    rows = evaluate(reference, heldout, thresholds, args.nprobe)
+    elapsed = time.perf_counter() - start
+    print(f"sessions={len(sessions)} reference={len(reference)} heldout={len(heldout)} eval={elapsed:.1f}s")
+    print_rows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""누적된 survey/skill_graph 데이터로 what-if 대리 모델을 학습해 S3(또는 파일)로 내보낸다.
+
+services.surrogate의 학습(해시 특징 + 희소 CG 릿지)을 오프라인으로 실행한다.
+공유 레코드를 가리키는 세션은 --records-table이 주어지면 레코드를 읽어 학습에 포함한다.
+--local이면 합성 세션 N개로 학습하고 검증 MAE, 학습 시간, 예측 지연 시간을 출력한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.train_surrogate --survey-table <survey> --skill-table <skill_graph> \\
+        --records-table <analysis_records> --bucket <모델 버킷> --key surrogate/model.json
+    python -m benchmarks.train_surrogate --local 2000 --output /tmp/model.json
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmarks import common
+
+JOBS = {"개발자": 14, "디자이너": 9, "마케터": 7, "회계사": 4, "간호사": 18, "교사": 15, "데이터 분석가": 10}
+SKILLS = {"Python": 35, "SQL": 55, "Excel": 85, "Communication": 20, "Figma": 60, "Leadership": 15,
+          "Writing": 70, "Statistics": 45, "Kubernetes": 25, "Negotiation": 18}
+AGE_GROUPS = ["20s", "30s", "40s", "50s"]
+
+
+def scan(table: Any, projection: str, names: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {"ProjectionExpression": projection}
+    if names:
+        kwargs["ExpressionAttributeNames"] = names
+    while True:
+        page = table.scan(**kwargs)
+        yield from page.get("Items", [])
+        if "LastEvaluatedKey" not in page:
+            return
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+def synthetic_sessions(count: int, seed: int = 7):
+    """직업별 기준 D-Day와 스킬별 기준 위험도에 잡음을 더한 합성 세션과 skill_graph 행."""
+    rng = random.Random(seed)
+    sessions: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    for i in range(count):
+        job = rng.choice(list(JOBS))
+        skills = rng.sample(list(SKILLS), rng.randint(2, 5))
+        avg_risk = sum(SKILLS[s] for s in skills) / len(skills)
+        sid = f"sid-{i}"
+        sessions.append({
+            "session_id": sid, "status": "completed", "job_title": job, "age_group": rng.choice(AGE_GROUPS),
+            "strengths": ", ".join(skills),
+            "remaining_years": max(JOBS[job] - (avg_risk - 45) / 10 + rng.gauss(0, 1), 0),
+        })
+        rows.extend({"session_id": sid, "skill_name": s, "replacement_prob": min(max(SKILLS[s] + rng.gauss(0, 5), 0), 100)}
+                    for s in skills)
+    return sessions, rows
+
+
+def run_local(count: int, output: Optional[str], args) -> None:
+    from services.surrogate import build_examples, train
+
+    sessions, rows = synthetic_sessions(count)
+    skill_examples, profile_examples = build_examples(sessions, rows)
+    start = time.perf_counter()
+    model = train(skill_examples, profile_examples, dim=args.dim, l2=args.l2, max_iter=args.max_iter)
+    train_s = time.perf_counter() - start
+
+    latencies = []
+    for job in JOBS:
+        for skill in SKILLS:
+            t0 = time.perf_counter()
+            model.predict_skill(job, "30s", skill)
+            model.predict_years(job, "30s", ["Python", "SQL", skill])
+            latencies.append((time.perf_counter() - t0) * 1000)
+    size = len(model.to_json().encode("utf-8"))
+    print(f"sessions={count} skill_examples={len(skill_examples)} train={train_s:.1f}s artifact={size / 1024:.1f}KB")
+    print(f"holdout skill_mae={model.meta['skill_mae']} years_mae={model.meta['years_mae']}")
+    print(f"predict: n={len(latencies)} p50={common.percentile(latencies, 50):.3f}ms "
+          f"p99={common.percentile(latencies, 99):.3f}ms")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(model.to_json())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services.surrogate import DEFAULT_DIM, DEFAULT_L2, DEFAULT_MAX_ITER
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--local", type=int, default=0, help="합성 세션 N개로 학습하고 지표를 출력")
+    parser.add_argument("--survey-table", help="survey DynamoDB 테이블 이름")
+    parser.add_argument("--skill-table", help="skill_graph DynamoDB 테이블 이름")
+    parser.add_argument("--records-table", default="", help="analysis_records 테이블 이름 (공유 레코드 세션 포함)")
+    parser.add_argument("--bucket", help="모델 아티팩트를 올릴 S3 버킷")
+    parser.add_argument("--key", default="surrogate/model.json")
+    parser.add_argument("--output", help="모델 아티팩트를 쓸 로컬 파일")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="해시 특징 차원")
+    parser.add_argument("--l2", type=float, default=DEFAULT_L2)
+    parser.add_argument("--max-iter", type=int, default=DEFAULT_MAX_ITER, help="CG 최대 반복 수")
+    args = parser.parse_args(argv)
+
+    if args.local:
+        run_local(args.local, args.output, args)
+        return
+    if not (args.survey_table and args.skill_table) or not (args.bucket or args.output):
+        parser.error("--survey-table/--skill-table과 --bucket 또는 --output이 필요합니다")
+
+    import boto3
+
+    from services.analysis_records import AnalysisRecordStore
+    from services.surrogate import build_examples, save_model, train
+
+    ddb = boto3.resource("dynamodb")
+    load_record = AnalysisRecordStore(ddb.Table(args.records_table)).get if args.records_table else None
+    skill_examples, profile_examples = build_examples(
+        scan(ddb.Table(args.survey_table),
+             "session_id, #s, job_title, age_group, strengths, remaining_years, analysis_ref", {"#s": "status"}),
+        scan(ddb.Table(args.skill_table), "session_id, skill_name, replacement_prob"),
+        load_record,
+    )
+    if not profile_examples:
+        raise SystemExit("학습할 완료 세션이 없습니다")
+    model = train(skill_examples, profile_examples, dim=args.dim, l2=args.l2, max_iter=args.max_iter)
+    print(f"skill_examples={len(skill_examples)} profiles={len(profile_examples)} "
+          f"skill_mae={model.meta['skill_mae']} years_mae={model.meta['years_mae']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(model.to_json())
+    if args.bucket:
+        size = save_model(boto3.client("s3"), args.bucket, args.key, model)
+        print(f"uploaded s3://{args.bucket}/{args.key} ({size / 1024:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""스킬 → 직무 전환 그래프 빌드와 로드맵 질의 지연 시간 벤치마크.
+
+빌드: career_cards 테이블의 조합 공식/로드맵과 카드 템플릿 로드맵을 services.transition_graph로
+모아 S3에 올린다 (analyze가 컨테이너당 한 번 읽는다). --wef-skills로 WEF 스킬 전망 JSON
+([{"skill": "AI and big data", "growth": 0.87, "keywords": ["ai", "machine learning"]}, ...])을 주면
+성장 스킬을 다루는 단계의 비용을 깎는다.
+--bench N이면 합성 카드 N개로 그래프를 만들고 k=1/k=3 로드맵 질의 지연 시간(마이크로초)을 출력한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.transition_graph --cards-table <career_cards> --bucket <모델 버킷> \\
+        --wef-skills wef_skills.json
+    python -m benchmarks.transition_graph --bench 20000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks import common
+from benchmarks.train_surrogate import scan
+
+JOBS = ["백엔드 개발자", "데이터 분석가", "UX 디자이너", "마케터", "회계사", "간호사", "교사", "생산 관리자", "영업 담당자"]
+SKILLS = ["Python", "SQL", "Excel", "Communication", "Figma", "Leadership", "Writing", "Statistics",
+          "Negotiation", "Project management", "Photoshop", "Teaching"]
+EXTRA_STEPS = ["Learn Docker and Kubernetes", "Complete a cloud certification", "Take an AI literacy course",
+               "Build a portfolio project", "Shadow an AI team for a quarter", "Learn SQL and dashboards"]
+
+
+def synthetic_cards(count: int, seed: int = 17) -> List[Dict[str, Any]]:
+    """템플릿 로드맵 일부를 다른 단계로 바꾸고 기간을 흔든 합성 career_cards 행."""
+    from services.career_templates import TEMPLATES
+
+    rng = random.Random(seed)
+    cards = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        steps = [(rng.choice(EXTRA_STEPS) if rng.random() < 0.3 else step, duration)
+                 for step, duration in template.roadmap]
+        skills = rng.sample(SKILLS, 2)
+        cards.append({
+            "combo_formula": f"[{rng.choice(JOBS)}] + [{skills[0]}] + [{skills[1]}] = [{template.title}]",
+            "roadmap": [{"step": step, "duration": f"{max(1, int(duration.split()[0]) + rng.randint(-1, 1))} months"}
+                        for step, duration in steps],
+        })
+    return cards
+
+
+def run_bench(count: int, queries: int) -> None:
+    from services.career_templates import TEMPLATES
+    from services.transition_graph import GraphBuilder, TransitionGraph
+
+    start = time.perf_counter()
+    builder = GraphBuilder()
+    builder.add_templates()
+    for card in synthetic_cards(count):
+        builder.add_card(card)
+    graph = builder.build()
+    build_s = time.perf_counter() - start
+    body = graph.to_bytes()
+    start = time.perf_counter()
+    TransitionGraph.from_bytes(body)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"cards={count} nodes={len(graph)} edges={graph.edge_count} build={build_s:.2f}s "
+          f"file={len(body) / 1024:.1f}KB load={load_ms:.2f}ms")
+
+    rng = random.Random(23)
+    for k in (1, 3):
+        latencies = []
+        for _ in range(queries):
+            job, skills, career = rng.choice(JOBS), rng.sample(SKILLS, 3), rng.choice(TEMPLATES).title
+            t0 = time.perf_counter()
+            graph.roadmaps(job, skills, career, k=k)
+            latencies.append((time.perf_counter() - t0) * 1e6)
+        print(f"roadmaps k={k}: n={len(latencies)} p50={common.percentile(latencies, 50):.0f}us "
+              f"p99={common.percentile(latencies, 99):.0f}us")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services.transition_graph import DEFAULT_GRAPH_KEY
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bench", type=int, default=0, help="합성 카드 N개로 질의 지연 시간 측정")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--cards-table", help="career_cards DynamoDB 테이블 이름")
+    parser.add_argument("--wef-skills", help="WEF 스킬 전망 JSON 파일")
+    parser.add_argument("--bucket", help="그래프를 올릴 S3 버킷")
+    parser.add_argument("--key", default=DEFAULT_GRAPH_KEY)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        run_bench(args.bench, args.queries)
+        return
+    if not (args.cards_table and args.bucket):
+        parser.error("--cards-table과 --bucket이 필요합니다 (또는 --bench N)")
+
+    import boto3
+
+    from services.transition_graph import GraphBuilder, save_graph
+
+    builder = GraphBuilder()
+    builder.add_templates()
+    table = boto3.resource("dynamodb").Table(args.cards_table)
+    for card in scan(table, "combo_formula, roadmap"):
+        builder.add_card(card)
+    if args.wef_skills:
+        with open(args.wef_skills, encoding="utf-8") as f:
+            builder.add_wef_skills(json.load(f))
+    graph = builder.build()
+    size = save_graph(boto3.client("s3"), args.bucket, args.key, graph)
+    print(f"cards={builder.paths} nodes={len(graph)} edges={graph.edge_count} "
+          f"uploaded s3://{args.bucket}/{args.key} ({size / 1024:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
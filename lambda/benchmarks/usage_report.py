@@ -0,0 +1,50 @@
+"""일별·모델별 토큰/비용 집계를 출력한다 (용량 계획용).
+
+system_state 테이블의 usage#<날짜>#<모델> 항목(services.token_usage.record_daily_rollup이
+누적)을 읽어 날짜·모델별 Agent 실행 수, 토큰, KB 검색 수, 추정 비용과
+실행당 평균 토큰을 보여준다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.usage_report --table <system_state 테이블 이름> --days 7
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from benchmarks import common  # noqa: F401  (레이어 경로 설정)
+
+
+def print_report(rollups: List[Dict[str, Any]]) -> None:
+    print(f"{'day':<11} {'model':<44} {'runs':>5} {'input':>11} {'output':>9} "
+          f"{'cache_r':>9} {'cache_w':>9} {'kb':>5} {'cost_usd':>9} {'tok/run':>8}")
+    for r in rollups:
+        runs = int(r.get("runs", 0))
+        tokens = sum(int(r.get(k, 0)) for k in ("input_tokens", "output_tokens",
+                                                 "cache_read_tokens", "cache_write_tokens"))
+        print(f"{r.get('rollup_day', ''):<11} {r.get('model_id', ''):<44} {runs:>5} "
+              f"{int(r.get('input_tokens', 0)):>11} {int(r.get('output_tokens', 0)):>9} "
+              f"{int(r.get('cache_read_tokens', 0)):>9} {int(r.get('cache_write_tokens', 0)):>9} "
+              f"{int(r.get('kb_queries', 0)):>5} {int(r.get('cost_microusd', 0)) / 1_000_000:>9.2f} "
+              f"{tokens // runs if runs else 0:>8}")
+
+
+def main() -> None:
+    import boto3
+
+    from services.token_usage import load_daily_rollups
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--table", required=True, help="system_state DynamoDB 테이블 이름")
+    parser.add_argument("--days", type=int, default=7, help="오늘 포함 최근 N일 (UTC)")
+    args = parser.parse_args()
+
+    since = (datetime.now(timezone.utc) - timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    rollups = load_daily_rollups(boto3.resource("dynamodb").Table(args.table), since_day=since)
+    if not rollups:
+        raise SystemExit(f"{since} 이후 사용량 집계가 없습니다")
+    print_report(rollups)
+
+
+if __name__ == "__main__":
+    main()
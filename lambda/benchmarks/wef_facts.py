@@ -0,0 +1,105 @@
+"""WEF 사실 테이블 빌드와 조회 지연 시간 벤치마크.
+
+빌드: 보고서 도표에서 옮긴 JSON 레코드 목록
+([{"kind": "job", "name": "Software and Applications Developers", "aliases": ["개발자"],
+   "figures": {"net_growth_pct": 17}, "source": "Figure 2.7"}, ...])을
+services.wef_facts 파일 형식으로 만들어 S3에 올린다 (analyze가 /tmp에 받아 mmap으로 연다).
+--bench N이면 합성 레코드 N개로 파일을 만들고 정확/부분 일치 조회 지연 시간(마이크로초)을 출력한다.
+
+사용법 (lambda/ 디렉토리에서):
+    python -m benchmarks.wef_facts --input wef_facts.json --bucket <모델 버킷>
+    python -m benchmarks.wef_facts --bench 2000
+
+올린 뒤 infra에서 cdk deploy -c wefFacts=true로 Agent 액션 그룹과 analyze 환경 변수를 켠다.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks import common
+
+WORDS = ["software", "data", "clinical", "sales", "marketing", "financial", "production", "customer",
+         "security", "logistics", "teaching", "design", "legal", "energy", "robotics", "research"]
+ROLES = ["developers", "analysts", "specialists", "managers", "clerks", "engineers", "operators", "assistants"]
+
+
+def synthetic_facts(count: int, seed: int = 31) -> List[Dict[str, Any]]:
+    """단어 조합 이름과 임의 수치를 가진 합성 직업/스킬 레코드."""
+    rng = random.Random(seed)
+    facts = []
+    for i in range(count):
+        kind = "job" if i % 2 == 0 else "skill"
+        name = f"{' '.join(rng.sample(WORDS, 2))} {rng.choice(ROLES) if kind == 'job' else 'skills'} {i}"
+        facts.append({"kind": kind, "name": name, "figures": {"net_growth_pct": rng.randint(-40, 80)},
+                      "source": f"Figure {rng.randint(1, 5)}.{rng.randint(1, 20)}"})
+    return facts
+
+
+def run_bench(count: int, queries: int) -> None:
+    from services.wef_facts import WEFFactStore, build_fact_table
+
+    facts = synthetic_facts(count)
+    body = build_fact_table(facts)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "facts.bin")
+        with open(path, "wb") as f:
+            f.write(body)
+        start = time.perf_counter()
+        store = WEFFactStore(path)
+        open_ms = (time.perf_counter() - start) * 1000
+        print(f"records={len(store)} file={len(body) / 1024:.1f}KB open={open_ms:.2f}ms")
+
+        rng = random.Random(37)
+        cases = {
+            "exact": lambda fact: fact["name"],
+            "partial": lambda fact: f"senior {fact['name']}",
+            "missing": lambda fact: f"{rng.choice(WORDS)} astronaut",
+        }
+        for label, make_query in cases.items():
+            latencies = []
+            for _ in range(queries):
+                fact = rng.choice(facts)
+                query = make_query(fact)
+                t0 = time.perf_counter()
+                store.lookup(fact["kind"], query)
+                latencies.append((time.perf_counter() - t0) * 1e6)
+            print(f"lookup {label}: n={len(latencies)} p50={common.percentile(latencies, 50):.0f}us "
+                  f"p99={common.percentile(latencies, 99):.0f}us")
+        store.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services.wef_facts import DEFAULT_FACTS_KEY
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bench", type=int, default=0, help="합성 레코드 N개로 조회 지연 시간 측정")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--input", help="WEF 사실 레코드 JSON 파일")
+    parser.add_argument("--bucket", help="사실 테이블을 올릴 S3 버킷")
+    parser.add_argument("--key", default=DEFAULT_FACTS_KEY)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        run_bench(args.bench, args.queries)
+        return
+    if not (args.input and args.bucket):
+        parser.error("--input과 --bucket이 필요합니다 (또는 --bench N)")
+
+    import boto3
+
+    from services.wef_facts import build_fact_table
+
+    with open(args.input, encoding="utf-8") as f:
+        facts = json.load(f)
+    body = build_fact_table(facts)
+    boto3.client("s3").put_object(Bucket=args.bucket, Key=args.key, Body=body)
+    print(f"records={len(facts)} uploaded s3://{args.bucket}/{args.key} ({len(body) / 1024:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
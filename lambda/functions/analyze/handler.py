@@ -11,46 +11,285 @@ import os
 import time
 import uuid
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import boto3
 
+from boto3.dynamodb.conditions import Key
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
+from services.agent_actions import FINAL_ANSWER_NOTE, ReturnControlExhausted, max_rounds, session_state
+from services.agent_stream import AgentStreamResult, collect_agent_stream, retrieve_references
+from services.amendment import normalize_skill
+from services.analysis_records import AnalysisRecordStore, shared_content
+from services.bulk_inference import AnalysisCache
+from services.career_templates import (
+    personalize_cards,
+    render_cards,
+    select_templates,
+    split_skills,
+    template_prompt_block,
+)
+from services.checkpoint import (
+    STAGE_CAREER_CARDS,
+    STAGE_GENERATION,
+    STAGE_RETRIEVAL,
+    STAGE_SKILL_RISKS,
+    CheckpointStore,
+)
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.context_compression import compress_references, leading_references
+from services.endpoint_balancer import Endpoint, EndpointBalancer, load_endpoints
+from services.experiments import (
+    DEFAULT_EXPERIMENT_ID,
+    GENERATION_AGENT,
+    GENERATION_TOOL,
+    RunMetrics,
+    Variant,
+    assign_variant,
+    emit_metrics,
+    load_variants,
+    record_run,
+)
+from services.ivf_index import MmapIVFIndex, S3IndexLoader
+from services.micro_batch import (
+    BedrockBatchGenerator,
+    build_batch_prompt,
+    group_compatible,
+    parse_batch_response,
+    share_usage,
+)
+from services.notifier import ConnectionRegistry, notify_session
+from services.prompt_templates import DEFAULT_PROMPT_VERSION, render_prompt
+from services.semantic_reuse import (
+    DEFAULT_INDEX_KEY as SEMANTIC_DEFAULT_INDEX_KEY,
+    DEFAULT_NPROBE as SEMANTIC_DEFAULT_NPROBE,
+    adapt_analysis,
+    nearest,
+)
+from services.single_flight import ROLE_FOLLOWER, ROLE_LEADER, ROLE_SOLO, SingleFlight, flight_key
+from services.speculation import (
+    SPEC_DONE,
+    SPEC_FAILED,
+    SPEC_STAGE_GENERATION,
+    SPEC_STAGE_RETRIEVAL,
+    analysis_input_hash,
+    finish_speculation,
+    retrieval_input_hash,
+)
+from services.stream_pipeline import STREAM_RESTART, run_streaming_persist
+from services.structured_output import StructuredOutputError, ToolUseGenerator, check_analysis
+from services.token_usage import (
+    TokenBudgetExceeded,
+    TokenUsage,
+    record_daily_rollup,
+    record_session_usage,
+    session_tokens_used,
+)
+from services.trace_replay import ReplayAgentRuntime
+from services.transition_graph import DEFAULT_GRAPH_KEY, TransitionGraph, apply_roadmaps, open_graph
+from services.translation import CANONICAL_LANGUAGE, LANGUAGE_NAMES
+from services.wef_facts import DEFAULT_FACTS_KEY, WEFFactStore
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 dynamodb = boto3.resource("dynamodb")
-bedrock_agent_runtime = boto3.client(
-    "bedrock-agent-runtime",
-    config=Config(read_timeout=120, connect_timeout=10, retries={"max_attempts": 2}),
-)
+AGENT_RUNTIME_CONFIG = Config(read_timeout=120, connect_timeout=10, retries={"max_attempts": 2})
+bedrock_agent_runtime = boto3.client("bedrock-agent-runtime", config=AGENT_RUNTIME_CONFIG)
+bedrock_runtime = boto3.client("bedrock-runtime", config=AGENT_RUNTIME_CONFIG)
+lambda_client = boto3.client("lambda")
+s3 = boto3.client("s3")
 
 SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
 SKILL_GRAPH_TABLE_NAME = os.environ.get("SKILL_GRAPH_TABLE_NAME", "")
 CAREER_CARDS_TABLE_NAME = os.environ.get("CAREER_CARDS_TABLE_NAME", "")
 BEDROCK_AGENT_ID = os.environ.get("BEDROCK_AGENT_ID", "")
 BEDROCK_AGENT_ALIAS_ID = os.environ.get("BEDROCK_AGENT_ALIAS_ID", "")
+KNOWLEDGE_BASE_ID = os.environ.get("KNOWLEDGE_BASE_ID", "")
+CONNECTIONS_TABLE_NAME = os.environ.get("CONNECTIONS_TABLE_NAME", "")
+WEBSOCKET_CALLBACK_URL = os.environ.get("WEBSOCKET_CALLBACK_URL", "")
+CHECKPOINT_TABLE_NAME = os.environ.get("CHECKPOINT_TABLE_NAME", "")
+STATE_TABLE_NAME = os.environ.get("STATE_TABLE_NAME", "")
+ANALYSIS_CACHE_TABLE_NAME = os.environ.get("ANALYSIS_CACHE_TABLE_NAME", "")
+# 공유/캐시된 분석을 세션별 행 대신 가리킬 불변 레코드 테이블 (비어 있으면 항상 세션별 행 저장)
+ANALYSIS_RECORDS_TABLE_NAME = os.environ.get("ANALYSIS_RECORDS_TABLE_NAME", "")
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_COOLDOWN_SECONDS = int(os.environ.get("BREAKER_COOLDOWN_SECONDS", "60"))
+# 다중 엔드포인트 설정 (JSON 배열). 비어 있으면 BEDROCK_AGENT_ID/ALIAS 단일 엔드포인트
+BEDROCK_ENDPOINTS = os.environ.get("BEDROCK_ENDPOINTS", "")
+# 로컬 벤치마크용 녹화 스트림 재생 백엔드 (배포 환경에서는 설정하지 않는다)
+AGENT_REPLAY_FILE = os.environ.get("AGENT_REPLAY_FILE", "")
+AGENT_REPLAY_TIME_SCALE = float(os.environ.get("AGENT_REPLAY_TIME_SCALE", "1.0"))
+# 프롬프트/모델 실험: 세션을 변형에 결정적으로 배정 (EXPERIMENT_VARIANTS가 비어 있으면 기준 변형만)
+EXPERIMENT_ID = os.environ.get("EXPERIMENT_ID", DEFAULT_EXPERIMENT_ID)
+EXPERIMENT_VARIANTS = os.environ.get("EXPERIMENT_VARIANTS", "")
+# 최종 응답을 스트리밍으로 받아 완성된 스킬/카드 원소를 생성 도중에 저장
+STREAMING_PERSIST = os.environ.get("STREAMING_PERSIST", "true").lower() == "true"
+# 세션 전체의 토큰 예산 (0이면 무제한). 재시도/사전 분석/부분 재분석이 survey 항목에 누적한 사용량을 빼고
+# 남은 만큼만 Agent 호출에 허용하며, 초과하면 중단하고 세션을 terminal 처리한다
+SESSION_TOKEN_BUDGET = int(os.environ.get("SESSION_TOKEN_BUDGET", "200000"))
+# 큐 소비 시 묶음 생성 모델 (비어 있으면 큐 메시지도 단건 Agent 경로로 처리)과 묶음 최대 크기
+MICRO_BATCH_MODEL_ID = os.environ.get("MICRO_BATCH_MODEL_ID", "")
+MICRO_BATCH_SIZE = int(os.environ.get("MICRO_BATCH_SIZE", "8"))
+# 검색 결과를 직업/스킬 관련 문장·표 행으로 줄여 붙일 토큰 예산 (0이면 원문 청크를 그대로 붙인다).
+# 설정하면 Agent 대신 Retrieve API로 먼저 검색해 압축한 결과만 Agent에 전달한다
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", "0"))
+# 실험 변형 generation_mode="tool"이 쓰는 converse 모델 (비어 있으면 tool 변형도 Agent 경로로 처리)
+STRUCTURED_OUTPUT_MODEL_ID = os.environ.get("STRUCTURED_OUTPUT_MODEL_ID", "")
+# 단건 재처리를 비동기로 넘길 자기 자신 (Lambda 밖에서는 같은 프로세스에서 처리)
+FUNCTION_NAME = os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "")
+# 같은 프로필의 동시 분석 합치기 (STATE_TABLE_NAME 필요). 임대는 analyze 타임아웃과 같게 둔다
+SINGLE_FLIGHT = os.environ.get("SINGLE_FLIGHT", "true").lower() == "true"
+SINGLE_FLIGHT_LEASE_SECONDS = int(os.environ.get("SINGLE_FLIGHT_LEASE_SECONDS", "180"))
+# 정확 일치 캐시 미스 뒤 의미 기반 재사용: 가장 가까운 캐시 항목의 유사도 하한 (0이면 끔)
+SEMANTIC_REUSE_THRESHOLD = float(os.environ.get("SEMANTIC_REUSE_THRESHOLD", "0"))
+SEMANTIC_INDEX_BUCKET = os.environ.get("SEMANTIC_INDEX_BUCKET", "")
+SEMANTIC_INDEX_KEY = os.environ.get("SEMANTIC_INDEX_KEY", SEMANTIC_DEFAULT_INDEX_KEY)
+SEMANTIC_NPROBE = int(os.environ.get("SEMANTIC_NPROBE", str(SEMANTIC_DEFAULT_NPROBE)))
+SEMANTIC_INDEX_REFRESH_SECONDS = int(os.environ.get("SEMANTIC_INDEX_REFRESH_SECONDS", "300"))
+INDEX_DIR = os.environ.get("INDEX_DIR", "/tmp")
+# 과거 카드로 만든 전환 그래프(benchmarks.transition_graph)로 템플릿 카드 로드맵을 사용자 스킬에 맞춘다 (비어 있으면 템플릿 그대로)
+TRANSITION_GRAPH_BUCKET = os.environ.get("TRANSITION_GRAPH_BUCKET", "")
+TRANSITION_GRAPH_KEY = os.environ.get("TRANSITION_GRAPH_KEY", DEFAULT_GRAPH_KEY)
+TRANSITION_GRAPH_REFRESH_SECONDS = int(os.environ.get("TRANSITION_GRAPH_REFRESH_SECONDS", "3600"))
+# Agent RETURN_CONTROL 액션 그룹(get_job_outlook/get_skill_outlook)에 답할 WEF 사실 테이블 (비어 있으면 "없음"으로 답한다)
+WEF_FACTS_BUCKET = os.environ.get("WEF_FACTS_BUCKET", "")
+WEF_FACTS_KEY = os.environ.get("WEF_FACTS_KEY", DEFAULT_FACTS_KEY)
+# 사실 테이블은 보고서 판이 바뀔 때만 다시 만들므로 ETag 확인 주기를 의미 인덱스와 따로 둔다
+WEF_FACTS_REFRESH_SECONDS = int(os.environ.get("WEF_FACTS_REFRESH_SECONDS", "3600"))
+
+if AGENT_REPLAY_FILE:
+    bedrock_agent_runtime = ReplayAgentRuntime.from_file(AGENT_REPLAY_FILE, time_scale=AGENT_REPLAY_TIME_SCALE)
+
+# Bedrock 서킷 브레이커: 컨테이너 메모리 상태 + system_state 테이블 공유 항목
+bedrock_breaker = CircuitBreaker(
+    "bedrock",
+    state_table=dynamodb.Table(STATE_TABLE_NAME) if STATE_TABLE_NAME else None,
+    failure_threshold=BREAKER_FAILURE_THRESHOLD,
+    cooldown_seconds=BREAKER_COOLDOWN_SECONDS,
+)
+
+# 엔드포인트 밸런서: 서킷 브레이커 안쪽에서 엔드포인트 간 분산/전환을 담당
+endpoint_balancer = EndpointBalancer(
+    load_endpoints(BEDROCK_ENDPOINTS, BEDROCK_AGENT_ID, BEDROCK_AGENT_ALIAS_ID)
+)
+
+experiment_variants = load_variants(EXPERIMENT_VARIANTS)
 
+# 리전별 bedrock-agent-runtime 클라이언트 (기본 리전은 bedrock_agent_runtime 사용)
+_regional_clients: Dict[str, Any] = {}
 
-def _build_prompt(name: str, job_title: str, age_group: str, strengths: str, hobbies: str) -> str:
+# WebSocket Management API 클라이언트 (콜백 URL이 설정된 경우에만 지연 생성)
+_management_api = None
+
+# 의미 기반 재사용 인덱스 로더 (SEMANTIC_REUSE_THRESHOLD가 설정된 경우에만 지연 생성)
+_semantic_loader: Optional[S3IndexLoader] = None
+
+# WEF 사실 테이블 로더 (WEF_FACTS_BUCKET이 설정된 경우에만 지연 생성)
+_fact_loader: Optional[S3IndexLoader] = None
+
+# 전환 그래프 로더 (TRANSITION_GRAPH_BUCKET이 설정된 경우에만 지연 생성)
+_transition_loader: Optional[S3IndexLoader] = None
+
+
+def _build_prompt(
+    name: str,
+    job_title: str,
+    age_group: str,
+    strengths: str,
+    hobbies: str,
+    references: Optional[List[Dict[str, str]]] = None,
+    template_cards: Optional[List[Dict[str, Any]]] = None,
+    prompt_version: str = DEFAULT_PROMPT_VERSION,
+) -> str:
     """Bedrock Agent에 전달할 분석 프롬프트를 생성한다.
 
     지침은 Agent 시스템 프롬프트에 포함되어 있으므로,
     여기서는 사용자 데이터만 전달한다.
+    응답은 항상 정규 언어로 생성하고, 다른 언어는 결과 조회 시 번역한다.
+    커리어 카드는 템플릿 라이브러리에서 미리 고른 카드를 전달하고 reason만 생성하게 한다.
+    이전 실행의 retrieval 체크포인트가 있으면 검색 결과를 함께 전달하여
+    Knowledge Base 재검색을 생략하도록 한다.
+    본문은 실험 변형의 prompt_version 템플릿을 사용한다.
     """
     skills = strengths
+    prompt = render_prompt(
+        prompt_version,
+        name=name,
+        job_title=job_title,
+        age_group=age_group,
+        skills=skills,
+        language=LANGUAGE_NAMES[CANONICAL_LANGUAGE],
+    )
+    if references:
+        prompt += _reference_block(references, job_title, strengths)
+    if template_cards:
+        prompt += "\n\n" + template_prompt_block(template_cards)
+    return prompt
+
+
+def _reference_block(references: List[Dict[str, str]], job_title: str, strengths: str) -> str:
+    """이미 검색한 Knowledge Base 결과를 프롬프트에 붙이는 블록.
+
+    CONTEXT_TOKEN_BUDGET이 있으면 사용자 직업/스킬 관련 문장과 표 행만 예산 안에서 남긴다.
+    관련 항목이 하나도 없어도 블록을 빼지 않고 원래 순서의 앞부분을 예산만큼 붙인다
+    (블록이 없으면 Agent가 다시 검색해 압축 전 청크를 통째로 받는다).
+    """
+    if CONTEXT_TOKEN_BUDGET:
+        compressed, stats = compress_references(references, job_title, split_skills(strengths), CONTEXT_TOKEN_BUDGET)
+        logger.info("참고 자료 압축: tokens=%d->%d, units=%d->%d, elapsed_us=%.0f",
+                    stats.input_tokens, stats.output_tokens, stats.units, stats.kept, stats.elapsed_us)
+        if not compressed:
+            compressed = leading_references(references, CONTEXT_TOKEN_BUDGET)
+            logger.info("관련 참고 자료 없음, 앞부분 %d건으로 대체", len(compressed))
+        if not compressed:
+            return ""
+        references = compressed
+    reference_lines = "\n".join(f"- {ref['text']}" for ref in references)
     return (
-        f"Please analyze the following user.\n\n"
-        f"Name: {name}\n"
-        f"Current Job: {job_title}\n"
-        f"Age Group: {age_group}\n"
-        f"Skills: {skills}\n"
-        f"Response Language: English"
+        "\n\nReference Data (already retrieved from the Knowledge Base; "
+        "use it instead of searching again):\n"
+        f"{reference_lines}"
     )
 
 
+def _retrieval_query(job_title: str, strengths: str) -> str:
+    """사전 분석 retrieval 단계에서 Knowledge Base에 보낼 검색 질의."""
+    return f"{job_title} job outlook and AI automation risk for skills: {strengths}"
+
+
+def _get_transition_graph() -> Optional[TransitionGraph]:
+    """전환 그래프 (컨테이너당 로더 하나). 설정이 없거나 아직 읽지 못했으면 None (템플릿 로드맵 사용).
+
+    읽기에 실패해도 TRANSITION_GRAPH_REFRESH_SECONDS 동안은 S3를 다시 부르지 않는다.
+    """
+    global _transition_loader
+    if not TRANSITION_GRAPH_BUCKET:
+        return None
+    if _transition_loader is None:
+        _transition_loader = S3IndexLoader(s3, TRANSITION_GRAPH_BUCKET, TRANSITION_GRAPH_KEY, INDEX_DIR,
+                                           TRANSITION_GRAPH_REFRESH_SECONDS, opener=open_graph)
+    return _transition_loader.get()
+
+
+def _template_cards(job_title: str, strengths: str) -> List[Dict[str, Any]]:
+    """직업/스킬 클러스터로 고른 템플릿 커리어 카드 (입력이 같으면 항상 같은 카드).
+
+    전환 그래프가 있으면 로드맵을 사용자 스킬에서 각 직무까지의 최단 경로로 바꾼다.
+    """
+    skills = split_skills(strengths)
+    cards = render_cards(select_templates(job_title, skills), job_title, skills)
+    graph = _get_transition_graph()
+    if graph is None:
+        return cards
+    started = time.perf_counter()
+    cards = apply_roadmaps(graph, cards, job_title, skills)
+    logger.info("전환 그래프 로드맵: cards=%d, elapsed_us=%.0f", len(cards), (time.perf_counter() - started) * 1e6)
+    return cards
+
+
 def _parse_agent_response(raw_response: str) -> Dict[str, Any]:
     """Agent 응답에서 JSON을 추출하고 파싱한다."""
     text = raw_response.strip()
@@ -68,6 +307,17 @@ def _parse_agent_response(raw_response: str) -> Dict[str, Any]:
     return json.loads(text)
 
 
+def _read_analysis(raw_response: str, structured: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """생성 결과를 분석 dict로 읽는다.
+
+    도구 호출 강제 모드의 도구 입력이 있으면 파싱 없이 그대로 쓰고,
+    없으면(Agent 응답, 체크포인트/캐시 텍스트) JSON을 추출한다.
+    """
+    if structured is not None:
+        return check_analysis(structured)
+    return _parse_agent_response(raw_response)
+
+
 def _convert_to_decimal(obj: Any) -> Any:
     """DynamoDB 저장을 위해 float를 Decimal로 변환한다."""
     if isinstance(obj, float):
@@ -81,23 +331,179 @@ def _convert_to_decimal(obj: Any) -> Any:
     return obj
 
 
-def _invoke_bedrock_agent(prompt: str) -> str:
-    """Bedrock Agent를 호출하고 응답 텍스트를 반환한다."""
-    response = bedrock_agent_runtime.invoke_agent(
-        agentId=BEDROCK_AGENT_ID,
-        agentAliasId=BEDROCK_AGENT_ALIAS_ID,
-        sessionId=str(uuid.uuid4()),
-        inputText=prompt,
-    )
+def _get_fact_store() -> Optional[WEFFactStore]:
+    """WEF 사실 테이블 (컨테이너당 로더 하나, ETag가 같으면 기존 매핑 재사용)."""
+    global _fact_loader
+    if not WEF_FACTS_BUCKET:
+        return None
+    if _fact_loader is None:
+        _fact_loader = S3IndexLoader(s3, WEF_FACTS_BUCKET, WEF_FACTS_KEY, INDEX_DIR, WEF_FACTS_REFRESH_SECONDS,
+                                     opener=WEFFactStore)
+    return _fact_loader.get()
+
+
+def _answer_return_control(result: AgentStreamResult) -> Optional[Dict[str, Any]]:
+    """returnControl 함수 호출을 사실 테이블로 답해 다음 호출의 sessionState를 만든다."""
+    started = time.perf_counter()
+    state = session_state(result.return_control or {}, _get_fact_store())
+    calls = len(state["returnControlInvocationResults"]) if state else 0
+    result.action_calls += calls
+    logger.info("액션 그룹 응답: calls=%d, elapsed_us=%.0f", calls, (time.perf_counter() - started) * 1e6)
+    return state
+
+
+def _agent_client_for(endpoint: Endpoint):
+    """엔드포인트 리전의 bedrock-agent-runtime 클라이언트를 반환한다 (컨테이너 내 재사용)."""
+    if not endpoint.region:
+        return bedrock_agent_runtime
+    if endpoint.region not in _regional_clients:
+        _regional_clients[endpoint.region] = boto3.client(
+            "bedrock-agent-runtime", region_name=endpoint.region, config=AGENT_RUNTIME_CONFIG
+        )
+    return _regional_clients[endpoint.region]
+
+
+def _invoke_bedrock_agent(
+    prompt: str,
+    agent_alias_id: str = "",
+    on_chunk: Optional[Callable[[Optional[str]], None]] = None,
+    token_budget: int = 0,
+    skill_count: int = 0,
+) -> AgentStreamResult:
+    """Bedrock Agent를 호출하고 응답 텍스트와 검색 결과를 반환한다.
+
+    트레이스를 활성화하여 Knowledge Base 검색 결과와 토큰 사용량을 함께 수집한다.
+    호출 대상은 endpoint_balancer가 건강 점수로 고르며,
+    스로틀/일시 오류면 다른 엔드포인트로 전환한다.
+    agent_alias_id가 있으면(실험 변형의 Agent 버전) 엔드포인트 기본 alias 대신 사용한다.
+    on_chunk가 있으면 최종 응답 스트리밍을 켜고 조각을 전달하며,
+    엔드포인트 시도마다 먼저 STREAM_RESTART를 보낸다.
+    token_budget(세션의 남은 허용량, 0이면 무제한)은 엔드포인트 전환과 returnControl 재호출을 합쳐
+    적용하고, 넘으면 TokenBudgetExceeded로 중단한다 (엔드포인트 전환/회로 실패로 집계하지 않는다).
+    전환으로 버린 시도의 사용량도 결과 사용량에 더한다.
+    returnControl은 skill_count로 정한 횟수(max_rounds)까지 답하고, 넘으면 새 세션에서 함수 호출 없이
+    답하라고 한 번 더 요청한다. 그래도 멈추지 않으면 빈 응답 대신 ReturnControlExhausted를 낸다.
+    """
+    abandoned = TokenUsage()
+    rounds = max_rounds(skill_count)
+
+    def attempt(endpoint: Endpoint, result: AgentStreamResult) -> AgentStreamResult:
+        kwargs: Dict[str, Any] = {}
+        if on_chunk:
+            on_chunk(STREAM_RESTART)
+            kwargs["streamingConfigurations"] = {"streamFinalResponse": True}
+        allowance = 0
+        if token_budget:
+            allowance = token_budget - abandoned.total_tokens
+            if allowance <= 0:
+                raise TokenBudgetExceeded(TokenUsage(), token_budget)
+        client = _agent_client_for(endpoint)
+
+        def call(agent_session_id: str, request: Dict[str, Any]) -> None:
+            response = client.invoke_agent(
+                agentId=endpoint.agent_id,
+                agentAliasId=agent_alias_id or endpoint.agent_alias_id,
+                sessionId=agent_session_id,
+                enableTrace=True,
+                **request,
+                **kwargs,
+            )
+            # 스트리밍 응답 수집 (스트림 중 오류도 엔드포인트 건강 지표에 반영)
+            collect_agent_stream(response.get("completion", []), on_chunk=on_chunk, token_budget=allowance, into=result)
+
+        agent_session_id = str(uuid.uuid4())
+        call(agent_session_id, {"inputText": prompt})
+        for _ in range(rounds):
+            # RETURN_CONTROL 액션 그룹 호출이면 Lambda 안에서 답하고 같은 세션으로 이어간다
+            state = _answer_return_control(result) if result.return_control else None
+            if state is None:
+                return result
+            call(agent_session_id, {"sessionState": state})
+        if not result.return_control:
+            return result
+        logger.warning("returnControl 상한 초과, 함수 호출 없이 답변 요청: rounds=%d", rounds)
+        call(str(uuid.uuid4()), {"inputText": prompt + FINAL_ANSWER_NOTE})
+        if result.return_control:
+            raise ReturnControlExhausted(rounds)
+        return result
+
+    def invoke(endpoint: Endpoint) -> AgentStreamResult:
+        result = AgentStreamResult()
+        try:
+            attempt(endpoint, result)
+        except TokenBudgetExceeded as e:
+            e.usage.add(abandoned)
+            raise
+        except Exception:
+            abandoned.add(result.usage)
+            raise
+        result.usage.add(abandoned)
+        return result
+
+    return endpoint_balancer.invoke(invoke)
+
+
+def _prefetch_references(
+    session_id: str, job_title: str, strengths: str, checkpoint_store: Optional[CheckpointStore], retrieval_hash: str
+) -> List[Dict[str, str]]:
+    """압축 단계를 거치도록 Agent 대신 Retrieve API로 먼저 검색한다 (retrieval 체크포인트로도 남긴다).
+
+    검색이 실패하면 분석을 실패시키지 않고 빈 목록을 돌려 Agent가 직접 검색하게 한다.
+    """
+    try:
+        references = retrieve_references(
+            bedrock_agent_runtime, KNOWLEDGE_BASE_ID, _retrieval_query(job_title, strengths)
+        )
+    except Exception:
+        logger.exception("참고 자료 사전 검색 실패, Agent 검색으로 진행: session_id=%s", session_id)
+        return []
+    _record_usage(session_id, TokenUsage(kb_queries=1))
+    if references and checkpoint_store:
+        checkpoint_store.save(session_id, STAGE_RETRIEVAL, retrieval_hash, references)
+    return references
+
+
+def _structured_mode(variant: Variant) -> bool:
+    return variant.generation_mode == GENERATION_TOOL and bool(STRUCTURED_OUTPUT_MODEL_ID)
+
 
-    # 스트리밍 응답 수집
-    completion = ""
-    for event in response.get("completion", []):
-        chunk = event.get("chunk", {})
-        if "bytes" in chunk:
-            completion += chunk["bytes"].decode("utf-8")
+def _generate(
+    prompt: str,
+    variant: Variant,
+    job_title: str,
+    strengths: str,
+    has_references: bool = False,
+    token_budget: int = 0,
+) -> AgentStreamResult:
+    """변형의 generation_mode에 따라 Agent 또는 도구 호출 강제(converse)로 분석을 생성한다.
 
-    return completion
+    tool 모드는 Agent의 Knowledge Base 검색이 없으므로, 프롬프트에 참고 자료가 없으면
+    Retrieve API로 검색해 붙이고 retrieved_references로 돌려준다 (retrieval 체크포인트 저장용).
+    completion에는 도구 입력을 JSON으로 직렬화해 두어 체크포인트/캐시가 Agent 경로와 같은 형식을 쓴다.
+    token_budget은 Agent 경로에서 스트림 중에 적용한다 (converse는 한 번에 응답하므로 호출 뒤 사용량으로만 누적).
+    """
+    if not _structured_mode(variant):
+        return bedrock_breaker.call(
+            _invoke_bedrock_agent, prompt, variant.agent_alias_id, None, token_budget, len(split_skills(strengths))
+        )
+    references: List[Dict[str, str]] = []
+    kb_queries = 0
+    if KNOWLEDGE_BASE_ID and not has_references:
+        references = retrieve_references(
+            bedrock_agent_runtime, KNOWLEDGE_BASE_ID, _retrieval_query(job_title, strengths)
+        )
+        kb_queries = 1
+        if references:
+            prompt += _reference_block(references, job_title, strengths)
+    generator = ToolUseGenerator(bedrock_runtime, STRUCTURED_OUTPUT_MODEL_ID)
+    structured, usage = bedrock_breaker.call(generator.generate, prompt)
+    usage.kb_queries = kb_queries
+    return AgentStreamResult(
+        completion=json.dumps(structured, ensure_ascii=False) if structured is not None else "",
+        retrieved_references=references,
+        usage=usage,
+        structured=structured,
+    )
 
 
 def _save_skill_risks(
@@ -119,6 +525,26 @@ def _save_skill_risks(
     logger.info("스킬 위험도 %d개 저장 완료: session_id=%s", len(skill_risks), session_id)
 
 
+def _prune_skill_risks(session_id: str, skill_risks: List[Dict[str, Any]]) -> None:
+    """skill_graph에서 skill_risks에 없는 행을 지운다.
+
+    스트리밍 저장은 끝까지 가지 못한 시도(엔드포인트 전환, 최종 파싱 실패)의 원소도 바로 쓰므로
+    최종 저장 뒤 남은 행을 정리한다. 커리어 카드는 템플릿 card_index로만 저장되어 최종 저장이 덮어쓴다.
+    """
+    keep = {risk["skill_name"] for risk in skill_risks}
+    table = dynamodb.Table(SKILL_GRAPH_TABLE_NAME)
+    rows = table.query(
+        KeyConditionExpression=Key("session_id").eq(session_id), ProjectionExpression="skill_name"
+    )["Items"]
+    stale = [row["skill_name"] for row in rows if row["skill_name"] not in keep]
+    if not stale:
+        return
+    with table.batch_writer() as batch:
+        for skill_name in stale:
+            batch.delete_item(Key={"session_id": session_id, "skill_name": skill_name})
+    logger.info("이전 스트리밍 시도의 스킬 위험도 %d개 삭제: session_id=%s", len(stale), session_id)
+
+
 def _save_career_cards(
     session_id: str, career_cards: List[Dict[str, Any]]
 ) -> None:
@@ -132,34 +558,697 @@ def _save_career_cards(
                 "combo_formula": card["combo_formula"],
                 "reason": card["reason"],
                 "roadmap": card["roadmap"],
+                "template_id": card.get("template_id", ""),
             })
             batch.put_item(Item=item)
     logger.info("커리어 카드 %d개 저장 완료: session_id=%s", len(career_cards), session_id)
 
 
-def _update_survey_status(session_id: str, status: str) -> None:
-    """survey 테이블의 status를 업데이트한다."""
+def _invoke_with_streaming_persist(
+    session_id: str,
+    prompt: str,
+    agent_alias_id: str,
+    template_cards: List[Dict[str, Any]],
+    array_keys: List[str],
+    token_budget: int = 0,
+    skill_count: int = 0,
+) -> Tuple[AgentStreamResult, Dict[str, List[Any]]]:
+    """Agent 응답을 스트리밍으로 소비하면서 완성된 스킬 위험도/카드 원소를 바로 저장한다.
+
+    카드는 템플릿 카드에 생성된 reason만 반영해 저장한다 (_save_career_cards와 같은 규칙).
+    반환하는 원소 목록은 최종 파싱 결과와 비교해 누락/불일치분을 다시 저장하는 데 쓴다.
+    """
+    def persist(key: str, element: Dict[str, Any]) -> None:
+        if key == "skill_risks":
+            _save_skill_risks(session_id, [element])
+            return
+        index = element.get("card_index")
+        cards = [c for c in personalize_cards(template_cards, [element]) if str(c["card_index"]) == str(index)]
+        if not cards:
+            raise ValueError(f"템플릿에 없는 card_index: {index!r}")
+        _save_career_cards(session_id, cards)
+
+    return run_streaming_persist(
+        lambda on_chunk: bedrock_breaker.call(
+            _invoke_bedrock_agent, prompt, agent_alias_id, on_chunk, token_budget, skill_count
+        ),
+        persist,
+        array_keys,
+    )
+
+
+def _update_survey_status(session_id: str, status: str, error_code: str = "") -> None:
+    """survey 테이블의 status를 업데이트한다. error_code가 있으면 함께 기록한다."""
     table = dynamodb.Table(SURVEY_TABLE_NAME)
+    update_expression = "SET #s = :s"
+    values: Dict[str, Any] = {":s": status}
+    if error_code:
+        update_expression += ", error_code = :e"
+        values[":e"] = error_code
     table.update_item(
         Key={"session_id": session_id},
-        UpdateExpression="SET #s = :s",
+        UpdateExpression=update_expression,
         ExpressionAttributeNames={"#s": "status"},
-        ExpressionAttributeValues={":s": status},
+        ExpressionAttributeValues=values,
     )
     logger.info("survey status 업데이트: session_id=%s, status=%s", session_id, status)
 
 
-def handler(event: dict, context) -> None:
+def _get_checkpoint_store() -> Optional[CheckpointStore]:
+    """체크포인트 저장소를 반환한다. 테이블이 설정되지 않았으면 None."""
+    if not CHECKPOINT_TABLE_NAME:
+        return None
+    return CheckpointStore(dynamodb.Table(CHECKPOINT_TABLE_NAME))
+
+
+def _get_semantic_index() -> Optional[MmapIVFIndex]:
+    """의미 기반 재사용 인덱스 (컨테이너당 로더 하나, ETag가 같으면 기존 매핑 재사용)."""
+    global _semantic_loader
+    if _semantic_loader is None:
+        _semantic_loader = S3IndexLoader(
+            s3, SEMANTIC_INDEX_BUCKET, SEMANTIC_INDEX_KEY, INDEX_DIR, SEMANTIC_INDEX_REFRESH_SECONDS
+        )
+    return _semantic_loader.get()
+
+
+def _semantic_analysis(
+    cache: AnalysisCache, job_title: str, strengths: str, age_group: str, prompt_version: str
+) -> Optional[str]:
+    """가장 가까운 캐시 항목의 유사도가 SEMANTIC_REUSE_THRESHOLD 이상이면 그 결과를 돌려준다.
+
+    이웃의 연령대/프롬프트 버전이나 템플릿 카드가 다르거나, 스킬 위험도를 사용자 스킬로 옮길 수 없으면
+    미스로 본다 (services.semantic_reuse.adapt_analysis).
+    """
+    index = _get_semantic_index()
+    match = nearest(index, job_title, strengths, SEMANTIC_NPROBE) if index is not None else None
+    if match is None:
+        return None
+    if match.similarity < SEMANTIC_REUSE_THRESHOLD:
+        logger.info("의미 기반 재사용 미스: similarity=%.3f, distance=%.3f, threshold=%.3f, cache_key=%s",
+                    match.similarity, match.distance, SEMANTIC_REUSE_THRESHOLD, match.cache_key)
+        return None
+    item = cache.get_item(match.cache_key) or {}
+    analysis = None
+    if item.get("analysis"):
+        analysis = adapt_analysis(item["analysis"], item, job_title, strengths, age_group, prompt_version)
+    logger.info("의미 기반 재사용: similarity=%.3f, distance=%.3f, threshold=%.3f, cache_key=%s, found=%s, adapted=%s",
+                match.similarity, match.distance, SEMANTIC_REUSE_THRESHOLD, match.cache_key,
+                bool(item.get("analysis")), analysis is not None)
+    return analysis
+
+
+def _cached_analysis(job_title: str, strengths: str, age_group: str, prompt_version: str) -> Optional[str]:
+    """대량 사전 분석(benchmarks/bulk_precompute.py)이 채운 같은 직업/스킬/연령대 조합의 결과를 조회한다.
+
+    캐시 키에 프롬프트 버전도 들어가므로 세션 실험 변형의 prompt_version으로 만든 결과만 쓴다.
+
+    정확 일치가 없고 SEMANTIC_REUSE_THRESHOLD가 설정되어 있으면 의미가 가까운 조합의 결과를 찾는다.
+    캐시 조회 실패는 분석을 막지 않는다 (Agent 호출로 진행).
+    """
+    if not ANALYSIS_CACHE_TABLE_NAME:
+        return None
+    try:
+        cache = AnalysisCache(dynamodb.Table(ANALYSIS_CACHE_TABLE_NAME))
+        cached = cache.get(job_title, strengths, age_group, prompt_version)
+        if cached is not None or SEMANTIC_REUSE_THRESHOLD <= 0 or not SEMANTIC_INDEX_BUCKET:
+            return cached
+        return _semantic_analysis(cache, job_title, strengths, age_group, prompt_version)
+    except Exception:
+        logger.exception("분석 캐시 조회 실패 (Agent 호출로 진행): job_title=%s", job_title)
+        return None
+
+
+def _get_management_api():
+    """WebSocket Management API 클라이언트를 반환한다 (컨테이너 내 재사용)."""
+    global _management_api
+    if _management_api is None:
+        _management_api = boto3.client("apigatewaymanagementapi", endpoint_url=WEBSOCKET_CALLBACK_URL)
+    return _management_api
+
+
+def _notify_status(session_id: str, status: str) -> None:
+    """WebSocket으로 연결된 클라이언트에 분석 종료(completed/error)를 푸시한다.
+
+    알림 실패는 분석 결과에 영향을 주지 않는다 (클라이언트는 폴링으로 폴백).
+    """
+    if not CONNECTIONS_TABLE_NAME or not WEBSOCKET_CALLBACK_URL:
+        return
+    try:
+        registry = ConnectionRegistry(dynamodb.Table(CONNECTIONS_TABLE_NAME))
+        notify_session(registry, _get_management_api(), session_id, {
+            "type": "analysis_status",
+            "session_id": session_id,
+            "status": status,
+        })
+    except Exception:
+        logger.exception("WebSocket 알림 실패: session_id=%s", session_id)
+
+
+def _run_metrics(latency_seconds: float, agent_result: AgentStreamResult) -> RunMetrics:
+    """Agent 호출 1회의 실험 지표."""
+    return RunMetrics(
+        latency_ms=int(latency_seconds * 1000),
+        input_tokens=agent_result.input_tokens,
+        output_tokens=agent_result.output_tokens,
+        output_chars=len(agent_result.completion),
+    )
+
+
+def _record_experiment(session_id: str, variant: Variant, metrics: RunMetrics) -> None:
+    """실험 지표를 survey 항목과 EMF 지표로 남긴다."""
+    record_run(dynamodb.Table(SURVEY_TABLE_NAME), session_id, EXPERIMENT_ID, variant, metrics)
+    emit_metrics(EXPERIMENT_ID, variant, metrics)
+
+
+def _record_usage(session_id: str, usage: TokenUsage) -> None:
+    """토큰/검색 사용량을 survey 항목에 누적하고 일별·모델별 집계에 더한다."""
+    record_session_usage(dynamodb.Table(SURVEY_TABLE_NAME), session_id, usage)
+    if STATE_TABLE_NAME:
+        record_daily_rollup(dynamodb.Table(STATE_TABLE_NAME), usage)
+
+
+def _token_allowance(session_id: str) -> int:
+    """이번 호출에 허용할 토큰 수 (SESSION_TOKEN_BUDGET - 세션 누적 사용량, 0이면 무제한).
+
+    Raises:
+        TokenBudgetExceeded: 이전 호출들이 이미 예산을 다 쓴 경우.
+    """
+    if not SESSION_TOKEN_BUDGET:
+        return 0
+    used = session_tokens_used(dynamodb.Table(SURVEY_TABLE_NAME), session_id)
+    if used >= SESSION_TOKEN_BUDGET:
+        raise TokenBudgetExceeded(TokenUsage(), SESSION_TOKEN_BUDGET, used)
+    return SESSION_TOKEN_BUDGET - used
+
+
+def _store_shared_record(result: Dict[str, Any], career_cards: List[Dict[str, Any]]) -> str:
+    """공유 분석 레코드를 저장하고 ID를 반환한다 (이미 있으면 재사용)."""
+    return AnalysisRecordStore(dynamodb.Table(ANALYSIS_RECORDS_TABLE_NAME)).put(shared_content(result, career_cards))
+
+
+def _mark_completed(session_id: str, result: Dict[str, Any], analysis_ref: str = "") -> None:
+    """D-Day 값과 근거를 survey 테이블에 저장하고 status를 completed로 업데이트한다.
+
+    analysis_ref가 있으면 D-Day/근거 대신 공유 분석 레코드 포인터만 저장한다.
+    """
+    table = dynamodb.Table(SURVEY_TABLE_NAME)
+    if analysis_ref:
+        table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression="SET #s = :s, analysis_ref = :ref",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={":s": "completed", ":ref": analysis_ref},
+        )
+        return
+    table.update_item(
+        Key={"session_id": session_id},
+        UpdateExpression="SET #s = :s, remaining_years = :d, remaining_years_reason = :r",
+        ExpressionAttributeNames={"#s": "status"},
+        ExpressionAttributeValues={
+            ":s": "completed",
+            ":d": _convert_to_decimal(result.get("remaining_years", 0)),
+            ":r": result.get("remaining_years_reason", ""),
+        },
+    )
+
+
+def _get_single_flight() -> Optional[SingleFlight]:
+    """single-flight 조정기를 생성한다. 꺼져 있거나 system_state 테이블이 없으면 None."""
+    if not SINGLE_FLIGHT or not STATE_TABLE_NAME:
+        return None
+    return SingleFlight(dynamodb.Table(STATE_TABLE_NAME), lease_seconds=SINGLE_FLIGHT_LEASE_SECONDS)
+
+
+def _join_flight(key: str, session_id: str) -> str:
+    """flight에 참여한다. 조정 실패는 분석을 막지 않는다 (단독 실행)."""
+    single_flight = _get_single_flight()
+    if single_flight is None:
+        return ROLE_SOLO
+    try:
+        return single_flight.join(key, session_id)
+    except Exception:
+        logger.exception("single-flight 참여 실패 (단독 실행): session_id=%s", session_id)
+        return ROLE_SOLO
+
+
+def _fan_out_result(
+    key: str, session_id: str, result: Dict[str, Any], career_cards: List[Dict[str, Any]]
+) -> None:
+    """리더의 분석 결과를 flight에서 기다리던 follower 세션에 저장한다.
+
+    공유 레코드 테이블이 있으면 행을 복사하지 않고 레코드 포인터만 저장한다.
+    저장에 실패한 follower는 error로 표시해 스위퍼가 다시 분석하게 한다.
+    """
+    try:
+        followers = _get_single_flight().complete(key, session_id)
+    except Exception:
+        logger.exception("flight 완료 처리 실패 (follower는 스위퍼가 다시 넣는다): leader=%s", session_id)
+        return
+    analysis_ref = ""
+    for follower in followers:
+        try:
+            if ANALYSIS_RECORDS_TABLE_NAME:
+                analysis_ref = analysis_ref or _store_shared_record(result, career_cards)
+            else:
+                _save_skill_risks(follower, result.get("skill_risks", []))
+                _save_career_cards(follower, career_cards)
+            _mark_completed(follower, result, analysis_ref)
+            _notify_status(follower, "completed")
+        except Exception:
+            logger.exception("follower 결과 저장 실패: session_id=%s, leader=%s", follower, session_id)
+            _update_survey_status(follower, "error")
+            _notify_status(follower, "error")
+    if followers:
+        logger.info("flight 결과 인계: leader=%s, followers=%d", session_id, len(followers))
+
+
+def _fan_out_failure(key: str, session_id: str, status: str, error_code: str = "") -> None:
+    """리더의 실패 상태를 follower에 그대로 전달한다 (error는 스위퍼가 다시 넣는다)."""
+    try:
+        for follower in _get_single_flight().complete(key, session_id):
+            _update_survey_status(follower, status, error_code=error_code)
+            _notify_status(follower, status)
+    except Exception:
+        logger.exception("follower 실패 전달 실패: leader=%s", session_id)
+
+
+def _dispatch_single(payload: Dict[str, Any]) -> None:
+    """묶음에서 빠진 세션을 단건 Agent 경로로 넘긴다 (Lambda에서는 자기 자신을 비동기 호출)."""
+    if FUNCTION_NAME:
+        lambda_client.invoke(FunctionName=FUNCTION_NAME, InvocationType="Event", Payload=json.dumps(payload))
+    else:
+        handler(payload, None)
+
+
+def _generate_group(
+    payloads: List[Dict[str, Any]], prompt_version: str, flights: Dict[str, str], variants: Dict[str, Variant]
+) -> List[Dict[str, Any]]:
+    """호환 그룹 하나를 모델 요청 1회로 분석하고 저장한다. 처리하지 못한 페이로드를 반환한다.
+
+    flights(session_id → flight 지문)에 있는 리더 세션은 저장 뒤 follower에게 결과를 인계한다.
+    세션마다 나눈 사용량과 묶음 지연 시간으로 변형(variants: session_id → Variant)의 실험 지표를 남긴다.
+    """
+    cards_by_session = {
+        p["session_id"]: _template_cards(p.get("job_title", ""), p.get("strengths", "")) for p in payloads
+    }
+    references: List[Dict[str, str]] = []
+    kb_queries = 0
+    if KNOWLEDGE_BASE_ID:
+        # 같은 직업의 프로필은 스킬을 합쳐 한 번만 검색한다
+        skills_by_job: Dict[str, List[str]] = {}
+        for p in payloads:
+            skills_by_job.setdefault(p.get("job_title", ""), []).extend(split_skills(p.get("strengths", "")))
+        seen = set()
+        for job_title, skills in skills_by_job.items():
+            kb_queries += 1
+            query = _retrieval_query(job_title, ", ".join(dict.fromkeys(skills)))
+            for ref in retrieve_references(bedrock_agent_runtime, KNOWLEDGE_BASE_ID, query):
+                if ref["text"] not in seen:
+                    seen.add(ref["text"])
+                    references.append(ref)
+    prompt = build_batch_prompt(
+        [
+            (p["session_id"], _build_prompt(
+                "", p.get("job_title", ""), p.get("age_group", ""), p.get("strengths", ""), "",
+                template_cards=cards_by_session[p["session_id"]],
+                prompt_version=prompt_version,
+            ))
+            for p in payloads
+        ],
+        references,
+    )
+
+    generator = BedrockBatchGenerator(bedrock_runtime, MICRO_BATCH_MODEL_ID)
+    batch_start = time.time()
+    text, usage = bedrock_breaker.call(generator.generate, prompt, len(payloads))
+    usage.kb_queries = kb_queries
+    batch_duration = time.time() - batch_start
+    results = parse_batch_response(text, cards_by_session)
+    logger.info("[TIMING] 묶음 생성 완료: size=%d, parsed=%d, duration=%.3fs, input_tokens=%d",
+                len(payloads), len(results), batch_duration, usage.input_tokens)
+    if STATE_TABLE_NAME:
+        record_daily_rollup(dynamodb.Table(STATE_TABLE_NAME), usage)
+    session_share = share_usage(usage, len(payloads))
+
+    leftovers = []
+    for payload in payloads:
+        session_id = payload["session_id"]
+        result = results.get(session_id)
+        if result is None:
+            leftovers.append(payload)
+            continue
+        try:
+            record_session_usage(dynamodb.Table(SURVEY_TABLE_NAME), session_id, session_share)
+            _record_experiment(session_id, variants[session_id], RunMetrics(
+                latency_ms=int(batch_duration * 1000),
+                input_tokens=session_share.input_tokens,
+                output_tokens=session_share.output_tokens,
+                output_chars=len(json.dumps(result, ensure_ascii=False)),
+            ))
+            career_cards = personalize_cards(cards_by_session[session_id], result.get("career_cards", []))
+            _save_skill_risks(session_id, result["skill_risks"])
+            _save_career_cards(session_id, career_cards)
+            _mark_completed(session_id, result)
+            _notify_status(session_id, "completed")
+            if session_id in flights:
+                _fan_out_result(flights.pop(session_id), session_id, result, career_cards)
+        except Exception:
+            logger.exception("묶음 결과 저장 실패 (단건 재처리): session_id=%s", session_id)
+            leftovers.append(payload)
+    return leftovers
+
+
+def _parse_queue_record(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """SQS 메시지 본문을 analyze 페이로드로 읽는다. 형식이 틀리면 None."""
+    try:
+        payload = json.loads(record["body"])
+    except (KeyError, TypeError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("session_id"), str) or not payload["session_id"]:
+        return None
+    return payload
+
+
+def _needs_single_path(payload: Dict[str, Any]) -> bool:
+    """체크포인트나 분석 캐시가 있어 단건 경로가 모델 호출 없이(또는 남은 단계만) 끝낼 수 있는 세션인지."""
+    session_id = payload["session_id"]
+    job_title, strengths = payload.get("job_title", ""), payload.get("strengths", "")
+    try:
+        checkpoint_store = _get_checkpoint_store()
+        if checkpoint_store and checkpoint_store.load(
+            session_id,
+            analysis_input_hash(payload.get("name", ""), job_title, payload.get("age_group", ""), strengths),
+            {STAGE_RETRIEVAL: retrieval_input_hash(job_title, strengths)},
+        ):
+            return True
+    except Exception:
+        logger.exception("체크포인트 조회 실패 (단건 경로로 처리): session_id=%s", session_id)
+        return True
+    prompt_version = assign_variant(EXPERIMENT_ID, session_id, experiment_variants).prompt_version
+    return _cached_analysis(job_title, strengths, payload.get("age_group", ""), prompt_version) is not None
+
+
+def _batchable_variant(variant: Variant) -> bool:
+    """묶음 생성은 MICRO_BATCH_MODEL_ID를 직접 부르므로 Agent alias와 생성 방식이 기본값인 변형만 묶는다."""
+    return not variant.agent_alias_id and variant.generation_mode == GENERATION_AGENT
+
+
+def _handle_queue_batch(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """SQS 이벤트 소스가 모은 설문 메시지를 묶음 생성으로 처리한다.
+
+    메시지는 하나씩 읽어 형식이 틀린 것만 batchItemFailures로 돌린다.
+    묶기 전에 단건 경로와 같은 순서로 거른다.
+        - 체크포인트/분석 캐시가 있는 세션은 단건 경로로 넘긴다 (완료된 단계나 캐시 결과 재사용)
+        - Agent alias나 생성 방식을 바꾼 실험 변형, 토큰 예산을 다 쓴 세션도 단건 경로로 넘긴다
+        - 같은 프로필이 이미 분석 중이면 follower로 등록만 한다 (리더가 결과를 인계)
+    같은 prompt_version끼리 MICRO_BATCH_SIZE 이하로 묶어 모델 요청 1회로 분석하고,
+    응답에서 빠졌거나 저장에 실패한 세션은 단건 Agent 경로로 넘긴다.
+    이때 그 세션이 리더인 flight는 follower를 error로 넘겨 스위퍼가 각자 다시 분석하게 한다
+    (단건 실행은 같은 세션이 리더인 flight에 다시 참여하지 못한다).
+    단건 전달까지 실패한 메시지만 batchItemFailures로 돌려 SQS가 다시 전달하게 한다.
+    """
+    message_ids: Dict[str, str] = {}
+    failures: List[Dict[str, str]] = []
+    payloads: List[Dict[str, Any]] = []
+    for record in records:
+        payload = _parse_queue_record(record)
+        if payload is None:
+            logger.warning("형식이 틀린 큐 메시지: message_id=%s", record.get("messageId"))
+            failures.append({"itemIdentifier": record.get("messageId", "")})
+            continue
+        message_ids[payload["session_id"]] = record["messageId"]
+        payloads.append(payload)
+
+    leftovers: List[Dict[str, Any]] = []
+    batchable: List[Dict[str, Any]] = []
+    flights: Dict[str, str] = {}
+    variants: Dict[str, Variant] = {}
+    joined = 0
+    if not MICRO_BATCH_MODEL_ID:
+        leftovers = payloads
+    else:
+        for payload in payloads:
+            if _needs_single_path(payload):
+                leftovers.append(payload)
+                continue
+            session_id = payload["session_id"]
+            variant = assign_variant(EXPERIMENT_ID, session_id, experiment_variants)
+            if not _batchable_variant(variant):
+                leftovers.append(payload)
+                continue
+            try:
+                _token_allowance(session_id)
+            except TokenBudgetExceeded:
+                # 단건 경로가 failed/token_budget_exceeded로 끝낸다
+                leftovers.append(payload)
+                continue
+            key = flight_key(
+                variant.variant_id, payload.get("job_title", ""), payload.get("age_group", ""),
+                payload.get("strengths", ""),
+            )
+            role = _join_flight(key, session_id)
+            if role == ROLE_FOLLOWER:
+                joined += 1
+                continue
+            if role == ROLE_LEADER:
+                flights[session_id] = key
+            variants[session_id] = variant
+            batchable.append(payload)
+
+    def prompt_version(payload: Dict[str, Any]) -> str:
+        return variants[payload["session_id"]].prompt_version
+
+    for group in group_compatible(batchable, prompt_version, MICRO_BATCH_SIZE):
+        try:
+            leftovers.extend(_generate_group(group, prompt_version(group[0]), flights, variants))
+        except Exception:
+            logger.exception("묶음 생성 실패 (단건 재처리): size=%d", len(group))
+            leftovers.extend(group)
+
+    for payload in leftovers:
+        session_id = payload["session_id"]
+        if session_id in flights:
+            _fan_out_failure(flights.pop(session_id), session_id, "error")
+        try:
+            _dispatch_single(payload)
+        except Exception:
+            logger.exception("단건 재처리 전달 실패: session_id=%s", session_id)
+            failures.append({"itemIdentifier": message_ids[session_id]})
+    logger.info("큐 묶음 처리 완료: received=%d, joined=%d, single=%d, failed=%d",
+                len(records), joined, len(leftovers), len(failures))
+    return {"batchItemFailures": failures}
+
+
+def _speculate(
+    session_id: str, name: str, job_title: str, age_group: str, strengths: str, stage: str
+) -> bool:
+    """설문 작성 중 사전 분석을 수행한다 (retrieval 또는 generation 단계까지).
+
+    결과는 체크포인트로만 남기고 survey 상태는 바꾸지 않는다.
+    그 사이 입력이 바뀌어 취소되었으면 체크포인트 지문이 달라 최종 분석에서 버려진다.
+
+    Returns:
+        최종 제출이 이 사전 분석에 연결되어 나머지 단계를 이어서 수행해야 하면 True.
+    """
+    input_hash = analysis_input_hash(name, job_title, age_group, strengths)
+    retrieval_hash = retrieval_input_hash(job_title, strengths)
+    spec_hash = input_hash if stage == SPEC_STAGE_GENERATION else retrieval_hash
+    outcome = SPEC_DONE
+
+    variant = assign_variant(EXPERIMENT_ID, session_id, experiment_variants)
+    spec_start = time.time()
+    try:
+        checkpoint_store = _get_checkpoint_store()
+        if checkpoint_store is None:
+            raise RuntimeError("CHECKPOINT_TABLE_NAME is required for speculative analysis")
+        checkpoints = checkpoint_store.load(session_id, input_hash, {STAGE_RETRIEVAL: retrieval_hash})
+
+        if stage == SPEC_STAGE_RETRIEVAL:
+            if STAGE_RETRIEVAL not in checkpoints and KNOWLEDGE_BASE_ID:
+                references = retrieve_references(
+                    bedrock_agent_runtime, KNOWLEDGE_BASE_ID, _retrieval_query(job_title, strengths)
+                )
+                _record_usage(session_id, TokenUsage(kb_queries=1))
+                if references:
+                    checkpoint_store.save(session_id, STAGE_RETRIEVAL, retrieval_hash, references)
+        elif STAGE_GENERATION not in checkpoints:
+            # 최종 분석이 이 generation 체크포인트를 그대로 쓰므로 최종 분석과 같은 이름 없는 프롬프트
+            prompt = _build_prompt(
+                "", job_title, age_group, strengths, "",
+                references=checkpoints.get(STAGE_RETRIEVAL),
+                template_cards=_template_cards(job_title, strengths),
+                prompt_version=variant.prompt_version,
+            )
+            agent_start = time.time()
+            try:
+                agent_result = _generate(
+                    prompt, variant, job_title, strengths, has_references=STAGE_RETRIEVAL in checkpoints,
+                    token_budget=_token_allowance(session_id),
+                )
+            except TokenBudgetExceeded as e:
+                _record_usage(session_id, e.usage)
+                raise
+            _record_usage(session_id, agent_result.usage)
+            metrics = _run_metrics(time.time() - agent_start, agent_result)
+            # 파싱 가능한 출력만 generation 체크포인트로 저장
+            try:
+                _read_analysis(agent_result.completion, agent_result.structured)
+            except (json.JSONDecodeError, StructuredOutputError):
+                metrics.parse_failed = True
+                raise
+            finally:
+                _record_experiment(session_id, variant, metrics)
+            if agent_result.retrieved_references and STAGE_RETRIEVAL not in checkpoints:
+                checkpoint_store.save(session_id, STAGE_RETRIEVAL, retrieval_hash, agent_result.retrieved_references)
+            checkpoint_store.save(session_id, STAGE_GENERATION, input_hash, agent_result.completion)
+    except Exception:
+        logger.exception("사전 분석 실패: session_id=%s, stage=%s", session_id, stage)
+        outcome = SPEC_FAILED
+
+    logger.info("[TIMING] 사전 분석 종료: session_id=%s, stage=%s, outcome=%s, duration=%.3fs",
+                session_id, stage, outcome, time.time() - spec_start)
+    item = finish_speculation(dynamodb.Table(SURVEY_TABLE_NAME), session_id, spec_hash, outcome)
+    return bool(item) and item.get("status") == "analyzing"
+
+
+def _amend(session_id: str, amend_version: int) -> None:
+    """POST /survey/amend로 수정된 세션을 부분 재분석한다 (services.amendment 참고).
+
+    survey 항목의 pending_amend가 요청 version과 다르면 오래된 재시도이므로 무시한다.
+    공유 분석 레코드를 가리키던 세션은 먼저 세션별 행으로 풀어 쓴 뒤 수정한다.
+    """
+    survey_table = dynamodb.Table(SURVEY_TABLE_NAME)
+    item = survey_table.get_item(Key={"session_id": session_id}, ConsistentRead=True).get("Item") or {}
+    pending = item.get("pending_amend") or {}
+    if int(pending.get("version", -1)) != amend_version:
+        logger.info("오래된 부분 재분석 무시: session_id=%s, version=%d", session_id, amend_version)
+        return
+
+    material = bool(pending.get("material"))
+    added = list(pending.get("added", []))
+    removed = {normalize_skill(skill) for skill in pending.get("removed", [])}
+    job_title, strengths = item.get("job_title", ""), item.get("strengths", "")
+    variant = assign_variant(EXPERIMENT_ID, session_id, experiment_variants)
+    logger.info("부분 재분석 시작: session_id=%s, version=%d, added=%d, removed=%d, material=%s",
+                session_id, amend_version, len(added), len(removed), material)
+
+    try:
+        summary = {
+            "remaining_years": item.get("remaining_years", 0),
+            "remaining_years_reason": item.get("remaining_years_reason", ""),
+        }
+        # 1. 공유 레코드를 가리키던 세션은 세션별 행으로 풀어 쓴다
+        if item.get("analysis_ref"):
+            content = AnalysisRecordStore(dynamodb.Table(ANALYSIS_RECORDS_TABLE_NAME)).get(item["analysis_ref"]) or {}
+            _save_skill_risks(session_id, content.get("skill_risks", []))
+            _save_career_cards(session_id, content.get("career_cards", []))
+            summary = {key: content.get(key, value) for key, value in summary.items()}
+
+        # 2. 제거된 스킬 행 삭제
+        skill_table = dynamodb.Table(SKILL_GRAPH_TABLE_NAME)
+        rows = skill_table.query(KeyConditionExpression=Key("session_id").eq(session_id))["Items"]
+        with skill_table.batch_writer() as batch:
+            for row in rows:
+                if normalize_skill(row["skill_name"]) in removed:
+                    batch.delete_item(Key={"session_id": session_id, "skill_name": row["skill_name"]})
+        existing = {normalize_skill(row["skill_name"]) for row in rows} - removed
+
+        # 3. 추가된 스킬만 분석 (중대한 변경이면 전체 입력으로 카드와 D-Day까지 다시 생성)
+        if added or material:
+            template_cards = _template_cards(job_title, strengths)
+            prompt = _build_prompt(
+                item.get("name", ""), job_title, item.get("age_group", ""),
+                strengths if material else ", ".join(added), item.get("hobbies", ""),
+                template_cards=template_cards,
+                prompt_version=variant.prompt_version,
+            )
+            agent_result = _generate(
+                prompt, variant, job_title, strengths, token_budget=_token_allowance(session_id)
+            )
+            _record_usage(session_id, agent_result.usage)
+            result = _read_analysis(agent_result.completion, agent_result.structured)
+            _save_skill_risks(session_id, [
+                risk for risk in result.get("skill_risks", [])
+                if normalize_skill(risk["skill_name"]) not in existing
+            ])
+            if material:
+                _save_career_cards(session_id, personalize_cards(template_cards, result.get("career_cards", [])))
+                summary = {key: result.get(key, value) for key, value in summary.items()}
+
+        # 4. 요청 version이 현재 version일 때만 완료 처리 (오래된 재시도가 새 결과를 덮어쓰지 않게)
+        survey_table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression=(
+                "SET #s = :s, remaining_years = :d, remaining_years_reason = :r REMOVE pending_amend, analysis_ref"
+            ),
+            ConditionExpression="version = :v",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={
+                ":s": "completed",
+                ":d": _convert_to_decimal(summary["remaining_years"]),
+                ":r": summary["remaining_years_reason"],
+                ":v": amend_version,
+            },
+        )
+        _notify_status(session_id, "completed")
+        logger.info("부분 재분석 완료: session_id=%s, version=%d", session_id, amend_version)
+
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            logger.exception("부분 재분석 중 오류: session_id=%s", session_id)
+            _update_survey_status(session_id, "error")
+            _notify_status(session_id, "error")
+            return
+        logger.warning("더 새로운 수정이 있어 결과 반영 생략: session_id=%s, version=%d", session_id, amend_version)
+
+    except CircuitOpenError:
+        _update_survey_status(session_id, "error", error_code="bedrock_unavailable")
+        _notify_status(session_id, "error")
+
+    except TokenBudgetExceeded as e:
+        # 수정 전 결과가 이미 있으므로 세션을 failed로 만들지 않고 그 결과로 되돌린다
+        _record_usage(session_id, e.usage)
+        try:
+            survey_table.update_item(
+                Key={"session_id": session_id},
+                UpdateExpression="SET #s = :s, error_code = :e REMOVE pending_amend",
+                ConditionExpression="version = :v",
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={":s": "completed", ":e": "token_budget_exceeded", ":v": amend_version},
+            )
+        except ClientError as ce:
+            if ce.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            return
+        _notify_status(session_id, "completed")
+
+    except Exception:
+        logger.exception("부분 재분석 중 오류: session_id=%s", session_id)
+        _update_survey_status(session_id, "error")
+        _notify_status(session_id, "error")
+
+
+def handler(event: dict, context) -> Optional[dict]:
     """analyze_handler 메인 진입점.
 
     survey_handler에서 비동기(Event)로 호출된다.
     Bedrock Agent를 통해 분석을 수행하고 결과를 DynamoDB에 저장한다.
+    SQS 이벤트(Records)로 호출되면 묶음 생성 모드로 처리한다 (_handle_queue_batch).
 
     Args:
         event: survey_handler가 전달한 설문 데이터
             {session_id, name, job_title, strengths, hobbies}
+            같은 세션/입력으로 다시 호출되면 체크포인트에서 재개한다.
+            survey_draft_handler가 보낸 사전 분석 이벤트에는 speculative(retrieval/generation)가 있다.
+            같은 프로필이 이미 분석 중이면 follower로 등록만 하고 끝난다 (리더가 결과를 인계).
+            POST /survey/amend가 보낸 이벤트에는 amend_version이 있다 (부분 재분석).
         context: Lambda 컨텍스트 (사용하지 않음)
     """
+    if "Records" in event:
+        return _handle_queue_batch(event["Records"])
+    if event.get("amend_version"):
+        return _amend(event.get("session_id", ""), int(event["amend_version"]))
+
     session_id = event.get("session_id", "")
     name = event.get("name", "")
     job_title = event.get("job_title", "")
@@ -167,61 +1256,154 @@ def handler(event: dict, context) -> None:
     strengths = event.get("strengths", "")
     hobbies = event.get("hobbies", "")
 
+    speculative_stage = event.get("speculative", "")
+    if speculative_stage:
+        if not _speculate(session_id, name, job_title, age_group, strengths, speculative_stage):
+            return
+        logger.info("최종 제출이 연결된 사전 분석에서 이어서 분석: session_id=%s", session_id)
+
     start_time = time.time()
-    logger.info("분석 시작: session_id=%s, job_title=%s", session_id, job_title)
+    variant = assign_variant(EXPERIMENT_ID, session_id, experiment_variants)
+    run_metrics: Optional[RunMetrics] = None
+    logger.info("분석 시작: session_id=%s, job_title=%s, variant=%s", session_id, job_title, variant.variant_id)
+
+    # 같은 프로필의 분석이 진행 중이면 follower로 등록하고 끝낸다 (리더가 결과를 저장해 준다)
+    current_flight = flight_key(variant.variant_id, job_title, age_group, strengths)
+    flight_role = _join_flight(current_flight, session_id)
+    if flight_role == ROLE_FOLLOWER:
+        logger.info("진행 중인 같은 프로필 분석에 합류: session_id=%s", session_id)
+        return
 
+    # 스트리밍 저장을 썼으면 마지막 시도에서 저장한 원소 (사용하지 않았으면 빈 dict)
+    streamed: Dict[str, List[Any]] = {}
     try:
-        # 1. 프롬프트 생성
+        # 0. 체크포인트 조회 (재시도/재구동 시 완료된 단계 건너뛰기)
+        checkpoint_store = _get_checkpoint_store()
+        input_hash = analysis_input_hash(name, job_title, age_group, strengths)
+        retrieval_hash = retrieval_input_hash(job_title, strengths)
+        checkpoints: Dict[str, Any] = {}
+        if checkpoint_store:
+            checkpoints = checkpoint_store.load(session_id, input_hash, {STAGE_RETRIEVAL: retrieval_hash})
+            if checkpoints:
+                logger.info("체크포인트에서 재개: session_id=%s, completed=%s", session_id, sorted(checkpoints))
+
+        # 사전 분석 캐시 결과는 세션별 행 대신 공유 레코드 포인터로 저장한다
+        cached_response = None
+        if STAGE_GENERATION not in checkpoints:
+            cached_response = _cached_analysis(job_title, strengths, age_group, variant.prompt_version)
+        shared = cached_response is not None and bool(ANALYSIS_RECORDS_TABLE_NAME)
+
+        # 1. 템플릿 카드 선택 + 프롬프트 생성 (압축을 켜면 검색을 먼저 해 압축한 결과만 붙인다)
         prompt_start = time.time()
-        prompt = _build_prompt(name, job_title, age_group, strengths, hobbies)
+        template_cards = _template_cards(job_title, strengths)
+        references = checkpoints.get(STAGE_RETRIEVAL)
+        if (CONTEXT_TOKEN_BUDGET and KNOWLEDGE_BASE_ID and references is None
+                and STAGE_GENERATION not in checkpoints and cached_response is None):
+            references = _prefetch_references(session_id, job_title, strengths, checkpoint_store, retrieval_hash)
+            if references:
+                checkpoints[STAGE_RETRIEVAL] = references
+        # 결과를 flight follower와 나누므로 이름 없는 프롬프트로 생성한다 (분석 캐시/묶음 생성과 같음)
+        prompt = _build_prompt(
+            "", job_title, age_group, strengths, hobbies,
+            references=references,
+            template_cards=template_cards,
+            prompt_version=variant.prompt_version,
+        )
         prompt_duration = time.time() - prompt_start
         logger.info("[TIMING] 프롬프트 생성: session_id=%s, duration=%.3fs", session_id, prompt_duration)
 
-        # 2. Bedrock Agent 호출
+        # 템플릿 카드를 생성 전에 먼저 저장해 분석 중에도 보여준다 (reason은 생성 후 개인화)
+        if STAGE_GENERATION not in checkpoints and STAGE_CAREER_CARDS not in checkpoints and not shared:
+            try:
+                _save_career_cards(session_id, template_cards)
+            except Exception:
+                logger.exception("템플릿 카드 선저장 실패 (생성 후 다시 저장): session_id=%s", session_id)
+
+        # 2. Bedrock Agent 호출 (generation 체크포인트나 사전 분석 캐시가 있으면 생략)
+        #    스트리밍 저장이 켜져 있으면 완성된 원소를 생성 도중에 저장한다
         agent_start = time.time()
-        raw_response = _invoke_bedrock_agent(prompt)
+        structured: Optional[Dict[str, Any]] = None
+        if STAGE_GENERATION in checkpoints:
+            raw_response = checkpoints[STAGE_GENERATION]
+            logger.info("generation 체크포인트 재사용: session_id=%s", session_id)
+        elif cached_response is not None:
+            raw_response = cached_response
+            logger.info("사전 분석 캐시 재사용: session_id=%s", session_id)
+        else:
+            stream_keys = [
+                key for key, stage in (("skill_risks", STAGE_SKILL_RISKS), ("career_cards", STAGE_CAREER_CARDS))
+                if stage not in checkpoints
+            ]
+            # 도구 호출 강제 모드는 완성된 도구 입력을 한 번에 받으므로 스트리밍 저장을 쓰지 않는다
+            if STREAMING_PERSIST and stream_keys and not _structured_mode(variant):
+                agent_result, streamed = _invoke_with_streaming_persist(
+                    session_id, prompt, variant.agent_alias_id, template_cards, stream_keys,
+                    token_budget=_token_allowance(session_id), skill_count=len(split_skills(strengths)),
+                )
+            else:
+                agent_result = _generate(
+                    prompt, variant, job_title, strengths, has_references=STAGE_RETRIEVAL in checkpoints,
+                    token_budget=_token_allowance(session_id),
+                )
+            raw_response = agent_result.completion
+            structured = agent_result.structured
+            _record_usage(session_id, agent_result.usage)
+            run_metrics = _run_metrics(time.time() - agent_start, agent_result)
+            if checkpoint_store and agent_result.retrieved_references and STAGE_RETRIEVAL not in checkpoints:
+                checkpoint_store.save(session_id, STAGE_RETRIEVAL, retrieval_hash, agent_result.retrieved_references)
         agent_duration = time.time() - agent_start
         logger.info("[TIMING] Bedrock Agent 호출 완료: session_id=%s, duration=%.3fs, response_length=%d", 
                     session_id, agent_duration, len(raw_response))
 
-        # 3. 응답 파싱
+        # 3. 응답 파싱 (도구 입력이면 그대로 사용, 파싱 가능한 출력만 generation 체크포인트로 저장)
         parse_start = time.time()
-        result = _parse_agent_response(raw_response)
+        result = _read_analysis(raw_response, structured)
+        if checkpoint_store and STAGE_GENERATION not in checkpoints:
+            checkpoint_store.save(session_id, STAGE_GENERATION, input_hash, raw_response)
         parse_duration = time.time() - parse_start
+        if run_metrics:
+            _record_experiment(session_id, variant, run_metrics)
         logger.info("[TIMING] 응답 파싱 완료: session_id=%s, duration=%.3fs", session_id, parse_duration)
 
-        # 4. 스킬 위험도 저장
+        # 4. 스킬 위험도 저장 (스트리밍 중 모두 저장됐거나 공유 레코드로 저장하면 생략)
         skill_save_start = time.time()
         skill_risks = result.get("skill_risks", [])
-        _save_skill_risks(session_id, skill_risks)
+        if STAGE_SKILL_RISKS not in checkpoints and not shared:
+            if streamed.get("skill_risks") != skill_risks:
+                _save_skill_risks(session_id, skill_risks)
+            if streamed:
+                _prune_skill_risks(session_id, skill_risks)
+            if checkpoint_store:
+                checkpoint_store.save(session_id, STAGE_SKILL_RISKS, input_hash, {"count": len(skill_risks)})
         skill_save_duration = time.time() - skill_save_start
         logger.info("[TIMING] 스킬 위험도 저장: session_id=%s, duration=%.3fs, count=%d", 
                     session_id, skill_save_duration, len(skill_risks))
 
-        # 5. 커리어 카드 저장
+        # 5. 커리어 카드 저장 (템플릿 카드에 생성된 reason만 반영, 스트리밍 중 모두 저장됐거나 공유 레코드로 저장하면 생략)
         card_save_start = time.time()
-        career_cards = result.get("career_cards", [])
-        _save_career_cards(session_id, career_cards)
+        career_cards = personalize_cards(template_cards, result.get("career_cards", []))
+        if STAGE_CAREER_CARDS not in checkpoints and not shared:
+            if streamed.get("career_cards") != result.get("career_cards", []):
+                _save_career_cards(session_id, career_cards)
+            if checkpoint_store:
+                checkpoint_store.save(session_id, STAGE_CAREER_CARDS, input_hash, {"count": len(career_cards)})
         card_save_duration = time.time() - card_save_start
         logger.info("[TIMING] 커리어 카드 저장: session_id=%s, duration=%.3fs, count=%d", 
                     session_id, card_save_duration, len(career_cards))
 
         # 6. D-Day 값과 근거를 survey 테이블에 저장하고 status를 completed로 업데이트
         survey_update_start = time.time()
-        table = dynamodb.Table(SURVEY_TABLE_NAME)
-        table.update_item(
-            Key={"session_id": session_id},
-            UpdateExpression="SET #s = :s, remaining_years = :d, remaining_years_reason = :r",
-            ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={
-                ":s": "completed",
-                ":d": _convert_to_decimal(result.get("remaining_years", 0)),
-                ":r": result.get("remaining_years_reason", ""),
-            },
-        )
+        _mark_completed(session_id, result, _store_shared_record(result, career_cards) if shared else "")
         survey_update_duration = time.time() - survey_update_start
         logger.info("[TIMING] Survey 업데이트: session_id=%s, duration=%.3fs", session_id, survey_update_duration)
 
+        # 7. WebSocket 구독자에게 완료 푸시
+        _notify_status(session_id, "completed")
+
+        # 8. 같은 프로필을 기다리던 follower 세션에 결과 인계
+        if flight_role == ROLE_LEADER:
+            _fan_out_result(current_flight, session_id, result, career_cards)
+
         # 전체 소요 시간
         total_duration = time.time() - start_time
         logger.info("[TIMING] 전체 분석 완료: session_id=%s, total_duration=%.3fs", session_id, total_duration)
@@ -230,10 +1412,52 @@ def handler(event: dict, context) -> None:
                     (parse_duration/total_duration)*100,
                     ((skill_save_duration + card_save_duration + survey_update_duration)/total_duration)*100)
 
-    except json.JSONDecodeError:
+    except CircuitOpenError as e:
+        # 회로가 열려 있으면 Bedrock 왕복 없이 즉시 실패 처리 (스위퍼가 백오프 후 재시도)
+        logger.warning("Bedrock 회로 open으로 즉시 실패: session_id=%s, retry_after=%.0fs",
+                       session_id, e.retry_after)
+        _update_survey_status(session_id, "error", error_code="bedrock_unavailable")
+        _notify_status(session_id, "error")
+        if flight_role == ROLE_LEADER:
+            _fan_out_failure(current_flight, session_id, "error", "bedrock_unavailable")
+
+    except TokenBudgetExceeded as e:
+        # 재시도해도 같은 비용이 드므로 스위퍼가 다시 넣지 않도록 바로 terminal 처리
+        logger.error("토큰 예산 초과로 분석 중단: session_id=%s, used=%d, prior=%d, limit=%d, model_invocations=%d",
+                     session_id, e.usage.total_tokens, e.prior_tokens, e.budget, e.usage.model_invocations)
+        _record_usage(session_id, e.usage)
+        _update_survey_status(session_id, "failed", error_code="token_budget_exceeded")
+        _notify_status(session_id, "failed")
+        if flight_role == ROLE_LEADER:
+            _fan_out_failure(current_flight, session_id, "failed", "token_budget_exceeded")
+
+    except ReturnControlExhausted as e:
+        # 답변 요청 뒤에도 함수 호출만 반복했으므로 재시도해도 같은 결과 → terminal 처리
+        logger.error("returnControl 상한 초과로 분석 중단: session_id=%s, rounds=%d", session_id, e.rounds)
+        _update_survey_status(session_id, "failed", error_code="return_control_exhausted")
+        _notify_status(session_id, "failed")
+        if flight_role == ROLE_LEADER:
+            _fan_out_failure(current_flight, session_id, "failed", "return_control_exhausted")
+
+    except (json.JSONDecodeError, StructuredOutputError):
         logger.exception("Bedrock Agent 응답 파싱 실패: session_id=%s", session_id)
+        if streamed:
+            # 파싱되지 않은 응답에서 스트리밍 중 저장한 행은 결과가 아니다 (실패하면 재시도의 최종 저장이 정리)
+            try:
+                _prune_skill_risks(session_id, [])
+            except Exception:
+                logger.exception("스트리밍 저장 행 정리 실패: session_id=%s", session_id)
+        if run_metrics:
+            run_metrics.parse_failed = True
+            _record_experiment(session_id, variant, run_metrics)
         _update_survey_status(session_id, "error")
+        _notify_status(session_id, "error")
+        if flight_role == ROLE_LEADER:
+            _fan_out_failure(current_flight, session_id, "error")
 
     except Exception:
         logger.exception("분석 중 예기치 않은 오류: session_id=%s", session_id)
         _update_survey_status(session_id, "error")
+        _notify_status(session_id, "error")
+        if flight_role == ROLE_LEADER:
+            _fan_out_failure(current_flight, session_id, "error")
@@ -0,0 +1,57 @@
+"""방명록 유사 프로필 인덱스 점진 갱신 Lambda 핸들러 (guestbook 테이블 DynamoDB 스트림).
+
+새 방명록 항목(INSERT)을 임베딩해 S3의 IVF 인덱스에 붙이고 다시 올린다.
+항목 수가 마지막 학습의 2배가 되면 중심을 다시 학습한다.
+업로드는 읽을 때의 ETag 조건부라 동시 쓰기가 있으면 실패하고, 스트림 재시도가 다시 읽어 붙인다
+(이미 색인된 키는 건너뛰므로 재시도해도 중복되지 않는다).
+"""
+
+import os
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+from services.guestbook_index import DEFAULT_INDEX_KEY, embed_entry, entry_key, load_index, save_index
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+s3 = boto3.client("s3")
+
+GUESTBOOK_INDEX_BUCKET = os.environ.get("GUESTBOOK_INDEX_BUCKET", "")
+GUESTBOOK_INDEX_KEY = os.environ.get("GUESTBOOK_INDEX_KEY", DEFAULT_INDEX_KEY)
+
+_deserializer = TypeDeserializer()
+
+
+def handler(event: dict, context) -> dict:
+    """스트림 레코드 묶음을 인덱스에 반영한다."""
+    items = [
+        {k: _deserializer.deserialize(v) for k, v in record["dynamodb"]["NewImage"].items()}
+        for record in event.get("Records", [])
+        if record.get("eventName") == "INSERT" and "NewImage" in record.get("dynamodb", {})
+    ]
+    if not items:
+        return {"indexed": 0}
+
+    index, etag = load_index(s3, GUESTBOOK_INDEX_BUCKET, GUESTBOOK_INDEX_KEY)
+    existing = set(index.keys())
+    added = 0
+    for item in items:
+        key = entry_key(item)
+        vec = embed_entry(item)
+        if key in existing or not vec:
+            continue
+        index.add(key, vec)
+        existing.add(key)
+        added += 1
+    if not added:
+        return {"indexed": 0}
+
+    rebuilt = index.needs_rebuild()
+    if rebuilt:
+        index = index.rebuilt()
+    size = save_index(s3, GUESTBOOK_INDEX_BUCKET, GUESTBOOK_INDEX_KEY, index, etag)
+    logger.info("방명록 인덱스 갱신: added=%d, total=%d, nlist=%d, rebuilt=%s, bytes=%d",
+                added, len(index), index.nlist, rebuilt, size)
+    return {"indexed": added}
@@ -0,0 +1,87 @@
+"""GET /guestbook/similar Lambda 핸들러.
+
+직업/스킬이 비슷한 사람의 방명록 항목을 돌려준다. 테이블을 훑지 않고
+S3의 IVF 인덱스(services.guestbook_index)를 /tmp에 받아 mmap으로 열어 검색한 뒤
+상위 항목만 BatchGetItem으로 읽는다. 인덱스는 INDEX_REFRESH_SECONDS마다 ETag를 확인해
+바뀌었을 때만 다시 받는다.
+
+쿼리 파라미터: job_title(필수), skills(쉼표 구분), limit, session_id(본인 항목 제외)
+"""
+
+import os
+import time
+from typing import Optional
+
+import boto3
+
+from services.guestbook_index import DEFAULT_INDEX_KEY, parse_key
+from services.ivf_index import MmapIVFIndex, S3IndexLoader
+from services.profile_embedding import DEFAULT_DIM, embed_profile
+from utils.logging import get_logger
+from utils.response import response
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+s3 = boto3.client("s3")
+
+GUESTBOOK_TABLE_NAME = os.environ.get("GUESTBOOK_TABLE_NAME", "")
+GUESTBOOK_INDEX_BUCKET = os.environ.get("GUESTBOOK_INDEX_BUCKET", "")
+GUESTBOOK_INDEX_KEY = os.environ.get("GUESTBOOK_INDEX_KEY", DEFAULT_INDEX_KEY)
+INDEX_REFRESH_SECONDS = int(os.environ.get("INDEX_REFRESH_SECONDS", "60"))
+SIMILAR_NPROBE = int(os.environ.get("SIMILAR_NPROBE", "8"))
+INDEX_DIR = os.environ.get("INDEX_DIR", "/tmp")
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_loader: Optional[S3IndexLoader] = None
+
+
+def _get_index() -> Optional[MmapIVFIndex]:
+    """현재 인덱스 (컨테이너당 로더 하나, ETag가 같으면 기존 매핑 재사용)."""
+    global _loader
+    if _loader is None:
+        _loader = S3IndexLoader(s3, GUESTBOOK_INDEX_BUCKET, GUESTBOOK_INDEX_KEY, INDEX_DIR, INDEX_REFRESH_SECONDS)
+    return _loader.get()
+
+
+def handler(event: dict, context) -> dict:
+    """GET /guestbook/similar 요청을 처리한다."""
+    params = event.get("queryStringParameters") or {}
+    job_title = (params.get("job_title") or "").strip()
+    if not job_title:
+        return response(400, {"error": "Invalid request", "details": ["필수 항목 누락 또는 빈 값: job_title"]})
+    try:
+        limit = max(1, min(int(params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT))
+    except (ValueError, TypeError):
+        limit = DEFAULT_LIMIT
+    session_id = params.get("session_id") or ""
+
+    index = _get_index()
+    if index is None:
+        return response(200, {"items": []})
+
+    started = time.perf_counter()
+    # 본인 항목이 섞일 수 있으므로 하나 더 찾는다
+    hits = index.search(embed_profile(job_title, params.get("skills") or "", DEFAULT_DIM), limit + 1, SIMILAR_NPROBE)
+    search_ms = (time.perf_counter() - started) * 1000
+    if not hits:
+        return response(200, {"items": []})
+
+    keys = [parse_key(key) for _, key in hits]
+    try:
+        resp = dynamodb.batch_get_item(RequestItems={GUESTBOOK_TABLE_NAME: {"Keys": keys}})
+    except Exception:
+        logger.exception("방명록 항목 조회 실패")
+        return response(500, {"error": "Internal server error"})
+    found = {item["entry_id"]: item for item in resp.get("Responses", {}).get(GUESTBOOK_TABLE_NAME, [])}
+
+    items = []
+    for (score, _), key in zip(hits, keys):
+        item = found.get(key["entry_id"])
+        if item is None or (session_id and item.get("session_id") == session_id):
+            continue
+        items.append({**item, "similarity": round(score, 3)})
+    logger.info("유사 방명록 검색: candidates=%d, returned=%d, search_ms=%.1f", len(hits), len(items[:limit]), search_ms)
+    return response(200, {"items": items[:limit]})
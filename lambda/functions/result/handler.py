@@ -1,14 +1,20 @@
 """GET /result/{sid} Lambda 핸들러.
 
 세션 ID 기반으로 분석 결과(스킬 위험도 + 커리어 카드)를 조회한다.
+공유 분석 레코드를 가리키는 세션(analysis_ref)은 레코드를 읽으며, 레코드는 불변이므로
+자주 조회되는 레코드를 컨테이너 메모리에 LRU로 캐시한다.
 
 Requirements: 7.1, 7.2, 7.3
 """
 
 import os
+from functools import lru_cache
 
 import boto3
+from botocore.config import Config
 
+from services.analysis_records import AnalysisRecordStore
+from services.translation import BedrockTranslator, TranslationCache, localize_result, negotiate_language
 from utils.logging import get_logger
 from utils.response import response
 
@@ -19,6 +25,18 @@ dynamodb = boto3.resource("dynamodb")
 SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
 SKILL_GRAPH_TABLE_NAME = os.environ.get("SKILL_GRAPH_TABLE_NAME", "")
 CAREER_CARDS_TABLE_NAME = os.environ.get("CAREER_CARDS_TABLE_NAME", "")
+TRANSLATION_CACHE_TABLE_NAME = os.environ.get("TRANSLATION_CACHE_TABLE_NAME", "")
+ANALYSIS_RECORDS_TABLE_NAME = os.environ.get("ANALYSIS_RECORDS_TABLE_NAME", "")
+# 컨테이너당 메모리에 둘 공유 분석 레코드 수 (레코드당 수 KB)
+RECORD_CACHE_SIZE = int(os.environ.get("RECORD_CACHE_SIZE", "256"))
+# 정규 언어(영어) 이외 응답용 번역 모델. 비어 있으면 항상 정규 언어로 응답
+TRANSLATION_MODEL_ID = os.environ.get("TRANSLATION_MODEL_ID", "")
+
+# 번역은 API Gateway 타임아웃(29초) 안에 끝나야 하므로 짧게 설정
+bedrock_runtime = boto3.client(
+    "bedrock-runtime",
+    config=Config(read_timeout=15, connect_timeout=5, retries={"max_attempts": 1}),
+)
 
 
 def handler(event: dict, context) -> dict:
@@ -27,6 +45,7 @@ def handler(event: dict, context) -> dict:
     1. 경로 파라미터에서 session_id 추출
     2. survey 테이블에서 status 확인
     3. status에 따라 적절한 응답 반환
+       (completed면 Accept-Language에 맞춰 텍스트 필드를 현지화)
     """
     # 경로 파라미터에서 session_id 추출
     path_params = event.get("pathParameters") or {}
@@ -48,46 +67,98 @@ def handler(event: dict, context) -> dict:
 
     survey_item = survey_resp.get("Item")
 
-    # 세션 미발견 시 404 반환
-    if not survey_item:
+    # 세션 미발견 시 404 반환 (설문 초안만 있는 세션도 아직 제출 전이므로 동일)
+    if not survey_item or survey_item.get("status") == "draft":
         logger.info("세션 미발견: session_id=%s", session_id)
         return response(404, {"error": "Session not found"})
 
     status = survey_item.get("status", "")
 
-    # 분석 진행 중이면 202 반환
+    # 분석 진행 중이면 202 반환 (템플릿 커리어 카드가 먼저 저장되어 있으면 미리보기로 포함)
     if status == "analyzing":
         logger.info("분석 진행 중: session_id=%s", session_id)
-        return response(202, {"status": "analyzing"})
-
-    # 에러 상태면 500 반환
+        body = {"status": "analyzing"}
+        try:
+            preview_cards = _query_career_cards(session_id)
+        except Exception:
+            logger.exception("커리어 카드 미리보기 조회 실패: session_id=%s", session_id)
+            preview_cards = []
+        if preview_cards:
+            # 템플릿 문구는 세션 간에 공유되므로 번역 캐시 적중률이 높다
+            body, language = _localize({**body, "career_cards": preview_cards}, _accept_language(event))
+            body["language"] = language
+        return response(202, body)
+
+    # 에러 상태면 500 반환 (세션 스위퍼가 백오프 후 재시도할 수 있음)
     if status == "error":
         logger.info("분석 에러 상태: session_id=%s", session_id)
         return response(500, {"error": "Analysis failed"})
 
-    # 분석 완료 시 skill_graph + career_cards 조회
+    # 분석 완료 시 공유 레코드 또는 skill_graph + career_cards 조회
     if status == "completed":
         try:
-            skill_risks = _query_skill_risks(session_id)
-            career_cards = _query_career_cards(session_id)
+            if survey_item.get("analysis_ref"):
+                content = _load_shared_record(survey_item["analysis_ref"])
+            else:
+                content = {
+                    "remaining_years": survey_item.get("remaining_years", 0),
+                    "remaining_years_reason": survey_item.get("remaining_years_reason", ""),
+                    "skill_risks": _query_skill_risks(session_id),
+                    "career_cards": _query_career_cards(session_id),
+                }
         except Exception:
             logger.exception("결과 데이터 조회 실패: session_id=%s", session_id)
             return response(500, {"error": "Internal server error"})
 
-        return response(200, {
+        # 캐시된 레코드를 그대로 넘기므로 현지화는 사본에만 적용된다 (localize_result가 복사)
+        result, language = _localize({
             "session_id": session_id,
             "status": "completed",
-            "remaining_years": survey_item.get("remaining_years", 0),
-            "remaining_years_reason": survey_item.get("remaining_years_reason", ""),
-            "skill_risks": skill_risks,
-            "career_cards": career_cards,
-        })
+            # 수정(POST /survey/amend)마다 늘어나는 세션 version: 클라이언트가 최신 결과인지 확인한다
+            "version": int(survey_item.get("version", 0)),
+            **content,
+        }, _accept_language(event))
+        result["language"] = language
+        return response(200, result, {"Content-Language": language, "Vary": "Accept-Language"})
+
+    # 재시도를 모두 소진한 terminal 실패면 410 반환 (클라이언트는 폴링 중단)
+    if status == "failed":
+        logger.info("분석 최종 실패: session_id=%s", session_id)
+        return response(410, {"error": "Analysis failed", "status": "failed"})
 
     # 알 수 없는 status
     logger.warning("알 수 없는 status: session_id=%s, status=%s", session_id, status)
     return response(500, {"error": "Internal server error"})
 
 
+def _accept_language(event: dict) -> str:
+    """요청 헤더에서 Accept-Language 값을 꺼낸다 (헤더 이름 대소문자 무시)."""
+    headers = event.get("headers") or {}
+    for key, value in headers.items():
+        if key.lower() == "accept-language":
+            return value or ""
+    return ""
+
+
+def _localize(result: dict, accept_language: str) -> tuple:
+    """정규 언어 결과를 요청 언어로 현지화한다. 번역 설정이 없으면 원문 그대로."""
+    language = negotiate_language(accept_language)
+    if not TRANSLATION_MODEL_ID:
+        return localize_result(result, language, None, None)
+    cache = TranslationCache(dynamodb.Table(TRANSLATION_CACHE_TABLE_NAME)) if TRANSLATION_CACHE_TABLE_NAME else None
+    translator = BedrockTranslator(bedrock_runtime, TRANSLATION_MODEL_ID)
+    return localize_result(result, language, cache, translator.translate)
+
+
+@lru_cache(maxsize=RECORD_CACHE_SIZE)
+def _load_shared_record(record_id: str) -> dict:
+    """공유 분석 레코드를 조회한다 (불변이므로 무효화 없이 캐시, 없으면 예외라 캐시되지 않음)."""
+    content = AnalysisRecordStore(dynamodb.Table(ANALYSIS_RECORDS_TABLE_NAME)).get(record_id)
+    if content is None:
+        raise KeyError(f"공유 분석 레코드 없음: {record_id}")
+    return content
+
+
 def _query_skill_risks(session_id: str) -> list:
     """skill_graph 테이블에서 세션의 스킬 위험도 데이터를 조회한다."""
     table = dynamodb.Table(SKILL_GRAPH_TABLE_NAME)
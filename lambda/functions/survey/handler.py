@@ -1,7 +1,8 @@
 """POST /survey Lambda 핸들러.
 
 설문 데이터를 검증하고 DynamoDB에 저장한 뒤,
-analyze_handler를 비동기로 호출한다.
+analyze_handler를 비동기로 호출한다 (ANALYSIS_QUEUE_URL이 있으면 묶음 생성 큐에 넣는다).
+같은 입력으로 진행 중인 사전 분석(POST /survey/draft)이 있으면 새로 호출하지 않고 연결한다.
 
 Requirements: 3.1, 10.4
 """
@@ -13,6 +14,7 @@ from datetime import datetime, timezone
 import boto3
 
 from models.schemas import SurveyRequest
+from services.speculation import analysis_input_hash, try_attach
 from services.validation import SurveyValidationError, validate_survey
 from utils.logging import get_logger
 from utils.response import response
@@ -21,17 +23,33 @@ logger = get_logger(__name__)
 
 dynamodb = boto3.resource("dynamodb")
 lambda_client = boto3.client("lambda")
+sqs_client = boto3.client("sqs")
 
 SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
 ANALYZE_FUNCTION_NAME = os.environ.get("ANALYZE_FUNCTION_NAME", "")
+# 버스트 대비 묶음 생성 모드: 설정되면 analyze 함수의 SQS 이벤트 소스로 전달한다
+ANALYSIS_QUEUE_URL = os.environ.get("ANALYSIS_QUEUE_URL", "")
+
+
+def _start_analysis(payload: dict) -> None:
+    """분석을 시작한다: 큐가 설정되어 있으면 메시지로, 아니면 analyze_handler 비동기 호출로."""
+    if ANALYSIS_QUEUE_URL:
+        sqs_client.send_message(QueueUrl=ANALYSIS_QUEUE_URL, MessageBody=json.dumps(payload))
+        return
+    lambda_client.invoke(
+        FunctionName=ANALYZE_FUNCTION_NAME,
+        InvocationType="Event",  # 비동기 호출
+        Payload=json.dumps(payload),
+    )
 
 
 def handler(event: dict, context) -> dict:
     """POST /survey 요청을 처리한다.
 
     1. 요청 본문을 파싱하고 Pydantic으로 유효성 검증
-    2. DynamoDB survey 테이블에 status='analyzing'으로 저장
-    3. analyze_handler Lambda를 비동기(Event) 호출
+    2. 같은 입력의 사전 분석이 진행 중이면 연결하고 종료
+    3. DynamoDB survey 테이블에 status='analyzing'으로 저장 (다른 입력의 사전 분석은 취소됨)
+    4. analyze_handler Lambda를 비동기(Event) 호출 (또는 묶음 생성 큐에 전달)
     """
     logger.info("POST /survey 요청 수신")
 
@@ -65,6 +83,15 @@ def handler(event: dict, context) -> dict:
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
+    # 진행 중인 사전 분석에 연결 (사전 분석이 끝나면 나머지 단계를 이어서 수행)
+    input_hash = analysis_input_hash(survey.name, survey.job_title, survey.age_group, survey.strengths)
+    try:
+        if try_attach(table, item, input_hash):
+            logger.info("진행 중인 사전 분석에 연결: session_id=%s", survey.session_id)
+            return response(200, {"session_id": survey.session_id, "status": "analyzing"})
+    except Exception:
+        logger.exception("사전 분석 연결 실패, 새로 분석을 시작: session_id=%s", survey.session_id)
+
     try:
         table.put_item(Item=item)
         logger.info("설문 저장 완료: session_id=%s", survey.session_id)
@@ -74,18 +101,14 @@ def handler(event: dict, context) -> dict:
 
     # analyze_handler 비동기 호출
     try:
-        lambda_client.invoke(
-            FunctionName=ANALYZE_FUNCTION_NAME,
-            InvocationType="Event",  # 비동기 호출
-            Payload=json.dumps({
-                "session_id": survey.session_id,
-                "name": survey.name,
-                "job_title": survey.job_title,
-                "age_group": survey.age_group,
-                "strengths": survey.strengths,
-                "hobbies": survey.hobbies,
-            }),
-        )
+        _start_analysis({
+            "session_id": survey.session_id,
+            "name": survey.name,
+            "job_title": survey.job_title,
+            "age_group": survey.age_group,
+            "strengths": survey.strengths,
+            "hobbies": survey.hobbies,
+        })
         logger.info("analyze_handler 비동기 호출 완료: session_id=%s", survey.session_id)
     except Exception:
         logger.exception("analyze_handler 호출 실패: session_id=%s", survey.session_id)
@@ -0,0 +1,125 @@
+"""POST /survey/amend Lambda 핸들러.
+
+분석이 끝난 세션의 직업 또는 스킬을 수정한다. 새 설문과 전체 Agent 실행 대신
+이전 입력과 비교한 차이만 analyze_handler에 부분 재분석으로 넘긴다.
+    - 추가된 스킬만 다시 분석하고 제거된 스킬은 skill_graph에서 지운다
+    - 중대한 변경(직업 변경 또는 AMEND_MATERIAL_RATIO 이상의 스킬 변경)이면 카드와 D-Day도 다시 생성한다
+수정마다 세션 version이 1씩 늘고, 분석 중인 세션은 수정할 수 없다(409).
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import boto3
+from botocore.exceptions import ClientError
+
+from services.amendment import DEFAULT_MATERIAL_RATIO, diff_inputs, is_material, pending_amend
+from utils.logging import get_logger
+from utils.response import response
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+lambda_client = boto3.client("lambda")
+
+SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
+ANALYZE_FUNCTION_NAME = os.environ.get("ANALYZE_FUNCTION_NAME", "")
+AMEND_MATERIAL_RATIO = float(os.environ.get("AMEND_MATERIAL_RATIO", str(DEFAULT_MATERIAL_RATIO)))
+
+AMEND_FIELDS = ("job_title", "strengths")
+
+
+def handler(event: dict, context) -> dict:
+    """POST /survey/amend 요청을 처리한다.
+
+    본문: {session_id, job_title?, strengths?} (둘 중 하나 이상)
+    변경이 없으면 200, 재분석을 시작하면 202와 새 version을 반환한다.
+    """
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except (json.JSONDecodeError, TypeError):
+        logger.warning("잘못된 JSON 요청 본문")
+        return response(400, {"error": "Invalid request", "details": ["잘못된 JSON 형식"]})
+
+    session_id = body.get("session_id", "")
+    if not isinstance(session_id, str) or not session_id.strip():
+        return response(400, {"error": "Invalid request", "details": ["필수 항목 누락 또는 빈 값: session_id"]})
+    updates = {f: str(body[f]).strip() for f in AMEND_FIELDS if body.get(f) is not None}
+    if not updates or not all(updates.values()):
+        return response(400, {"error": "Invalid request", "details": ["job_title 또는 strengths가 필요합니다"]})
+
+    table = dynamodb.Table(SURVEY_TABLE_NAME)
+    try:
+        item = table.get_item(Key={"session_id": session_id}, ConsistentRead=True).get("Item")
+    except Exception:
+        logger.exception("survey 테이블 조회 실패: session_id=%s", session_id)
+        return response(500, {"error": "Internal server error"})
+    if not item or item.get("status") == "draft":
+        return response(404, {"error": "Session not found"})
+    if item.get("status") != "completed":
+        return response(409, {"error": "Analysis in progress", "status": item.get("status", "")})
+
+    job_title = updates.get("job_title", item.get("job_title", ""))
+    strengths = updates.get("strengths", item.get("strengths", ""))
+    diff = diff_inputs(item.get("job_title", ""), item.get("strengths", ""), job_title, strengths)
+    version = int(item.get("version", 0))
+    if not diff.changed:
+        return response(200, {"session_id": session_id, "status": "completed", "version": version})
+
+    material = is_material(diff, AMEND_MATERIAL_RATIO)
+    try:
+        table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression=(
+                "SET job_title = :j, strengths = :st, #s = :analyzing, version = :next, pending_amend = :amend, "
+                "amended_at = :now, last_attempt_at = :now, attempts = :zero REMOVE error_code"
+            ),
+            ConditionExpression="#s = :completed AND (attribute_not_exists(version) OR version = :v)",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={
+                ":j": job_title,
+                ":st": strengths,
+                ":analyzing": "analyzing",
+                ":completed": "completed",
+                ":v": version,
+                ":next": version + 1,
+                ":amend": pending_amend(version + 1, diff, material),
+                # 스위퍼가 멈춤/나이를 이번 수정부터 재고, 재시도 횟수도 새로 센다
+                ":now": datetime.now(timezone.utc).isoformat(),
+                ":zero": 0,
+            },
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return response(409, {"error": "Session changed concurrently"})
+        logger.exception("세션 수정 실패: session_id=%s", session_id)
+        return response(500, {"error": "Internal server error"})
+
+    try:
+        lambda_client.invoke(
+            FunctionName=ANALYZE_FUNCTION_NAME,
+            InvocationType="Event",
+            Payload=json.dumps({"session_id": session_id, "amend_version": version + 1}),
+        )
+    except Exception:
+        # pending_amend가 남아 있으므로 세션 스위퍼가 error 세션을 다시 넣을 때 부분 재분석으로 이어진다
+        logger.exception("부분 재분석 호출 실패: session_id=%s", session_id)
+        table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression="SET #s = :s",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={":s": "error"},
+        )
+        return response(500, {"error": "Internal server error"})
+
+    logger.info("세션 수정: session_id=%s, version=%d, added=%d, removed=%d, material=%s",
+                session_id, version + 1, len(diff.added), len(diff.removed), material)
+    return response(202, {
+        "session_id": session_id,
+        "status": "analyzing",
+        "version": version + 1,
+        "added": diff.added,
+        "removed": diff.removed,
+        "material": material,
+    })
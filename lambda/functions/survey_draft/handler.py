@@ -0,0 +1,74 @@
+"""POST /survey/draft Lambda 핸들러.
+
+사용자가 설문을 작성하는 동안 부분 설문을 받아 같은 session_id로
+사전(speculative) 분석을 시작한다.
+    - 직업과 스킬만 있으면 retrieval(Knowledge Base 검색)까지
+    - 이름·연령대까지 채워지면 generation(Agent 호출)까지
+최종 POST /survey가 같은 입력이면 진행 중인 사전 분석에 연결되어 대기 시간이 줄어든다.
+"""
+
+import json
+import os
+
+import boto3
+
+from services.speculation import DEFAULT_MAX_SPECULATIONS, SPEC_FAILED, finish_speculation, record_draft
+from utils.logging import get_logger
+from utils.response import response
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+lambda_client = boto3.client("lambda")
+
+SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
+ANALYZE_FUNCTION_NAME = os.environ.get("ANALYZE_FUNCTION_NAME", "")
+MAX_SPECULATIONS = int(os.environ.get("MAX_SPECULATIONS", str(DEFAULT_MAX_SPECULATIONS)))
+
+DRAFT_FIELDS = ("name", "job_title", "age_group", "strengths", "hobbies")
+
+
+def handler(event: dict, context) -> dict:
+    """POST /survey/draft 요청을 처리한다.
+
+    사전 분석은 최선 노력(best effort)이므로 시작하지 못해도 202를 반환한다.
+    이미 최종 제출된 세션이면 409를 반환한다.
+    """
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except (json.JSONDecodeError, TypeError):
+        logger.warning("잘못된 JSON 요청 본문")
+        return response(400, {"error": "Invalid request", "details": ["잘못된 JSON 형식"]})
+
+    session_id = body.get("session_id", "")
+    if not isinstance(session_id, str) or not session_id.strip():
+        return response(400, {"error": "Invalid request", "details": ["필수 항목 누락 또는 빈 값: session_id"]})
+
+    draft = {field: str(body.get(field) or "").strip() for field in DRAFT_FIELDS}
+
+    table = dynamodb.Table(SURVEY_TABLE_NAME)
+    try:
+        result = record_draft(table, session_id, draft, MAX_SPECULATIONS)
+    except Exception:
+        logger.exception("설문 초안 기록 실패: session_id=%s", session_id)
+        return response(500, {"error": "Internal server error"})
+
+    if not result["accepted"]:
+        return response(409, {"error": "Survey already submitted"})
+
+    stage = result["stage"]
+    if stage:
+        try:
+            lambda_client.invoke(
+                FunctionName=ANALYZE_FUNCTION_NAME,
+                InvocationType="Event",
+                Payload=json.dumps({"session_id": session_id, **draft, "speculative": stage}),
+            )
+            logger.info("사전 분석 비동기 호출: session_id=%s, stage=%s", session_id, stage)
+        except Exception:
+            # 사전 분석 실패는 최종 제출에 영향을 주지 않는다 (최종 제출이 새로 분석을 시작)
+            logger.exception("사전 분석 호출 실패: session_id=%s", session_id)
+            finish_speculation(table, session_id, result["spec_hash"], SPEC_FAILED)
+            stage = None
+
+    return response(202, {"session_id": session_id, "speculation": stage})
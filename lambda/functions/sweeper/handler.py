@@ -0,0 +1,90 @@
+"""세션 스위퍼 Lambda 핸들러 (EventBridge 스케줄 실행).
+
+analyzing 상태로 멈춘 세션과 error 세션을 지수 백오프로 analyze_handler에 다시 넣고,
+재시도를 소진한 세션은 failed(terminal)로 표시한다 (수정 세션은 이전 결과의 completed로 되돌린다).
+"""
+
+import json
+import os
+
+import boto3
+
+from services.circuit_breaker import CircuitBreaker
+from services.notifier import ConnectionRegistry, notify_session
+from services.sweeper import SweepConfig, sweep
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+lambda_client = boto3.client("lambda")
+
+SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
+ANALYZE_FUNCTION_NAME = os.environ.get("ANALYZE_FUNCTION_NAME", "")
+CONNECTIONS_TABLE_NAME = os.environ.get("CONNECTIONS_TABLE_NAME", "")
+WEBSOCKET_CALLBACK_URL = os.environ.get("WEBSOCKET_CALLBACK_URL", "")
+STATE_TABLE_NAME = os.environ.get("STATE_TABLE_NAME", "")
+# analyze_handler와 같은 값이어야 두 Lambda가 회로 open 여부를 같게 판단한다
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_COOLDOWN_SECONDS = int(os.environ.get("BREAKER_COOLDOWN_SECONDS", "60"))
+
+SWEEP_CONFIG = SweepConfig(
+    stuck_threshold_seconds=int(os.environ.get("SWEEP_STUCK_THRESHOLD_SECONDS", "300")),
+    base_backoff_seconds=int(os.environ.get("SWEEP_BASE_BACKOFF_SECONDS", "30")),
+    max_backoff_seconds=int(os.environ.get("SWEEP_MAX_BACKOFF_SECONDS", "600")),
+    max_attempts=int(os.environ.get("SWEEP_MAX_ATTEMPTS", "3")),
+    max_session_age_seconds=int(os.environ.get("SWEEP_MAX_SESSION_AGE_SECONDS", "3600")),
+)
+
+# analyze_handler의 Bedrock 회로와 같은 system_state 항목을 읽기만 한다
+bedrock_breaker = CircuitBreaker(
+    "bedrock",
+    state_table=dynamodb.Table(STATE_TABLE_NAME) if STATE_TABLE_NAME else None,
+    failure_threshold=BREAKER_FAILURE_THRESHOLD,
+    cooldown_seconds=BREAKER_COOLDOWN_SECONDS,
+)
+
+
+def _enqueue_analysis(payload: dict) -> None:
+    """analyze_handler를 비동기(Event)로 다시 호출한다."""
+    lambda_client.invoke(
+        FunctionName=ANALYZE_FUNCTION_NAME,
+        InvocationType="Event",
+        Payload=json.dumps(payload),
+    )
+
+
+def _notify_status(session_id: str, status: str) -> None:
+    """terminal 처리된 세션의 WebSocket 구독자에게 알린다 (실패는 무시)."""
+    if not CONNECTIONS_TABLE_NAME or not WEBSOCKET_CALLBACK_URL:
+        return
+    try:
+        registry = ConnectionRegistry(dynamodb.Table(CONNECTIONS_TABLE_NAME))
+        management_api = boto3.client("apigatewaymanagementapi", endpoint_url=WEBSOCKET_CALLBACK_URL)
+        notify_session(registry, management_api, session_id, {
+            "type": "analysis_status",
+            "session_id": session_id,
+            "status": status,
+        })
+    except Exception:
+        logger.exception("WebSocket 알림 실패: session_id=%s", session_id)
+
+
+def handler(event: dict, context) -> dict:
+    """스케줄 이벤트마다 스위프 1회를 수행한다.
+
+    Bedrock 회로가 열려 있으면 재시도가 즉시 실패하며 시도 횟수만 소진하므로 이번 스위프를 건너뛴다.
+    """
+    if STATE_TABLE_NAME and bedrock_breaker.is_open():
+        logger.info("Bedrock 회로 open: 스위프 건너뜀")
+        return {"scanned": 0, "retried": 0, "failed": 0, "restored": 0}
+
+    logger.info("세션 스위프 시작")
+    counts = sweep(
+        dynamodb.Table(SURVEY_TABLE_NAME),
+        enqueue=_enqueue_analysis,
+        config=SWEEP_CONFIG,
+        on_failed=lambda session_id: _notify_status(session_id, "failed"),
+        on_restored=lambda session_id: _notify_status(session_id, "completed"),
+    )
+    return counts
@@ -0,0 +1,153 @@
+"""POST /whatif Lambda 핸들러.
+
+완료된 세션에 스킬을 더하거나 빼거나 직업을 바꿨을 때의 결과를 Agent 실행 없이
+대리 모델(services.surrogate)로 즉시 추정한다. 결과는 저장하지 않는다.
+    - 유지한 스킬은 실제 분석값을, 새 스킬은 모델 예측값을 쓴다 (직업을 바꾸면 모두 예측)
+    - D-Day는 실제값에 모델 예측의 변화량(새 프로필 - 기존 프로필)만 더한다
+모델 파일은 컨테이너당 한 번 S3에서 읽어 메모리에 둔다.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from services.amendment import normalize_skill
+from services.analysis_records import AnalysisRecordStore
+from services.career_templates import split_skills
+from services.surrogate import SurrogateModel, load_model
+from utils.logging import get_logger
+from utils.response import response
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+s3 = boto3.client("s3")
+
+SURVEY_TABLE_NAME = os.environ.get("SURVEY_TABLE_NAME", "")
+SKILL_GRAPH_TABLE_NAME = os.environ.get("SKILL_GRAPH_TABLE_NAME", "")
+ANALYSIS_RECORDS_TABLE_NAME = os.environ.get("ANALYSIS_RECORDS_TABLE_NAME", "")
+SURROGATE_BUCKET = os.environ.get("SURROGATE_BUCKET", "")
+SURROGATE_KEY = os.environ.get("SURROGATE_KEY", "surrogate/model.json")
+
+# 한 요청에서 더하거나 뺄 수 있는 최대 스킬 수
+MAX_SKILL_CHANGES = 10
+
+_model: Optional[SurrogateModel] = None
+
+
+def _get_model() -> Optional[SurrogateModel]:
+    """대리 모델을 컨테이너당 한 번 읽는다. 설정이 없거나 읽기에 실패하면 None."""
+    global _model
+    if _model is None and SURROGATE_BUCKET:
+        try:
+            _model = load_model(s3, SURROGATE_BUCKET, SURROGATE_KEY)
+            logger.info("대리 모델 로드: key=%s, trained_at=%s", SURROGATE_KEY, _model.meta.get("trained_at"))
+        except Exception:
+            logger.exception("대리 모델 로드 실패: bucket=%s, key=%s", SURROGATE_BUCKET, SURROGATE_KEY)
+    return _model
+
+
+def _skill_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return split_skills(value)
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    raise ValueError
+
+
+def _actual_analysis(item: Dict[str, Any]) -> Dict[str, Any]:
+    """세션의 실제 분석값 {remaining_years, risks: {정규화 스킬명: replacement_prob}}."""
+    if item.get("analysis_ref"):
+        record = AnalysisRecordStore(dynamodb.Table(ANALYSIS_RECORDS_TABLE_NAME)).get(item["analysis_ref"]) or {}
+        rows = record.get("skill_risks", [])
+        remaining = record.get("remaining_years")
+    else:
+        rows = dynamodb.Table(SKILL_GRAPH_TABLE_NAME).query(
+            KeyConditionExpression=Key("session_id").eq(item["session_id"])
+        ).get("Items", [])
+        remaining = item.get("remaining_years")
+    return {
+        "remaining_years": float(remaining) if remaining is not None else None,
+        "risks": {normalize_skill(r["skill_name"]): float(r["replacement_prob"]) for r in rows},
+    }
+
+
+def handler(event: dict, context) -> dict:
+    """POST /whatif 요청을 처리한다.
+
+    본문: {session_id, add_skills?, remove_skills?, job_title?} (스킬은 목록 또는 쉼표 문자열)
+    """
+    try:
+        body = json.loads(event.get("body") or "{}")
+        add_skills = _skill_list(body.get("add_skills"))
+        remove_skills = _skill_list(body.get("remove_skills"))
+    except (json.JSONDecodeError, TypeError, ValueError):
+        logger.warning("잘못된 요청 본문")
+        return response(400, {"error": "Invalid request", "details": ["잘못된 JSON 형식"]})
+
+    session_id = body.get("session_id", "")
+    if not isinstance(session_id, str) or not session_id.strip():
+        return response(400, {"error": "Invalid request", "details": ["필수 항목 누락 또는 빈 값: session_id"]})
+    new_job = str(body.get("job_title") or "").strip()
+    if not (add_skills or remove_skills or new_job):
+        return response(400, {"error": "Invalid request", "details": ["add_skills, remove_skills, job_title 중 하나가 필요합니다"]})
+    if len(add_skills) + len(remove_skills) > MAX_SKILL_CHANGES:
+        return response(400, {"error": "Invalid request", "details": [f"스킬 변경은 최대 {MAX_SKILL_CHANGES}개입니다"]})
+
+    model = _get_model()
+    if model is None:
+        return response(503, {"error": "What-if model unavailable"})
+
+    try:
+        item = dynamodb.Table(SURVEY_TABLE_NAME).get_item(Key={"session_id": session_id}).get("Item")
+        if not item or item.get("status") == "draft":
+            return response(404, {"error": "Session not found"})
+        if item.get("status") != "completed":
+            return response(409, {"error": "Analysis in progress", "status": item.get("status", "")})
+        actual = _actual_analysis(item)
+    except Exception:
+        logger.exception("세션 조회 실패: session_id=%s", session_id)
+        return response(500, {"error": "Internal server error"})
+
+    job_title = item.get("job_title", "")
+    age_group = item.get("age_group", "")
+    old_skills = split_skills(item.get("strengths", ""))
+    removed = {normalize_skill(s) for s in remove_skills}
+    new_skills = [s for s in old_skills if normalize_skill(s) not in removed]
+    kept = {normalize_skill(s) for s in new_skills}
+    for skill in add_skills:
+        if normalize_skill(skill) not in kept:
+            new_skills.append(skill)
+            kept.add(normalize_skill(skill))
+    job_changed = bool(new_job) and normalize_skill(new_job) != normalize_skill(job_title)
+    target_job = new_job if job_changed else job_title
+
+    skill_risks = []
+    for skill in new_skills:
+        observed = None if job_changed else actual["risks"].get(normalize_skill(skill))
+        if observed is not None:
+            skill_risks.append({"skill_name": skill, "replacement_prob": round(observed), "source": "analysis"})
+        else:
+            predicted = model.predict_skill(target_job, age_group, skill)
+            skill_risks.append({"skill_name": skill, "replacement_prob": round(predicted), "source": "model"})
+
+    baseline_pred = model.predict_years(job_title, age_group, old_skills)
+    whatif_pred = model.predict_years(target_job, age_group, new_skills)
+    baseline = actual["remaining_years"] if actual["remaining_years"] is not None else baseline_pred
+    delta = whatif_pred - baseline_pred
+
+    return response(200, {
+        "session_id": session_id,
+        "job_title": target_job,
+        "baseline_remaining_years": round(baseline, 1),
+        "remaining_years": round(max(baseline + delta, 0.0), 1),
+        "delta_years": round(delta, 1),
+        "skill_risks": skill_risks,
+        "model": {"trained_at": model.meta.get("trained_at", ""), "skill_mae": model.meta.get("skill_mae"),
+                  "years_mae": model.meta.get("years_mae")},
+    })
@@ -0,0 +1,41 @@
+"""WebSocket $connect Lambda 핸들러.
+
+쿼리 파라미터의 session_id와 connection_id를 연결 레지스트리에 등록한다.
+분석이 끝나면 analyze_handler가 이 매핑으로 완료 알림을 푸시한다.
+"""
+
+import os
+
+import boto3
+
+from services.notifier import ConnectionRegistry
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+
+CONNECTIONS_TABLE_NAME = os.environ.get("CONNECTIONS_TABLE_NAME", "")
+
+
+def handler(event: dict, context) -> dict:
+    """$connect 라우트를 처리한다.
+
+    session_id가 없으면 400으로 연결을 거부한다.
+    """
+    connection_id = (event.get("requestContext") or {}).get("connectionId", "")
+    query_params = event.get("queryStringParameters") or {}
+    session_id = query_params.get("session_id", "")
+
+    if not session_id or not connection_id:
+        logger.warning("WebSocket 연결 거부: session_id 누락")
+        return {"statusCode": 400, "body": "session_id is required"}
+
+    registry = ConnectionRegistry(dynamodb.Table(CONNECTIONS_TABLE_NAME))
+    try:
+        registry.register(session_id, connection_id)
+    except Exception:
+        logger.exception("연결 등록 실패: session_id=%s", session_id)
+        return {"statusCode": 500, "body": "Internal server error"}
+
+    return {"statusCode": 200, "body": "Connected"}
@@ -0,0 +1,34 @@
+"""WebSocket $disconnect Lambda 핸들러.
+
+끊긴 connection_id의 매핑을 연결 레지스트리에서 삭제한다.
+삭제에 실패해도 TTL(expires_at)로 결국 정리된다.
+"""
+
+import os
+
+import boto3
+
+from services.notifier import ConnectionRegistry
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+dynamodb = boto3.resource("dynamodb")
+
+CONNECTIONS_TABLE_NAME = os.environ.get("CONNECTIONS_TABLE_NAME", "")
+
+
+def handler(event: dict, context) -> dict:
+    """$disconnect 라우트를 처리한다."""
+    connection_id = (event.get("requestContext") or {}).get("connectionId", "")
+    if not connection_id:
+        return {"statusCode": 400, "body": "connectionId is required"}
+
+    registry = ConnectionRegistry(dynamodb.Table(CONNECTIONS_TABLE_NAME))
+    try:
+        registry.unregister(connection_id)
+    except Exception:
+        logger.exception("연결 해제 처리 실패: connection_id=%s", connection_id)
+        return {"statusCode": 500, "body": "Internal server error"}
+
+    return {"statusCode": 200, "body": "Disconnected"}
@@ -0,0 +1,3 @@
+"""방명록 유사 프로필 인덱스 갱신 핸들러 래퍼 (테스트용 임포트 경로 통합)."""
+
+from functions.guestbook_indexer.handler import handler  # noqa: F401
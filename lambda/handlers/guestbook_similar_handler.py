@@ -0,0 +1,3 @@
+"""유사 방명록 조회 핸들러 래퍼 (테스트용 임포트 경로 통합)."""
+
+from functions.guestbook_similar.handler import handler  # noqa: F401
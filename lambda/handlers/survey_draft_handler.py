@@ -0,0 +1,3 @@
+"""설문 초안(사전 분석) 핸들러 래퍼 (테스트용 임포트 경로 통합)."""
+
+from functions.survey_draft.handler import handler  # noqa: F401
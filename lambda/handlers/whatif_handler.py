@@ -0,0 +1,3 @@
+"""What-if(대리 모델 즉시 추정) 핸들러 래퍼 (테스트용 임포트 경로 통합)."""
+
+from functions.whatif.handler import handler  # noqa: F401
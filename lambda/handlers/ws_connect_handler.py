@@ -0,0 +1,3 @@
+"""WebSocket $connect 핸들러 래퍼 (테스트용 임포트 경로 통합)."""
+
+from functions.ws_connect.handler import handler  # noqa: F401
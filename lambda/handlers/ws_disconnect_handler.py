@@ -0,0 +1,3 @@
+"""WebSocket $disconnect 핸들러 래퍼 (테스트용 임포트 경로 통합)."""
+
+from functions.ws_disconnect.handler import handler  # noqa: F401
@@ -1,5 +1,11 @@
 """Business logic services for Career Doomsday Clock."""
 
+from .notifier import ConnectionRegistry, LocalManagementApi, notify_session
 from .validation import validate_survey
 
-__all__ = ["validate_survey"]
+__all__ = [
+    "validate_survey",
+    "ConnectionRegistry",
+    "LocalManagementApi",
+    "notify_session",
+]
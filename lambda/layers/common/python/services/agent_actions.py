@@ -0,0 +1,77 @@
+"""Agent RETURN_CONTROL 액션 그룹(WEF 수치 조회)을 Lambda 안에서 처리한다.
+
+Agent에 정의한 액션 그룹 ACTION_GROUP의 함수(get_job_outlook, get_skill_outlook)는
+실행기 없이 RETURN_CONTROL로 선언되어 있어, invoke_agent 스트림이 returnControl 이벤트로 멈춘다.
+호출 입력을 services.wef_facts 사실 테이블로 답해 sessionState.returnControlInvocationResults로
+같은 세션에 다시 보내면 Agent가 이어서 생성한다 (벡터 검색과 도구 왕복 없이 정확한 수치).
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+ACTION_GROUP = "wef_facts"
+# 함수 이름 → (파라미터 이름, 사실 종류)
+FUNCTIONS = {
+    "get_job_outlook": ("job", "job"),
+    "get_skill_outlook": ("skill", "skill"),
+}
+# 함수 호출 수(직업 1 + 스킬마다 1)에 더해 받아 줄 returnControl 여유 횟수 (REPROMPT 재호출 등)
+RETURN_CONTROL_SLACK = 1
+# 상한을 다 쓰면 새 세션에서 함수 호출 없이 답하라고 한 번 더 요청한다
+FINAL_ANSWER_NOTE = (
+    "\n\nDo not call any functions. The WEF figure lookups are finished; "
+    "answer now with the final JSON using the Knowledge Base or general knowledge."
+)
+
+NOT_FOUND_NOTE = "No WEF figure for this name. Use the knowledge base or general knowledge instead."
+
+
+class ReturnControlExhausted(RuntimeError):
+    """returnControl 상한과 마지막 답변 요청 뒤에도 Agent가 함수 호출을 멈추지 않았다."""
+
+    def __init__(self, rounds: int):
+        super().__init__(f"returnControl 상한 초과: rounds={rounds}")
+        self.rounds = rounds
+
+
+def max_rounds(skill_count: int) -> int:
+    """한 Agent 호출에서 받아 줄 returnControl 횟수 (호출을 한 턴에 하나씩 해도 모두 답할 수 있게)."""
+    return 1 + max(skill_count, 0) + RETURN_CONTROL_SLACK
+
+
+def answer(store: Any, function: str, parameters: Dict[str, str]) -> Dict[str, Any]:
+    """함수 호출 하나의 응답 본문 (store가 없거나 이름이 없으면 found=False)."""
+    param, kind = FUNCTIONS[function]
+    query = (parameters.get(param) or "").strip()
+    found = store.lookup(kind, query) if store is not None and query else None
+    if found is None:
+        return {"found": False, "query": query, "note": NOT_FOUND_NOTE}
+    record, matched = found
+    return {"found": True, "query": query, "matched": matched, **record}
+
+
+def function_results(return_control: Dict[str, Any], store: Any) -> List[Dict[str, Any]]:
+    """returnControl 이벤트의 호출 입력마다 returnControlInvocationResults 항목을 만든다."""
+    results = []
+    for invocation in return_control.get("invocationInputs", []):
+        call = invocation.get("functionInvocationInput")
+        if not call:
+            continue
+        parameters = {p.get("name", ""): p.get("value", "") for p in call.get("parameters", [])}
+        result: Dict[str, Any] = {"actionGroup": call.get("actionGroup", ACTION_GROUP), "function": call.get("function", "")}
+        if call.get("function") in FUNCTIONS:
+            body = answer(store, call["function"], parameters)
+        else:
+            body = {"error": f"unknown function: {call.get('function')}"}
+            result["responseState"] = "REPROMPT"
+        result["responseBody"] = {"TEXT": {"body": json.dumps(body, ensure_ascii=False)}}
+        results.append({"functionResult": result})
+    return results
+
+
+def session_state(return_control: Dict[str, Any], store: Any) -> Optional[Dict[str, Any]]:
+    """다음 invoke_agent에 넘길 sessionState (처리할 함수 호출이 없으면 None)."""
+    results = function_results(return_control, store)
+    if not results:
+        return None
+    return {"invocationId": return_control.get("invocationId", ""), "returnControlInvocationResults": results}
@@ -0,0 +1,179 @@
+"""Bedrock Agent 스트리밍 응답 수집 서비스.
+
+invoke_agent의 response["completion"] 이벤트 스트림에서
+완성 텍스트(chunk)와 트레이스(trace)를 함께 수집한다.
+트레이스에서는 Knowledge Base 검색 결과(retrievedReferences)를 추출해
+단계 체크포인트의 retrieval 컨텍스트로 사용하고, 모델 호출별 토큰 사용량(usage)과
+Knowledge Base 검색 횟수를 합산한다 (services.token_usage.TokenUsage).
+사전 분석에서는 Agent 없이 Retrieve API로 같은 형식의 검색 결과를 만든다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from services.token_usage import TokenBudgetExceeded, TokenUsage
+
+# 체크포인트/프롬프트에 보관할 검색 결과 상한
+MAX_REFERENCES = 10
+MAX_REFERENCE_CHARS = 1500
+
+
+@dataclass
+class AgentStreamResult:
+    """Agent 스트림 수집 결과."""
+
+    completion: str = ""
+    retrieved_references: List[Dict[str, str]] = field(default_factory=list)
+    trace_event_count: int = 0
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    # 스트림이 RETURN_CONTROL로 멈췄을 때의 returnControl 페이로드 (services.agent_actions가 처리)
+    return_control: Optional[Dict[str, Any]] = None
+    # Lambda 안에서 답한 액션 그룹 함수 호출 수
+    action_calls: int = 0
+    # 도구 호출 강제 모드(services.structured_output)에서 받은 도구 입력 (Agent 경로에서는 None)
+    structured: Optional[Dict[str, Any]] = None
+
+    @property
+    def input_tokens(self) -> int:
+        return self.usage.input_tokens
+
+    @property
+    def output_tokens(self) -> int:
+        return self.usage.output_tokens
+
+    @property
+    def model_invocation_count(self) -> int:
+        return self.usage.model_invocations
+
+
+def extract_references(trace_payload: Dict[str, Any]) -> List[Dict[str, str]]:
+    """트레이스 이벤트 1건에서 Knowledge Base 검색 결과를 추출한다.
+
+    Args:
+        trace_payload: 스트림 이벤트의 "trace" 값
+            (bedrock-agent-tracing-file.txt의 각 항목과 동일한 형식)
+
+    Returns:
+        [{"text": ..., "source": ...}] 목록. KB 검색 결과가 아니면 빈 목록.
+    """
+    orchestration = (trace_payload.get("trace") or {}).get("orchestrationTrace") or {}
+    lookup_output = (orchestration.get("observation") or {}).get("knowledgeBaseLookupOutput") or {}
+    return normalize_references(lookup_output.get("retrievedReferences", []))
+
+
+def extract_usage(trace_payload: Dict[str, Any]) -> Dict[str, int]:
+    """트레이스 이벤트 1건에서 모델 호출 토큰 사용량을 추출한다. 모델 호출 출력이 아니면 빈 dict."""
+    trace = trace_payload.get("trace") or {}
+    for step in trace.values():
+        output = (step or {}).get("modelInvocationOutput") if isinstance(step, dict) else None
+        usage = ((output or {}).get("metadata") or {}).get("usage")
+        if usage:
+            return {
+                "input_tokens": int(usage.get("inputTokens") or 0),
+                "output_tokens": int(usage.get("outputTokens") or 0),
+                "cache_read_tokens": int(usage.get("cacheReadInputTokens") or 0),
+                "cache_write_tokens": int(usage.get("cacheWriteInputTokens") or 0),
+            }
+    return {}
+
+
+def extract_model_id(trace_payload: Dict[str, Any]) -> str:
+    """모델 호출 입력 트레이스에서 foundationModel을 추출한다. 없으면 빈 문자열."""
+    for step in (trace_payload.get("trace") or {}).values():
+        if isinstance(step, dict):
+            model_id = (step.get("modelInvocationInput") or {}).get("foundationModel")
+            if model_id:
+                return model_id
+    return ""
+
+
+def is_knowledge_base_lookup(trace_payload: Dict[str, Any]) -> bool:
+    """Knowledge Base 검색 호출 트레이스인지 판단한다."""
+    orchestration = (trace_payload.get("trace") or {}).get("orchestrationTrace") or {}
+    return "knowledgeBaseLookupInput" in (orchestration.get("invocationInput") or {})
+
+
+def normalize_references(raw_references: Iterable[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """retrievedReferences/retrievalResults 항목을 [{"text", "source"}]로 변환한다."""
+    references = []
+    for ref in raw_references:
+        text = (ref.get("content") or {}).get("text", "")
+        if not text:
+            continue
+        source = ((ref.get("location") or {}).get("s3Location") or {}).get("uri", "")
+        references.append({"text": text, "source": source})
+    return references
+
+
+def retrieve_references(client: Any, knowledge_base_id: str, query: str) -> List[Dict[str, str]]:
+    """Retrieve API로 Knowledge Base를 직접 검색한다 (Agent 호출 없이 retrieval 단계만 수행).
+
+    결과는 collect_agent_stream과 같은 상한(MAX_REFERENCES, MAX_REFERENCE_CHARS)을 적용한다.
+    """
+    resp = client.retrieve(
+        knowledgeBaseId=knowledge_base_id,
+        retrievalQuery={"text": query},
+        retrievalConfiguration={"vectorSearchConfiguration": {"numberOfResults": MAX_REFERENCES}},
+    )
+    return [
+        {"text": ref["text"][:MAX_REFERENCE_CHARS], "source": ref["source"]}
+        for ref in normalize_references(resp.get("retrievalResults", []))
+    ]
+
+
+def collect_agent_stream(
+    events: Iterable[Dict[str, Any]],
+    on_chunk: Optional[Callable[[str], None]] = None,
+    token_budget: int = 0,
+    into: Optional[AgentStreamResult] = None,
+) -> AgentStreamResult:
+    """completion 이벤트 스트림을 끝까지 소비하여 결과를 수집한다.
+
+    동일한 텍스트의 검색 결과는 한 번만 보관하며, 최대 MAX_REFERENCES건까지 유지한다.
+    on_chunk가 있으면 completion 조각을 도착하는 대로 전달한다 (점진 파싱용).
+    into가 있으면 (returnControl 응답 뒤 같은 세션 재호출) 이전 결과에 이어서 모은다.
+
+    Raises:
+        TokenBudgetExceeded: token_budget(0이면 무제한)을 넘은 경우.
+            스트림을 닫아 남은 오케스트레이션을 중단하고, 그때까지의 사용량을 담는다.
+    """
+    result = into if into is not None else AgentStreamResult()
+    result.return_control = None
+    completion_parts: List[str] = [result.completion]
+    seen_texts = {ref["text"] for ref in result.retrieved_references}
+
+    for event in events:
+        chunk = event.get("chunk", {})
+        if "bytes" in chunk:
+            text = chunk["bytes"].decode("utf-8")
+            completion_parts.append(text)
+            if on_chunk:
+                on_chunk(text)
+
+        if "returnControl" in event:
+            result.return_control = event["returnControl"]
+
+        if "trace" in event:
+            result.trace_event_count += 1
+            result.usage.model_id = result.usage.model_id or extract_model_id(event["trace"])
+            if is_knowledge_base_lookup(event["trace"]):
+                result.usage.kb_queries += 1
+            usage = extract_usage(event["trace"])
+            if usage:
+                result.usage.add_invocation(usage)
+                if token_budget and result.usage.total_tokens > token_budget:
+                    close = getattr(events, "close", None)
+                    if close:
+                        close()
+                    raise TokenBudgetExceeded(result.usage, token_budget)
+            for ref in extract_references(event["trace"]):
+                if ref["text"] in seen_texts or len(result.retrieved_references) >= MAX_REFERENCES:
+                    continue
+                seen_texts.add(ref["text"])
+                result.retrieved_references.append({
+                    "text": ref["text"][:MAX_REFERENCE_CHARS],
+                    "source": ref["source"],
+                })
+
+    result.completion = "".join(completion_parts)
+    return result
@@ -0,0 +1,61 @@
+"""완료된 세션의 직업/스킬 수정(amend)과 부분 재분석 규칙.
+
+POST /survey/amend가 이전 입력과 새 입력을 비교해 추가/제거/유지 스킬을 구하고,
+변경이 중대한지(material) 판정해 survey 항목의 pending_amend에 기록한다.
+analyze_handler는 추가된 스킬만 다시 분석하고 제거된 스킬 행을 지우며,
+중대한 변경일 때만 커리어 카드와 D-Day를 다시 생성한다.
+
+세션별 version은 수정마다 1씩 늘고, 재분석은 자신의 version이 현재 version일 때만 결과를 반영한다
+(오래된 재시도가 새 결과를 덮어쓰지 않는다).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from services.career_templates import split_skills
+
+# 추가+제거 스킬 수가 이전 스킬 수의 이 비율 이상이면 중대한 변경으로 본다 (직업 변경은 항상 중대)
+DEFAULT_MATERIAL_RATIO = 0.5
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+@dataclass
+class InputDiff:
+    """이전 입력 대비 변경 내용 (스킬은 새 입력의 표기를 따른다)."""
+
+    job_changed: bool
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    kept: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.job_changed or bool(self.added or self.removed)
+
+
+def diff_inputs(old_job: str, old_strengths: str, new_job: str, new_strengths: str) -> InputDiff:
+    """직업/스킬 입력을 비교한다 (대소문자·공백·중복 무시)."""
+    old = {normalize_skill(s): s for s in split_skills(old_strengths)}
+    new = {normalize_skill(s): s for s in split_skills(new_strengths)}
+    return InputDiff(
+        job_changed=normalize_skill(old_job) != normalize_skill(new_job),
+        added=[skill for key, skill in new.items() if key not in old],
+        removed=[skill for key, skill in old.items() if key not in new],
+        kept=[skill for key, skill in new.items() if key in old],
+    )
+
+
+def is_material(diff: InputDiff, ratio: float = DEFAULT_MATERIAL_RATIO) -> bool:
+    """카드와 D-Day를 다시 생성할 만큼 중대한 변경인지 판정한다."""
+    if diff.job_changed:
+        return True
+    previous = len(diff.kept) + len(diff.removed)
+    return (len(diff.added) + len(diff.removed)) >= ratio * max(previous, 1)
+
+
+def pending_amend(version: int, diff: InputDiff, material: bool) -> Dict[str, Any]:
+    """survey 항목에 기록할 재분석 지시 (analyze_handler가 version으로 조회)."""
+    return {"version": version, "added": diff.added, "removed": diff.removed, "material": material}
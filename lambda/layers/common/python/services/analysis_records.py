@@ -0,0 +1,72 @@
+"""내용 해시로 주소를 매기는 불변 공유 분석 레코드.
+
+공유/캐시된 분석(single-flight follower, 대량 사전 분석 캐시 적중)은 세션마다 skill_graph/
+career_cards 행을 복사하는 대신 analysis_records 테이블의 레코드 하나를 가리킨다.
+세션(survey 항목)에는 포인터(analysis_ref)와 개인 필드만 남는다.
+    - record_id: 공유 필드(D-Day, 근거, 스킬 위험도, 카드)의 정규화 JSON sha256
+    - content: 공유 필드 JSON 문자열 (DynamoDB 숫자 변환 없이 그대로 복원)
+같은 내용은 같은 ID가 되므로 조건부 쓰기 한 번으로 충분하고, 레코드는 바뀌지 않아
+조회 측(result_handler)은 무효화 없이 메모리 캐시에 둘 수 있다.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_RISK_FIELDS = ("skill_name", "category", "replacement_prob", "time_horizon", "justification")
+_CARD_FIELDS = ("card_index", "combo_formula", "reason", "roadmap")
+
+
+def shared_content(result: Dict[str, Any], career_cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """분석 결과에서 세션 간에 공유되는 필드만 result_handler 응답 형식으로 뽑는다."""
+    return {
+        "remaining_years": result.get("remaining_years", 0),
+        "remaining_years_reason": result.get("remaining_years_reason", ""),
+        "skill_risks": [{f: risk.get(f) for f in _RISK_FIELDS} for risk in result.get("skill_risks", [])],
+        "career_cards": [{f: card.get(f) for f in _CARD_FIELDS} for card in career_cards],
+    }
+
+
+def _canonical_json(content: Dict[str, Any]) -> str:
+    return json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def record_id(content: Dict[str, Any]) -> str:
+    """공유 내용의 주소 (내용이 같으면 같은 ID)."""
+    return hashlib.sha256(_canonical_json(content).encode("utf-8")).hexdigest()
+
+
+class AnalysisRecordStore:
+    """analysis_records 테이블 (record_id HASH) 저장소."""
+
+    def __init__(self, table: Any) -> None:
+        self.table = table
+
+    def put(self, content: Dict[str, Any]) -> str:
+        """레코드를 저장하고 ID를 반환한다. 이미 있으면 쓰지 않는다 (불변)."""
+        rid = record_id(content)
+        try:
+            self.table.put_item(
+                Item={
+                    "record_id": rid,
+                    "content": _canonical_json(content),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                },
+                ConditionExpression="attribute_not_exists(record_id)",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            logger.info("공유 분석 레코드 재사용: record_id=%s", rid)
+        return rid
+
+    def get(self, rid: str) -> Optional[Dict[str, Any]]:
+        item = self.table.get_item(Key={"record_id": rid}).get("Item")
+        return json.loads(item["content"]) if item else None
@@ -0,0 +1,289 @@
+"""Bedrock 배치 추론(model invocation job) 기반 대량 사전 분석.
+
+자주 들어오는 직업/스킬 조합(예: 상위 5,000개)을 온라인 Agent 호출 대신 비동기 배치 작업으로
+미리 분석해 분석 캐시(analysis_cache 테이블)에 채운다. analyze_handler는 같은 조합의
+캐시가 있으면 Agent 호출을 생략한다.
+    1. 조합별 invoke_model 요청을 JSONL로 S3에 쓴다 (임시 파일로 한 줄씩, 메모리 상한 고정)
+    2. create_model_invocation_job으로 작업을 제출하고 완료까지 폴링한다
+    3. 출력 JSONL(<출력 경로>/<job id>/<입력 파일명>.out)을 줄 단위 스트림으로 읽어
+       파싱되는 결과만 batch_writer로 캐시에 쓴다
+요청/응답 형식은 묶음 생성(services.micro_batch)과 같아서 파싱 규칙을 공유한다.
+로컬에서는 S3 대체(moto)와 tests.helpers.FakeBatchJobRunner로 전체 흐름을 실행할 수 있다.
+"""
+
+import hashlib
+import json
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from services.career_templates import render_cards, select_templates, split_skills, template_prompt_block
+from services.micro_batch import BATCH_SYSTEM_PROMPT, PER_PROFILE_MAX_TOKENS, build_batch_prompt, parse_batch_response
+from services.prompt_templates import DEFAULT_PROMPT_VERSION, render_prompt
+from services.translation import CANONICAL_LANGUAGE, LANGUAGE_NAMES
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bedrock 배치 추론 작업당 레코드 수 제한 (서비스 할당량 기본값)
+MIN_RECORDS_PER_JOB = 100
+MAX_RECORDS_PER_JOB = 50000
+
+JOB_DONE_STATUSES = frozenset({"Completed", "PartiallyCompleted"})
+JOB_FAILED_STATUSES = frozenset({"Failed", "Stopped", "Expired"})
+
+OUTPUT_SUFFIX = ".jsonl.out"
+INGEST_LOG_INTERVAL = 1000
+
+
+class BulkJobFailed(Exception):
+    """배치 추론 작업이 실패/중지/만료되었거나 시간 안에 끝나지 않았다."""
+
+
+@dataclass
+class Combination:
+    """사전 분석할 직업/스킬 조합 (연령대와 프롬프트 버전도 결과를 바꾸므로 키에 포함한다)."""
+
+    job_title: str
+    strengths: str
+    age_group: str = ""
+    prompt_version: str = DEFAULT_PROMPT_VERSION
+
+    @property
+    def cache_key(self) -> str:
+        return combination_key(self.job_title, self.strengths, self.age_group, self.prompt_version)
+
+
+@dataclass
+class IngestStats:
+    """출력 적재 결과."""
+
+    records: int = 0
+    cached: int = 0
+    failed: int = 0
+
+
+def combination_key(
+    job_title: str, strengths: str, age_group: str = "", prompt_version: str = DEFAULT_PROMPT_VERSION
+) -> str:
+    """직업/스킬 조합의 캐시 키 (대소문자·공백·스킬 순서·중복 무시).
+
+    프롬프트에 들어가는 연령대와 프롬프트 템플릿 버전이 다르면 다른 키다
+    (템플릿을 바꾸면 이전 버전으로 만든 캐시 항목은 조회되지 않는다).
+    """
+    skills = sorted({s.lower() for s in split_skills(strengths)})
+    normalized = json.dumps(
+        [" ".join(job_title.lower().split()), skills, age_group.strip(), prompt_version], ensure_ascii=False
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def top_combinations(
+    items: Iterable[Dict[str, Any]], limit: int, prompt_version: str = DEFAULT_PROMPT_VERSION
+) -> List[Combination]:
+    """survey 항목에서 가장 많이 들어온 직업/스킬/연령대 조합 limit개를 고른다 (첫 입력 표기 유지)."""
+    counts: Counter = Counter()
+    first_seen: Dict[str, Combination] = {}
+    for item in items:
+        combo = Combination(
+            item.get("job_title", ""), item.get("strengths", ""), item.get("age_group", ""), prompt_version
+        )
+        if not combo.job_title.strip():
+            continue
+        counts[combo.cache_key] += 1
+        first_seen.setdefault(combo.cache_key, combo)
+    return [first_seen[key] for key, _ in counts.most_common(limit)]
+
+
+def build_profile_prompt(
+    job_title: str, strengths: str, prompt_version: str = DEFAULT_PROMPT_VERSION, age_group: str = ""
+) -> str:
+    """이름 없는 조합 프로필 프롬프트 (템플릿 카드 포함, analyze와 같은 카드 선택)."""
+    skills = split_skills(strengths)
+    cards = render_cards(select_templates(job_title, skills), job_title, skills)
+    prompt = render_prompt(
+        prompt_version,
+        name="",
+        job_title=job_title,
+        age_group=age_group,
+        skills=strengths,
+        language=LANGUAGE_NAMES[CANONICAL_LANGUAGE],
+    )
+    return prompt + "\n\n" + template_prompt_block(cards)
+
+
+def build_record(combo: Combination, references: Sequence[Dict[str, str]] = ()) -> Dict[str, Any]:
+    """배치 추론 입력 JSONL 한 줄 (recordId = 캐시 키)."""
+    profile_prompt = build_profile_prompt(combo.job_title, combo.strengths, combo.prompt_version, combo.age_group)
+    prompt = build_batch_prompt([(combo.cache_key, profile_prompt)], references)
+    return {
+        "recordId": combo.cache_key,
+        "modelInput": {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": PER_PROFILE_MAX_TOKENS,
+            "system": BATCH_SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": prompt}],
+        },
+    }
+
+
+def split_s3_uri(uri: str) -> Tuple[str, str]:
+    """s3://bucket/key → (bucket, key)."""
+    if not uri.startswith("s3://"):
+        raise ValueError(f"S3 URI가 아닙니다: {uri}")
+    bucket, _, key = uri[len("s3://"):].partition("/")
+    return bucket, key
+
+
+def write_input_jsonl(s3_client: Any, input_uri: str, records: Iterable[Dict[str, Any]]) -> int:
+    """입력 레코드를 JSONL로 S3에 쓴다 (메모리 대신 임시 파일에 한 줄씩 쓰고 업로드)."""
+    bucket, key = split_s3_uri(input_uri)
+    count = 0
+    with tempfile.TemporaryFile("w+b") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            count += 1
+        if count > MAX_RECORDS_PER_JOB:
+            raise ValueError(f"작업당 레코드 수 초과: {count} > {MAX_RECORDS_PER_JOB}")
+        if count < MIN_RECORDS_PER_JOB:
+            logger.warning("레코드 수가 배치 작업 최소값보다 적음: %d < %d", count, MIN_RECORDS_PER_JOB)
+        f.seek(0)
+        s3_client.upload_fileobj(f, bucket, key)
+    logger.info("배치 입력 업로드: uri=%s, records=%d", input_uri, count)
+    return count
+
+
+def submit_job(
+    bedrock_client: Any, job_name: str, role_arn: str, model_id: str, input_uri: str, output_uri: str
+) -> str:
+    """배치 추론 작업을 제출하고 jobArn을 반환한다."""
+    resp = bedrock_client.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=role_arn,
+        modelId=model_id,
+        inputDataConfig={"s3InputDataConfig": {"s3Uri": input_uri, "s3InputFormat": "JSONL"}},
+        outputDataConfig={"s3OutputDataConfig": {"s3Uri": output_uri}},
+    )
+    logger.info("배치 추론 작업 제출: job=%s, arn=%s", job_name, resp["jobArn"])
+    return resp["jobArn"]
+
+
+def wait_for_job(
+    bedrock_client: Any,
+    job_arn: str,
+    poll_seconds: float = 60.0,
+    timeout_seconds: float = 24 * 3600,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> Dict[str, Any]:
+    """작업이 끝날 때까지 폴링한다. 완료(부분 완료 포함)면 작업 정보를 반환한다.
+
+    Raises:
+        BulkJobFailed: 실패/중지/만료되었거나 timeout_seconds 안에 끝나지 않은 경우
+    """
+    deadline = clock() + timeout_seconds
+    while True:
+        job = bedrock_client.get_model_invocation_job(jobIdentifier=job_arn)
+        status = job.get("status", "")
+        if status in JOB_DONE_STATUSES:
+            logger.info("배치 추론 작업 완료: arn=%s, status=%s", job_arn, status)
+            return job
+        if status in JOB_FAILED_STATUSES:
+            raise BulkJobFailed(f"{job_arn}: {status} {job.get('message', '')}".strip())
+        if clock() >= deadline:
+            raise BulkJobFailed(f"{job_arn}: {timeout_seconds:.0f}초 안에 끝나지 않음 (status={status})")
+        sleep(poll_seconds)
+
+
+def job_output_prefix(output_uri: str, job_arn: str) -> Tuple[str, str]:
+    """작업 출력이 쓰이는 (bucket, prefix). Bedrock은 <출력 경로>/<job id>/ 아래에 쓴다."""
+    bucket, prefix = split_s3_uri(output_uri)
+    job_id = job_arn.rsplit("/", 1)[-1]
+    return bucket, f"{prefix.rstrip('/')}/{job_id}/".lstrip("/")
+
+
+def iter_output_records(s3_client: Any, bucket: str, prefix: str) -> Iterator[Dict[str, Any]]:
+    """출력 JSONL 파일들을 줄 단위 스트림으로 읽는다 (파일 전체를 메모리에 올리지 않는다)."""
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            if not obj["Key"].endswith(OUTPUT_SUFFIX):
+                continue
+            body = s3_client.get_object(Bucket=bucket, Key=obj["Key"])["Body"]
+            for line in body.iter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+def parse_output_record(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """출력 레코드 하나에서 분석 결과를 꺼낸다. 오류 레코드나 형식이 틀린 응답이면 None."""
+    output = record.get("modelOutput")
+    if not output or record.get("error"):
+        return None
+    text = "".join(block.get("text", "") for block in output.get("content", []))
+    return parse_batch_response(text, [record.get("recordId", "")]).get(record.get("recordId", ""))
+
+
+class AnalysisCache:
+    """직업/스킬 조합별 분석 결과 캐시 (analysis_cache 테이블, cache_key HASH).
+
+    analysis는 Agent 응답과 같은 JSON 문자열로 저장해 analyze의 파싱 경로를 그대로 쓴다.
+    """
+
+    def __init__(self, table: Any) -> None:
+        self.table = table
+
+    def get(
+        self, job_title: str, strengths: str, age_group: str = "", prompt_version: str = DEFAULT_PROMPT_VERSION
+    ) -> Optional[str]:
+        return self.get_by_key(combination_key(job_title, strengths, age_group, prompt_version))
+
+    def get_by_key(self, cache_key: str) -> Optional[str]:
+        item = self.get_item(cache_key)
+        return item.get("analysis") if item else None
+
+    def get_item(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """원문 직업/스킬(있으면)을 포함한 캐시 항목 전체."""
+        return self.table.get_item(Key={"cache_key": cache_key}).get("Item")
+
+    def ingest(
+        self,
+        records: Iterable[Dict[str, Any]],
+        model_id: str,
+        source: str = "bulk",
+        profiles: Optional[Dict[str, Combination]] = None,
+    ) -> IngestStats:
+        """출력 레코드 스트림을 캐시에 적재한다 (batch_writer가 25건 단위로 비워 메모리 상한 고정).
+
+        profiles(cache_key → 조합)가 주어지면 원문 직업/스킬과 연령대/프롬프트 버전도 함께 저장해
+        의미 기반 재사용 인덱스(services.semantic_reuse)의 말뭉치로 쓸 수 있게 한다.
+        """
+        stats = IngestStats()
+        created_at = datetime.now(timezone.utc).isoformat()
+        with self.table.batch_writer(overwrite_by_pkeys=["cache_key"]) as batch:
+            for record in records:
+                stats.records += 1
+                analysis = parse_output_record(record)
+                if analysis is None:
+                    stats.failed += 1
+                    continue
+                item = {
+                    "cache_key": record["recordId"],
+                    "analysis": json.dumps(analysis, ensure_ascii=False),
+                    "model_id": model_id,
+                    "source": source,
+                    "created_at": created_at,
+                }
+                combo = (profiles or {}).get(record["recordId"])
+                if combo is not None:
+                    item.update(job_title=combo.job_title, strengths=combo.strengths,
+                                age_group=combo.age_group, prompt_version=combo.prompt_version)
+                batch.put_item(Item=item)
+                stats.cached += 1
+                if stats.records % INGEST_LOG_INTERVAL == 0:
+                    logger.info("캐시 적재 진행: %s", stats)
+        logger.info("캐시 적재 완료: %s", stats)
+        return stats
@@ -0,0 +1,270 @@
+"""커리어 카드 템플릿 라이브러리.
+
+자주 반복되는 추천 직무(Prompt Engineer, AI Ethics Consultant 등)를 미리 작성한
+템플릿(조합 공식 뼈대, 추천 이유, 로드맵)으로 관리하고, 직업 클러스터와
+스킬 클러스터로 로컬에서 상위 3개를 고른다.
+
+모델은 카드를 새로 만들지 않고 템플릿마다 짧은 reason만 개인화하므로
+생성 출력이 줄고, 템플릿 카드는 생성 전에 미리 저장해 먼저 보여줄 수 있다.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+CARD_COUNT = 3
+
+# 개인화 reason 최대 길이 (넘으면 템플릿 기본 reason 사용)
+MAX_REASON_CHARS = 400
+
+GENERAL_CLUSTER = "general"
+
+# 직업 클러스터 → 직업명 키워드 (소문자 부분 일치)
+JOB_CLUSTERS: Dict[str, Tuple[str, ...]] = {
+    "software": ("develop", "programmer", "software", "engineer", "개발", "프로그래머", "엔지니어"),
+    "data": ("data", "analyst", "scientist", "데이터", "분석"),
+    "design": ("design", "ux", "디자인", "디자이너"),
+    "marketing": ("market", "advertis", "brand", "마케팅", "마케터", "광고", "홍보"),
+    "finance": ("financ", "account", "bank", "invest", "금융", "회계", "은행", "투자", "세무"),
+    "education": ("teach", "tutor", "instructor", "professor", "교사", "강사", "교수", "교육"),
+    "healthcare": ("doctor", "nurse", "medical", "pharma", "therap", "의사", "간호", "의료", "약사"),
+    "sales_service": ("sales", "service", "support", "consult", "retail", "영업", "판매", "서비스", "상담", "컨설"),
+    "manufacturing": ("manufactur", "factory", "production", "mechanic", "생산", "제조", "공장", "정비"),
+    "media": ("writer", "journalist", "editor", "video", "content", "작가", "기자", "편집", "영상", "콘텐츠"),
+    "student": ("student", "학생", "취준", "대학"),
+}
+
+# 스킬 클러스터 → 스킬명 키워드 (소문자 부분 일치)
+SKILL_CLUSTERS: Dict[str, Tuple[str, ...]] = {
+    "programming": ("python", "java", "script", "sql", "c++", "coding", "programming", "코딩", "프로그래밍", "개발"),
+    "data": ("data", "analy", "excel", "statist", "데이터", "분석", "엑셀", "통계"),
+    "design": ("design", "figma", "photoshop", "ux", "drawing", "디자인", "그림", "드로잉"),
+    "communication": ("communicat", "present", "negotiat", "speak", "소통", "커뮤니케이션", "발표", "협상", "대화"),
+    "management": ("manag", "leader", "planning", "project", "관리", "리더십", "기획", "운영"),
+    "writing": ("writ", "copy", "blog", "story", "글쓰기", "작문", "카피", "스토리"),
+}
+
+
+@dataclass(frozen=True)
+class CareerTemplate:
+    """미리 작성한 커리어 카드 템플릿 (정규 언어)."""
+
+    template_id: str
+    title: str
+    job_clusters: FrozenSet[str]
+    skill_clusters: FrozenSet[str]
+    reason: str
+    roadmap: Tuple[Tuple[str, str], ...]
+
+
+def _template(template_id, title, jobs, skills, reason, roadmap) -> CareerTemplate:
+    return CareerTemplate(template_id, title, frozenset(jobs), frozenset(skills), reason, tuple(roadmap))
+
+
+TEMPLATES: Tuple[CareerTemplate, ...] = (
+    _template(
+        "prompt_engineer", "Prompt Engineer",
+        ("software", "media", "marketing", GENERAL_CLUSTER), ("writing", "programming", "communication"),
+        "Turning domain knowledge into precise instructions is the interface every AI system still needs.",
+        [("Master prompt patterns and evaluation basics", "2 months"),
+         ("Build a prompt library for your current domain", "3 months"),
+         ("Ship an LLM workflow with measurable quality checks", "4 months")],
+    ),
+    _template(
+        "ai_ethics_consultant", "AI Ethics Consultant",
+        ("education", "healthcare", "finance", GENERAL_CLUSTER), ("communication", "management", "writing"),
+        "Regulation is catching up with automation, and organizations need people who can translate it into practice.",
+        [("Study AI regulation and responsible AI frameworks", "3 months"),
+         ("Audit an AI use case in your current field", "4 months"),
+         ("Earn an AI governance certification and advise projects", "6 months")],
+    ),
+    _template(
+        "mlops_engineer", "MLOps Engineer",
+        ("software", "data"), ("programming", "data"),
+        "Models only create value once someone keeps them deployed, monitored, and reproducible.",
+        [("Learn ML fundamentals and experiment tracking", "3 months"),
+         ("Automate training and deployment pipelines in the cloud", "4 months"),
+         ("Operate monitored models in production", "6 months")],
+    ),
+    _template(
+        "ai_product_manager", "AI Product Manager",
+        ("software", "marketing", "sales_service"), ("management", "communication"),
+        "Someone has to decide which problems AI should solve and whether it actually solved them.",
+        [("Learn how ML products are scoped and evaluated", "2 months"),
+         ("Run an AI feature discovery with real users", "4 months"),
+         ("Own the roadmap and metrics of an AI product", "6 months")],
+    ),
+    _template(
+        "data_storyteller", "Data Storyteller",
+        ("data", "marketing", "media"), ("data", "writing", "design"),
+        "Automated analysis produces more numbers than ever; turning them into decisions remains human work.",
+        [("Strengthen visualization and narrative techniques", "2 months"),
+         ("Publish recurring data reports for a real audience", "4 months"),
+         ("Lead decision briefings built on AI-generated analysis", "4 months")],
+    ),
+    _template(
+        "digital_twin_designer", "Digital Twin Designer",
+        ("manufacturing", "design", "software"), ("design", "programming", "data"),
+        "Factories and cities are being simulated before they are changed, and those simulations need designers.",
+        [("Learn 3D modeling and simulation tools", "3 months"),
+         ("Connect sensor data to a simulated asset", "4 months"),
+         ("Deliver a digital twin for an operational process", "6 months")],
+    ),
+    _template(
+        "collaboration_coordinator", "AI-Human Collaboration Coordinator",
+        ("sales_service", "education", GENERAL_CLUSTER), ("communication", "management"),
+        "Teams adopting AI agents need someone who redesigns the work so humans and machines do what each does best.",
+        [("Map current workflows and automation opportunities", "2 months"),
+         ("Pilot an AI-assisted workflow with your team", "4 months"),
+         ("Scale the operating model across departments", "6 months")],
+    ),
+    _template(
+        "human_centered_ai_ux", "Human-Centered AI UX Designer",
+        ("design",), ("design", "communication"),
+        "AI interfaces fail when users cannot trust or correct them; designing that trust is a growing specialty.",
+        [("Study conversational and AI interaction patterns", "2 months"),
+         ("Prototype and test an AI-assisted interface", "3 months"),
+         ("Lead UX for an AI product release", "6 months")],
+    ),
+    _template(
+        "generative_content_director", "Generative Content Director",
+        ("media", "marketing", "design"), ("writing", "design"),
+        "Generative tools multiply output, which makes editorial judgment and brand direction scarcer, not cheaper.",
+        [("Master generative text, image, and video tools", "2 months"),
+         ("Build an AI-assisted content pipeline with review gates", "4 months"),
+         ("Direct a brand's generative content strategy", "6 months")],
+    ),
+    _template(
+        "learning_experience_designer", "AI Learning Experience Designer",
+        ("education", "student"), ("communication", "writing", "design"),
+        "Personalized AI tutors still need curricula, pedagogy, and assessment designed by people.",
+        [("Learn instructional design and learning analytics", "3 months"),
+         ("Build an AI-tutored course module", "4 months"),
+         ("Evaluate learning outcomes and iterate at scale", "5 months")],
+    ),
+    _template(
+        "clinical_ai_specialist", "Clinical AI Workflow Specialist",
+        ("healthcare",), ("data", "communication"),
+        "Hospitals adopting diagnostic AI need clinicians who can validate it and fit it into care pathways.",
+        [("Study clinical AI validation and data privacy", "3 months"),
+         ("Join a clinical AI pilot as domain reviewer", "6 months"),
+         ("Own the rollout of an AI-assisted care workflow", "6 months")],
+    ),
+    _template(
+        "algorithmic_risk_analyst", "Algorithmic Risk Analyst",
+        ("finance", "data"), ("data", "management"),
+        "Automated decisions in credit and trading create model risk that regulators require humans to own.",
+        [("Learn model risk management and explainability", "3 months"),
+         ("Validate a production scoring model", "4 months"),
+         ("Lead model governance reviews", "6 months")],
+    ),
+    _template(
+        "robotics_process_coordinator", "Robotics Process Coordinator",
+        ("manufacturing",), ("management", "programming"),
+        "As robots take over repetitive tasks, plants need people who orchestrate and maintain mixed lines.",
+        [("Learn robot programming and safety standards", "3 months"),
+         ("Coordinate a robotic cell on the shop floor", "6 months"),
+         ("Optimize human-robot line throughput", "6 months")],
+    ),
+    _template(
+        "trust_safety_specialist", "AI Trust & Safety Specialist",
+        ("media", "sales_service", GENERAL_CLUSTER), ("communication", "writing"),
+        "Every platform deploying generative AI needs people who define and enforce what it must not do.",
+        [("Study content policy and AI misuse patterns", "2 months"),
+         ("Red-team an AI system and document failures", "3 months"),
+         ("Own safety policy for an AI product", "6 months")],
+    ),
+    _template(
+        "synthetic_data_engineer", "Synthetic Data Engineer",
+        ("data", "software", "student"), ("programming", "data"),
+        "Privacy rules and data scarcity make generated training data a core ingredient of new models.",
+        [("Learn data generation and privacy techniques", "3 months"),
+         ("Build a synthetic dataset with quality metrics", "4 months"),
+         ("Supply synthetic data to a production ML team", "5 months")],
+    ),
+    _template(
+        "automation_strategy_consultant", "Automation Strategy Consultant",
+        ("finance", "sales_service", "manufacturing", GENERAL_CLUSTER), ("management", "data"),
+        "Companies know they must automate but not where it pays off; that judgment is billable.",
+        [("Learn process mining and automation ROI analysis", "2 months"),
+         ("Assess automation candidates in your organization", "4 months"),
+         ("Lead an automation portfolio with measured savings", "6 months")],
+    ),
+)
+
+
+def classify(text: str, clusters: Dict[str, Tuple[str, ...]]) -> FrozenSet[str]:
+    """텍스트가 속하는 클러스터 집합 (키워드 부분 일치)."""
+    lowered = text.lower()
+    return frozenset(name for name, keywords in clusters.items() if any(k in lowered for k in keywords))
+
+
+def split_skills(strengths: str) -> List[str]:
+    """쉼표로 구분된 스킬 문자열을 목록으로 만든다."""
+    return [s.strip() for s in strengths.split(",") if s.strip()]
+
+
+def select_templates(
+    job_title: str, skills: Sequence[str], count: int = CARD_COUNT
+) -> List[CareerTemplate]:
+    """직업/스킬 클러스터 일치도가 높은 템플릿을 count개 고른다 (동점이면 라이브러리 순서)."""
+    job_clusters = classify(job_title, JOB_CLUSTERS) or frozenset({GENERAL_CLUSTER})
+    skill_clusters = frozenset().union(*(classify(s, SKILL_CLUSTERS) for s in skills))
+
+    def score(template: CareerTemplate) -> int:
+        return (
+            3 * len(template.job_clusters & job_clusters)
+            + 2 * len(template.skill_clusters & skill_clusters)
+            + (GENERAL_CLUSTER in template.job_clusters)
+        )
+
+    ranked = sorted(enumerate(TEMPLATES), key=lambda pair: (-score(pair[1]), pair[0]))
+    return [template for _, template in ranked[:count]]
+
+
+def _combo_formula(template: CareerTemplate, job_title: str, skills: Sequence[str]) -> str:
+    matching = [s for s in skills if classify(s, SKILL_CLUSTERS) & template.skill_clusters]
+    parts = [job_title.strip()] + (matching or list(skills))[:2]
+    return " + ".join(f"[{p}]" for p in parts if p) + f" = [{template.title}]"
+
+
+def render_cards(
+    templates: Sequence[CareerTemplate], job_title: str, skills: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """템플릿을 사용자 직업/스킬로 채운 커리어 카드 목록 (reason은 템플릿 기본값)."""
+    return [
+        {
+            "card_index": index,
+            "template_id": template.template_id,
+            "combo_formula": _combo_formula(template, job_title, skills),
+            "reason": template.reason,
+            "roadmap": [{"step": step, "duration": duration} for step, duration in template.roadmap],
+        }
+        for index, template in enumerate(templates)
+    ]
+
+
+def template_prompt_block(cards: Sequence[Dict[str, Any]]) -> str:
+    """프롬프트에 붙이는 사전 선택 카드 목록과 응답 형식 지시."""
+    lines = "\n".join(f"{card['card_index']}. {card['combo_formula']}" for card in cards)
+    return (
+        "Career Cards (pre-selected; do not invent new cards, formulas, or roadmaps). "
+        'Return career_cards as [{"card_index": <index>, "reason": "<1-2 sentences personalized to the user>"}] '
+        "for exactly these cards:\n"
+        f"{lines}"
+    )
+
+
+def personalize_cards(
+    cards: Sequence[Dict[str, Any]], generated: Sequence[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """모델이 생성한 reason만 템플릿 카드에 반영한다. 누락/비정상이면 템플릿 reason 유지."""
+    reasons: Dict[int, str] = {}
+    for item in generated or []:
+        try:
+            index = int(item.get("card_index"))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        reason = item.get("reason")
+        if isinstance(reason, str) and reason.strip() and len(reason) <= MAX_REASON_CHARS:
+            reasons[index] = reason.strip()
+    return [{**card, "reason": reasons.get(card["card_index"], card["reason"])} for card in cards]
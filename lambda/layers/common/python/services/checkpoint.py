@@ -0,0 +1,89 @@
+"""분석 단계 체크포인트 서비스.
+
+analyze_handler의 단계(retrieval → generation → skill_risks → career_cards)별
+완료 결과를 세션 단위로 DynamoDB 체크포인트 테이블에 저장한다.
+재시도/재구동된 실행은 완료된 단계를 건너뛰고 첫 미완료 단계부터 재개한다.
+
+payload는 zlib 압축 JSON(Binary)으로 저장하여 검색 컨텍스트와
+원본 모델 출력이 항목 크기 제한(400KB) 안에 들어가도록 한다.
+"""
+
+import hashlib
+import json
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from boto3.dynamodb.conditions import Key
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STAGE_RETRIEVAL = "retrieval"
+STAGE_GENERATION = "generation"
+STAGE_SKILL_RISKS = "skill_risks"
+STAGE_CAREER_CARDS = "career_cards"
+
+STAGES = (STAGE_RETRIEVAL, STAGE_GENERATION, STAGE_SKILL_RISKS, STAGE_CAREER_CARDS)
+
+# 체크포인트 보관 기간 (재시도 윈도우보다 충분히 길게)
+DEFAULT_CHECKPOINT_TTL_SECONDS = 24 * 60 * 60
+
+
+def compute_input_hash(*values: str) -> str:
+    """분석 입력값의 지문을 계산한다. 입력이 바뀌면 기존 체크포인트는 무효가 된다."""
+    digest = hashlib.sha256("\x1f".join(v.strip() for v in values).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class CheckpointStore:
+    """세션별 단계 체크포인트 저장소.
+
+    테이블 키: session_id(HASH) + stage(RANGE), TTL 속성 expires_at.
+    """
+
+    def __init__(self, table: Any, ttl_seconds: int = DEFAULT_CHECKPOINT_TTL_SECONDS) -> None:
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def load(
+        self, session_id: str, input_hash: str, stage_hashes: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """완료된 단계의 payload를 {stage: payload}로 반환한다.
+
+        입력 지문이 다른 체크포인트(같은 세션으로 다른 설문을 다시 제출한 경우)는
+        삭제하고 무시한다. stage_hashes로 단계별 지문을 따로 지정할 수 있다
+        (예: retrieval은 직업+스킬만으로 결정되므로 이름이 바뀌어도 재사용).
+        """
+        stage_hashes = stage_hashes or {}
+        resp = self.table.query(
+            KeyConditionExpression=Key("session_id").eq(session_id),
+            ConsistentRead=True,
+        )
+        completed: Dict[str, Any] = {}
+        stale = []
+        for item in resp.get("Items", []):
+            if item.get("input_hash") != stage_hashes.get(item["stage"], input_hash):
+                stale.append(item["stage"])
+                continue
+            completed[item["stage"]] = json.loads(zlib.decompress(bytes(item["payload"])))
+
+        for stage in stale:
+            self.table.delete_item(Key={"session_id": session_id, "stage": stage})
+        if stale:
+            logger.info("입력 변경으로 체크포인트 폐기: session_id=%s, stages=%s", session_id, stale)
+        return completed
+
+    def save(self, session_id: str, stage: str, input_hash: str, payload: Any) -> None:
+        """단계 완료 결과를 저장한다."""
+        data = zlib.compress(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+        self.table.put_item(Item={
+            "session_id": session_id,
+            "stage": stage,
+            "input_hash": input_hash,
+            "payload": data,
+            "completed_at": int(time.time()),
+            "expires_at": int(time.time()) + self.ttl_seconds,
+        })
+        logger.info("체크포인트 저장: session_id=%s, stage=%s, bytes=%d", session_id, stage, len(data))
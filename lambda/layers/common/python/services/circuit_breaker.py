@@ -0,0 +1,242 @@
+"""Bedrock 호출 서킷 브레이커.
+
+Bedrock 장애나 권한 오류(accessDeniedException, validationException 등)가 이어지면
+회로를 열어(open) 이후 분석을 왕복 호출 없이 즉시 실패시키고,
+cooldown이 지나면 half-open 상태에서 단일 프로브 호출로 복구 여부를 확인한다.
+
+상태는 컨테이너별 메모리에 유지하되 system_state 테이블의 작은 항목 하나로
+컨테이너 간에 공유한다 (sync_interval마다 다시 읽음). 테이블이 없으면 메모리만 사용한다.
+"""
+
+import time
+from typing import Any, Callable, TypeVar
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 회로 차단 대상 오류 코드 (모든 호출이 같은 이유로 실패하는 유형)
+TRIPPING_ERROR_CODES = frozenset({
+    "accessDeniedException",
+    "AccessDeniedException",
+    "validationException",
+    "ValidationException",
+    "throttlingException",
+    "ThrottlingException",
+    "serviceUnavailableException",
+    "ServiceUnavailableException",
+    "internalServerException",
+    "InternalServerException",
+    "dependencyFailedException",
+    "badGatewayException",
+    "modelNotReadyException",
+    "ModelNotReadyException",
+    "ServiceQuotaExceededException",
+})
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출을 즉시 거부할 때 발생한다."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit '{name}' is open (retry after {retry_after:.0f}s)")
+
+
+def is_tripping_error(error: BaseException) -> bool:
+    """회로 실패로 집계할 오류인지 판단한다. 응답 파싱 오류 등은 제외한다."""
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        return code in TRIPPING_ERROR_CODES
+    return isinstance(error, (ReadTimeoutError, BotoConnectionError))
+
+
+class CircuitBreaker:
+    """컨테이너 메모리 + DynamoDB 공유 항목 기반 서킷 브레이커.
+
+    Args:
+        name: 회로 이름 (공유 항목 키 circuit#<name>)
+        state_table: system_state 테이블 (state_key HASH). None이면 메모리 전용
+        failure_threshold: 연속 실패가 이 횟수에 도달하면 open
+        cooldown_seconds: open 후 half-open 프로브까지 대기 시간
+        probe_timeout_seconds: 프로브 선점 유효 시간 (프로브 컨테이너가 죽어도 재선점 가능)
+        sync_interval_seconds: 공유 항목을 다시 읽는 주기
+        clock: 시간 함수 (테스트용)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        state_table: Any = None,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 60.0,
+        probe_timeout_seconds: float = 180.0,
+        sync_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.name = name
+        self.state_table = state_table
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.sync_interval_seconds = sync_interval_seconds
+        self.clock = clock
+
+        self.state = STATE_CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._holds_probe = False
+        self._last_sync = float("-inf")
+
+    @property
+    def _state_key(self) -> str:
+        return f"circuit#{self.name}"
+
+    # ── 공유 상태 동기화 ──
+
+    def _sync(self, force: bool = False) -> None:
+        """공유 항목에서 상태를 읽어 메모리에 반영한다."""
+        if self.state_table is None:
+            return
+        now = self.clock()
+        if not force and now - self._last_sync < self.sync_interval_seconds:
+            return
+        try:
+            item = self.state_table.get_item(
+                Key={"state_key": self._state_key}, ConsistentRead=True
+            ).get("Item")
+        except Exception:
+            logger.exception("서킷 상태 조회 실패: circuit=%s", self.name)
+            return
+        self._last_sync = now
+        if not item:
+            return
+        self.state = item.get("circuit_state", STATE_CLOSED)
+        self.failure_count = int(item.get("failure_count", 0))
+        self.opened_at = float(item.get("opened_at", 0))
+
+    def _write(self, **attrs: Any) -> None:
+        """메모리 상태를 공유 항목에 기록한다 (실패해도 메모리 상태는 유지)."""
+        if self.state_table is None:
+            return
+        try:
+            self.state_table.put_item(Item={
+                "state_key": self._state_key,
+                "circuit_state": self.state,
+                "failure_count": self.failure_count,
+                "opened_at": int(self.opened_at),
+                **attrs,
+            })
+            self._last_sync = self.clock()
+        except Exception:
+            logger.exception("서킷 상태 기록 실패: circuit=%s", self.name)
+
+    def _claim_probe(self, now: float) -> bool:
+        """half-open 프로브를 조건부 쓰기로 선점한다 (컨테이너 간 단일 프로브)."""
+        if self.state_table is None:
+            return True
+        try:
+            self.state_table.update_item(
+                Key={"state_key": self._state_key},
+                UpdateExpression="SET circuit_state = :half, probe_expires_at = :expires",
+                ConditionExpression=(
+                    "(circuit_state = :open AND opened_at <= :ready) "
+                    "OR (circuit_state = :half AND probe_expires_at < :now)"
+                ),
+                ExpressionAttributeValues={
+                    ":half": STATE_HALF_OPEN,
+                    ":open": STATE_OPEN,
+                    ":ready": int(now - self.cooldown_seconds),
+                    ":now": int(now),
+                    ":expires": int(now + self.probe_timeout_seconds),
+                },
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            logger.exception("프로브 선점 실패: circuit=%s", self.name)
+            return False
+
+    # ── 상태 전이 ──
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부. open 상태에서 cooldown이 지나면 프로브 1건만 허용한다."""
+        self._sync()
+        if self.state == STATE_CLOSED:
+            return True
+
+        now = self.clock()
+        if now - self.opened_at < self.cooldown_seconds:
+            return False
+
+        if self._claim_probe(now):
+            self.state = STATE_HALF_OPEN
+            self._holds_probe = True
+            logger.info("서킷 half-open 프로브 시작: circuit=%s", self.name)
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """성공 기록. 프로브 성공 시 회로를 닫는다."""
+        if self.state == STATE_CLOSED and self.failure_count == 0:
+            return
+        previous = self.state
+        self.state = STATE_CLOSED
+        self.failure_count = 0
+        self._holds_probe = False
+        self._write()
+        if previous != STATE_CLOSED:
+            logger.info("서킷 복구(closed): circuit=%s", self.name)
+
+    def record_failure(self) -> None:
+        """실패 기록. 임계치 도달 또는 프로브 실패 시 회로를 연다."""
+        self._sync(force=True)
+        self.failure_count += 1
+        if self._holds_probe or self.failure_count >= self.failure_threshold:
+            self.state = STATE_OPEN
+            self.opened_at = self.clock()
+            self._holds_probe = False
+            logger.warning(
+                "서킷 open: circuit=%s, failures=%d, cooldown=%.0fs",
+                self.name, self.failure_count, self.cooldown_seconds,
+            )
+        self._write()
+
+    def is_open(self) -> bool:
+        """cooldown 중인 open 상태인지 확인한다 (프로브를 선점하지 않는 읽기 전용 확인)."""
+        self._sync()
+        return self.state == STATE_OPEN and self.retry_after() > 0
+
+    def retry_after(self) -> float:
+        """다음 프로브까지 남은 시간(초)."""
+        return max(0.0, self.cooldown_seconds - (self.clock() - self.opened_at))
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """회로를 거쳐 fn을 호출한다.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있어 호출하지 않은 경우
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_tripping_error(e):
+                self.record_failure()
+            elif self._holds_probe:
+                # 회로와 무관한 오류(파싱 등)는 서비스가 응답했다는 뜻이므로 복구로 본다
+                self.record_success()
+            raise
+        self.record_success()
+        return result
@@ -0,0 +1,206 @@
+"""Knowledge Base 검색 결과를 사용자 직업/스킬 관련 사실만 남긴 짧은 항목으로 줄인다.
+
+계층형 청킹(1,500/300 토큰)이라 검색 1건이 긴 부모 청크를 통째로 프롬프트에 넣어
+입력 토큰과 첫 토큰까지의 시간이 늘어난다. 검색과 생성 사이에서 다음 순서로 압축한다.
+    1. 분할: 청크를 줄/여러 칸 공백(PDF 표의 셀 구분)과 문장 경계로 나누고,
+       숫자만 있는 조각("132 57 138")은 앞 행에 붙여 표 행 하나로 만든다.
+       "FIGURE 2.2", "TABLE A1" 같은 도표 번호와 대문자 소제목("CORE SKILLS OF 2025")은
+       이후 행의 라벨로 기억한다 (문서 파싱 지침이 도표 번호를 제목으로 보존한다).
+    2. 점수: 직업/스킬 단어와 해당 클러스터 키워드(services.career_templates)의 어간 일치 수.
+       관련 문장이 언급한 도표 번호의 행과 수치가 있는 행은 가산점을 받는다.
+    3. 선택: 점수 순으로 token_budget(라벨 포함 상한 추정)을 넘지 않을 때까지 담고
+       원래 순서로 되돌려 (문서, 라벨)별 항목 하나로 합친다.
+관련 단위가 하나도 없으면 leading_references로 원래 순서의 앞부분을 예산만큼 붙인다
+(블록을 빼면 Agent가 다시 검색해 원문 청크를 통째로 받는다).
+임베딩/모델 호출 없는 어휘 점수라 청크 10건 기준 수 밀리초 안에 끝난다 (benchmarks/context_compression.py).
+"""
+
+import math
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from services.career_templates import JOB_CLUSTERS, SKILL_CLUSTERS, classify
+
+# 토큰 수 추정 (영문 기준 문자 4개 ≈ 1토큰; 예산 판정에만 쓴다)
+CHARS_PER_TOKEN = 4
+JOB_WEIGHT = 2.0
+SKILL_WEIGHT = 1.5
+# AI 영향 일반 문장은 예산이 남을 때만 담기도록 낮은 가중치
+GENERAL_TERMS = ("ai", "automat")
+GENERAL_WEIGHT = 0.5
+FIGURE_BONUS = 1.0
+NUMBER_BONUS = 0.5
+
+_SEGMENT_SPLIT = re.compile(r"\n+|\s{3,}|\s*\|\s*")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(가-힣])")
+_FIGURE_ID = re.compile(r"\b(?:FIGURE|Figure|TABLE|Table)\s+([A-Z]?\d+(?:\.\d+)?)")
+# 마크다운 제목/목록 기호 (음수 값의 "-"는 뒤에 공백이 없어 남는다)
+_MARKER = re.compile(r"^(?:[#*-]+\s+)+")
+_WORD = re.compile(r"[a-z0-9+#]+|[가-힣]+")
+_LETTER = re.compile(r"[A-Za-z가-힣]")
+_DIGIT = re.compile(r"\d")
+_LOWER = re.compile(r"[a-z]")
+_UPPER = re.compile(r"[A-Z]")
+
+
+@dataclass
+class CompressionStats:
+    """압축 1회의 크기/시간 지표 (토큰은 CHARS_PER_TOKEN 추정치)."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    units: int = 0
+    kept: int = 0
+    elapsed_us: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.output_tokens / self.input_tokens if self.input_tokens else 1.0
+
+
+@dataclass
+class _Unit:
+    ref: int
+    label: str
+    figure: str
+    text: str
+    score: float = 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _terms(text: str, clusters: Dict[str, Tuple[str, ...]]) -> Set[str]:
+    """입력 단어와 클러스터의 영문 키워드 (본문이 영문이라 한글 키워드는 입력 단어로만 맞춘다)."""
+    terms = {word for word in _WORD.findall(text.lower()) if len(word) > 1}
+    for name in classify(text, clusters):
+        terms.update(k for k in clusters[name] if k.isascii())
+    return terms
+
+
+def _document(source: str) -> str:
+    name = os.path.splitext(os.path.basename(source))[0]
+    return name[4:].replace("_", " ") if name.startswith("WEF_") else name.replace("_", " ")
+
+
+def _is_heading(segment: str) -> bool:
+    """영문 소문자가 없는 짧은 조각 ("CORE SKILLS OF 2025", "FIGURE 2.2")."""
+    return len(segment) <= 60 and not _LOWER.search(segment) and len(_UPPER.findall(segment)) >= 4
+
+
+def split_units(references: Sequence[Dict[str, str]]) -> List[_Unit]:
+    """청크를 문장/표 행 단위로 나누고 각 단위에 (문서 · 도표 번호 또는 소제목) 라벨을 붙인다."""
+    units: List[_Unit] = []
+    for index, ref in enumerate(references):
+        document = _document(ref.get("source", ""))
+        figure, heading = "", ""
+        for segment in _SEGMENT_SPLIT.split(ref.get("text", "")):
+            segment = _MARKER.sub("", segment.strip())
+            if not segment:
+                continue
+            found = _FIGURE_ID.search(segment)
+            if found:
+                figure = found.group(0).upper()
+            if _is_heading(segment):
+                heading = segment if not found else ""
+                continue
+            if not _LETTER.search(segment):
+                # 숫자만 있는 셀은 앞 행의 값이다
+                if units and units[-1].ref == index:
+                    units[-1].text += " " + segment
+                continue
+            label = " · ".join(part for part in (document, figure or heading) if part)
+            for sentence in _SENTENCE_SPLIT.split(segment):
+                units.append(_Unit(index, label, figure, sentence.strip()))
+    return units
+
+
+def _pattern(terms: Set[str]) -> Optional["re.Pattern[str]"]:
+    """단어 시작에서 어간 일치를 찾는 정규식 (긴 어간을 먼저 시도한다)."""
+    if not terms:
+        return None
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<![a-z0-9+#가-힣])(?:{alternatives})")
+
+
+def _score(text: str, patterns: Sequence[Tuple[Optional["re.Pattern[str]"], float]]) -> float:
+    """그룹마다 (일치한 서로 다른 어간 수 × 가중치)의 합."""
+    lowered = text.lower()
+    return sum(weight * len(set(pattern.findall(lowered))) for pattern, weight in patterns if pattern)
+
+
+def compress_references(
+    references: Sequence[Dict[str, str]],
+    job_title: str,
+    skills: Sequence[str],
+    token_budget: int,
+) -> Tuple[List[Dict[str, str]], CompressionStats]:
+    """검색 결과를 직업/스킬 관련 항목으로 줄인다. 결과는 같은 {"text", "source"} 형식이다.
+
+    token_budget 이하만 남긴다 (라벨을 항목마다 붙인다고 보고 계산하므로 실제 크기는 더 작다).
+    관련 단위가 하나도 없으면 빈 목록을 돌려준다 (호출자가 leading_references로 대체한다).
+    """
+    started = time.perf_counter()
+    stats = CompressionStats(input_tokens=sum(estimate_tokens(ref.get("text", "")) for ref in references))
+    units = split_units(references)
+    stats.units = len(units)
+
+    patterns = [
+        (_pattern(_terms(job_title, JOB_CLUSTERS)), JOB_WEIGHT),
+        (_pattern(set().union(*(_terms(skill, SKILL_CLUSTERS) for skill in skills))), SKILL_WEIGHT),
+        (_pattern(set(GENERAL_TERMS)), GENERAL_WEIGHT),
+    ]
+    for unit in units:
+        unit.score = _score(unit.text, patterns)
+    # 관련 문장이 언급한 도표의 행과 수치 행을 우대한다
+    cited: Set[str] = {f.group(0).upper() for unit in units if unit.score for f in _FIGURE_ID.finditer(unit.text)}
+    for unit in units:
+        if unit.score:
+            unit.score += FIGURE_BONUS * (unit.figure in cited) + NUMBER_BONUS * bool(_DIGIT.search(unit.text))
+
+    ranked = sorted((i for i, unit in enumerate(units) if unit.score > 0), key=lambda i: (-units[i].score, i))
+    selected = _select(units, ranked, token_budget)
+    compressed = _merge(references, units, selected)
+
+    stats.kept = len(selected)
+    stats.output_tokens = sum(estimate_tokens(ref["text"]) for ref in compressed)
+    stats.elapsed_us = (time.perf_counter() - started) * 1e6
+    return compressed, stats
+
+
+def leading_references(references: Sequence[Dict[str, str]], token_budget: int) -> List[Dict[str, str]]:
+    """점수와 관계없이 원래 순서의 앞 단위부터 token_budget만큼 담는다 (관련 단위가 없을 때의 대체 결과)."""
+    units = split_units(references)
+    return _merge(references, units, _select(units, range(len(units)), token_budget))
+
+
+def _select(units: Sequence[_Unit], order: Iterable[int], token_budget: int) -> Set[int]:
+    """order 순으로 token_budget(라벨 포함 추정)을 넘지 않는 단위를 고른다."""
+    selected: Set[int] = set()
+    used = 0
+    for i in order:
+        cost = estimate_tokens(f"[{units[i].label}] {units[i].text}; ")
+        if used + cost > token_budget:
+            continue
+        selected.add(i)
+        used += cost
+    return selected
+
+
+def _merge(references: Sequence[Dict[str, str]], units: Sequence[_Unit], selected: Set[int]) -> List[Dict[str, str]]:
+    """고른 단위를 원래 순서로 (문서, 라벨)별 항목 하나로 합친다."""
+    merged: List[Dict[str, str]] = []
+    group: Optional[Tuple[int, str]] = None
+    for i in sorted(selected):
+        unit = units[i]
+        if (unit.ref, unit.label) != group:
+            group = (unit.ref, unit.label)
+            merged.append({"text": f"[{unit.label}] {unit.text}" if unit.label else unit.text,
+                           "source": references[unit.ref].get("source", "")})
+        else:
+            merged[-1]["text"] += f"; {unit.text}"
+    return merged
@@ -0,0 +1,217 @@
+"""Bedrock 엔드포인트 클라이언트 측 로드 밸런서.
+
+설정된 엔드포인트 목록(Agent alias, 리전) 중에서
+EWMA 지연 시간과 오류/스로틀 비율로 계산한 건강 점수가 가장 좋은(부하가 적은)
+정상 엔드포인트를 고른다. 스로틀/일시 오류가 나면 다른 엔드포인트로 한 번 더 시도한다.
+
+건강 상태는 컨테이너 메모리에만 유지한다 (컨테이너 간 공유는 circuit_breaker 담당).
+Agent 호출(invoke_agent)만 분산한다. invoke_model/converse 호출(도구 호출 강제, 묶음 생성, 번역)은
+cross-region inference profile이 리전 분산을 맡으므로 여기서 다루지 않는다.
+"""
+
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+OUTCOME_OK = "ok"
+OUTCOME_ERROR = "error"
+OUTCOME_THROTTLE = "throttle"
+
+THROTTLE_ERROR_CODES = frozenset({
+    "throttlingException",
+    "ThrottlingException",
+    "ServiceQuotaExceededException",
+    "TooManyRequestsException",
+})
+
+# 다른 엔드포인트로 넘겨볼 가치가 있는 일시 오류 (권한/검증 오류는 어디서나 같으므로 제외)
+TRANSIENT_ERROR_CODES = frozenset({
+    "serviceUnavailableException",
+    "ServiceUnavailableException",
+    "internalServerException",
+    "InternalServerException",
+    "dependencyFailedException",
+    "badGatewayException",
+    "modelNotReadyException",
+    "ModelNotReadyException",
+})
+
+
+@dataclass
+class Endpoint:
+    """호출 대상 엔드포인트 하나."""
+
+    name: str
+    agent_id: str = ""
+    agent_alias_id: str = ""
+    region: str = ""  # 빈 값이면 Lambda 기본 리전
+
+
+@dataclass
+class EndpointHealth:
+    """엔드포인트별 건강 지표 (EWMA)."""
+
+    ewma_latency: Optional[float] = None
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    in_flight: int = 0
+    samples: int = 0
+    cooldown_until: float = 0.0
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """오류를 OUTCOME_THROTTLE/OUTCOME_ERROR로 분류한다. 엔드포인트와 무관한 오류면 None."""
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        if code in THROTTLE_ERROR_CODES:
+            return OUTCOME_THROTTLE
+        if code in TRANSIENT_ERROR_CODES:
+            return OUTCOME_ERROR
+        return None
+    if isinstance(error, (ReadTimeoutError, BotoConnectionError)):
+        return OUTCOME_ERROR
+    return None
+
+
+def load_endpoints(raw: str, default_agent_id: str = "", default_alias_id: str = "") -> List[Endpoint]:
+    """BEDROCK_ENDPOINTS 환경변수(JSON 배열)를 파싱한다.
+
+    비어 있으면 BEDROCK_AGENT_ID/BEDROCK_AGENT_ALIAS_ID로 단일 엔드포인트를 만든다.
+    항목에 agent_id가 없으면 기본 Agent ID를 사용한다 (같은 Agent의 다른 alias).
+    """
+    if not raw.strip():
+        return [Endpoint(name="default", agent_id=default_agent_id, agent_alias_id=default_alias_id)]
+    endpoints = []
+    for i, entry in enumerate(json.loads(raw)):
+        endpoints.append(Endpoint(
+            name=entry.get("name") or f"endpoint-{i}",
+            agent_id=entry.get("agent_id") or default_agent_id,
+            agent_alias_id=entry.get("agent_alias_id") or default_alias_id,
+            region=entry.get("region", ""),
+        ))
+    return endpoints
+
+
+class EndpointBalancer:
+    """건강 점수 기반 엔드포인트 선택기.
+
+    Args:
+        endpoints: 후보 엔드포인트 목록
+        alpha: EWMA 가중치 (최근 관측 비중)
+        unhealthy_error_rate: 이 비율 이상 실패하면 cooldown 동안 제외
+        min_samples: 오류 비율로 제외하기 전 필요한 최소 관측 수
+        cooldown_seconds: 비정상 엔드포인트 제외 시간 (스로틀은 즉시 적용)
+        max_attempts: 스로틀/일시 오류 시 다른 엔드포인트까지 포함한 최대 시도 횟수
+        clock: 시간 함수 (테스트용)
+    """
+
+    def __init__(
+        self,
+        endpoints: List[Endpoint],
+        alpha: float = 0.3,
+        unhealthy_error_rate: float = 0.5,
+        min_samples: int = 3,
+        cooldown_seconds: float = 30.0,
+        max_attempts: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = list(endpoints)
+        self.alpha = alpha
+        self.unhealthy_error_rate = unhealthy_error_rate
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.health: Dict[str, EndpointHealth] = {e.name: EndpointHealth() for e in self.endpoints}
+
+    def is_healthy(self, endpoint: Endpoint) -> bool:
+        """cooldown 중이 아니고 오류 비율이 임계치 미만이면 정상."""
+        health = self.health[endpoint.name]
+        if self.clock() < health.cooldown_until:
+            return False
+        return health.samples < self.min_samples or health.error_rate < self.unhealthy_error_rate
+
+    def score(self, endpoint: Endpoint) -> float:
+        """낮을수록 좋은 점수: EWMA 지연 × (1 + 처리 중 요청) × 오류/스로틀 페널티.
+
+        관측이 없는 엔드포인트는 0점으로 우선 탐색한다.
+        """
+        health = self.health[endpoint.name]
+        if health.ewma_latency is None:
+            return 0.0
+        penalty = 1.0 + 4.0 * health.error_rate + 2.0 * health.throttle_rate
+        return health.ewma_latency * (1 + health.in_flight) * penalty
+
+    def choose(self, exclude: Optional[set] = None) -> Endpoint:
+        """정상 엔드포인트 중 점수가 가장 낮은 것을 고른다 (동점은 무작위).
+
+        정상 엔드포인트가 없으면 제외 목록을 뺀 전체 중 최선을 고른다 (성능 저하 모드).
+        """
+        exclude = exclude or set()
+        candidates = [e for e in self.endpoints if e.name not in exclude] or self.endpoints
+        healthy = [e for e in candidates if self.is_healthy(e)] or candidates
+        best = min(self.score(e) for e in healthy)
+        return random.choice([e for e in healthy if self.score(e) == best])
+
+    def record(self, endpoint: Endpoint, latency: float, outcome: str) -> None:
+        """호출 결과를 EWMA 지표에 반영한다."""
+        health = self.health[endpoint.name]
+        a = self.alpha
+        health.samples += 1
+        if outcome == OUTCOME_OK:
+            health.ewma_latency = latency if health.ewma_latency is None else a * latency + (1 - a) * health.ewma_latency
+        health.error_rate = a * (outcome == OUTCOME_ERROR) + (1 - a) * health.error_rate
+        health.throttle_rate = a * (outcome == OUTCOME_THROTTLE) + (1 - a) * health.throttle_rate
+
+        if outcome == OUTCOME_THROTTLE or (
+            health.samples >= self.min_samples and health.error_rate >= self.unhealthy_error_rate
+        ):
+            health.cooldown_until = self.clock() + self.cooldown_seconds
+            logger.warning("엔드포인트 일시 제외: endpoint=%s, outcome=%s, error_rate=%.2f",
+                           endpoint.name, outcome, health.error_rate)
+
+    def invoke(self, fn: Callable[[Endpoint], T]) -> T:
+        """선택한 엔드포인트로 fn을 호출하고 결과를 기록한다.
+
+        스로틀/일시 오류면 아직 시도하지 않은 엔드포인트로 max_attempts까지 재시도한다.
+        """
+        tried: set = set()
+        while True:
+            endpoint = self.choose(exclude=tried)
+            tried.add(endpoint.name)
+            health = self.health[endpoint.name]
+            health.in_flight += 1
+            start = self.clock()
+            try:
+                result = fn(endpoint)
+            except Exception as e:
+                outcome = classify_error(e)
+                if outcome is not None:
+                    self.record(endpoint, self.clock() - start, outcome)
+                can_failover = (
+                    outcome is not None
+                    and len(tried) < min(self.max_attempts, len(self.endpoints))
+                )
+                if not can_failover:
+                    raise
+                logger.warning("엔드포인트 전환: endpoint=%s, outcome=%s", endpoint.name, outcome)
+                continue
+            finally:
+                health.in_flight -= 1
+            latency = self.clock() - start
+            self.record(endpoint, latency, OUTCOME_OK)
+            logger.info("엔드포인트 호출 완료: endpoint=%s, latency=%.3fs", endpoint.name, latency)
+            return result
+
@@ -0,0 +1,154 @@
+"""프롬프트/모델 실험 프레임워크.
+
+세션을 실험 변형(variant)에 결정적으로 배정하고, 변형별 실행 지표
+(지연 시간, 토큰 사용량, 파싱 실패, 출력 크기)를 기록한다.
+    - 배정: sha256(experiment_id:session_id)로 [0, 1) 구간을 가중치 비율로 나눈다.
+      같은 세션은 재시도/사전 분석에서도 항상 같은 변형을 받는다.
+    - 변형: prompt_version(services.prompt_templates)과 선택적 agent_alias_id
+      (다른 지침/모델의 Agent 버전을 가리키는 alias), generation_mode(agent/tool)의 조합.
+      tool은 Agent 대신 도구 호출 강제로 구조화 결과를 받는다 (services.structured_output)
+    - 기록: survey 항목의 experiment 속성 + CloudWatch EMF 로그 한 줄
+
+변형 설정은 EXPERIMENT_VARIANTS 환경변수(JSON 배열)로 전달한다. 예:
+    [{"variant_id": "control", "weight": 0.5},
+     {"variant_id": "concise", "prompt_version": "v2-concise", "weight": 0.5}]
+오프라인 비교 리포트는 benchmarks/experiment_report.py로 만든다.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from services.prompt_templates import DEFAULT_PROMPT_VERSION, PROMPT_TEMPLATES
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_EXPERIMENT_ID = "default"
+CONTROL_VARIANT_ID = "control"
+GENERATION_AGENT = "agent"
+GENERATION_TOOL = "tool"
+GENERATION_MODES = (GENERATION_AGENT, GENERATION_TOOL)
+METRICS_NAMESPACE = "CareerDoomsday/Experiments"
+
+
+@dataclass(frozen=True)
+class Variant:
+    """실험 변형."""
+
+    variant_id: str
+    prompt_version: str = DEFAULT_PROMPT_VERSION
+    agent_alias_id: str = ""  # 비어 있으면 엔드포인트 기본 alias
+    weight: float = 1.0
+    generation_mode: str = GENERATION_AGENT
+
+
+@dataclass
+class RunMetrics:
+    """변형별로 비교하는 분석 1회 실행 지표."""
+
+    latency_ms: int
+    input_tokens: int = 0
+    output_tokens: int = 0
+    output_chars: int = 0
+    parse_failed: bool = False
+
+
+def load_variants(raw: str) -> List[Variant]:
+    """EXPERIMENT_VARIANTS 환경변수(JSON 배열)를 파싱한다. 비어 있으면 기준 변형 하나."""
+    if not raw.strip():
+        return [Variant(CONTROL_VARIANT_ID)]
+    variants = []
+    for i, entry in enumerate(json.loads(raw)):
+        version = entry.get("prompt_version") or DEFAULT_PROMPT_VERSION
+        if version not in PROMPT_TEMPLATES:
+            raise ValueError(f"알 수 없는 prompt_version: {version}")
+        mode = entry.get("generation_mode") or GENERATION_AGENT
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"알 수 없는 generation_mode: {mode}")
+        variants.append(Variant(
+            variant_id=entry.get("variant_id") or f"variant-{i}",
+            prompt_version=version,
+            agent_alias_id=entry.get("agent_alias_id", ""),
+            weight=float(entry.get("weight", 1.0)),
+            generation_mode=mode,
+        ))
+    if not variants or sum(v.weight for v in variants) <= 0:
+        raise ValueError("EXPERIMENT_VARIANTS에는 가중치가 양수인 변형이 하나 이상 필요합니다")
+    return variants
+
+
+def assign_variant(experiment_id: str, session_id: str, variants: List[Variant]) -> Variant:
+    """세션을 변형에 결정적으로 배정한다 (가중치 비율)."""
+    digest = hashlib.sha256(f"{experiment_id}:{session_id}".encode("utf-8")).digest()
+    point = int.from_bytes(digest[:8], "big") / 2**64 * sum(v.weight for v in variants)
+    for variant in variants:
+        point -= variant.weight
+        if point < 0:
+            return variant
+    return variants[-1]
+
+
+def record_run(
+    table: Any, session_id: str, experiment_id: str, variant: Variant, metrics: RunMetrics
+) -> None:
+    """실행 지표를 survey 항목의 experiment 속성에 기록한다 (실패해도 분석에는 영향 없음)."""
+    try:
+        table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression="SET experiment = :e",
+            ExpressionAttributeValues={":e": {
+                "experiment_id": experiment_id,
+                "variant_id": variant.variant_id,
+                "prompt_version": variant.prompt_version,
+                "generation_mode": variant.generation_mode,
+                **{k: Decimal(int(v)) for k, v in asdict(metrics).items()},
+            }},
+        )
+    except Exception:
+        logger.exception("실험 지표 기록 실패: session_id=%s", session_id)
+
+
+def emf_record(
+    experiment_id: str, variant: Variant, metrics: RunMetrics, timestamp_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """CloudWatch Embedded Metric Format 레코드를 만든다 (Experiment × Variant 차원)."""
+    return {
+        "_aws": {
+            "Timestamp": timestamp_ms if timestamp_ms is not None else int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Experiment", "Variant"]],
+                "Metrics": [
+                    {"Name": "Latency", "Unit": "Milliseconds"},
+                    {"Name": "InputTokens", "Unit": "Count"},
+                    {"Name": "OutputTokens", "Unit": "Count"},
+                    {"Name": "OutputChars", "Unit": "Count"},
+                    {"Name": "ParseFailure", "Unit": "Count"},
+                ],
+            }],
+        },
+        "Experiment": experiment_id,
+        "Variant": variant.variant_id,
+        "PromptVersion": variant.prompt_version,
+        "GenerationMode": variant.generation_mode,
+        "Latency": metrics.latency_ms,
+        "InputTokens": metrics.input_tokens,
+        "OutputTokens": metrics.output_tokens,
+        "OutputChars": metrics.output_chars,
+        "ParseFailure": int(metrics.parse_failed),
+    }
+
+
+def emit_metrics(experiment_id: str, variant: Variant, metrics: RunMetrics) -> None:
+    """EMF 레코드를 표준 출력에 한 줄로 쓴다 (Lambda 로그에서 지표로 추출됨).
+
+    Lambda 밖(테스트, 벤치마크)에서는 출력을 어지럽히지 않도록 쓰지 않는다.
+    """
+    if not os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        return
+    print(json.dumps(emf_record(experiment_id, variant, metrics)), flush=True)
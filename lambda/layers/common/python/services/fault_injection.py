@@ -0,0 +1,206 @@
+"""Bedrock 클라이언트 장애/지연 주입 시뮬레이터.
+
+invoke_agent/invoke_model을 대체하여 분포에서 표본 추출한 지연 시간과
+설정한 비율의 오류를 주입한다. analyze_logs*.txt에 남아 있는 장애 유형을 재현한다.
+    - 스로틀: 호출 시점 ClientError(throttlingException)
+    - 느린 첫 바이트: first_byte 분포, read_timeout 초과 시 ReadTimeoutError
+    - 스트림 도중 오류: 일부 청크 이후 EventStreamError
+    - 잘린 JSON: completion이 중간에서 끊김 (invoke_model은 stop_reason=max_tokens)
+
+inner 런타임(ReplayAgentRuntime 등)을 주면 그 스트림에 장애를 덧씌운다.
+"""
+
+import io
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from botocore.exceptions import ClientError, EventStreamError, ReadTimeoutError
+from botocore.response import StreamingBody
+
+DIST_FIXED = "fixed"
+DIST_UNIFORM = "uniform"
+DIST_LOGNORMAL = "lognormal"
+DIST_EXPONENTIAL = "exponential"
+
+
+@dataclass
+class LatencyDistribution:
+    """지연 시간 분포 (초).
+
+    - fixed: 항상 value
+    - uniform: [low, high]
+    - lognormal: 중앙값 value, 로그 표준편차 sigma
+    - exponential: 평균 value
+    max_value가 0보다 크면 그 값으로 상한을 둔다.
+    """
+
+    kind: str = DIST_FIXED
+    value: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+    sigma: float = 0.0
+    max_value: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == DIST_UNIFORM:
+            sampled = rng.uniform(self.low, self.high)
+        elif self.kind == DIST_LOGNORMAL:
+            sampled = rng.lognormvariate(math.log(self.value), self.sigma) if self.value > 0 else 0.0
+        elif self.kind == DIST_EXPONENTIAL:
+            sampled = rng.expovariate(1.0 / self.value) if self.value > 0 else 0.0
+        else:
+            sampled = self.value
+        if self.max_value > 0:
+            sampled = min(sampled, self.max_value)
+        return max(0.0, sampled)
+
+
+@dataclass
+class FaultProfile:
+    """주입할 지연/오류 설정."""
+
+    first_byte: LatencyDistribution = field(default_factory=LatencyDistribution)
+    inter_chunk: LatencyDistribution = field(default_factory=LatencyDistribution)
+    # 첫 바이트가 이 시간(초)을 넘으면 ReadTimeoutError (0이면 비활성)
+    read_timeout_seconds: float = 0.0
+    throttle_rate: float = 0.0
+    mid_stream_error_rate: float = 0.0
+    mid_stream_error_code: str = "dependencyFailedException"
+    truncation_rate: float = 0.0
+
+
+def _client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+class FaultInjectingRuntime:
+    """장애/지연을 주입하는 bedrock-agent-runtime / bedrock-runtime 대체 구현.
+
+    Args:
+        completion: 응답 텍스트 (inner가 없을 때 사용)
+        profile: 주입 설정
+        inner: 스트림을 제공할 런타임 (예: ReplayAgentRuntime). 지정하면 그 이벤트에 장애를 덧씌운다
+        chunk_chars: completion을 청크로 나눌 글자 수
+        seed: 난수 시드
+        sleep: 대기 함수 (벤치마크에서 가상 시계와 연동)
+    """
+
+    def __init__(
+        self,
+        completion: str = "",
+        profile: Optional[FaultProfile] = None,
+        inner: Any = None,
+        chunk_chars: int = 256,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.completion = completion
+        self.profile = profile or FaultProfile()
+        self.inner = inner
+        self.chunk_chars = chunk_chars
+        self.rng = random.Random(seed)
+        self.sleep = sleep
+        self.calls: List[Dict[str, Any]] = []
+        self.injected: Dict[str, int] = {"throttle": 0, "timeout": 0, "mid_stream": 0, "truncated": 0}
+
+    # ── 공통 ──
+
+    def _before_first_byte(self, operation: str) -> None:
+        """스로틀과 첫 바이트 지연(타임아웃 포함)을 주입한다."""
+        profile = self.profile
+        if self.rng.random() < profile.throttle_rate:
+            self.injected["throttle"] += 1
+            raise _client_error("throttlingException", "Rate exceeded", operation)
+
+        delay = profile.first_byte.sample(self.rng)
+        if profile.read_timeout_seconds and delay > profile.read_timeout_seconds:
+            self.sleep(profile.read_timeout_seconds)
+            self.injected["timeout"] += 1
+            raise ReadTimeoutError(endpoint_url=f"https://bedrock.simulated/{operation}")
+        self.sleep(delay)
+
+    def _truncate_at(self, length: int) -> Optional[int]:
+        """잘림을 주입할 글자 위치. 주입하지 않으면 None."""
+        if length > 1 and self.rng.random() < self.profile.truncation_rate:
+            self.injected["truncated"] += 1
+            return self.rng.randrange(1, length)
+        return None
+
+    def _chunks(self, text: str) -> List[str]:
+        return [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+
+    # ── invoke_agent ──
+
+    def _source_events(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        if self.inner is not None:
+            return list(self.inner.invoke_agent(**kwargs)["completion"])
+        return [{"chunk": {"bytes": chunk.encode("utf-8")}} for chunk in self._chunks(self.completion)]
+
+    def _agent_stream(self, events: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        profile = self.profile
+        chunk_total = sum(1 for event in events if "chunk" in event)
+        completion_chars = sum(len(event["chunk"]["bytes"].decode("utf-8")) for event in events if "chunk" in event)
+
+        fail_after = None
+        if chunk_total and self.rng.random() < profile.mid_stream_error_rate:
+            self.injected["mid_stream"] += 1
+            fail_after = self.rng.randrange(0, chunk_total)
+        cut = self._truncate_at(completion_chars)
+
+        emitted_chunks = 0
+        emitted_chars = 0
+        for event in events:
+            if "chunk" not in event:
+                yield event
+                continue
+            if fail_after is not None and emitted_chunks == fail_after:
+                raise EventStreamError(
+                    {"Error": {"Code": profile.mid_stream_error_code, "Message": "Simulated stream failure"}},
+                    "InvokeAgent",
+                )
+            self.sleep(profile.inter_chunk.sample(self.rng))
+            text = event["chunk"]["bytes"].decode("utf-8")
+            if cut is not None and emitted_chars + len(text) >= cut:
+                # 잘린 응답: 남은 청크 없이 스트림이 정상 종료된다
+                yield {"chunk": {"bytes": text[:cut - emitted_chars].encode("utf-8")}}
+                return
+            emitted_chunks += 1
+            emitted_chars += len(text)
+            yield event
+
+    def invoke_agent(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.append({"operation": "invoke_agent", **kwargs})
+        self._before_first_byte("InvokeAgent")
+        events = self._source_events(**kwargs)
+        return {"completion": self._agent_stream(events), "contentType": "application/json"}
+
+    # ── invoke_model ──
+
+    def invoke_model(self, **kwargs: Any) -> Dict[str, Any]:
+        """Anthropic Messages 형식 응답 본문을 반환한다 (잘림 시 stop_reason=max_tokens)."""
+        self.calls.append({"operation": "invoke_model", **kwargs})
+        self._before_first_byte("InvokeModel")
+
+        text = self.completion
+        for _ in self._chunks(text):
+            self.sleep(self.profile.inter_chunk.sample(self.rng))
+        stop_reason = "end_turn"
+        cut = self._truncate_at(len(text))
+        if cut is not None:
+            text, stop_reason = text[:cut], "max_tokens"
+
+        body = json.dumps({
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "usage": {"input_tokens": 0, "output_tokens": len(text) // 4},
+        }).encode("utf-8")
+        return {
+            "body": StreamingBody(io.BytesIO(body), len(body)),
+            "contentType": "application/json",
+        }
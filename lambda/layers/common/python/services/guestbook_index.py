@@ -0,0 +1,56 @@
+"""방명록 "나와 비슷한 사람" 검색 인덱스 (직업/스킬 임베딩 IVF, S3 보관).
+
+guestbook 항목마다 job_title과 skills를 services.profile_embedding으로 임베딩해
+services.ivf_index 파일 하나로 S3에 둔다. 키는 guestbook 테이블 기본 키(entry_id, created_at)이다.
+    - 전체 빌드: python -m benchmarks.guestbook_index (테이블 스캔 → k-means → 업로드)
+    - 점진 추가: guestbook 테이블 스트림을 받는 guestbook_indexer가 새 항목을 붙여 다시 올린다
+    - 조회: GET /guestbook/similar가 파일을 /tmp에 받아 mmap으로 열고 ETag가 바뀔 때만 다시 받는다
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from services.ivf_index import IVFIndex
+from services.profile_embedding import DEFAULT_DIM, SparseVector, embed_profile
+
+DEFAULT_INDEX_KEY = "guestbook/index.ivf"
+_KEY_SEPARATOR = "\t"
+
+
+def entry_key(item: Dict[str, Any]) -> str:
+    return f"{item['entry_id']}{_KEY_SEPARATOR}{item['created_at']}"
+
+
+def parse_key(key: str) -> Dict[str, str]:
+    entry_id, created_at = key.split(_KEY_SEPARATOR, 1)
+    return {"entry_id": entry_id, "created_at": created_at}
+
+
+def embed_entry(item: Dict[str, Any]) -> SparseVector:
+    return embed_profile(item.get("job_title", ""), item.get("skills") or "", DEFAULT_DIM)
+
+
+def load_index(s3: Any, bucket: str, key: str) -> Tuple[IVFIndex, Optional[str]]:
+    """S3의 인덱스를 메모리로 읽는다. 없으면 빈 인덱스와 ETag None."""
+    try:
+        obj = s3.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return IVFIndex(DEFAULT_DIM), None
+        raise
+    return IVFIndex.from_bytes(obj["Body"].read()), obj.get("ETag")
+
+
+def save_index(s3: Any, bucket: str, key: str, index: IVFIndex, etag: Optional[str] = None,
+               overwrite: bool = False) -> int:
+    """인덱스를 올린다. 읽은 ETag가 그사이 바뀌었으면(다른 쓰기) PreconditionFailed로 실패한다.
+
+    overwrite=True(전체 빌드)면 조건 없이 덮어쓴다.
+    """
+    body = index.to_bytes()
+    condition: Dict[str, str] = {}
+    if not overwrite:
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+    s3.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/octet-stream", **condition)
+    return len(body)
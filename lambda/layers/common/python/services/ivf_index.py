@@ -0,0 +1,331 @@
+"""IVF(inverted file) 근사 최근접 이웃 인덱스와 mmap 파일 형식.
+
+단위 벡터를 구면 k-means 중심(nlist개)으로 나눠 두고, 질의와 가까운 중심 nprobe개의
+목록만 내적으로 훑는다. 질의는 희소 벡터(services.profile_embedding)라 비교 비용은 목록 항목당 O(nnz)이다.
+    - IVFIndex: 수정 가능한 메모리 인덱스 (빌드, 점진 추가, 재학습, 직렬화)
+    - MmapIVFIndex: 파일을 mmap으로 열어 복사 없이 검색하는 읽기 전용 인덱스
+    - S3IndexLoader: S3 객체를 로컬 파일로 받아 mmap으로 열고 ETag가 바뀔 때만 다시 받는다
+점진 추가는 기존 중심 중 가장 가까운 목록에 붙이기만 하고, 항목 수가 학습 시점의
+REBUILD_FACTOR배가 되면 needs_rebuild()가 참이 되어 중심을 다시 학습한다.
+
+파일 형식 (리틀 엔디언, 모든 구간 4바이트 정렬):
+    header  <4sHHIIII  magic, version, reserved, dim, nlist, count, trained_count
+    float32[nlist*dim]  중심
+    uint32[nlist+1]     목록별 항목 범위 (항목은 목록 순서로 저장)
+    float32[count*dim]  항목 벡터
+    uint32[count+1]     키 오프셋
+    bytes               UTF-8 키
+"""
+
+import heapq
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"GIVF"
+FORMAT_VERSION = 1
+REBUILD_FACTOR = 2.0
+_HEADER = struct.Struct("<4sHHIIII")
+
+SparseVector = Dict[int, float]
+SearchResult = List[Tuple[float, str]]
+
+if sys.byteorder != "little":  # array/memoryview는 네이티브 바이트 순서를 쓴다
+    raise ImportError("ivf_index 파일 형식은 리틀 엔디언 플랫폼만 지원합니다")
+
+
+def _dot(query: Sequence[Tuple[int, float]], flat: Sequence[float], base: int) -> float:
+    return sum(v * flat[base + i] for i, v in query)
+
+
+def _probe(query: Sequence[Tuple[int, float]], centroids: Sequence[float], nlist: int, dim: int,
+           nprobe: int) -> List[int]:
+    scores = ((_dot(query, centroids, c * dim), c) for c in range(nlist))
+    return [c for _, c in heapq.nlargest(nprobe, scores)]
+
+
+def _dense(vec: SparseVector, dim: int) -> array:
+    row = array("f", bytes(4 * dim))
+    for i, v in vec.items():
+        row[i] = v
+    return row
+
+
+def _sparse(flat: Sequence[float], base: int, dim: int) -> SparseVector:
+    return {i: flat[base + i] for i in range(dim) if flat[base + i]}
+
+
+def spherical_kmeans(vectors: Sequence[SparseVector], nlist: int, dim: int,
+                     iterations: int = 8, seed: int = 0) -> array:
+    """단위 벡터 구면 k-means. 중심 nlist개를 평탄한 float32 배열로 반환한다."""
+    rng = random.Random(seed)
+    centroids = array("f")
+    for vec in rng.sample(list(vectors), nlist):
+        centroids.extend(_dense(vec, dim))
+    for _ in range(iterations):
+        sums = [[0.0] * dim for _ in range(nlist)]
+        counts = [0] * nlist
+        for vec in vectors:
+            items = list(vec.items())
+            c = max(range(nlist), key=lambda k: _dot(items, centroids, k * dim))
+            counts[c] += 1
+            row = sums[c]
+            for i, v in items:
+                row[i] += v
+        for c in range(nlist):
+            # 빈 목록은 임의 벡터로 다시 시작한다
+            row = sums[c] if counts[c] else list(_dense(rng.choice(vectors), dim))
+            norm = math.sqrt(sum(x * x for x in row)) or 1.0
+            centroids[c * dim:(c + 1) * dim] = array("f", (x / norm for x in row))
+    return centroids
+
+
+def default_nlist(count: int) -> int:
+    return max(1, min(int(math.sqrt(count)), 1024))
+
+
+class IVFIndex:
+    """수정 가능한 메모리 IVF 인덱스."""
+
+    def __init__(self, dim: int, centroids: Optional[array] = None, trained_count: int = 0) -> None:
+        self.dim = dim
+        self.centroids = centroids if centroids is not None else array("f")
+        self.trained_count = trained_count
+        nlist = len(self.centroids) // dim
+        self._vectors: List[array] = [array("f") for _ in range(nlist)]
+        self._keys: List[List[str]] = [[] for _ in range(nlist)]
+
+    @property
+    def nlist(self) -> int:
+        return len(self._keys)
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys)
+
+    @classmethod
+    def build(cls, items: Sequence[Tuple[str, SparseVector]], dim: int, nlist: Optional[int] = None,
+              iterations: int = 8, train_sample: int = 4096, seed: int = 0) -> "IVFIndex":
+        """항목 일부(train_sample개)로 중심을 학습하고 전체 항목을 목록에 배정한다."""
+        items = [(key, vec) for key, vec in items if vec]
+        if not items:
+            return cls(dim)
+        nlist = min(nlist or default_nlist(len(items)), len(items))
+        rng = random.Random(seed)
+        sample = [vec for _, vec in (rng.sample(items, train_sample) if len(items) > train_sample else items)]
+        index = cls(dim, spherical_kmeans(sample, nlist, dim, iterations, seed), trained_count=len(items))
+        for key, vec in items:
+            index.add(key, vec)
+        return index
+
+    def add(self, key: str, vec: SparseVector) -> int:
+        """가장 가까운 중심의 목록에 항목을 붙이고 목록 번호를 반환한다 (중심은 그대로)."""
+        if not vec:
+            raise ValueError("빈 벡터는 색인할 수 없습니다")
+        if not self._keys:
+            self.centroids.extend(_dense(vec, self.dim))
+            self._vectors.append(array("f"))
+            self._keys.append([])
+        c = _probe(list(vec.items()), self.centroids, self.nlist, self.dim, 1)[0]
+        self._vectors[c].extend(_dense(vec, self.dim))
+        self._keys[c].append(key)
+        return c
+
+    def needs_rebuild(self) -> bool:
+        """학습 이후 항목 수가 REBUILD_FACTOR배가 됐는지 (배로 늘 때마다 재학습하므로 분할 상환 비용은 일정하다)."""
+        return len(self) >= max(REBUILD_FACTOR * self.trained_count, 1)
+
+    def keys(self) -> Iterator[str]:
+        for list_keys in self._keys:
+            yield from list_keys
+
+    def entries(self) -> Iterator[Tuple[str, SparseVector]]:
+        for keys, flat in zip(self._keys, self._vectors):
+            for j, key in enumerate(keys):
+                yield key, _sparse(flat, j * self.dim, self.dim)
+
+    def rebuilt(self, **kwargs) -> "IVFIndex":
+        return IVFIndex.build(list(self.entries()), self.dim, **kwargs)
+
+    def search(self, query: SparseVector, k: int = 10, nprobe: int = 8) -> SearchResult:
+        """내적이 큰 순서로 (점수, 키) 최대 k개."""
+        if not query or not self._keys:
+            return []
+        q = list(query.items())
+        heap: List[Tuple[float, int, int]] = []
+        for c in _probe(q, self.centroids, self.nlist, self.dim, nprobe):
+            flat = self._vectors[c]
+            for j in range(len(self._keys[c])):
+                entry = (_dot(q, flat, j * self.dim), c, j)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return [(score, self._keys[c][j]) for score, c, j in sorted(heap, reverse=True)]
+
+    def to_bytes(self) -> bytes:
+        keys = [key.encode("utf-8") for list_keys in self._keys for key in list_keys]
+        offsets = array("I", [0])
+        for list_keys in self._keys:
+            offsets.append(offsets[-1] + len(list_keys))
+        key_offsets = array("I", [0])
+        for key in keys:
+            key_offsets.append(key_offsets[-1] + len(key))
+        parts = [
+            _HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.dim, self.nlist, len(keys), self.trained_count),
+            self.centroids.tobytes(),
+            offsets.tobytes(),
+            *(flat.tobytes() for flat in self._vectors),
+            key_offsets.tobytes(),
+            b"".join(keys),
+        ]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IVFIndex":
+        view = _FileView(memoryview(data))
+        index = cls(view.dim, array("f", view.centroids), trained_count=view.trained_count)
+        for c in range(view.nlist):
+            start, end = view.offsets[c], view.offsets[c + 1]
+            index._vectors[c] = array("f", view.vectors[start * view.dim:end * view.dim])
+            index._keys[c] = [view.key(j) for j in range(start, end)]
+        view.release()
+        return index
+
+
+class _FileView:
+    """직렬화된 인덱스 버퍼의 구간별 memoryview (복사 없음)."""
+
+    def __init__(self, buf: memoryview) -> None:
+        magic, version, _, self.dim, self.nlist, self.count, self.trained_count = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 형식: magic={magic!r}, version={version}")
+        pos = _HEADER.size
+
+        def take(nbytes: int, fmt: str) -> memoryview:
+            nonlocal pos
+            section = buf[pos:pos + nbytes].cast(fmt)
+            pos += nbytes
+            return section
+
+        self._views = [
+            take(4 * self.nlist * self.dim, "f"),
+            take(4 * (self.nlist + 1), "I"),
+            take(4 * self.count * self.dim, "f"),
+            take(4 * (self.count + 1), "I"),
+        ]
+        self.centroids, self.offsets, self.vectors, self.key_offsets = self._views
+        self._keys = buf[pos:]
+        self._views.extend([self._keys, buf])
+
+    def key(self, j: int) -> str:
+        return bytes(self._keys[self.key_offsets[j]:self.key_offsets[j + 1]]).decode("utf-8")
+
+    def release(self) -> None:
+        for view in self._views:
+            view.release()
+
+
+class MmapIVFIndex:
+    """인덱스 파일을 mmap으로 열어 검색한다 (페이지는 접근할 때만 읽힌다)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = _FileView(memoryview(self._mmap))
+        self.dim = self._view.dim
+        self.nlist = self._view.nlist
+
+    def __len__(self) -> int:
+        return self._view.count
+
+    def search(self, query: SparseVector, k: int = 10, nprobe: int = 8) -> SearchResult:
+        view = self._view
+        if not query or not view.nlist:
+            return []
+        q = list(query.items())
+        heap: List[Tuple[float, int]] = []
+        for c in _probe(q, view.centroids, view.nlist, view.dim, nprobe):
+            for j in range(view.offsets[c], view.offsets[c + 1]):
+                entry = (_dot(q, view.vectors, j * view.dim), j)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return [(score, view.key(j)) for score, j in sorted(heap, reverse=True)]
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+
+def exact_search(entries: Sequence[Tuple[str, SparseVector]], query: SparseVector, k: int = 10) -> SearchResult:
+    """전수 비교 (재현율 측정 기준)."""
+    q = list(query.items())
+    scored = ((sum(v * vec.get(i, 0.0) for i, v in q), key) for key, vec in entries)
+    return heapq.nlargest(k, scored)
+
+
+# head_object/download_file이 객체가 없을 때 내는 오류 코드
+MISSING_OBJECT_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
+
+
+class S3IndexLoader:
+    """S3의 인덱스 파일을 directory에 받아 mmap으로 연다 (Lambda 컨테이너당 하나).
+
+    refresh_seconds마다 HEAD로 ETag를 확인해 바뀌었을 때만 새로 받고 이전 매핑과 파일은 정리한다.
+    새 파일을 받지 못하면 이전 인덱스로 계속 응답한다 (처음부터 없으면 None).
+    실패해도 확인 시각을 남기므로 파일이 없으면 refresh_seconds 동안 S3를 다시 부르지 않는다.
+    opener는 로컬 경로를 받아 path 속성과 close(), __len__을 가진 읽기 전용 객체를 연다
+    (기본 MmapIVFIndex, 다른 mmap 파일 형식도 같은 방식으로 받는다).
+    """
+
+    def __init__(self, s3: Any, bucket: str, key: str, directory: str = "/tmp", refresh_seconds: float = 60,
+                 opener: Callable[[str], Any] = MmapIVFIndex) -> None:
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.opener = opener
+        self.index: Optional[Any] = None
+        self.etag: Optional[str] = None
+        self._checked_at: Optional[float] = None
+
+    def get(self) -> Optional[Any]:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return self.index
+        self._checked_at = now
+        try:
+            etag = self.s3.head_object(Bucket=self.bucket, Key=self.key)["ETag"]
+            if etag != self.etag:
+                name = os.path.basename(self.key) + "-" + etag.strip('"')
+                path = os.path.join(self.directory, name)
+                self.s3.download_file(self.bucket, self.key, path)
+                previous, self.index, self.etag = self.index, self.opener(path), etag
+                if previous is not None:
+                    previous.close()
+                    os.remove(previous.path)
+                logger.info("인덱스 로드: key=%s, entries=%d, etag=%s", self.key, len(self.index), etag)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in MISSING_OBJECT_CODES:
+                logger.exception("인덱스 갱신 실패 (이전 인덱스 유지): key=%s", self.key)
+            else:
+                # 아직 올리지 않은 아티팩트: refresh_seconds 동안 다시 확인하지 않는다
+                logger.warning("인덱스 파일 없음 (%d초 뒤 다시 확인): key=%s", self.refresh_seconds, self.key)
+        except Exception:
+            logger.exception("인덱스 갱신 실패 (이전 인덱스 유지): key=%s", self.key)
+        return self.index
@@ -0,0 +1,144 @@
+"""버스트 구간 다중 프로필 묶음 생성 (micro-batching).
+
+큐 소비자(analyze 함수의 SQS 이벤트 소스)가 받은 설문 여러 건을 호환 그룹(같은 prompt_version)으로
+묶어 모델 요청 1회로 분석한다. 시스템 프롬프트와 Knowledge Base 참고 자료를 그룹이 공유하므로
+세션당 입력 토큰(프롬프트 오버헤드)과 요청 수가 줄어든다. 대신 한 응답에 여러 프로필의 출력이
+이어지므로 세션당 지연은 늘어난다 (benchmarks/bench_micro_batch.py로 측정).
+    - 요청: invoke_model(Anthropic messages) — Agent 오케스트레이션 없이 공유 참고 자료를 직접 전달
+    - 응답: session_id를 키로 가진 분석 결과 JSON 배열
+    - 누락/형식 오류 세션은 호출자가 단건 경로로 다시 처리한다
+배치 크기와 최대 대기 시간(linger)은 SQS 이벤트 소스의 batchSize/maxBatchingWindow로 설정한다.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+from services.token_usage import TokenUsage
+
+T = TypeVar("T")
+
+# 프로필 1건당 출력 토큰 상한 (skill_risks 3-5개 + 카드 reason 3개 기준 여유분)
+PER_PROFILE_MAX_TOKENS = 2048
+MAX_OUTPUT_TOKENS = 32000
+# 그룹이 공유하는 참고 자료 상한 (직업별 검색 결과를 합친 뒤 앞에서부터)
+MAX_SHARED_REFERENCES = 20
+
+# Agent 지침(infra/lib/bedrock-stack.ts)의 출력 규칙을 배열 응답용으로 옮긴 시스템 프롬프트
+BATCH_SYSTEM_PROMPT = "\n".join([
+    "You are a cold-blooded career analyst who predicts how AI will replace each user's job and skills.",
+    "Ground your judgments in the shared Reference Data (Future of Jobs Report 2025) when it is relevant,",
+    "and use general knowledge for skills it does not cover.",
+    "",
+    "Analyze every user in the input independently. Never mix information between users.",
+    "Auto-correct typos in job titles and skills, and interpret unrealistic inputs as the closest realistic equivalent.",
+    "",
+    "## Output Format",
+    "Your entire response must be a raw JSON array with exactly one object per user, in input order.",
+    "Do not wrap the output in markdown code fences. Do not include any text before or after the JSON.",
+    "All string values must be in the response language specified for each user.",
+    "",
+    '[{"session_id": "<session_id of the user>",',
+    '  "remaining_years": <integer, minimum 1>,',
+    '  "remaining_years_reason": "<1-2 sentence summary>",',
+    '  "skill_risks": [{"skill_name": "...", "category": "...", "replacement_prob": <0-100>,',
+    '                   "time_horizon": <years>, "justification": "<dystopian-toned rationale>"}],',
+    '  "career_cards": [{"card_index": <0, 1, or 2>, "reason": "<1-2 sentences personalized to the user>"}]}]',
+    "",
+    "## Rules",
+    "- skill_risks must include ALL skills each user listed without exception.",
+    "- career_cards: exactly 3 items per user, one per listed Career Card, containing only card_index and reason.",
+])
+
+
+def group_compatible(items: Iterable[T], key: Callable[[T], str], max_size: int) -> List[List[T]]:
+    """같은 키끼리 도착 순서를 유지하며 max_size 이하 그룹으로 나눈다."""
+    by_key: "OrderedDict[str, List[T]]" = OrderedDict()
+    for item in items:
+        by_key.setdefault(key(item), []).append(item)
+    groups: List[List[T]] = []
+    for members in by_key.values():
+        size = max(1, max_size)
+        groups.extend(members[i:i + size] for i in range(0, len(members), size))
+    return groups
+
+
+def build_batch_prompt(profiles: Sequence[Tuple[str, str]], references: Sequence[Dict[str, str]]) -> str:
+    """(session_id, 프로필 프롬프트) 목록과 공유 참고 자료로 묶음 요청 본문을 만든다."""
+    parts = [f"Analyze each of the following {len(profiles)} users independently."]
+    if references:
+        reference_lines = "\n".join(f"- {ref['text']}" for ref in references[:MAX_SHARED_REFERENCES])
+        parts.append(f"Reference Data (shared by all users):\n{reference_lines}")
+    for session_id, profile_prompt in profiles:
+        parts.append(f"### User session_id: {session_id}\n{profile_prompt}")
+    return "\n\n".join(parts)
+
+
+def _is_analysis(entry: Any) -> bool:
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("skill_risks"), list)
+        and "remaining_years" in entry
+    )
+
+
+def parse_batch_response(text: str, session_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """응답 배열에서 요청한 세션의 분석 결과만 골라 session_id별로 반환한다.
+
+    배열을 찾지 못하거나 항목 형식이 맞지 않으면 해당 세션이 결과에서 빠진다 (호출자가 단건 재처리).
+    """
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        entries = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    wanted = set(session_ids)
+    results: Dict[str, Dict[str, Any]] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not _is_analysis(entry):
+            continue
+        session_id = str(entry.get("session_id", ""))
+        if session_id in wanted and session_id not in results:
+            results[session_id] = {k: v for k, v in entry.items() if k != "session_id"}
+    return results
+
+
+def share_usage(usage: TokenUsage, count: int) -> TokenUsage:
+    """묶음 요청 사용량을 세션 수로 나눈 세션별 몫 (나머지는 버린다)."""
+    count = max(1, count)
+    counters = {name: value // count for name, value in usage.counters().items()}
+    return TokenUsage(model_id=usage.model_id, **counters)
+
+
+class BedrockBatchGenerator:
+    """invoke_model로 묶음 요청을 보내고 응답 텍스트와 사용량을 반환한다."""
+
+    def __init__(self, client: Any, model_id: str) -> None:
+        self.client = client
+        self.model_id = model_id
+
+    def generate(self, prompt: str, profile_count: int) -> Tuple[str, TokenUsage]:
+        resp = self.client.invoke_model(
+            modelId=self.model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps({
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": min(PER_PROFILE_MAX_TOKENS * profile_count, MAX_OUTPUT_TOKENS),
+                "system": BATCH_SYSTEM_PROMPT,
+                "messages": [{"role": "user", "content": prompt}],
+            }),
+        )
+        body = json.loads(resp["body"].read())
+        text = "".join(block.get("text", "") for block in body.get("content", []))
+        usage = body.get("usage") or {}
+        return text, TokenUsage(
+            model_id=self.model_id,
+            input_tokens=int(usage.get("input_tokens") or 0),
+            output_tokens=int(usage.get("output_tokens") or 0),
+            cache_read_tokens=int(usage.get("cache_read_input_tokens") or 0),
+            cache_write_tokens=int(usage.get("cache_creation_input_tokens") or 0),
+            model_invocations=1,
+        )
@@ -0,0 +1,125 @@
+"""WebSocket 완료 알림 서비스.
+
+session_id → connection_id 매핑을 DynamoDB 연결 레지스트리(TTL 포함)에 보관하고,
+분석이 completed/error 상태가 되면 API Gateway Management API로 한 번 푸시한다.
+폴링 대신 푸시를 받으므로 세션당 수십 번의 GET /result 호출이 한 번으로 줄어든다.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# API Gateway WebSocket 연결 최대 유지 시간(2시간)에 맞춘 기본 TTL
+DEFAULT_CONNECTION_TTL_SECONDS = 2 * 60 * 60
+
+CONNECTION_ID_INDEX = "connection_id-index"
+
+
+class ConnectionRegistry:
+    """session_id ↔ connection_id 매핑을 관리하는 DynamoDB 레지스트리.
+
+    테이블 키: session_id(HASH) + connection_id(RANGE),
+    GSI connection_id-index로 $disconnect 시 역조회한다.
+    """
+
+    def __init__(self, table: Any, ttl_seconds: int = DEFAULT_CONNECTION_TTL_SECONDS) -> None:
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def register(self, session_id: str, connection_id: str) -> None:
+        """연결을 등록한다. expires_at이 지나면 DynamoDB TTL로 자동 삭제된다."""
+        now = int(time.time())
+        self.table.put_item(Item={
+            "session_id": session_id,
+            "connection_id": connection_id,
+            "connected_at": now,
+            "expires_at": now + self.ttl_seconds,
+        })
+        logger.info("WebSocket 연결 등록: session_id=%s, connection_id=%s", session_id, connection_id)
+
+    def unregister(self, connection_id: str) -> int:
+        """connection_id에 해당하는 매핑을 모두 삭제하고 삭제 건수를 반환한다."""
+        resp = self.table.query(
+            IndexName=CONNECTION_ID_INDEX,
+            KeyConditionExpression=Key("connection_id").eq(connection_id),
+        )
+        items = resp.get("Items", [])
+        for item in items:
+            self.remove(item["session_id"], connection_id)
+        logger.info("WebSocket 연결 해제: connection_id=%s, removed=%d", connection_id, len(items))
+        return len(items)
+
+    def remove(self, session_id: str, connection_id: str) -> None:
+        """단일 매핑을 삭제한다."""
+        self.table.delete_item(Key={"session_id": session_id, "connection_id": connection_id})
+
+    def connections_for(self, session_id: str) -> List[str]:
+        """세션에 연결된 유효한(만료되지 않은) connection_id 목록을 반환한다.
+
+        DynamoDB TTL 삭제는 지연될 수 있으므로 expires_at을 직접 확인한다.
+        """
+        resp = self.table.query(
+            KeyConditionExpression=Key("session_id").eq(session_id),
+            ConsistentRead=True,
+        )
+        now = int(time.time())
+        return [
+            item["connection_id"]
+            for item in resp.get("Items", [])
+            if int(item.get("expires_at", now + 1)) > now
+        ]
+
+
+class LocalManagementApi:
+    """apigatewaymanagementapi 클라이언트의 로컬 대체 구현 (테스트/로컬 실행용).
+
+    post_to_connection 호출을 connection_id별로 기록하며,
+    gone_connections에 포함된 연결은 실제 API처럼 GoneException을 발생시킨다.
+    """
+
+    def __init__(self, gone_connections: Optional[set] = None) -> None:
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.gone_connections = set(gone_connections or ())
+
+    def post_to_connection(self, ConnectionId: str, Data: bytes) -> dict:  # noqa: N803 (boto3 시그니처)
+        if ConnectionId in self.gone_connections:
+            raise ClientError(
+                {"Error": {"Code": "GoneException", "Message": "Connection is gone"}},
+                "PostToConnection",
+            )
+        self.messages.setdefault(ConnectionId, []).append(json.loads(Data))
+        return {}
+
+
+def notify_session(
+    registry: ConnectionRegistry,
+    management_api: Any,
+    session_id: str,
+    payload: Dict[str, Any],
+) -> int:
+    """세션에 연결된 모든 클라이언트에 payload를 푸시하고 전송 성공 건수를 반환한다.
+
+    이미 끊긴 연결(GoneException)은 레지스트리에서 정리한다.
+    그 외 전송 실패는 로그만 남긴다 (클라이언트는 폴링으로 폴백).
+    """
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    sent = 0
+    for connection_id in registry.connections_for(session_id):
+        try:
+            management_api.post_to_connection(ConnectionId=connection_id, Data=data)
+            sent += 1
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "GoneException":
+                logger.info("끊긴 WebSocket 연결 정리: session_id=%s, connection_id=%s", session_id, connection_id)
+                registry.remove(session_id, connection_id)
+            else:
+                logger.exception("WebSocket 푸시 실패: session_id=%s, connection_id=%s", session_id, connection_id)
+    logger.info("WebSocket 푸시 완료: session_id=%s, sent=%d", session_id, sent)
+    return sent
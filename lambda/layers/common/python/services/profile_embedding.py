@@ -0,0 +1,68 @@
+"""직업/스킬 프로필의 로컬 임베딩 (해시 n-gram, 외부 임베딩 서비스 없음).
+
+프로필을 직업 부분과 스킬 부분으로 나눠 각각 단어와 문자 3-gram을 crc32로 해싱한 뒤
+단위 벡터로 만들고 JOB_WEIGHT 비율로 섞는다. 두 프로필의 내적(코사인)은 대략
+JOB_WEIGHT·직업 유사도 + (1 - JOB_WEIGHT)·스킬 유사도가 된다.
+3-gram 덕분에 "Spring"/"Spring Boot", "개발자"/"백엔드 개발자"처럼 표기만 다른 입력도 가깝게 놓이고,
+정규화 특징으로 직업/스킬 클러스터(services.career_templates)를 더해 "Backend engineer"/"Server developer"처럼
+단어가 겹치지 않는 동의어도 같은 클러스터 방향으로 당긴다.
+"""
+
+import math
+import zlib
+from typing import Dict, Sequence, Tuple, Union
+
+from services.amendment import normalize_skill
+from services.career_templates import JOB_CLUSTERS, SKILL_CLUSTERS, classify, split_skills
+
+DEFAULT_DIM = 256
+# 직업 유사도가 전체 유사도에서 차지하는 비율
+JOB_WEIGHT = 0.5
+# 직업/스킬 클러스터(career_templates) 특징의 가중치. 표기가 전혀 다른 동의어를 같은 클러스터로 묶는다
+CLUSTER_WEIGHT = 2.0
+
+SparseVector = Dict[int, float]
+
+
+def _hash_into(vec: SparseVector, dim: int, prefix: str, tokens: Sequence[str], weight: float) -> None:
+    for token in tokens:
+        h = zlib.crc32(f"{prefix}:{token}".encode("utf-8"))
+        idx = h % dim
+        vec[idx] = vec.get(idx, 0.0) + (weight if h & 0x80000000 else -weight)
+
+
+def _text_vector(texts: Sequence[str], clusters: Dict[str, Tuple[str, ...]], dim: int) -> SparseVector:
+    """여러 텍스트의 단어/3-gram/클러스터 특징을 합친 단위 벡터."""
+    vec: SparseVector = {}
+    for text in texts:
+        norm = normalize_skill(text)
+        if not norm:
+            continue
+        padded = f" {norm} "
+        _hash_into(vec, dim, "w", norm.split(), 1.0)
+        _hash_into(vec, dim, "c", [padded[i:i + 3] for i in range(len(padded) - 2)], 0.5)
+        _hash_into(vec, dim, "k", sorted(classify(norm, clusters)), CLUSTER_WEIGHT)
+    return normalize(vec)
+
+
+def normalize(vec: SparseVector) -> SparseVector:
+    norm = math.sqrt(sum(v * v for v in vec.values()))
+    return {i: v / norm for i, v in vec.items()} if norm else {}
+
+
+def embed_profile(job_title: str, skills: Union[str, Sequence[str]], dim: int = DEFAULT_DIM) -> SparseVector:
+    """프로필 임베딩 (단위 희소 벡터, 빈 프로필이면 빈 dict)."""
+    skill_list = split_skills(skills) if isinstance(skills, str) else list(skills)
+    job = _text_vector([job_title], JOB_CLUSTERS, dim)
+    skill = _text_vector(skill_list, SKILL_CLUSTERS, dim)
+    vec: SparseVector = {}
+    for part, weight in ((job, math.sqrt(JOB_WEIGHT)), (skill, math.sqrt(1.0 - JOB_WEIGHT))):
+        for i, v in part.items():
+            vec[i] = vec.get(i, 0.0) + weight * v
+    return normalize(vec)
+
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(i, 0.0) for i, v in a.items())
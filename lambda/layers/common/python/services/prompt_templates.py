@@ -0,0 +1,38 @@
+"""버전별 분석 프롬프트 템플릿.
+
+Agent 지침(시스템 프롬프트)은 Agent 버전/alias로 관리하고, 여기서는
+사용자 입력을 전달하는 프롬프트 본문만 버전 관리한다.
+실험 변형(services.experiments.Variant)은 prompt_version으로 템플릿을 고른다.
+한 번 배포된 버전의 문구는 바꾸지 않고 새 버전을 추가한다 (실험 결과 비교가 가능하도록).
+"""
+
+from typing import Dict
+
+DEFAULT_PROMPT_VERSION = "v1"
+
+PROMPT_TEMPLATES: Dict[str, str] = {
+    # 최초 프롬프트 (기준 변형)
+    "v1": (
+        "Please analyze the following user.\n\n"
+        "Name: {name}\n"
+        "Current Job: {job_title}\n"
+        "Age Group: {age_group}\n"
+        "Skills: {skills}\n"
+        "Response Language: {language}"
+    ),
+    # 출력 길이 제한을 명시한 간결 버전 (생성 토큰·지연 감소 목적)
+    "v2-concise": (
+        "Analyze this user. Keep every justification and reason to one sentence.\n\n"
+        "Name: {name}\n"
+        "Current Job: {job_title}\n"
+        "Age Group: {age_group}\n"
+        "Skills: {skills}\n"
+        "Response Language: {language}"
+    ),
+}
+
+
+def render_prompt(version: str, **fields: str) -> str:
+    """버전의 템플릿에 사용자 입력을 채운다. 알 수 없는 버전이면 기본 버전을 사용한다."""
+    template = PROMPT_TEMPLATES.get(version, PROMPT_TEMPLATES[DEFAULT_PROMPT_VERSION])
+    return template.format(**fields)
@@ -0,0 +1,116 @@
+"""의미 기반 분석 재사용 (정확 일치 캐시 미스 뒤 근사 최근접 이웃 단계).
+
+analysis_cache의 정확 일치 키(combination_key)는 "백엔드 개발자"와 "서버 개발자"처럼
+표기만 다른 프로필을 다른 조합으로 본다. 이 단계는 캐시 항목 중 원문 직업/스킬이 있는 것
+(AnalysisCache.ingest에 profiles를 넘겨 적재한 항목)을 services.profile_embedding으로 임베딩해
+services.ivf_index 파일 하나로 S3에 두고, 정확 일치가 없을 때 가장 가까운 항목의 유사도가
+임계값 이상이면 그 분석 결과를 adapt_analysis로 이 사용자에게 맞춰 재사용한다.
+    - 프롬프트에 들어가는 연령대와 프롬프트 버전이 같아야 한다 (버전이 없는 이전 항목은 쓰지 않는다)
+    - 카드 reason은 card_index로 템플릿 카드에 붙으므로 두 프로필의 템플릿 카드가 같아야 한다
+    - skill_risks는 사용자 스킬 표기로 옮긴다 (같은 스킬 → 같은 스킬 클러스터 순).
+      옮길 수 없는 스킬이 하나라도 있으면 재사용하지 않는다
+    - 빌드/평가: python -m benchmarks.semantic_reuse_eval
+    - 조회: analyze가 S3IndexLoader로 /tmp에 받아 mmap으로 연다
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from services.amendment import normalize_skill
+from services.career_templates import SKILL_CLUSTERS, classify, select_templates, split_skills
+from services.ivf_index import IVFIndex, MmapIVFIndex
+from services.prompt_templates import DEFAULT_PROMPT_VERSION
+from services.profile_embedding import DEFAULT_DIM, embed_profile
+
+DEFAULT_INDEX_KEY = "analysis/semantic.ivf"
+# 재사용 유사도 하한 (benchmarks.semantic_reuse_eval로 적중률/품질 차이를 보고 조정)
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_NPROBE = 8
+
+
+@dataclass(frozen=True)
+class SemanticMatch:
+    """가장 가까운 캐시 항목과 코사인 유사도."""
+
+    cache_key: str
+    similarity: float
+
+    @property
+    def distance(self) -> float:
+        return 1.0 - self.similarity
+
+
+def nearest(
+    index: Union[IVFIndex, MmapIVFIndex], job_title: str, strengths: str, nprobe: int = DEFAULT_NPROBE
+) -> Optional[SemanticMatch]:
+    """프로필과 가장 가까운 캐시 항목 (인덱스가 비었거나 빈 프로필이면 None)."""
+    query = embed_profile(job_title, strengths, DEFAULT_DIM)
+    if not query:
+        return None
+    hits = index.search(query, 1, nprobe)
+    if not hits:
+        return None
+    score, cache_key = hits[0]
+    return SemanticMatch(cache_key, score)
+
+
+def build_index(items: Iterable[Dict[str, Any]], nlist: Optional[int] = None) -> IVFIndex:
+    """analysis_cache 항목으로 인덱스를 만든다 (원문 job_title이 없는 항목은 건너뛴다)."""
+    entries = []
+    for item in items:
+        if not item.get("job_title"):
+            continue
+        vec = embed_profile(item["job_title"], item.get("strengths") or "", DEFAULT_DIM)
+        if vec:
+            entries.append((item["cache_key"], vec))
+    return IVFIndex.build(entries, DEFAULT_DIM, nlist=nlist)
+
+
+def remap_skill_risks(
+    skill_risks: Sequence[Dict[str, Any]], skills: Sequence[str]
+) -> Optional[List[Dict[str, Any]]]:
+    """이웃의 스킬 위험도를 사용자 스킬 표기로 옮긴다. 옮길 수 없는 스킬이 있으면 None.
+
+    정규화한 이름이 같은 항목을 먼저 쓰고, 없으면 스킬 클러스터가 같은 남은 항목을 쓴다.
+    """
+    remaining = [risk for risk in skill_risks if isinstance(risk, dict) and risk.get("skill_name")]
+    remapped: List[Dict[str, Any]] = []
+    for skill in skills:
+        clusters = classify(skill, SKILL_CLUSTERS)
+        match = next((r for r in remaining if normalize_skill(r["skill_name"]) == normalize_skill(skill)), None)
+        if match is None and clusters:
+            match = next((r for r in remaining if classify(r["skill_name"], SKILL_CLUSTERS) == clusters), None)
+        if match is None:
+            return None
+        remaining.remove(match)
+        remapped.append({**match, "skill_name": skill})
+    return remapped
+
+
+def adapt_analysis(
+    analysis: str,
+    cached_item: Dict[str, Any],
+    job_title: str,
+    strengths: str,
+    age_group: str = "",
+    prompt_version: str = DEFAULT_PROMPT_VERSION,
+) -> Optional[str]:
+    """이웃 캐시 항목의 분석을 이 사용자에게 맞춘 JSON 문자열로 돌려준다. 재사용할 수 없으면 None."""
+    if not cached_item.get("job_title"):
+        return None
+    if (cached_item.get("age_group", ""), cached_item.get("prompt_version")) != (age_group.strip(), prompt_version):
+        return None
+    skills = split_skills(strengths)
+    neighbor_skills = split_skills(cached_item.get("strengths") or "")
+    mine = [t.template_id for t in select_templates(job_title, skills)]
+    if mine != [t.template_id for t in select_templates(cached_item["job_title"], neighbor_skills)]:
+        return None
+    try:
+        result = json.loads(analysis)
+    except json.JSONDecodeError:
+        return None
+    skill_risks = remap_skill_risks(result.get("skill_risks") or [], skills)
+    if skill_risks is None:
+        return None
+    return json.dumps({**result, "skill_risks": skill_risks}, ensure_ascii=False)
@@ -0,0 +1,128 @@
+"""같은 프로필의 동시 분석을 하나로 합치는 single-flight 조정 서비스.
+
+워크숍처럼 같은 프로필(직업/스킬/연령대, 실험 변형)이 몇 초 안에 여러 건 제출되면
+아직 완료된 결과가 없어 분석 캐시로는 막을 수 없다. 처음 도착한 분석이 조건부 쓰기로
+리더가 되고, 나중에 온 분석은 follower로 등록만 하고 바로 끝난다(세션은 analyzing 유지).
+리더는 분석을 마치면 flight 항목을 지우면서 follower 목록을 받아 결과를 각 세션에 저장한다.
+
+상태는 system_state 테이블의 flight#<지문> 항목 하나로 관리한다.
+    - leader: 리더 session_id
+    - lease_expires_at: 리더 임대 만료 시각(epoch 초). analyze 타임아웃과 같게 둔다
+    - followers: 결과를 기다리는 session_id 집합
+리더가 죽으면 임대가 만료되고, 세션 스위퍼가 멈춘 follower를 다시 넣을 때(stuck 기준 300초 > 임대)
+그 실행이 만료된 flight를 이어받아 남은 follower와 함께 처리한다.
+"""
+
+import time
+from typing import Any, Callable, List
+
+from botocore.exceptions import ClientError
+
+from services.bulk_inference import combination_key
+from services.checkpoint import compute_input_hash
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+FLIGHT_KEY_PREFIX = "flight#"
+
+ROLE_LEADER = "leader"
+ROLE_FOLLOWER = "follower"
+# flight 없이 단독 실행 (조건부 쓰기 경합이 계속되거나 같은 세션이 이미 리더인 중복 실행)
+ROLE_SOLO = "solo"
+
+# analyze 타임아웃(180초)과 같게 둔다: 임대가 남아 있으면 리더가 아직 실행 중이다
+DEFAULT_LEASE_SECONDS = 180
+_JOIN_ROUNDS = 2
+
+
+def flight_key(variant_id: str, job_title: str, age_group: str, strengths: str) -> str:
+    """합칠 수 있는 분석의 지문.
+
+    flight에 참여하는 분석은 분석 캐시와 같이 이름 없는 프롬프트로 생성하므로 이름은 넣지 않는다
+    (이름이 달라도 같은 결과를 나눠 받는다).
+    """
+    return FLIGHT_KEY_PREFIX + compute_input_hash(variant_id, combination_key(job_title, strengths), age_group)
+
+
+def _is_conditional_failure(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+class SingleFlight:
+    """flight 항목의 리더 등록, follower 구독, 완료 시 follower 인계를 담당한다."""
+
+    def __init__(
+        self,
+        table: Any,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.table = table
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+
+    def _try_update(self, key: str, update: str, condition: str, values: dict) -> bool:
+        try:
+            self.table.update_item(
+                Key={"state_key": key},
+                UpdateExpression=update,
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values,
+            )
+            return True
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                return False
+            raise
+
+    def join(self, key: str, session_id: str) -> str:
+        """리더가 되거나 진행 중인 flight의 follower로 등록한다. 역할(ROLE_*)을 반환한다."""
+        for _ in range(_JOIN_ROUNDS):
+            now = int(self.clock())
+            lease = {":sid": session_id, ":exp": now + self.lease_seconds}
+            # 1. 새 flight 시작
+            if self._try_update(
+                key, "SET leader = :sid, lease_expires_at = :exp, started_at = :now",
+                "attribute_not_exists(state_key)", {**lease, ":now": now},
+            ):
+                return ROLE_LEADER
+            # 2. 임대가 만료된 flight 이어받기 (기다리던 follower는 유지하고 자신만 뺀다)
+            if self._try_update(
+                key, "SET leader = :sid, lease_expires_at = :exp DELETE followers :me",
+                "attribute_exists(state_key) AND lease_expires_at < :now",
+                {**lease, ":me": {session_id}, ":now": now},
+            ):
+                logger.warning("리더 임대 만료로 flight 이어받음: key=%s, session_id=%s", key, session_id)
+                return ROLE_LEADER
+            # 3. 진행 중인 flight 구독
+            if self._try_update(
+                key, "ADD followers :me",
+                "attribute_exists(state_key) AND lease_expires_at >= :now AND leader <> :sid",
+                {":sid": session_id, ":me": {session_id}, ":now": now},
+            ):
+                return ROLE_FOLLOWER
+            item = self.table.get_item(Key={"state_key": key}, ConsistentRead=True).get("Item")
+            if item and item.get("leader") == session_id:
+                return ROLE_SOLO
+        return ROLE_SOLO
+
+    def complete(self, key: str, session_id: str) -> List[str]:
+        """리더가 flight를 끝내고 follower 목록을 받는다.
+
+        항목을 지우는 조건부 삭제라서 이후에 온 분석은 새 flight를 시작하고,
+        임대 만료로 다른 세션이 이어받았다면 빈 목록을 반환한다 (새 리더가 인계).
+        """
+        try:
+            resp = self.table.delete_item(
+                Key={"state_key": key},
+                ConditionExpression="leader = :sid",
+                ExpressionAttributeValues={":sid": session_id},
+                ReturnValues="ALL_OLD",
+            )
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                logger.warning("다른 세션이 이어받은 flight: key=%s, session_id=%s", key, session_id)
+                return []
+            raise
+        return sorted(resp.get("Attributes", {}).get("followers", set()))
@@ -0,0 +1,190 @@
+"""설문 작성 중 사전(speculative) 분석 조정 서비스.
+
+POST /survey/draft가 부분 설문으로 같은 session_id의 사전 분석을 시작하고,
+최종 POST /survey는 입력이 같으면 진행 중인 사전 분석에 연결(attach)하고
+다르면 사전 분석 표시를 덮어써 취소한 뒤 새로 분석을 시작한다.
+
+상태는 survey 항목의 spec_* 속성으로 관리한다.
+    - spec_hash: 사전 분석 입력 지문 (단계별 지문, 아래 참고)
+    - spec_stage: retrieval(직업+스킬만 확정) / generation(프롬프트 입력 전체 확정)
+    - spec_status: running / done / failed
+    - spec_count: 세션당 generation 사전 분석 횟수 (비용 상한)
+연결/완료 판정은 모두 조건부 쓰기로 하므로 최종 제출과 사전 분석 완료가 경합해도
+분석은 정확히 한 번 이어진다.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from services.checkpoint import compute_input_hash
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STATUS_DRAFT = "draft"
+
+SPEC_STAGE_RETRIEVAL = "retrieval"
+SPEC_STAGE_GENERATION = "generation"
+
+SPEC_RUNNING = "running"
+SPEC_DONE = "done"
+SPEC_FAILED = "failed"
+
+# 세션당 generation 사전 분석 최대 횟수 (입력을 계속 고치는 사용자의 Bedrock 비용 상한)
+DEFAULT_MAX_SPECULATIONS = 3
+# 이보다 오래 running인 사전 분석에는 연결하지 않는다 (analyze 타임아웃 180초, 중단된 실행 대비)
+DEFAULT_ATTACH_WINDOW_SECONDS = 180
+
+
+def analysis_input_hash(name: str, job_title: str, age_group: str, strengths: str) -> str:
+    """generation 이후 단계의 입력 지문 (프롬프트에 들어가는 필드만 사용)."""
+    return compute_input_hash(name, job_title, age_group, strengths)
+
+
+def retrieval_input_hash(job_title: str, strengths: str) -> str:
+    """retrieval 단계의 입력 지문 (Knowledge Base 검색에 쓰이는 필드만 사용)."""
+    return compute_input_hash(job_title, strengths)
+
+
+def plan_speculation(draft: Dict[str, str]) -> Optional[str]:
+    """부분 설문으로 시작할 사전 분석 단계를 정한다. 시작할 수 없으면 None."""
+    if not (draft.get("job_title", "").strip() and draft.get("strengths", "").strip()):
+        return None
+    if all(draft.get(f, "").strip() for f in ("name", "age_group")):
+        return SPEC_STAGE_GENERATION
+    return SPEC_STAGE_RETRIEVAL
+
+
+def speculation_hash(stage: str, draft: Dict[str, str]) -> str:
+    """사전 분석 단계에 해당하는 입력 지문."""
+    if stage == SPEC_STAGE_GENERATION:
+        return analysis_input_hash(
+            draft.get("name", ""), draft.get("job_title", ""),
+            draft.get("age_group", ""), draft.get("strengths", ""),
+        )
+    return retrieval_input_hash(draft.get("job_title", ""), draft.get("strengths", ""))
+
+
+def _is_conditional_failure(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+def record_draft(
+    table: Any,
+    session_id: str,
+    draft: Dict[str, str],
+    max_speculations: int = DEFAULT_MAX_SPECULATIONS,
+) -> Dict[str, Any]:
+    """부분 설문을 기록하고 새 사전 분석을 시작해야 하는지 판단한다.
+
+    Returns:
+        {"accepted": 최종 제출 전이라 기록했는지,
+         "stage": 새로 시작할 사전 분석 단계 또는 None (진행 중/완료된 같은 작업이 있거나 상한 초과),
+         "spec_hash": 새 사전 분석의 입력 지문}
+    """
+    stage = plan_speculation(draft)
+    if stage is None:
+        return {"accepted": True, "stage": None, "spec_hash": ""}
+    spec_hash = speculation_hash(stage, draft)
+
+    existing = table.get_item(Key={"session_id": session_id}, ConsistentRead=True).get("Item") or {}
+    if existing and existing.get("status") != STATUS_DRAFT:
+        return {"accepted": False, "stage": None, "spec_hash": ""}
+    if existing.get("spec_hash") == spec_hash and existing.get("spec_status") in (SPEC_RUNNING, SPEC_DONE):
+        return {"accepted": True, "stage": None, "spec_hash": spec_hash}
+
+    spec_count = int(existing.get("spec_count", 0)) + (stage == SPEC_STAGE_GENERATION)
+    if spec_count > max_speculations:
+        logger.info("사전 분석 상한 초과: session_id=%s, count=%d", session_id, spec_count)
+        return {"accepted": True, "stage": None, "spec_hash": ""}
+
+    now = datetime.now(timezone.utc).isoformat()
+    try:
+        table.put_item(
+            Item={
+                "session_id": session_id,
+                **{field: draft.get(field, "") for field in ("job_title", "strengths", "hobbies")},
+                "status": STATUS_DRAFT,
+                "spec_hash": spec_hash,
+                "spec_stage": stage,
+                "spec_status": SPEC_RUNNING,
+                "spec_count": spec_count,
+                "spec_started_at": now,
+                "created_at": existing.get("created_at", now),
+            },
+            ConditionExpression="attribute_not_exists(session_id) OR #s = :draft",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={":draft": STATUS_DRAFT},
+        )
+    except ClientError as e:
+        if _is_conditional_failure(e):
+            return {"accepted": False, "stage": None, "spec_hash": ""}
+        raise
+    logger.info("사전 분석 등록: session_id=%s, stage=%s", session_id, stage)
+    return {"accepted": True, "stage": stage, "spec_hash": spec_hash}
+
+
+def try_attach(
+    table: Any,
+    item: Dict[str, Any],
+    input_hash: str,
+    attach_window_seconds: int = DEFAULT_ATTACH_WINDOW_SECONDS,
+) -> bool:
+    """최종 제출을 같은 입력으로 진행 중인 generation 사전 분석에 연결한다.
+
+    연결되면 status를 analyzing으로 바꾸고 사전 분석이 끝나는 대로 나머지 단계를 이어서 수행한다.
+    사전 분석이 없거나, 입력이 다르거나, 이미 끝났거나, 너무 오래 running이면 False
+    (호출자가 새로 분석을 시작한다).
+    """
+    fresh_after = (datetime.now(timezone.utc) - timedelta(seconds=attach_window_seconds)).isoformat()
+    fields = {k: v for k, v in item.items() if k != "session_id"}
+    names = {f"#f{i}": k for i, k in enumerate(fields)}
+    values = {f":v{i}": v for i, v in enumerate(fields.values())}
+    assignments = ", ".join(f"#f{i} = :v{i}" for i in range(len(fields)))
+    try:
+        table.update_item(
+            Key={"session_id": item["session_id"]},
+            UpdateExpression=f"SET {assignments}",
+            ConditionExpression=(
+                "spec_status = :running AND spec_hash = :hash AND spec_stage = :generation "
+                "AND #cur = :draft AND spec_started_at > :fresh"
+            ),
+            ExpressionAttributeNames={**names, "#cur": "status"},
+            ExpressionAttributeValues={
+                **values,
+                ":running": SPEC_RUNNING,
+                ":hash": input_hash,
+                ":generation": SPEC_STAGE_GENERATION,
+                ":draft": STATUS_DRAFT,
+                ":fresh": fresh_after,
+            },
+        )
+        return True
+    except ClientError as e:
+        if _is_conditional_failure(e):
+            return False
+        raise
+
+
+def finish_speculation(table: Any, session_id: str, spec_hash: str, outcome: str) -> Optional[Dict[str, Any]]:
+    """사전 분석 종료(done/failed)를 기록하고 갱신된 survey 항목을 반환한다.
+
+    그 사이 입력이 바뀌어(새 초안 또는 다른 입력의 최종 제출) 사전 분석이 취소되었으면 None.
+    반환 항목의 status가 analyzing이면 최종 제출이 연결된 것이므로 호출자가 분석을 이어간다.
+    """
+    try:
+        resp = table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression="SET spec_status = :outcome",
+            ConditionExpression="spec_hash = :hash AND spec_status = :running",
+            ExpressionAttributeValues={":outcome": outcome, ":hash": spec_hash, ":running": SPEC_RUNNING},
+            ReturnValues="ALL_NEW",
+        )
+    except ClientError as e:
+        if _is_conditional_failure(e):
+            logger.info("사전 분석 취소됨(입력 변경): session_id=%s", session_id)
+            return None
+        raise
+    return resp.get("Attributes", {})
@@ -0,0 +1,164 @@
+"""스트림 소비와 저장을 겹치는 asyncio 분석 파이프라인.
+
+Agent 최종 응답 스트림을 조각 단위로 점진 파싱하여, 최상위 JSON 객체의 지정한 배열
+(skill_risks, career_cards)에서 원소 객체가 닫히는 즉시 저장 작업을 시작한다.
+생성이 끝나기를 기다린 뒤 한꺼번에 쓰던 저장 시간이 스트리밍 구간 뒤에 숨는다.
+    - 생산자: 동기 boto3 스트림 소비(invoke_agent + collect_agent_stream)를
+      실행기 스레드에서 돌리고, 조각을 call_soon_threadsafe로 이벤트 루프 큐에 넘긴다.
+    - 소비자: 이벤트 루프에서 IncrementalJsonScanner로 원소를 찾아 쓰기 실행기에 제출한다.
+    - 재시도: 생산자가 STREAM_RESTART(None)를 보내면(엔드포인트 전환 등) 스캐너를 초기화하고,
+      이전 시도에서 쓴 원소는 결과 집계에서 제외한다 (호출자가 최종 파싱 결과로 보정하고
+      최종 결과에 없는 행은 지운다).
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 생산자가 새 시도를 시작할 때 보내는 조각 값
+STREAM_RESTART = None
+
+DEFAULT_WRITE_WORKERS = 4
+
+_END = object()
+
+
+class IncrementalJsonScanner:
+    """최상위 JSON 객체의 배열 원소를 조각 단위로 찾아내는 스캐너.
+
+    문자열/이스케이프/중첩 깊이만 추적하므로 조각 경계가 토큰 중간이어도 된다.
+    최상위 객체 앞의 마크다운 코드 블록 표시(```json) 같은 텍스트는 무시한다.
+    """
+
+    def __init__(self, array_keys: Iterable[str]) -> None:
+        self.array_keys = frozenset(array_keys)
+        self.reset()
+
+    def reset(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_chars: List[str] = []
+        self._last_key = ""
+        self._array: Optional[str] = None
+        self._capture: Optional[List[str]] = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """조각을 처리하고 이번 조각에서 완성된 (배열 키, 원소) 목록을 반환한다."""
+        completed: List[Tuple[str, Any]] = []
+        for ch in text:
+            if self._capture is not None:
+                self._capture.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = "".join(self._key_chars)
+                    continue
+                if self._depth == 1:
+                    self._key_chars.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._key_chars = []
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._last_key in self.array_keys:
+                    self._array = self._last_key
+                elif ch == "{" and self._depth == 3 and self._array:
+                    self._capture = ["{"]
+            elif ch in "}]" and self._depth > 0:
+                if ch == "}" and self._depth == 3 and self._capture is not None:
+                    element = self._finish_capture()
+                    if element is not None:
+                        completed.append((self._array, element))
+                elif ch == "]" and self._depth == 2:
+                    self._array = None
+                self._depth -= 1
+        return completed
+
+    def _finish_capture(self) -> Optional[Any]:
+        raw = "".join(self._capture or [])
+        self._capture = None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            # 최종 파싱 결과로 다시 저장되므로 건너뛴다
+            logger.warning("스트림 원소 파싱 실패 (최종 결과로 보정): %.80s", raw)
+            return None
+
+
+def run_streaming_persist(
+    produce: Callable[[Callable[[Optional[str]], None]], T],
+    on_element: Callable[[str, Any], None],
+    array_keys: Iterable[str],
+    max_workers: int = DEFAULT_WRITE_WORKERS,
+) -> Tuple[T, Dict[str, List[Any]]]:
+    """스트림을 소비하면서 완성된 배열 원소를 동시에 저장한다.
+
+    Args:
+        produce: 조각 콜백을 받아 스트림을 끝까지 소비하고 결과를 반환하는 동기 함수.
+            새 시도를 시작할 때마다 콜백에 STREAM_RESTART를 전달한다.
+        on_element: (배열 키, 원소)를 저장하는 동기 함수 (쓰기 실행기 스레드에서 호출)
+        array_keys: 원소를 저장할 최상위 배열 키
+        max_workers: 동시 쓰기 스레드 수
+
+    Returns:
+        (produce 반환값, 마지막 시도에서 저장에 성공한 {배열 키: [원소]})
+    """
+    return asyncio.run(_pipeline(produce, on_element, frozenset(array_keys), max_workers))
+
+
+async def _pipeline(
+    produce: Callable[[Callable[[Optional[str]], None]], T],
+    on_element: Callable[[str, Any], None],
+    array_keys: frozenset,
+    max_workers: int,
+) -> Tuple[T, Dict[str, List[Any]]]:
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    scanner = IncrementalJsonScanner(array_keys)
+
+    def on_chunk(text: Optional[str]) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, text)
+
+    attempt = 0
+    writes: List[Tuple[int, str, Any, asyncio.Future]] = []
+    with ThreadPoolExecutor(max_workers=1) as reader, ThreadPoolExecutor(max_workers=max_workers) as writer:
+        producer = loop.run_in_executor(reader, produce, on_chunk)
+        # 조각 전달과 완료 통지 모두 루프 콜백 순서를 따르므로 END는 마지막 조각 뒤에 온다
+        producer.add_done_callback(lambda _: queue.put_nowait(_END))
+
+        while True:
+            text = await queue.get()
+            if text is _END:
+                break
+            if text is STREAM_RESTART:
+                attempt += 1
+                scanner.reset()
+                continue
+            for key, element in scanner.feed(text):
+                writes.append((attempt, key, element, loop.run_in_executor(writer, on_element, key, element)))
+
+        outcomes = await asyncio.gather(*(w[3] for w in writes), return_exceptions=True)
+        result = await producer
+
+    written: Dict[str, List[Any]] = {key: [] for key in array_keys}
+    for (write_attempt, key, element, _), outcome in zip(writes, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("스트림 원소 저장 실패 (최종 결과로 보정): key=%s, error=%r", key, outcome)
+        elif write_attempt == attempt:
+            written[key].append(element)
+    return result, written
@@ -0,0 +1,134 @@
+"""도구 호출 강제(forced tool use)로 분석 결과를 구조화 데이터로 받는 생성 모드.
+
+Agent 경로는 자유 텍스트 응답에서 코드 펜스/JSON을 추측해 꺼내므로(_parse_agent_response)
+앞뒤에 설명 문장이 붙거나 펜스가 어긋나면 세션 전체가 파싱 실패로 끝난다.
+이 모드는 AnalysisResult JSON 스키마를 도구(ANALYSIS_TOOL) 하나로 정의하고
+Converse API의 toolChoice로 그 도구 호출을 강제해, 모델이 채운 도구 입력을 그대로 결과로 쓴다.
+    - 요청: converse(system + 사용자 프롬프트, toolConfig.toolChoice={"tool": ANALYSIS_TOOL})
+    - 응답: output.message.content의 toolUse.input (JSON 문자열 파싱 단계 없음)
+    - Agent 오케스트레이션이 없으므로 Knowledge Base 검색은 호출자가 Retrieve API로 미리 붙인다
+Agent의 toolChoice 강제가 없어 실험 변형의 generation_mode="tool"로만 켠다 (services.experiments).
+두 모드의 파싱 실패율은 benchmarks/experiment_report.py의 변형별 parse_failure_rate로 비교한다.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from services.token_usage import TokenUsage
+
+ANALYSIS_TOOL = "record_analysis"
+MAX_OUTPUT_TOKENS = 4096
+
+# Agent 지침(infra/lib/bedrock-stack.ts)의 출력 형식을 JSON 스키마로 옮긴 것
+ANALYSIS_RESULT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "remaining_years": {"type": "integer", "minimum": 1},
+        "remaining_years_reason": {"type": "string", "description": "1-2 sentence summary"},
+        "skill_risks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "skill_name": {"type": "string"},
+                    "category": {"type": "string"},
+                    "replacement_prob": {"type": "integer", "minimum": 0, "maximum": 100},
+                    "time_horizon": {"type": "integer", "description": "years"},
+                    "justification": {"type": "string", "description": "dystopian-toned rationale"},
+                },
+                "required": ["skill_name", "category", "replacement_prob", "time_horizon", "justification"],
+            },
+        },
+        "career_cards": {
+            "type": "array",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "card_index": {"type": "integer", "enum": [0, 1, 2]},
+                    "reason": {"type": "string", "description": "1-2 sentences personalized to the user"},
+                },
+                "required": ["card_index", "reason"],
+            },
+        },
+    },
+    "required": ["remaining_years", "remaining_years_reason", "skill_risks", "career_cards"],
+}
+
+# Agent 지침에서 출력 형식 부분을 뺀 시스템 프롬프트 (형식은 도구 스키마가 정한다)
+STRUCTURED_SYSTEM_PROMPT = "\n".join([
+    "You are the AI Tribunal of Career Doomsday Clock.",
+    "You analyze user career data and deliver verdicts in a cold, dystopian tone.",
+    "Ground your judgments in the Reference Data (Future of Jobs Report 2025) when it is relevant,",
+    "and use general knowledge for skills it does not cover.",
+    "",
+    "Auto-correct typos in job titles and skills, and interpret unrealistic inputs as the closest realistic equivalent.",
+    "Career cards are pre-selected and listed under 'Career Cards'. Do not invent new roles;",
+    "only write a short reason explaining why each listed card fits this user.",
+    "",
+    f"Record your verdict by calling the {ANALYSIS_TOOL} tool exactly once.",
+    "All string values must be in the language specified in the user input.",
+    "- skill_risks must include ALL skills the user listed without exception.",
+    "- career_cards: exactly 3 items, one per listed Career Card.",
+])
+
+
+class StructuredOutputError(ValueError):
+    """도구 입력이 분석 결과 형식이 아니다 (파싱 실패와 같이 집계한다)."""
+
+
+def tool_config() -> Dict[str, Any]:
+    """AnalysisResult 도구 하나와 그 호출을 강제하는 toolChoice."""
+    return {
+        "tools": [{"toolSpec": {
+            "name": ANALYSIS_TOOL,
+            "description": "Record the career analysis verdict for the user.",
+            "inputSchema": {"json": ANALYSIS_RESULT_SCHEMA},
+        }}],
+        "toolChoice": {"tool": {"name": ANALYSIS_TOOL}},
+    }
+
+
+def check_analysis(data: Any) -> Dict[str, Any]:
+    """필수 필드의 타입만 확인한다 (세부 값 범위는 저장 단계의 기존 처리에 맡긴다)."""
+    if not isinstance(data, dict):
+        raise StructuredOutputError(f"도구 입력이 객체가 아닙니다: {type(data).__name__}")
+    missing = [key for key in ANALYSIS_RESULT_SCHEMA["required"] if key not in data]
+    if missing:
+        raise StructuredOutputError(f"도구 입력에 필수 필드가 없습니다: {missing}")
+    if not isinstance(data["skill_risks"], list) or not isinstance(data["career_cards"], list):
+        raise StructuredOutputError("skill_risks/career_cards는 배열이어야 합니다")
+    return data
+
+
+class ToolUseGenerator:
+    """converse로 분석 도구 호출을 강제하고 도구 입력과 사용량을 반환한다."""
+
+    def __init__(self, client: Any, model_id: str) -> None:
+        self.client = client
+        self.model_id = model_id
+
+    def generate(self, prompt: str) -> Tuple[Optional[Dict[str, Any]], TokenUsage]:
+        """도구 입력(모델이 도구를 부르지 않았으면 None)과 사용량."""
+        resp = self.client.converse(
+            modelId=self.model_id,
+            system=[{"text": STRUCTURED_SYSTEM_PROMPT}],
+            messages=[{"role": "user", "content": [{"text": prompt}]}],
+            inferenceConfig={"maxTokens": MAX_OUTPUT_TOKENS},
+            toolConfig=tool_config(),
+        )
+        tool_input = None
+        for block in ((resp.get("output") or {}).get("message") or {}).get("content", []):
+            tool_use = block.get("toolUse")
+            if tool_use and tool_use.get("name") == ANALYSIS_TOOL:
+                tool_input = tool_use.get("input")
+                break
+        usage = resp.get("usage") or {}
+        return tool_input, TokenUsage(
+            model_id=self.model_id,
+            input_tokens=int(usage.get("inputTokens") or 0),
+            output_tokens=int(usage.get("outputTokens") or 0),
+            cache_read_tokens=int(usage.get("cacheReadInputTokens") or 0),
+            cache_write_tokens=int(usage.get("cacheWriteInputTokens") or 0),
+            model_invocations=1,
+        )
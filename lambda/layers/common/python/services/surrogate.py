@@ -0,0 +1,289 @@
+"""누적된 분석 결과로 학습한 경량 대리 모델 (what-if 즉시 응답용).
+
+"Kubernetes를 배우면?" 같은 질문마다 Agent 전체 실행을 돌리지 않도록, 지금까지의
+skill_graph 행과 survey 항목으로 릿지 회귀 두 개를 학습해 작은 JSON 파일로 내보낸다.
+    - skill 헤드: (직업, 연령대, 스킬) → replacement_prob
+    - years 헤드: (직업, 연령대, 스킬 목록) → remaining_years
+특징은 단어/문자 3-gram을 crc32로 해싱한 희소 벡터라 어휘 사전 없이 처음 보는 스킬에도 값을 낸다.
+학습은 희소 켤레기울기(CG)로 정규방정식을 풀어 NumPy 없이 순수 Python으로 동작하고,
+POST /whatif는 파일을 한 번 읽은 뒤 수 ms 안에 예측한다.
+"""
+
+import json
+import math
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from services.amendment import normalize_skill
+from services.career_templates import split_skills
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARTIFACT_FORMAT = 1
+DEFAULT_DIM = 1 << 14
+DEFAULT_L2 = 1.0
+DEFAULT_MAX_ITER = 200
+# 해시 특징 행렬의 열 번호가 맞는지 확인하는 용도. 특징 정의를 바꾸면 올린다
+FEATURE_VERSION = 1
+
+SparseVector = Dict[int, float]
+
+
+def _words(text: str) -> List[str]:
+    return normalize_skill(text).split()
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f" {normalize_skill(text)} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _add_group(vec: SparseVector, dim: int, prefix: str, tokens: Sequence[str], scale: float = 1.0) -> None:
+    """토큰 묶음을 부호 있는 해시 특징으로 더한다 (묶음별 L2 크기 = scale)."""
+    if not tokens:
+        return
+    weight = scale / math.sqrt(len(tokens))
+    for token in tokens:
+        h = zlib.crc32(f"{prefix}:{token}".encode("utf-8"))
+        idx = h % dim
+        vec[idx] = vec.get(idx, 0.0) + (weight if h & 0x80000000 else -weight)
+
+
+def skill_features(job_title: str, age_group: str, skill: str, dim: int = DEFAULT_DIM) -> SparseVector:
+    vec: SparseVector = {}
+    _add_group(vec, dim, "s", _words(skill))
+    _add_group(vec, dim, "c", _trigrams(skill))
+    _add_group(vec, dim, "j", _words(job_title))
+    _add_group(vec, dim, "a", [age_group] if age_group else [])
+    _add_group(vec, dim, "x", [f"{normalize_skill(job_title)}|{normalize_skill(skill)}"])
+    return vec
+
+
+def profile_features(job_title: str, age_group: str, skills: Sequence[str], dim: int = DEFAULT_DIM) -> SparseVector:
+    vec: SparseVector = {}
+    _add_group(vec, dim, "j", _words(job_title))
+    _add_group(vec, dim, "jc", _trigrams(job_title))
+    _add_group(vec, dim, "a", [age_group] if age_group else [])
+    # 스킬 특징은 평균을 내어 스킬 수와 무관한 크기로 맞춘다
+    scale = 1.0 / max(len(skills), 1)
+    for skill in skills:
+        _add_group(vec, dim, "s", _words(skill), scale)
+        _add_group(vec, dim, "c", _trigrams(skill), scale)
+    return vec
+
+
+@dataclass
+class RidgeHead:
+    """희소 선형 모델 한 개 (bias + 해시 특징 가중치)."""
+
+    bias: float
+    weights: Dict[int, float] = field(default_factory=dict)
+
+    def predict(self, vec: SparseVector) -> float:
+        return self.bias + sum(self.weights.get(i, 0.0) * v for i, v in vec.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        idx = sorted(i for i, w in self.weights.items() if w)
+        return {"bias": round(self.bias, 6), "idx": idx, "val": [round(self.weights[i], 6) for i in idx]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RidgeHead":
+        return cls(bias=float(data["bias"]), weights=dict(zip(data["idx"], data["val"])))
+
+
+def fit_ridge(
+    rows: Sequence[SparseVector], targets: Sequence[float],
+    l2: float = DEFAULT_L2, max_iter: int = DEFAULT_MAX_ITER, tol: float = 1e-6,
+) -> RidgeHead:
+    """min ||Xw + b - y||² + l2·||w||² 를 푼다 (b는 규제하지 않는다).
+
+    y를 평균으로 중심화하고 상수 열을 덧붙인 정규방정식을 희소 CG로 푼다.
+    쓰인 열만 압축 번호로 다루므로 비용은 반복당 O(nnz)이다.
+    """
+    if not rows:
+        return RidgeHead(bias=0.0)
+    bias = sum(targets) / len(targets)
+    columns = sorted({i for row in rows for i in row})
+    col_of = {c: k for k, c in enumerate(columns)}
+    m = len(columns)
+    # 마지막 열(m)은 규제하지 않는 절편 보정 항
+    packed = [[(col_of[i], v) for i, v in row.items()] + [(m, 1.0)] for row in rows]
+    penalty = [l2] * m + [0.0]
+
+    def normal_matvec(v: List[float]) -> List[float]:
+        out = [a * x for a, x in zip(penalty, v)]
+        for row in packed:
+            dot = sum(v[k] * x for k, x in row)
+            if dot:
+                for k, x in row:
+                    out[k] += dot * x
+        return out
+
+    rhs = [0.0] * (m + 1)
+    for row, y in zip(packed, targets):
+        resid = y - bias
+        for k, x in row:
+            rhs[k] += resid * x
+
+    w = [0.0] * (m + 1)
+    r = rhs[:]
+    p = r[:]
+    rs = sum(x * x for x in r)
+    stop = tol * tol * max(rs, 1e-12)
+    for _ in range(max_iter):
+        if rs <= stop:
+            break
+        ap = normal_matvec(p)
+        alpha = rs / sum(a * b for a, b in zip(p, ap))
+        w = [a + alpha * b for a, b in zip(w, p)]
+        r = [a - alpha * b for a, b in zip(r, ap)]
+        rs_next = sum(x * x for x in r)
+        p = [a + (rs_next / rs) * b for a, b in zip(r, p)]
+        rs = rs_next
+    return RidgeHead(bias=bias + w[m], weights={columns[k]: w[k] for k in range(m)})
+
+
+@dataclass
+class SkillExample:
+    job_title: str
+    age_group: str
+    skill_name: str
+    replacement_prob: float
+
+
+@dataclass
+class ProfileExample:
+    job_title: str
+    age_group: str
+    skills: List[str]
+    remaining_years: float
+
+
+def build_examples(
+    survey_items: Iterable[Dict[str, Any]],
+    skill_items: Iterable[Dict[str, Any]],
+    load_record: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+) -> Tuple[List[SkillExample], List[ProfileExample]]:
+    """완료된 세션과 skill_graph 행을 학습 예제로 묶는다.
+
+    공유 레코드를 가리키는 세션(analysis_ref)은 load_record로 레코드를 읽어 같은 형식으로 쓴다
+    (load_record가 없으면 건너뛴다).
+    """
+    sessions = {item["session_id"]: item for item in survey_items if item.get("status") == "completed"}
+    skills: List[SkillExample] = []
+    profiles: List[ProfileExample] = []
+
+    def add_skill(session: Dict[str, Any], name: str, prob: Any) -> None:
+        skills.append(SkillExample(session.get("job_title", ""), session.get("age_group", ""), name, float(prob)))
+
+    for row in skill_items:
+        session = sessions.get(row.get("session_id"))
+        if session and not session.get("analysis_ref") and row.get("replacement_prob") is not None:
+            add_skill(session, row["skill_name"], row["replacement_prob"])
+
+    for session in sessions.values():
+        remaining = session.get("remaining_years")
+        if session.get("analysis_ref"):
+            record = load_record(session["analysis_ref"]) if load_record else None
+            if not record:
+                continue
+            for risk in record.get("skill_risks", []):
+                add_skill(session, risk["skill_name"], risk["replacement_prob"])
+            remaining = record.get("remaining_years")
+        if remaining is None:
+            continue
+        profiles.append(ProfileExample(
+            session.get("job_title", ""), session.get("age_group", ""),
+            split_skills(session.get("strengths", "")), float(remaining),
+        ))
+    return skills, profiles
+
+
+def _mae(head: RidgeHead, rows: Sequence[SparseVector], targets: Sequence[float]) -> Optional[float]:
+    if not rows:
+        return None
+    return round(sum(abs(head.predict(x) - y) for x, y in zip(rows, targets)) / len(rows), 3)
+
+
+class SurrogateModel:
+    """skill/years 두 헤드와 메타데이터. JSON 아티팩트로 저장/복원한다."""
+
+    def __init__(self, skill: RidgeHead, years: RidgeHead, dim: int = DEFAULT_DIM,
+                 meta: Optional[Dict[str, Any]] = None) -> None:
+        self.skill = skill
+        self.years = years
+        self.dim = dim
+        self.meta = meta or {}
+
+    def predict_skill(self, job_title: str, age_group: str, skill: str) -> float:
+        value = self.skill.predict(skill_features(job_title, age_group, skill, self.dim))
+        return min(max(value, 0.0), 100.0)
+
+    def predict_years(self, job_title: str, age_group: str, skills: Sequence[str]) -> float:
+        return max(self.years.predict(profile_features(job_title, age_group, skills, self.dim)), 0.0)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "format": ARTIFACT_FORMAT,
+            "feature_version": FEATURE_VERSION,
+            "dim": self.dim,
+            "meta": self.meta,
+            "skill": self.skill.to_dict(),
+            "years": self.years.to_dict(),
+        }, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SurrogateModel":
+        data = json.loads(raw)
+        if data.get("format") != ARTIFACT_FORMAT or data.get("feature_version") != FEATURE_VERSION:
+            raise ValueError(f"지원하지 않는 대리 모델 형식: format={data.get('format')}, "
+                             f"feature_version={data.get('feature_version')}")
+        return cls(RidgeHead.from_dict(data["skill"]), RidgeHead.from_dict(data["years"]),
+                   dim=int(data["dim"]), meta=data.get("meta", {}))
+
+
+def train(
+    skill_examples: Sequence[SkillExample], profile_examples: Sequence[ProfileExample],
+    dim: int = DEFAULT_DIM, l2: float = DEFAULT_L2, max_iter: int = DEFAULT_MAX_ITER, holdout_every: int = 10,
+) -> SurrogateModel:
+    """두 헤드를 학습한다. holdout_every번째 예제마다 검증용으로 빼서 MAE를 meta에 남긴다 (0이면 검증 없음)."""
+
+    def split(xs: List[SparseVector], ys: List[float]):
+        if holdout_every <= 1:
+            return xs, ys, [], []
+        held = set(range(0, len(xs), holdout_every))
+        train_idx = [i for i in range(len(xs)) if i not in held]
+        return ([xs[i] for i in train_idx], [ys[i] for i in train_idx],
+                [xs[i] for i in sorted(held)], [ys[i] for i in sorted(held)])
+
+    heads = {}
+    metrics: Dict[str, Any] = {}
+    datasets = {
+        "skill": ([skill_features(e.job_title, e.age_group, e.skill_name, dim) for e in skill_examples],
+                  [e.replacement_prob for e in skill_examples]),
+        "years": ([profile_features(e.job_title, e.age_group, e.skills, dim) for e in profile_examples],
+                  [e.remaining_years for e in profile_examples]),
+    }
+    for name, (xs, ys) in datasets.items():
+        train_x, train_y, test_x, test_y = split(xs, ys)
+        heads[name] = fit_ridge(train_x, train_y, l2=l2, max_iter=max_iter)
+        metrics[f"{name}_mae"] = _mae(heads[name], test_x, test_y)
+        metrics[f"{name}_examples"] = len(xs)
+        logger.info("대리 모델 헤드 학습: head=%s, examples=%d, holdout_mae=%s", name, len(xs), metrics[f"{name}_mae"])
+
+    meta = {"trained_at": datetime.now(timezone.utc).isoformat(), "l2": l2, **metrics}
+    return SurrogateModel(heads["skill"], heads["years"], dim=dim, meta=meta)
+
+
+def save_model(s3: Any, bucket: str, key: str, model: SurrogateModel) -> int:
+    body = model.to_json().encode("utf-8")
+    s3.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/json")
+    return len(body)
+
+
+def load_model(s3: Any, bucket: str, key: str) -> SurrogateModel:
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    return SurrogateModel.from_json(body.decode("utf-8"))
@@ -0,0 +1,236 @@
+"""멈춘/실패한 분석 세션 스위퍼 및 재시도 스케줄러.
+
+survey 테이블의 status-created_at-index GSI로 analyzing/error 세션을 조회하여
+- analyzing 상태로 임계 시간 이상 멈춘 세션과
+- 백오프 대기 시간이 지난 error 세션을
+analyze_handler에 다시 넣는다 (체크포인트 덕분에 완료된 단계는 건너뛴다).
+재시도 횟수를 모두 소진했거나 너무 오래된 세션은 terminal 상태(failed)로 표시하여
+프론트엔드 폴링이 TIMEOUT_MS 전에 멈출 수 있게 한다.
+수정(amend) 중인 세션은 이미 완료된 결과가 있으므로 failed 대신 completed로 되돌린다
+(error_code=amend_failed). 세션 나이도 created_at 대신 마지막 수정 시각(amended_at)부터 잰다.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STATUS_INDEX_NAME = "status-created_at-index"
+
+STATUS_ANALYZING = "analyzing"
+STATUS_ERROR = "error"
+STATUS_FAILED = "failed"
+STATUS_COMPLETED = "completed"
+
+AMEND_FAILED_ERROR_CODE = "amend_failed"
+
+ACTION_RETRY = "retry"
+ACTION_FAIL = "fail"
+
+# analyze_handler에 다시 전달하는 설문 필드
+ANALYZE_PAYLOAD_FIELDS = ("session_id", "name", "job_title", "age_group", "strengths", "hobbies")
+
+
+@dataclass
+class SweepConfig:
+    """스위퍼 동작 설정."""
+
+    # analyzing 상태가 이 시간(초)을 넘으면 멈춘 것으로 본다 (analyze 타임아웃 180초 + 여유)
+    stuck_threshold_seconds: int = 300
+    # error 재시도 백오프: base * 2^attempts (초), 최대 max_backoff_seconds
+    base_backoff_seconds: int = 30
+    max_backoff_seconds: int = 600
+    # 스위퍼가 다시 넣는 최대 횟수
+    max_attempts: int = 3
+    # 이보다 오래된 세션은 재시도하지 않고 바로 terminal 처리 (사용자가 이미 떠난 세션)
+    max_session_age_seconds: int = 3600
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def backoff_seconds(attempts: int, config: SweepConfig) -> int:
+    """attempts회 재시도한 세션의 다음 재시도까지 대기 시간(초)."""
+    return min(config.base_backoff_seconds * (2 ** attempts), config.max_backoff_seconds)
+
+
+def plan_action(item: Dict[str, Any], now: datetime, config: SweepConfig) -> Optional[str]:
+    """세션 항목 하나에 대해 수행할 조치를 결정한다.
+
+    Returns:
+        ACTION_RETRY, ACTION_FAIL 또는 조치가 필요 없으면 None.
+    """
+    status = item.get("status")
+    created_at = _parse_time(item.get("created_at"))
+    if status not in (STATUS_ANALYZING, STATUS_ERROR) or created_at is None:
+        return None
+
+    last_attempt_at = _parse_time(item.get("last_attempt_at")) or created_at
+    started_at = _parse_time(item.get("amended_at")) or created_at
+    attempts = int(item.get("attempts", 0))
+    elapsed = (now - last_attempt_at).total_seconds()
+
+    if status == STATUS_ANALYZING and elapsed < config.stuck_threshold_seconds:
+        return None
+    if status == STATUS_ERROR and elapsed < backoff_seconds(attempts, config):
+        return None
+
+    if attempts >= config.max_attempts:
+        return ACTION_FAIL
+    if (now - started_at).total_seconds() > config.max_session_age_seconds:
+        return ACTION_FAIL
+    return ACTION_RETRY
+
+
+def find_candidates(table: Any, now: datetime, config: SweepConfig) -> List[Dict[str, Any]]:
+    """GSI로 analyzing(임계 시간 경과)·error 세션을 모두 조회한다."""
+    stuck_cutoff = (now - timedelta(seconds=config.stuck_threshold_seconds)).isoformat()
+    conditions = [
+        Key("status").eq(STATUS_ANALYZING) & Key("created_at").lte(stuck_cutoff),
+        Key("status").eq(STATUS_ERROR),
+    ]
+
+    items: List[Dict[str, Any]] = []
+    for condition in conditions:
+        query_kwargs: Dict[str, Any] = {"IndexName": STATUS_INDEX_NAME, "KeyConditionExpression": condition}
+        while True:
+            resp = table.query(**query_kwargs)
+            items.extend(resp.get("Items", []))
+            last_key = resp.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            query_kwargs["ExclusiveStartKey"] = last_key
+    return items
+
+
+def _claim_retry(table: Any, item: Dict[str, Any], now: datetime) -> bool:
+    """조건부 업데이트로 재시도를 선점한다. 다른 스위퍼가 먼저 처리했으면 False."""
+    attempts = int(item.get("attempts", 0))
+    try:
+        table.update_item(
+            Key={"session_id": item["session_id"]},
+            UpdateExpression="SET #s = :analyzing, attempts = :next, last_attempt_at = :now",
+            ConditionExpression="#s = :old AND (attribute_not_exists(attempts) OR attempts = :cur)",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={
+                ":analyzing": STATUS_ANALYZING,
+                ":old": item["status"],
+                ":cur": attempts,
+                ":next": attempts + 1,
+                ":now": now.isoformat(),
+            },
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def _mark_failed(table: Any, item: Dict[str, Any]) -> bool:
+    """세션을 terminal 상태(failed)로 표시한다. 상태가 이미 바뀌었으면 False."""
+    try:
+        table.update_item(
+            Key={"session_id": item["session_id"]},
+            UpdateExpression="SET #s = :failed",
+            ConditionExpression="#s = :old",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={":failed": STATUS_FAILED, ":old": item["status"]},
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def _restore_completed(table: Any, item: Dict[str, Any]) -> bool:
+    """재분석을 포기한 수정 세션을 이전 결과 그대로 completed로 되돌린다. 상태가 이미 바뀌었으면 False."""
+    try:
+        table.update_item(
+            Key={"session_id": item["session_id"]},
+            UpdateExpression="SET #s = :completed, error_code = :e REMOVE pending_amend",
+            ConditionExpression="#s = :old AND pending_amend.version = :v",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={
+                ":completed": STATUS_COMPLETED,
+                ":e": AMEND_FAILED_ERROR_CODE,
+                ":old": item["status"],
+                ":v": item["pending_amend"]["version"],
+            },
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def sweep(
+    table: Any,
+    enqueue: Callable[[Dict[str, Any]], None],
+    config: SweepConfig,
+    now: Optional[datetime] = None,
+    on_failed: Optional[Callable[[str], None]] = None,
+    on_restored: Optional[Callable[[str], None]] = None,
+) -> Dict[str, int]:
+    """스위프 1회를 수행하고 조치 건수를 반환한다.
+
+    Args:
+        table: survey 테이블 (status-created_at-index GSI 필요)
+        enqueue: analyze 페이로드를 받아 분석을 다시 시작하는 함수
+        config: 스위퍼 설정
+        now: 기준 시각 (테스트용, 기본값 현재 UTC)
+        on_failed: terminal 처리된 session_id를 받는 콜백 (WebSocket 알림 등)
+        on_restored: completed로 되돌린 수정 세션의 session_id를 받는 콜백
+    """
+    now = now or datetime.now(timezone.utc)
+    counts = {"scanned": 0, "retried": 0, "failed": 0, "restored": 0}
+
+    for item in find_candidates(table, now, config):
+        counts["scanned"] += 1
+        action = plan_action(item, now, config)
+        session_id = item["session_id"]
+
+        if action == ACTION_RETRY and _claim_retry(table, item, now):
+            try:
+                payload = {field: item.get(field, "") for field in ANALYZE_PAYLOAD_FIELDS}
+                if item.get("pending_amend"):
+                    # 수정(amend) 세션은 전체 분석 대신 부분 재분석을 이어서 수행한다
+                    payload["amend_version"] = int(item["pending_amend"]["version"])
+                enqueue(payload)
+            except Exception:
+                # 선점은 되었으므로 stuck_threshold 경과 후 다음 스위프에서 다시 처리된다
+                logger.exception("분석 재시작 실패: session_id=%s", session_id)
+                continue
+            counts["retried"] += 1
+            logger.info(
+                "세션 재시도 등록: session_id=%s, previous_status=%s, attempt=%d",
+                session_id, item["status"], int(item.get("attempts", 0)) + 1,
+            )
+        elif action == ACTION_FAIL and item.get("pending_amend"):
+            if _restore_completed(table, item):
+                counts["restored"] += 1
+                logger.info("수정 재분석 포기, 이전 결과로 복원: session_id=%s", session_id)
+                if on_restored:
+                    on_restored(session_id)
+        elif action == ACTION_FAIL and _mark_failed(table, item):
+            counts["failed"] += 1
+            logger.info("세션 terminal 처리: session_id=%s, attempts=%s", session_id, item.get("attempts", 0))
+            if on_failed:
+                on_failed(session_id)
+
+    logger.info("스위프 완료: %s", counts)
+    return counts
@@ -0,0 +1,169 @@
+"""세션별 토큰/비용 집계와 예산 적용.
+
+Agent 트레이스의 모델 호출 사용량(input/output/cache 토큰)과 Knowledge Base 검색 횟수를
+TokenUsage로 모아
+    - survey 항목의 usage_* 속성에 누적하고 (재시도/사전 분석 포함 세션 합계)
+    - system_state 테이블의 usage#<날짜>#<모델> 항목에 일별·모델별로 누적한다 (용량 계획용).
+세션 토큰 예산은 survey 항목에 이미 누적된 사용량(session_tokens_used)을 뺀 남은 허용량으로
+호출마다 적용하며, 넘으면 collect_agent_stream이 TokenBudgetExceeded를 던져
+스트림 소비(오케스트레이션)를 중단한다.
+일별 집계 리포트는 benchmarks/usage_report.py로 출력한다.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ROLLUP_KEY_PREFIX = "usage#"
+UNKNOWN_MODEL = "none"
+
+# 예산에 세는 토큰 카운터 (TokenUsage.total_tokens와 같은 구성)
+TOKEN_COUNTERS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+
+# 백만 토큰당 USD (input, output, cache read, cache write). 모델 ID 부분 문자열로 찾는다.
+# 추정치이므로 청구 금액과 다를 수 있다 (요금 변경 시 여기만 갱신).
+MODEL_PRICING: Dict[str, Tuple[float, float, float, float]] = {
+    "claude-sonnet-4-5": (3.0, 15.0, 0.30, 3.75),
+    "claude-3-5-haiku": (0.80, 4.0, 0.08, 1.0),
+}
+
+
+@dataclass
+class TokenUsage:
+    """Agent 호출(또는 세션)의 토큰·검색 사용량."""
+
+    model_id: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    model_invocations: int = 0
+    kb_queries: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+    def add_invocation(self, usage: Dict[str, int]) -> None:
+        """모델 호출 1회의 사용량(extract_usage 결과)을 더한다."""
+        self.model_invocations += 1
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.cache_read_tokens += usage.get("cache_read_tokens", 0)
+        self.cache_write_tokens += usage.get("cache_write_tokens", 0)
+
+    def add(self, other: "TokenUsage") -> None:
+        """다른 사용량의 카운터를 더한다 (model_id는 비어 있을 때만 채운다)."""
+        for name, value in other.counters().items():
+            setattr(self, name, getattr(self, name) + value)
+        self.model_id = self.model_id or other.model_id
+
+    def counters(self) -> Dict[str, int]:
+        """누적 저장할 정수 카운터 (model_id 제외)."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "model_id"}
+
+
+class TokenBudgetExceeded(Exception):
+    """세션 토큰 예산을 넘어 오케스트레이션을 중단했다 (재시도해도 같은 비용이 드므로 terminal).
+
+    usage는 이번 호출의 사용량(세션에 아직 기록하지 않은 몫), prior_tokens는 호출 전에 이미 쓴 토큰이다.
+    """
+
+    def __init__(self, usage: TokenUsage, budget: int, prior_tokens: int = 0) -> None:
+        super().__init__(f"token budget exceeded: {prior_tokens + usage.total_tokens} > {budget}")
+        self.usage = usage
+        self.budget = budget
+        self.prior_tokens = prior_tokens
+
+
+def estimated_cost_usd(usage: TokenUsage) -> float:
+    """모델 요금표로 추정한 비용 (알 수 없는 모델은 0)."""
+    for model_key, (inp, out, cache_read, cache_write) in MODEL_PRICING.items():
+        if model_key in usage.model_id:
+            return (
+                usage.input_tokens * inp
+                + usage.output_tokens * out
+                + usage.cache_read_tokens * cache_read
+                + usage.cache_write_tokens * cache_write
+            ) / 1_000_000
+    return 0.0
+
+
+def _counter_update(usage: TokenUsage, prefix: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """카운터 ADD 식과 이름/값 매핑을 만든다 (비용은 마이크로달러 정수로 누적)."""
+    counters = {**usage.counters(), "cost_microusd": int(round(estimated_cost_usd(usage) * 1_000_000))}
+    names = {f"#{name}": f"{prefix}{name}" for name in counters}
+    values = {f":{name}": Decimal(value) for name, value in counters.items()}
+    expression = "ADD " + ", ".join(f"#{name} :{name}" for name in counters)
+    return expression, names, values
+
+
+def record_session_usage(table: Any, session_id: str, usage: TokenUsage) -> None:
+    """survey 항목의 usage_* 카운터에 사용량을 누적한다 (실패해도 분석에는 영향 없음)."""
+    expression, names, values = _counter_update(usage, "usage_")
+    if usage.model_id:
+        expression += " SET usage_model_id = :model_id"
+        values[":model_id"] = usage.model_id
+    try:
+        table.update_item(
+            Key={"session_id": session_id},
+            UpdateExpression=expression,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+    except Exception:
+        logger.exception("세션 사용량 기록 실패: session_id=%s", session_id)
+
+
+def session_tokens_used(table: Any, session_id: str) -> int:
+    """survey 항목의 usage_* 카운터에 누적된 세션 토큰 합계 (재시도/사전 분석/부분 재분석 포함)."""
+    item = table.get_item(
+        Key={"session_id": session_id},
+        ConsistentRead=True,
+        ProjectionExpression=", ".join(f"usage_{name}" for name in TOKEN_COUNTERS),
+    ).get("Item") or {}
+    return sum(int(item.get(f"usage_{name}", 0)) for name in TOKEN_COUNTERS)
+
+
+def rollup_key(day: str, model_id: str) -> str:
+    return f"{ROLLUP_KEY_PREFIX}{day}#{model_id or UNKNOWN_MODEL}"
+
+
+def record_daily_rollup(table: Any, usage: TokenUsage, now: Optional[datetime] = None) -> None:
+    """system_state 테이블의 일별·모델별 집계 항목에 사용량을 누적한다 (UTC 날짜 기준)."""
+    day = (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+    expression, names, values = _counter_update(usage, "")
+    names["#runs"] = "runs"
+    values[":one"] = Decimal(1)
+    values[":day"] = day
+    values[":model_id"] = usage.model_id or UNKNOWN_MODEL
+    try:
+        table.update_item(
+            Key={"state_key": rollup_key(day, usage.model_id)},
+            UpdateExpression=f"{expression}, #runs :one SET rollup_day = :day, model_id = :model_id",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+    except Exception:
+        logger.exception("일별 사용량 집계 실패: day=%s, model_id=%s", day, usage.model_id)
+
+
+def load_daily_rollups(table: Any, since_day: str = "") -> List[Dict[str, Any]]:
+    """일별·모델별 집계 항목을 (날짜, 모델) 순으로 반환한다. since_day(YYYY-MM-DD) 이후만."""
+    kwargs: Dict[str, Any] = {"FilterExpression": Attr("state_key").begins_with(ROLLUP_KEY_PREFIX)}
+    items: List[Dict[str, Any]] = []
+    while True:
+        resp = table.scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        if "LastEvaluatedKey" not in resp:
+            break
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    items = [item for item in items if item.get("rollup_day", "") >= since_day]
+    return sorted(items, key=lambda item: (item.get("rollup_day", ""), item.get("model_id", "")))
@@ -0,0 +1,155 @@
+"""녹화된 Agent 스트림 재생(replay) 백엔드.
+
+bedrock-agent-tracing-file.txt 형식(트레이스 항목의 JSON 배열)에 completion 청크를 더한
+녹화 파일을 읽어, invoke_agent와 같은 response["completion"] 이터레이터로 다시 내보낸다.
+이벤트 간 간격은 eventTime 기준 원본 타이밍을 따르며 time_scale로 배속을 조절한다.
+
+녹화 파일 항목:
+    - 트레이스: {"eventTime": ..., "trace": {...}, ...}  (트레이스 파일 항목 그대로)
+    - 청크: {"eventTime": ..., "chunk": {"text": "..."}}
+청크 항목이 없으면 finalResponse 텍스트를 해당 시각에 청크로 나누어 내보낸다.
+invoke_agent에 streamingConfigurations.streamFinalResponse=True를 주면 합성 청크를
+마지막 모델 호출 구간(modelInvocationInput → finalResponse)에 고르게 나누어 내보낸다
+(실제 Agent의 최종 응답 스트리밍 근사).
+"""
+
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# finalResponse로 청크를 합성할 때 청크 하나의 글자 수
+DEFAULT_CHUNK_CHARS = 256
+
+
+@dataclass
+class ReplayEvent:
+    """재생할 스트림 이벤트와 녹화 시작 기준 시각(초)."""
+
+    offset_seconds: float
+    event: Dict[str, Any]
+
+
+def _parse_event_time(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _final_response_text(entry: Dict[str, Any]) -> str:
+    orchestration = (entry.get("trace") or {}).get("orchestrationTrace") or {}
+    return ((orchestration.get("observation") or {}).get("finalResponse") or {}).get("text", "")
+
+
+def _is_model_invocation_input(entry: Dict[str, Any]) -> bool:
+    return "modelInvocationInput" in ((entry.get("trace") or {}).get("orchestrationTrace") or {})
+
+
+def parse_recording(
+    entries: List[Dict[str, Any]],
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    stream_final_response: bool = False,
+) -> List[ReplayEvent]:
+    """녹화 항목 목록을 재생 이벤트 목록으로 변환한다 (eventTime 순 정렬).
+
+    stream_final_response이면 finalResponse 합성 청크를 마지막 모델 호출 시작부터
+    finalResponse 시각까지 균등 간격으로 배치한다.
+    """
+    timed = sorted(
+        (entry for entry in entries if entry.get("eventTime")),
+        key=lambda entry: _parse_event_time(entry["eventTime"]),
+    )
+    if not timed:
+        return []
+
+    start = _parse_event_time(timed[0]["eventTime"])
+    has_chunks = any("chunk" in entry for entry in timed)
+    events: List[ReplayEvent] = []
+    generation_start = 0.0
+    for entry in timed:
+        offset = _parse_event_time(entry["eventTime"]) - start
+        if _is_model_invocation_input(entry):
+            generation_start = offset
+        if "chunk" in entry:
+            text = entry["chunk"].get("text", "")
+            events.append(ReplayEvent(offset, {"chunk": {"bytes": text.encode("utf-8")}}))
+            continue
+
+        events.append(ReplayEvent(offset, {"trace": entry}))
+        final_text = _final_response_text(entry)
+        if final_text and not has_chunks:
+            chunks = [final_text[i:i + chunk_chars] for i in range(0, len(final_text), chunk_chars)]
+            for n, chunk in enumerate(chunks, start=1):
+                chunk_offset = offset
+                if stream_final_response:
+                    chunk_offset = generation_start + (offset - generation_start) * n / len(chunks)
+                events.append(ReplayEvent(chunk_offset, {"chunk": {"bytes": chunk.encode("utf-8")}}))
+    # 스트리밍 청크가 앞당겨진 경우에도 시각 순서를 유지한다 (같은 시각은 원래 순서)
+    events.sort(key=lambda e: e.offset_seconds)
+    return events
+
+
+def load_recording(
+    path: str, chunk_chars: int = DEFAULT_CHUNK_CHARS, stream_final_response: bool = False
+) -> List[ReplayEvent]:
+    """녹화 파일을 읽어 재생 이벤트 목록을 반환한다."""
+    with open(path, encoding="utf-8") as f:
+        return parse_recording(json.load(f), chunk_chars=chunk_chars, stream_final_response=stream_final_response)
+
+
+class ReplayAgentRuntime:
+    """bedrock-agent-runtime 클라이언트 대체 구현 (녹화 스트림 재생).
+
+    Args:
+        events: 재생할 이벤트 목록 (load_recording 결과)
+        time_scale: 원본 간격에 곱할 배율 (1.0=원본 속도, 0=대기 없음)
+        sleep: 대기 함수 (테스트에서 가짜 시계와 연동)
+        streamed_events: streamFinalResponse 요청 시 재생할 이벤트 목록 (없으면 events)
+    """
+
+    def __init__(
+        self,
+        events: List[ReplayEvent],
+        time_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+        streamed_events: Optional[List[ReplayEvent]] = None,
+    ) -> None:
+        self.events = events
+        self.streamed_events = streamed_events
+        self.time_scale = time_scale
+        self.sleep = sleep
+        self.calls: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_file(cls, path: str, time_scale: float = 1.0, chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                  sleep: Optional[Callable[[float], None]] = None) -> "ReplayAgentRuntime":
+        return cls(
+            load_recording(path, chunk_chars=chunk_chars),
+            time_scale=time_scale,
+            sleep=sleep or time.sleep,
+            streamed_events=load_recording(path, chunk_chars=chunk_chars, stream_final_response=True),
+        )
+
+    @property
+    def duration_seconds(self) -> float:
+        """배율을 적용한 재생 1회 소요 시간(초)."""
+        return self.events[-1].offset_seconds * self.time_scale if self.events else 0.0
+
+    def _stream(self, events: List[ReplayEvent]) -> Iterator[Dict[str, Any]]:
+        previous = 0.0
+        for replay_event in events:
+            delay = (replay_event.offset_seconds - previous) * self.time_scale
+            if delay > 0:
+                self.sleep(delay)
+            previous = replay_event.offset_seconds
+            yield replay_event.event
+
+    def invoke_agent(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.append(kwargs)
+        streaming = (kwargs.get("streamingConfigurations") or {}).get("streamFinalResponse")
+        events = self.streamed_events if streaming and self.streamed_events else self.events
+        return {
+            "completion": self._stream(events),
+            "contentType": "application/json",
+            "sessionId": kwargs.get("sessionId") or str(uuid.uuid4()),
+        }
@@ -0,0 +1,401 @@
+"""스킬 → 중간 단계 → 목표 직무 전환 그래프와 로컬 최단 경로 로드맵 엔진.
+
+과거 career_cards(조합 공식과 로드맵)와 카드 템플릿 로드맵을 가중 방향 그래프로 모은다.
+    - 노드: 스킬("s:"), 현재 직업("j:"), 스킬/직업 클러스터("k:"), 로드맵 단계("t:"), 목표 직무("c:")
+    - 간선: 출발 노드 → 1단계 → … → 마지막 단계 → 직무. 비용은 도착 단계의 평균 기간(개월)에
+      드물게 관측된 간선일수록 RARITY_PENALTY를 더하고, WEF 스킬 전망에서 중요도가 커지는 스킬을
+      다루는 단계는 WEF_DISCOUNT 비율만큼 깎는다 (기간 자체는 months에 따로 보관)
+인접 목록은 CSR 배열(offsets/targets/costs/months)로 압축해 직렬화하고,
+사용자 스킬과 직업에서 출발하는 다중 출발점 Yen k-최단 경로(다익스트라)로 로드맵을 만든다.
+
+파일 형식 (리틀 엔디언):
+    header  <4sHHII  magic, version, reserved, nodes, edges
+    uint32[nodes+1]  노드별 간선 범위
+    uint32[edges]    도착 노드
+    float32[edges]   비용
+    float32[edges]   기간(개월)
+    bytes            UTF-8 JSON {"keys": [...], "labels": [...]}
+"""
+
+import heapq
+import json
+import re
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from services.amendment import normalize_skill
+from services.career_templates import JOB_CLUSTERS, SKILL_CLUSTERS, TEMPLATES, classify
+
+DEFAULT_GRAPH_KEY = "roadmap/transition.graph"
+MAGIC = b"GTRG"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+
+# 관측 횟수가 적은 간선에 더하는 비용 (개월 / 관측 횟수)
+RARITY_PENALTY = 1.0
+# 정확히 같은 스킬이 없어 클러스터 노드에서 출발할 때의 비용 (개월)
+CLUSTER_PENALTY = 1.0
+# WEF 전망 성장률(0~1)이 1인 스킬을 다루는 단계의 비용 할인 비율
+WEF_DISCOUNT = 0.3
+DEFAULT_MONTHS = 3.0
+
+_BRACKETS = re.compile(r"\[([^\]]+)\]")
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(?:\s*[-~]\s*(\d+(?:\.\d+)?))?\s*(year|yr|년|month|mo|개월|달|week|wk|주)?",
+                       re.IGNORECASE)
+_UNIT_MONTHS = {"year": 12.0, "yr": 12.0, "년": 12.0, "week": 0.25, "wk": 0.25, "주": 0.25}
+
+if sys.byteorder != "little":  # array는 네이티브 바이트 순서를 쓴다
+    raise ImportError("transition_graph 파일 형식은 리틀 엔디언 플랫폼만 지원합니다")
+
+
+def parse_duration(text: str) -> float:
+    """"2 months", "1-2 years", "6주" 같은 기간 문자열을 개월 수로 바꾼다 (범위는 평균, 해석 불가면 기본값)."""
+    match = _DURATION.search(text or "")
+    if not match:
+        return DEFAULT_MONTHS
+    low = float(match.group(1))
+    value = (low + float(match.group(2))) / 2 if match.group(2) else low
+    return value * _UNIT_MONTHS.get((match.group(3) or "").lower(), 1.0)
+
+
+def format_duration(months: float) -> str:
+    """개월 수를 템플릿 로드맵과 같은 "N months" 표기로 바꾼다."""
+    rounded = max(1, int(months + 0.5))
+    return f"{rounded} month" if rounded == 1 else f"{rounded} months"
+
+
+def parse_formula(combo_formula: str) -> Tuple[str, List[str], str]:
+    """"[직업] + [스킬] + … = [직무]"를 (직업, 스킬 목록, 직무)로 나눈다. 형식이 다르면 직무가 빈 문자열."""
+    left, sep, right = (combo_formula or "").rpartition("=")
+    if not sep:
+        return "", [], ""
+    parts = [p.strip() for p in _BRACKETS.findall(left) if p.strip()]
+    target = _BRACKETS.findall(right)
+    career = (target[0] if target else right).strip()
+    return (parts[0] if parts else ""), parts[1:], career
+
+
+def skill_key(skill: str) -> str:
+    return "s:" + normalize_skill(skill)
+
+
+def job_key(job_title: str) -> str:
+    return "j:" + normalize_skill(job_title)
+
+
+def career_key(title: str) -> str:
+    return "c:" + normalize_skill(title)
+
+
+def _step_key(step: str) -> str:
+    return "t:" + normalize_skill(step)
+
+
+def _cluster_keys(text: str, clusters: Dict[str, Tuple[str, ...]]) -> List[str]:
+    return ["k:" + name for name in sorted(classify(text, clusters))]
+
+
+@dataclass(frozen=True)
+class TransitionPath:
+    """사용자에서 직무까지의 단계 경로 (steps: (단계, 개월), cost: 탐색 비용)."""
+
+    career: str
+    steps: Tuple[Tuple[str, float], ...]
+    cost: float
+
+    @property
+    def months(self) -> float:
+        return sum(m for _, m in self.steps)
+
+    def roadmap(self) -> List[Dict[str, str]]:
+        """career_cards의 roadmap 형식."""
+        return [{"step": step, "duration": format_duration(m)} for step, m in self.steps]
+
+
+class GraphBuilder:
+    """관측 경로를 모아 간선별 평균 기간과 관측 횟수를 집계한다."""
+
+    def __init__(self) -> None:
+        self._labels: Dict[str, str] = {}
+        self._edges: Dict[Tuple[str, str], List[float]] = {}
+        self._growth: Dict[str, float] = {}
+        self.paths = 0
+
+    def _node(self, key: str, label: str) -> str:
+        self._labels.setdefault(key, label)
+        return key
+
+    def add_path(self, job_title: str, skills: Sequence[str], steps: Sequence[Tuple[str, float]],
+                 career: str) -> None:
+        """출발(직업, 스킬과 그 클러스터) → 단계들 → 직무 경로 하나를 더한다."""
+        steps = [(s.strip(), m) for s, m in steps if s and s.strip()]
+        if not steps or not career.strip():
+            return
+        origins = [self._node(skill_key(s), s.strip()) for s in skills if s.strip()]
+        for s in skills:
+            origins.extend(self._node(k, k[2:]) for k in _cluster_keys(s, SKILL_CLUSTERS))
+        if job_title.strip():
+            origins.append(self._node(job_key(job_title), job_title.strip()))
+            origins.extend(self._node(k, k[2:]) for k in _cluster_keys(job_title, JOB_CLUSTERS))
+        if not origins:
+            return
+        chain = [self._node(_step_key(step), step) for step, _ in steps]
+        for origin in dict.fromkeys(origins):
+            self._observe(origin, chain[0], steps[0][1])
+        for (prev, nxt), (_, months) in zip(zip(chain, chain[1:]), steps[1:]):
+            self._observe(prev, nxt, months)
+        self._observe(chain[-1], self._node(career_key(career), career.strip()), 0.0)
+        self.paths += 1
+
+    def _observe(self, u: str, v: str, months: float) -> None:
+        stat = self._edges.setdefault((u, v), [0.0, 0])
+        stat[0] += months
+        stat[1] += 1
+
+    def add_card(self, card: Dict[str, Any], job_title: str = "", skills: Sequence[str] = ()) -> None:
+        """career_cards 행 하나 (조합 공식에 직업/스킬이 없으면 job_title/skills 사용)."""
+        formula_job, formula_skills, career = parse_formula(card.get("combo_formula", ""))
+        steps = [(item.get("step", ""), parse_duration(item.get("duration", "")))
+                 for item in card.get("roadmap") or [] if isinstance(item, dict)]
+        self.add_path(formula_job or job_title, formula_skills or list(skills), steps, career)
+
+    def add_templates(self) -> None:
+        """카드 템플릿 로드맵을 시드 경로로 더한다 (템플릿 클러스터에서 출발)."""
+        for template in TEMPLATES:
+            steps = [(step, parse_duration(duration)) for step, duration in template.roadmap]
+            chain = [self._node(_step_key(step), step) for step, _ in steps]
+            for cluster in sorted(template.job_clusters | template.skill_clusters):
+                self._observe(self._node("k:" + cluster, cluster), chain[0], steps[0][1])
+            for (prev, nxt), (_, months) in zip(zip(chain, chain[1:]), steps[1:]):
+                self._observe(prev, nxt, months)
+            self._observe(chain[-1], self._node(career_key(template.title), template.title), 0.0)
+
+    def add_wef_skills(self, skills: Iterable[Dict[str, Any]]) -> None:
+        """WEF 스킬 전망 [{"skill", "growth"(0~1), "keywords"?}]를 단계 비용 할인에 반영한다."""
+        for item in skills:
+            growth = max(0.0, min(float(item.get("growth", 0.0)), 1.0))
+            for keyword in item.get("keywords") or [item["skill"]]:
+                keyword = normalize_skill(keyword)
+                if keyword:
+                    self._growth[keyword] = max(self._growth.get(keyword, 0.0), growth)
+
+    def _discount(self, key: str) -> float:
+        if not key.startswith("t:") or not self._growth:
+            return 1.0
+        text = key[2:]
+        growth = max((g for kw, g in self._growth.items() if re.search(rf"\b{re.escape(kw)}\b", text)), default=0.0)
+        return 1.0 - WEF_DISCOUNT * growth
+
+    def build(self) -> "TransitionGraph":
+        keys = sorted(self._labels)
+        ids = {key: i for i, key in enumerate(keys)}
+        discount = {key: self._discount(key) for key in keys}
+        adjacency: List[List[Tuple[int, float, float]]] = [[] for _ in keys]
+        for (u, v), (total, count) in self._edges.items():
+            months = total / count
+            cost = (months + RARITY_PENALTY / count) * discount[v] if not v.startswith("c:") else 0.0
+            adjacency[ids[u]].append((ids[v], cost, months))
+        offsets, targets, costs, months_arr = array("I", [0]), array("I"), array("f"), array("f")
+        for edges in adjacency:
+            for v, cost, months in sorted(edges):
+                targets.append(v)
+                costs.append(cost)
+                months_arr.append(months)
+            offsets.append(len(targets))
+        return TransitionGraph(keys, [self._labels[k] for k in keys], offsets, targets, costs, months_arr)
+
+
+_Path = Tuple[float, Tuple[int, ...], Tuple[int, ...]]  # (비용, 단계 노드…직무 노드, 각 노드로 들어온 간선)
+
+
+class TransitionGraph:
+    """CSR 인접 배열 전환 그래프 (읽기 전용)."""
+
+    def __init__(self, keys: List[str], labels: List[str], offsets: array, targets: array,
+                 costs: array, months: array) -> None:
+        self.keys = keys
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.months = months
+        self._ids = {key: i for i, key in enumerate(keys)}
+        self.path = ""  # open_graph로 읽은 로컬 파일 (S3IndexLoader가 교체 시 지운다)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def close(self) -> None:
+        """메모리에 모두 읽어 두므로 닫을 자원이 없다 (S3IndexLoader opener 규약)."""
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def sources(self, job_title: str, skills: Sequence[str]) -> Dict[int, float]:
+        """사용자 직업/스킬의 출발 노드와 출발 비용 (정확 일치 0, 클러스터만 일치하면 CLUSTER_PENALTY)."""
+        found: Dict[int, float] = {}
+
+        def add(key: str, cost: float) -> None:
+            node = self._ids.get(key)
+            if node is not None and cost < found.get(node, float("inf")):
+                found[node] = cost
+
+        for skill in skills:
+            add(skill_key(skill), 0.0)
+            for key in _cluster_keys(skill, SKILL_CLUSTERS):
+                add(key, CLUSTER_PENALTY)
+        if job_title.strip():
+            add(job_key(job_title), 0.0)
+            for key in _cluster_keys(job_title, JOB_CLUSTERS):
+                add(key, CLUSTER_PENALTY)
+        return found
+
+    def _entries(self, sources: Dict[int, float]) -> Dict[int, Tuple[float, int]]:
+        """출발 노드들을 첫 단계 노드별 (최소 비용, 들어온 간선)으로 접는다.
+
+        출발 노드는 들어오는 간선이 없으므로 경로는 첫 단계부터 같고 출발점만 다른 경로를 따로 세지 않는다.
+        """
+        entries: Dict[int, Tuple[float, int]] = {}
+        for u, base in sources.items():
+            for e in range(self.offsets[u], self.offsets[u + 1]):
+                cost = base + self.costs[e]
+                v = self.targets[e]
+                if v not in entries or cost < entries[v][0]:
+                    entries[v] = (cost, e)
+        return entries
+
+    def _dijkstra(self, starts: Dict[int, Tuple[float, int]], target: int, banned_nodes: Set[int],
+                  banned_edges: Set[int]) -> Optional[_Path]:
+        dist: Dict[int, float] = {}
+        prev: Dict[int, Tuple[int, int]] = {}
+        heap = [(cost, node) for node, (cost, _) in starts.items() if node not in banned_nodes]
+        heapq.heapify(heap)
+        best = {node: cost for cost, node in heap}
+        offsets, dest, costs = self.offsets, self.targets, self.costs
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in dist:
+                continue
+            dist[u] = d
+            if u == target:
+                nodes, edges = [u], []
+                while u in prev:
+                    u, e = prev[u]
+                    nodes.append(u)
+                    edges.append(e)
+                edges.append(starts[u][1])
+                return d, tuple(reversed(nodes)), tuple(reversed(edges))
+            for e in range(offsets[u], offsets[u + 1]):
+                v = dest[e]
+                if v in dist or v in banned_nodes or e in banned_edges:
+                    continue
+                nd = d + costs[e]
+                if nd < best.get(v, float("inf")):
+                    best[v] = nd
+                    prev[v] = (u, e)
+                    heapq.heappush(heap, (nd, v))
+        return None
+
+    def k_shortest_paths(self, sources: Dict[int, float], target: int, k: int = 3) -> List[_Path]:
+        """Yen 알고리즘으로 비용이 작은 순서의 단순 경로 최대 k개.
+
+        출발 노드들 앞에 가상 출발 노드가 있다고 보고, 가상 노드에서 갈라지는 경우는
+        이미 찾은 경로의 첫 단계를 빼고 다시 찾는다.
+        """
+        entries = self._entries(sources)
+        first = self._dijkstra(entries, target, set(), set())
+        if first is None:
+            return []
+        found: List[_Path] = [first]
+        candidates: List[_Path] = []
+        seen = {first[1]}
+
+        def offer(path: Optional[_Path]) -> None:
+            if path is not None and path[1] not in seen:
+                seen.add(path[1])
+                heapq.heappush(candidates, path)
+
+        while len(found) < k:
+            _, nodes, edges = found[-1]
+            used = {p[1][0] for p in found}
+            offer(self._dijkstra({n: v for n, v in entries.items() if n not in used}, target, set(), set()))
+            root_cost = entries[nodes[0]][0]
+            for i in range(len(nodes) - 1):
+                root = nodes[:i + 1]
+                banned_edges = {p[2][i + 1] for p in found if p[1][:i + 1] == root and len(p[2]) > i + 1}
+                spur = self._dijkstra({nodes[i]: (root_cost, edges[i])}, target, set(root[:-1]), banned_edges)
+                if spur is not None:
+                    offer((spur[0], root[:-1] + spur[1], edges[:i] + spur[2]))
+                root_cost += self.costs[edges[i + 1]]
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates))
+        return found
+
+    def _to_transition(self, path: _Path) -> TransitionPath:
+        cost, nodes, edges = path
+        steps = tuple((self.labels[v], float(self.months[e])) for v, e in zip(nodes, edges)
+                      if self.keys[v].startswith("t:"))
+        return TransitionPath(self.labels[nodes[-1]], steps, round(cost, 3))
+
+    def roadmaps(self, job_title: str, skills: Sequence[str], career: str, k: int = 1) -> List[TransitionPath]:
+        """사용자 직업/스킬에서 career까지 비용이 작은 단계 경로 최대 k개 (경로가 없으면 빈 목록)."""
+        target = self._ids.get(career_key(career))
+        sources = self.sources(job_title, skills)
+        if target is None or not sources:
+            return []
+        return [self._to_transition(p) for p in self.k_shortest_paths(sources, target, k)]
+
+    def to_bytes(self) -> bytes:
+        names = json.dumps({"keys": self.keys, "labels": self.labels}, ensure_ascii=False).encode("utf-8")
+        return b"".join([
+            _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self.keys), len(self.targets)),
+            self.offsets.tobytes(), self.targets.tobytes(), self.costs.tobytes(), self.months.tobytes(), names,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TransitionGraph":
+        magic, version, _, nodes, edges = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 전환 그래프 형식: magic={magic!r}, version={version}")
+        pos = _HEADER.size
+        sections = []
+        for fmt, count in (("I", nodes + 1), ("I", edges), ("f", edges), ("f", edges)):
+            section = array(fmt)
+            section.frombytes(data[pos:pos + 4 * count])
+            sections.append(section)
+            pos += 4 * count
+        names = json.loads(data[pos:].decode("utf-8"))
+        return cls(names["keys"], names["labels"], *sections)
+
+
+def apply_roadmaps(graph: TransitionGraph, cards: Sequence[Dict[str, Any]], job_title: str,
+                   skills: Sequence[str]) -> List[Dict[str, Any]]:
+    """카드마다 사용자 직업/스킬에서 카드 직무까지의 최단 경로로 roadmap을 바꾼다 (경로가 없으면 그대로)."""
+    result = []
+    for card in cards:
+        paths = graph.roadmaps(job_title, skills, parse_formula(card.get("combo_formula", ""))[2])
+        result.append({**card, "roadmap": paths[0].roadmap()} if paths else dict(card))
+    return result
+
+
+def save_graph(s3: Any, bucket: str, key: str, graph: TransitionGraph) -> int:
+    body = graph.to_bytes()
+    s3.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/octet-stream")
+    return len(body)
+
+
+def load_graph(s3: Any, bucket: str, key: str) -> TransitionGraph:
+    return TransitionGraph.from_bytes(s3.get_object(Bucket=bucket, Key=key)["Body"].read())
+
+
+def open_graph(path: str) -> TransitionGraph:
+    """로컬 파일에서 그래프를 읽는다 (S3IndexLoader opener)."""
+    with open(path, "rb") as f:
+        graph = TransitionGraph.from_bytes(f.read())
+    graph.path = path
+    return graph
@@ -0,0 +1,200 @@
+"""분석 결과 현지화(번역) 서비스.
+
+분석 생성은 정규 언어(영어)로 프로필당 한 번만 수행한다. 수치 필드
+(replacement_prob, time_horizon, remaining_years)는 언어와 무관하므로 그대로 두고,
+다른 언어 응답은 텍스트 필드만 저렴한 모델(invoke_model)로 번역한다.
+
+번역 결과는 (텍스트 해시, 언어) 단위로 translation_cache 테이블에 저장하므로
+같은 문장은 세션이 달라도 언어별로 한 번만 번역된다.
+번역이 실패하면 정규 언어 원문을 그대로 반환한다 (결과 조회를 막지 않는다).
+"""
+
+import copy
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CANONICAL_LANGUAGE = "en"
+SUPPORTED_LANGUAGES = ("en", "ko")
+LANGUAGE_NAMES = {"en": "English", "ko": "Korean"}
+
+# 번역 캐시 보관 기간 (같은 문장 재사용 기간)
+DEFAULT_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+# 모델 호출 1회에 번역할 최대 문자열 수 (응답 max_tokens 안에 들어가도록)
+DEFAULT_BATCH_SIZE = 40
+# DynamoDB BatchGetItem 요청당 최대 키 수
+_BATCH_GET_LIMIT = 100
+
+
+def text_hash(text: str) -> str:
+    """번역 캐시 키로 쓰는 텍스트 지문."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def negotiate_language(
+    accept_language: Optional[str],
+    supported: Sequence[str] = SUPPORTED_LANGUAGES,
+    default: str = CANONICAL_LANGUAGE,
+) -> str:
+    """Accept-Language 헤더에서 지원 언어 중 가장 선호도가 높은 언어를 고른다.
+
+    예: "ko-KR,ko;q=0.9,en-US;q=0.8" → "ko". 지원 언어가 없으면 default.
+    """
+    candidates: List[Tuple[float, int, str]] = []
+    for index, part in enumerate((accept_language or "").split(",")):
+        tag, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        primary = tag.strip().split("-")[0].lower()
+        if primary and quality > 0:
+            candidates.append((-quality, index, primary))
+
+    for _, _, primary in sorted(candidates):
+        if primary == "*":
+            return default
+        if primary in supported:
+            return primary
+    return default
+
+
+def _localizable_slots(result: Dict[str, Any]) -> List[Tuple[Dict[str, Any], str]]:
+    """번역 대상 텍스트 필드의 (소유 dict, 키) 목록. 수치·스킬명·카테고리는 제외한다."""
+    slots: List[Tuple[Dict[str, Any], str]] = [(result, "remaining_years_reason")]
+    for risk in result.get("skill_risks", []):
+        slots.append((risk, "justification"))
+    for card in result.get("career_cards", []):
+        slots.append((card, "combo_formula"))
+        slots.append((card, "reason"))
+        for step in card.get("roadmap", []):
+            if isinstance(step, dict):
+                slots.extend((step, key) for key in ("step", "duration"))
+    return [(owner, key) for owner, key in slots if isinstance(owner.get(key), str) and owner[key].strip()]
+
+
+class TranslationCache:
+    """(텍스트 해시, 언어) 단위 번역 캐시.
+
+    테이블 키: text_hash(HASH) + language(RANGE), TTL 속성 expires_at.
+    """
+
+    def __init__(self, table: Any, ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS) -> None:
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def get_many(self, hashes: Sequence[str], language: str) -> Dict[str, str]:
+        """캐시된 번역을 {text_hash: 번역문}으로 반환한다."""
+        found: Dict[str, str] = {}
+        client = self.table.meta.client
+        for start in range(0, len(hashes), _BATCH_GET_LIMIT):
+            request = {
+                self.table.name: {
+                    "Keys": [{"text_hash": h, "language": language} for h in hashes[start:start + _BATCH_GET_LIMIT]],
+                    "ProjectionExpression": "text_hash, translated",
+                }
+            }
+            while request:
+                resp = client.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(self.table.name, []):
+                    found[item["text_hash"]] = item["translated"]
+                request = resp.get("UnprocessedKeys") or None
+        return found
+
+    def put_many(self, translations: Dict[str, str], language: str) -> None:
+        """번역 결과를 캐시에 저장한다."""
+        expires_at = int(time.time()) + self.ttl_seconds
+        with self.table.batch_writer() as batch:
+            for h, translated in translations.items():
+                batch.put_item(Item={
+                    "text_hash": h,
+                    "language": language,
+                    "translated": translated,
+                    "expires_at": expires_at,
+                })
+
+
+class BedrockTranslator:
+    """invoke_model로 문자열 목록을 한 번에 번역한다 (JSON 배열 입출력)."""
+
+    def __init__(self, client: Any, model_id: str, max_tokens: int = 4096) -> None:
+        self.client = client
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+
+    def translate(self, texts: List[str], language: str) -> List[str]:
+        """texts를 language로 번역한다. 응답 길이가 다르면 ValueError."""
+        instruction = (
+            f"Translate each string in the JSON array below into {LANGUAGE_NAMES.get(language, language)}. "
+            "Keep numbers, skill names, and bracket formatting unchanged. "
+            "Reply with only a JSON array of the same length and order.\n\n"
+            + json.dumps(texts, ensure_ascii=False)
+        )
+        resp = self.client.invoke_model(
+            modelId=self.model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps({
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": self.max_tokens,
+                "temperature": 0,
+                "messages": [{"role": "user", "content": instruction}],
+            }),
+        )
+        body = json.loads(resp["body"].read())
+        text = "".join(block.get("text", "") for block in body.get("content", []))
+        start, end = text.find("["), text.rfind("]")
+        translated = json.loads(text[start:end + 1]) if start != -1 and end > start else None
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise ValueError("번역 응답 형식 오류 (stop_reason=%s)" % body.get("stop_reason"))
+        return [str(t) for t in translated]
+
+
+def localize_result(
+    result: Dict[str, Any],
+    language: str,
+    cache: Optional[TranslationCache],
+    translate: Optional[Callable[[List[str], str], List[str]]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[Dict[str, Any], str]:
+    """정규 언어 분석 결과를 language로 현지화한다.
+
+    Returns:
+        (현지화된 결과 사본, 실제 응답 언어). 번역기가 없거나 실패하면 원문과 정규 언어.
+    """
+    if language == CANONICAL_LANGUAGE or translate is None:
+        return result, CANONICAL_LANGUAGE
+
+    localized = copy.deepcopy(result)
+    slots = _localizable_slots(localized)
+    by_hash = {text_hash(owner[key]): owner[key] for owner, key in slots}
+
+    try:
+        translations = cache.get_many(list(by_hash), language) if cache else {}
+        missing = [h for h in by_hash if h not in translations]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            fresh = dict(zip(batch, translate([by_hash[h] for h in batch], language)))
+            translations.update(fresh)
+            if cache:
+                cache.put_many(fresh, language)
+    except Exception:
+        logger.exception("번역 실패, 정규 언어로 응답: language=%s", language)
+        return result, CANONICAL_LANGUAGE
+
+    logger.info(
+        "결과 현지화: language=%s, texts=%d, translated=%d",
+        language, len(by_hash), len(missing),
+    )
+    for owner, key in slots:
+        owner[key] = translations[text_hash(owner[key])]
+    return localized, language
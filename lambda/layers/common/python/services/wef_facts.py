@@ -0,0 +1,141 @@
+"""WEF Future of Jobs 수치 사실 테이블 (mmap 파일, 벡터 검색 없음).
+
+Agent의 RETURN_CONTROL 액션 그룹(get_job_outlook, get_skill_outlook)에 analyze Lambda 안에서
+정확한 수치로 답하기 위한 구조화 테이블이다. 직업/스킬마다 레코드 하나
+{"kind": "job"|"skill", "name", "aliases", "figures": {...}, "source": "<보고서 도표/페이지>"}를 두고,
+정규화한 이름과 별칭을 정렬된 키로 저장해 mmap 위에서 이진 탐색한다.
+정확히 같은 키가 없으면 질의의 연속 단어 구간을 긴 것부터 이진 탐색해 가장 긴 일치 키를 쓴다
+(키 구간 전체를 훑지 않으므로 레코드 수와 무관하게 질의 단어 수에만 비례한다).
+    - 빌드: python -m benchmarks.wef_facts (보고서에서 옮긴 JSON → 파일 → S3)
+    - 조회: analyze가 services.ivf_index.S3IndexLoader(opener=WEFFactStore)로 /tmp에 받아 연다
+
+파일 형식 (리틀 엔디언):
+    header  <4sHHII  magic, version, reserved, keys, records
+    uint32[keys+1]     키 오프셋 ("<kind>:<정규화 이름>", 정렬)
+    uint32[keys]       키 → 레코드 번호
+    uint32[records+1]  레코드 오프셋
+    bytes              UTF-8 키
+    bytes              UTF-8 JSON 레코드
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.amendment import normalize_skill
+
+DEFAULT_FACTS_KEY = "wef/facts.bin"
+MAGIC = b"GWEF"
+FORMAT_VERSION = 1
+KINDS = ("job", "skill")
+_HEADER = struct.Struct("<4sHHII")
+
+if sys.byteorder != "little":  # memoryview.cast는 네이티브 바이트 순서를 쓴다
+    raise ImportError("wef_facts 파일 형식은 리틀 엔디언 플랫폼만 지원합니다")
+
+
+def fact_key(kind: str, name: str) -> str:
+    return f"{kind}:{normalize_skill(name)}"
+
+
+def build_fact_table(facts: Iterable[Dict[str, Any]]) -> bytes:
+    """사실 레코드 목록을 파일 형식으로 직렬화한다 (같은 키는 먼저 나온 레코드가 이긴다)."""
+    records: List[bytes] = []
+    keys: Dict[str, int] = {}
+    for fact in facts:
+        kind, name = fact.get("kind"), (fact.get("name") or "").strip()
+        if kind not in KINDS or not name:
+            raise ValueError(f"잘못된 WEF 사실 레코드: {fact!r}")
+        record = {"kind": kind, "name": name, "figures": fact.get("figures") or {}, "source": fact.get("source", "")}
+        for alias in [name, *(fact.get("aliases") or [])]:
+            if normalize_skill(alias):
+                keys.setdefault(fact_key(kind, alias), len(records))
+        records.append(json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+    ordered = sorted((key.encode("utf-8"), index) for key, index in keys.items())
+    key_offsets, record_offsets = array("I", [0]), array("I", [0])
+    for key, _ in ordered:
+        key_offsets.append(key_offsets[-1] + len(key))
+    for record in records:
+        record_offsets.append(record_offsets[-1] + len(record))
+    return b"".join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(ordered), len(records)),
+        key_offsets.tobytes(),
+        array("I", [index for _, index in ordered]).tobytes(),
+        record_offsets.tobytes(),
+        *(key for key, _ in ordered),
+        *records,
+    ])
+
+
+class _SortedKeys:
+    """mmap 키 구간을 bisect할 수 있는 읽기 전용 시퀀스."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+
+class WEFFactStore:
+    """사실 테이블 파일을 mmap으로 열어 조회한다 (services.ivf_index.S3IndexLoader opener 규약)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        magic, version, _, key_count, record_count = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            buf.release()
+            self._mmap.close()
+            raise ValueError(f"지원하지 않는 WEF 사실 테이블 형식: magic={magic!r}, version={version}")
+        pos = _HEADER.size
+        views = []
+        for count in (key_count + 1, key_count, record_count + 1):
+            views.append(buf[pos:pos + 4 * count].cast("I"))
+            pos += 4 * count
+        key_offsets, self._key_records, self._record_offsets = views
+        key_blob = buf[pos:pos + key_offsets[-1]]
+        self._records = buf[pos + key_offsets[-1]:]
+        self._keys = _SortedKeys(key_offsets, key_blob)
+        self._views = views + [key_blob, self._records, buf]
+        self._record_count = record_count
+
+    def __len__(self) -> int:
+        return self._record_count
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        start, end = self._record_offsets[index], self._record_offsets[index + 1]
+        return json.loads(bytes(self._records[start:end]).decode("utf-8"))
+
+    def _find(self, key: bytes) -> Optional[int]:
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return None
+
+    def lookup(self, kind: str, name: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """(레코드, 일치한 이름)을 돌려준다. 정확한 키가 없으면 질의 안의 가장 긴 단어 구간 키, 없으면 None."""
+        words = fact_key(kind, name)[len(kind) + 1:].split()
+        for size in range(len(words), 0, -1):
+            for start in range(len(words) - size + 1):
+                matched = " ".join(words[start:start + size])
+                i = self._find(f"{kind}:{matched}".encode("utf-8"))
+                if i is not None:
+                    return self._record(self._key_records[i]), matched
+        return None
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._mmap.close()
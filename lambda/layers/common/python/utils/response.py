@@ -2,7 +2,7 @@
 
 import json
 from decimal import Decimal
-from typing import Any
+from typing import Any, Dict, Optional
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -16,12 +16,13 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(o)
 
 
-def response(status_code: int, body: Any) -> dict:
+def response(status_code: int, body: Any, headers: Optional[Dict[str, str]] = None) -> dict:
     """Build a standard API Gateway proxy response.
 
     Args:
         status_code: HTTP status code.
         body: Response payload (will be JSON-serialized).
+        headers: Extra response headers merged over the defaults.
 
     Returns:
         API Gateway Lambda proxy integration response dict.
@@ -33,6 +34,7 @@ def response(status_code: int, body: Any) -> dict:
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
             "Access-Control-Allow-Headers": "Content-Type",
+            **(headers or {}),
         },
         "body": json.dumps(body, cls=DecimalEncoder, ensure_ascii=False),
     }
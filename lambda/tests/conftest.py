@@ -4,6 +4,10 @@ import os
 import sys
 from pathlib import Path
 
+import boto3
+import pytest
+from moto import mock_aws
+
 # lambda/ 디렉토리를 기준으로 경로 설정
 _lambda_root = Path(__file__).resolve().parent.parent
 _layers_path = _lambda_root / "layers" / "common" / "python"
@@ -19,3 +23,38 @@ os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
 os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
 os.environ.setdefault("AWS_SECURITY_TOKEN", "testing")
 os.environ.setdefault("AWS_SESSION_TOKEN", "testing")
+
+from tests.helpers import create_analysis_tables  # noqa: E402  (경로 설정 뒤에 임포트)
+
+# analyze 모듈 상수 기본값: create_analysis_tables의 테이블을 쓰고 선택 기능 테이블은 끈다
+ANALYZE_SETTINGS = {
+    "SURVEY_TABLE_NAME": "survey",
+    "SKILL_GRAPH_TABLE_NAME": "skill_graph",
+    "CAREER_CARDS_TABLE_NAME": "career_cards",
+    "CHECKPOINT_TABLE_NAME": "",
+    "STATE_TABLE_NAME": "",
+    "ANALYSIS_CACHE_TABLE_NAME": "",
+    "ANALYSIS_RECORDS_TABLE_NAME": "",
+}
+
+
+@pytest.fixture
+def analyze_overrides():
+    """analyze_module에 덮어쓸 모듈 상수 (테스트 모듈이 같은 이름의 픽스처로 재정의한다)."""
+    return {}
+
+
+@pytest.fixture
+def analyze_module(request, monkeypatch, analyze_overrides):
+    """moto 테이블 위에 functions.analyze.handler를 구성해 (module, ddb)를 돌려준다.
+
+    ANALYZE_SETTINGS에 analyze_overrides, indirect 매개변수(dict) 순서로 덮어쓴다.
+    """
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        import functions.analyze.handler as module
+
+        for name, value in {**ANALYZE_SETTINGS, **analyze_overrides, **getattr(request, "param", {})}.items():
+            monkeypatch.setattr(module, name, value)
+        yield module, ddb
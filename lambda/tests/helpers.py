@@ -0,0 +1,284 @@
+"""analyze_handler 테스트 공용 헬퍼 (샘플 분석 결과, 테이블 생성, 가짜 Agent/모델/배치 작업 런타임)."""
+
+import io
+import json
+import random
+import re
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from botocore.exceptions import ClientError
+
+from services.bulk_inference import job_output_prefix, split_s3_uri
+
+SAMPLE_ANALYSIS = {
+    "remaining_years": 7,
+    "remaining_years_reason": "반복 업무 비중이 높아 자동화 위험이 크다.",
+    "skill_risks": [
+        {
+            "skill_name": "Python",
+            "category": "Technology",
+            "replacement_prob": 60,
+            "time_horizon": 5,
+            "justification": "코드 생성 AI가 단순 구현을 대체한다.",
+        },
+        {
+            "skill_name": "Communication",
+            "category": "Self-efficacy",
+            "replacement_prob": 20,
+            "time_horizon": 10,
+            "justification": "인간 관계 조율은 여전히 인간의 영역이다.",
+        },
+    ],
+    "career_cards": [
+        {
+            "card_index": i,
+            "combo_formula": f"[개발자] + [Python] = [직업 {i}]",
+            "reason": "성장 직군",
+            "roadmap": [{"step": "기초 학습", "duration": "3 months"}],
+        }
+        for i in range(3)
+    ],
+}
+
+
+def create_analysis_tables(ddb) -> None:
+    """analyze_handler가 사용하는 survey/skill_graph/career_cards/system_state/checkpoint/analysis_cache/analysis_records 테이블을 생성한다."""
+    ddb.create_table(
+        TableName="survey",
+        KeySchema=[{"AttributeName": "session_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "session_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    ddb.create_table(
+        TableName="skill_graph",
+        KeySchema=[
+            {"AttributeName": "session_id", "KeyType": "HASH"},
+            {"AttributeName": "skill_name", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "session_id", "AttributeType": "S"},
+            {"AttributeName": "skill_name", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    ddb.create_table(
+        TableName="career_cards",
+        KeySchema=[
+            {"AttributeName": "session_id", "KeyType": "HASH"},
+            {"AttributeName": "card_index", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "session_id", "AttributeType": "S"},
+            {"AttributeName": "card_index", "AttributeType": "N"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    ddb.create_table(
+        TableName="system_state",
+        KeySchema=[{"AttributeName": "state_key", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "state_key", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    ddb.create_table(
+        TableName="analysis_checkpoints",
+        KeySchema=[
+            {"AttributeName": "session_id", "KeyType": "HASH"},
+            {"AttributeName": "stage", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "session_id", "AttributeType": "S"},
+            {"AttributeName": "stage", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    ddb.create_table(
+        TableName="analysis_cache",
+        KeySchema=[{"AttributeName": "cache_key", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "cache_key", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    ddb.create_table(
+        TableName="analysis_records",
+        KeySchema=[{"AttributeName": "record_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "record_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+class FakeAgentRuntime:
+    """bedrock-agent-runtime 클라이언트 대체 구현.
+
+    invoke_agent 호출 횟수를 기록하고, KB 검색 트레이스 1건과
+    completion 텍스트를 청크로 나누어 반환한다.
+    """
+
+    def __init__(self, completion: str, chunk_size: int = 64) -> None:
+        self.completion = completion
+        self.chunk_size = chunk_size
+        self.calls = []
+
+    def invoke_agent(self, **kwargs):
+        self.calls.append(kwargs)
+        events = [{
+            "trace": {
+                "trace": {
+                    "orchestrationTrace": {
+                        "observation": {
+                            "knowledgeBaseLookupOutput": {
+                                "retrievedReferences": [{
+                                    "content": {"text": "Software developers: 17% net growth to 2030"},
+                                    "location": {"s3Location": {"uri": "s3://kb/pdfdata/jobs.pdf"}},
+                                }],
+                            },
+                        },
+                    },
+                },
+            },
+        }]
+        for i in range(0, len(self.completion), self.chunk_size):
+            events.append({"chunk": {"bytes": self.completion[i:i + self.chunk_size].encode("utf-8")}})
+        return {"completion": iter(events)}
+
+
+class FakeBatchModelRuntime:
+    """묶음 생성용 bedrock-runtime 클라이언트 대체 구현.
+
+    프롬프트의 "### User session_id: <id>" 항목마다 SAMPLE_ANALYSIS를 돌려주고,
+    응답 지연과 입력 토큰은 공유 오버헤드 + 프로필 수 비례로 흉내 낸다.
+    skip_sessions에 있는 세션은 응답 배열에서 뺀다.
+    """
+
+    def __init__(
+        self,
+        overhead_seconds: float = 0.0,
+        per_profile_seconds: float = 0.0,
+        shared_input_tokens: int = 8000,
+        per_profile_input_tokens: int = 400,
+        per_profile_output_tokens: int = 700,
+        skip_sessions=(),
+        sleep=time.sleep,
+    ) -> None:
+        self.overhead_seconds = overhead_seconds
+        self.per_profile_seconds = per_profile_seconds
+        self.shared_input_tokens = shared_input_tokens
+        self.per_profile_input_tokens = per_profile_input_tokens
+        self.per_profile_output_tokens = per_profile_output_tokens
+        self.skip_sessions = set(skip_sessions)
+        self.sleep = sleep
+        self.calls = []
+
+    def invoke_model(self, **kwargs):
+        self.calls.append(kwargs)
+        prompt = json.loads(kwargs["body"])["messages"][0]["content"]
+        session_ids = re.findall(r"^### User session_id: (\S+)$", prompt, flags=re.MULTILINE)
+        self.sleep(self.overhead_seconds + self.per_profile_seconds * len(session_ids))
+        results = [{"session_id": sid, **SAMPLE_ANALYSIS} for sid in session_ids if sid not in self.skip_sessions]
+        body = {
+            "content": [{"type": "text", "text": json.dumps(results, ensure_ascii=False)}],
+            "stop_reason": "end_turn",
+            "usage": {
+                "input_tokens": self.shared_input_tokens + self.per_profile_input_tokens * len(session_ids),
+                "output_tokens": self.per_profile_output_tokens * len(session_ids),
+            },
+        }
+        return {"body": io.BytesIO(json.dumps(body).encode("utf-8"))}
+
+
+class StubEndpointRuntime:
+    """지연 시간과 오류 동작을 설정할 수 있는 로컬 bedrock-agent-runtime 스텁.
+
+    Args:
+        completion: 성공 시 반환할 응답 텍스트
+        latency_seconds: 응답 지연 (sleep 함수로 대기)
+        error_rate: 일시 오류(serviceUnavailableException) 비율
+        throttle_rate: 스로틀(throttlingException) 비율
+        seed: 난수 시드
+        sleep: 대기 함수 (테스트에서 가짜 시계와 연동)
+    """
+
+    def __init__(
+        self,
+        completion: str,
+        latency_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.completion = completion
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.sleep = sleep
+        self.calls = 0
+
+    def invoke_agent(self, **kwargs: Any) -> Dict[str, Iterator[Dict[str, Any]]]:
+        self.calls += 1
+        self.sleep(self.latency_seconds)
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            raise ClientError(
+                {"Error": {"Code": "throttlingException", "Message": "Rate exceeded"}}, "InvokeAgent"
+            )
+        if roll < self.throttle_rate + self.error_rate:
+            raise ClientError(
+                {"Error": {"Code": "serviceUnavailableException", "Message": "Service unavailable"}},
+                "InvokeAgent",
+            )
+        return {"completion": iter([{"chunk": {"bytes": self.completion.encode("utf-8")}}])}
+
+
+class FakeBatchJobRunner:
+    """로컬 테스트용 bedrock(control plane) 배치 추론 대체 구현.
+
+    create_model_invocation_job은 작업을 등록만 하고, get_model_invocation_job을
+    polls_until_complete번 호출하면 입력 JSONL을 줄 단위로 읽어 respond(modelInput)의
+    텍스트로 출력 JSONL을 쓴 뒤 Completed를 반환한다. respond가 예외를 던지면 오류 레코드를 쓴다.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        respond: Callable[[Dict[str, Any]], str],
+        polls_until_complete: int = 2,
+    ) -> None:
+        self.s3 = s3_client
+        self.respond = respond
+        self.polls_until_complete = polls_until_complete
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create_model_invocation_job(self, **kwargs: Any) -> Dict[str, str]:
+        job_arn = f"arn:aws:bedrock:us-east-1:000000000000:model-invocation-job/{kwargs['jobName']}"
+        self.jobs[job_arn] = {"request": kwargs, "polls": 0, "status": "Submitted"}
+        return {"jobArn": job_arn}
+
+    def get_model_invocation_job(self, jobIdentifier: str) -> Dict[str, Any]:
+        job = self.jobs[jobIdentifier]
+        job["polls"] += 1
+        if job["status"] != "Completed" and job["polls"] >= self.polls_until_complete:
+            self._run(jobIdentifier, job["request"])
+            job["status"] = "Completed"
+        elif job["status"] == "Submitted":
+            job["status"] = "InProgress"
+        return {"jobArn": jobIdentifier, "status": job["status"]}
+
+    def _run(self, job_arn: str, request: Dict[str, Any]) -> None:
+        in_bucket, in_key = split_s3_uri(request["inputDataConfig"]["s3InputDataConfig"]["s3Uri"])
+        out_bucket, out_prefix = job_output_prefix(request["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"], job_arn)
+        body = self.s3.get_object(Bucket=in_bucket, Key=in_key)["Body"]
+        with tempfile.TemporaryFile("w+b") as out:
+            for line in body.iter_lines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                try:
+                    text = self.respond(record["modelInput"])
+                    record["modelOutput"] = {"content": [{"type": "text", "text": text}], "stop_reason": "end_turn"}
+                except Exception as e:
+                    record["error"] = {"errorCode": 400, "errorMessage": str(e)}
+                out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            out.seek(0)
+            self.s3.upload_fileobj(out, out_bucket, out_prefix + in_key.rsplit("/", 1)[-1] + ".out")
@@ -0,0 +1,78 @@
+"""공유 분석 레코드(내용 해시 주소)와 세션 포인터 테스트."""
+
+import json
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+from moto import mock_aws
+
+from services.analysis_records import AnalysisRecordStore, record_id, shared_content
+from services.bulk_inference import combination_key
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime, create_analysis_tables
+
+CARDS = [{"card_index": i, "combo_formula": f"A + B = C{i}", "reason": "성장 직군", "roadmap": []} for i in range(3)]
+
+
+def test_record_id_is_content_address():
+    content = shared_content(SAMPLE_ANALYSIS, CARDS)
+    reordered = json.loads(json.dumps(content))
+    assert record_id(content) == record_id(reordered)
+    assert record_id(content) != record_id({**content, "remaining_years": 8})
+
+
+def test_put_is_idempotent():
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        store = AnalysisRecordStore(ddb.Table("analysis_records"))
+        content = shared_content(SAMPLE_ANALYSIS, CARDS)
+
+        assert store.put(content) == store.put(content) == record_id(content)
+        assert ddb.Table("analysis_records").scan()["Count"] == 1
+        assert store.get(record_id(content)) == content
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {"ANALYSIS_CACHE_TABLE_NAME": "analysis_cache", "ANALYSIS_RECORDS_TABLE_NAME": "analysis_records",
+            "bedrock_agent_runtime": FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS))}
+
+
+def test_cached_analysis_stores_pointer_and_result_dereferences(analyze_module, monkeypatch):
+    """사전 분석 캐시 적중 세션은 행 대신 포인터만 저장하고, 결과 조회는 레코드를 캐시해 읽는다."""
+    analyze, ddb = analyze_module
+    for sid in ("sid-1", "sid-2"):
+        ddb.Table("survey").put_item(Item={"session_id": sid, "status": "analyzing"})
+    ddb.Table("analysis_cache").put_item(Item={
+        "cache_key": combination_key("개발자", "Python, Communication"),
+        "analysis": json.dumps(SAMPLE_ANALYSIS),
+    })
+
+    # result_handler는 임포트 시 환경변수로 테이블 이름을 읽는다 (test_result_handler와 같은 설정)
+    monkeypatch.setenv("SURVEY_TABLE_NAME", "survey")
+    monkeypatch.setenv("SKILL_GRAPH_TABLE_NAME", "skill_graph")
+    monkeypatch.setenv("CAREER_CARDS_TABLE_NAME", "career_cards")
+    import functions.result.handler as result
+
+    monkeypatch.setattr(result, "SURVEY_TABLE_NAME", "survey")
+    monkeypatch.setattr(result, "ANALYSIS_RECORDS_TABLE_NAME", "analysis_records")
+    monkeypatch.setattr(result, "TRANSLATION_MODEL_ID", "")
+    result._load_shared_record.cache_clear()
+
+    for sid in ("sid-1", "sid-2"):
+        analyze.handler({"session_id": sid, "name": sid, "job_title": "개발자",
+                         "strengths": "Python, Communication"}, None)
+
+    items = [ddb.Table("survey").get_item(Key={"session_id": sid})["Item"] for sid in ("sid-1", "sid-2")]
+    assert items[0]["status"] == "completed"
+    assert items[0]["analysis_ref"] == items[1]["analysis_ref"]
+    assert ddb.Table("analysis_records").scan()["Count"] == 1
+    for table in ("skill_graph", "career_cards"):
+        assert ddb.Table(table).query(KeyConditionExpression=Key("session_id").eq("sid-1"))["Items"] == []
+
+    bodies = [json.loads(result.handler({"pathParameters": {"sid": sid}}, None)["body"]) for sid in ("sid-1", "sid-2")]
+    assert bodies[0]["remaining_years"] == SAMPLE_ANALYSIS["remaining_years"]
+    assert len(bodies[0]["skill_risks"]) == 2 and len(bodies[0]["career_cards"]) == 3
+    assert bodies[1]["session_id"] == "sid-2"
+    assert result._load_shared_record.cache_info().hits == 1
@@ -0,0 +1,94 @@
+"""analyze_handler 단계 체크포인트 재개 테스트.
+
+생성 이후 단계에서 실패한 실행을 같은 세션/입력으로 재실행하면
+Bedrock 호출 없이 첫 미완료 단계부터 재개하는지 검증한다.
+"""
+
+import json
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+EVENT = {
+    "session_id": "sid-1",
+    "name": "테스트",
+    "job_title": "개발자",
+    "age_group": "30대",
+    "strengths": "Python, Communication",
+    "hobbies": "Python, Communication",
+}
+
+
+@pytest.fixture
+def analyze_overrides():
+    """체크포인트 테이블과 가짜 Agent 런타임을 쓴다."""
+    return {
+        "CHECKPOINT_TABLE_NAME": "analysis_checkpoints",
+        "bedrock_agent_runtime": FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS)),
+    }
+
+
+@pytest.fixture
+def module(analyze_module):
+    module, ddb = analyze_module
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing"})
+    return module
+
+
+def _stages(ddb_table) -> set:
+    items = ddb_table.query(KeyConditionExpression=Key("session_id").eq("sid-1"))["Items"]
+    return {item["stage"] for item in items}
+
+
+def test_failed_run_resumes_without_regeneration(module, monkeypatch):
+    """career_cards 저장 실패 후 재실행 시 Agent를 다시 호출하지 않는다."""
+    ddb = boto3.resource("dynamodb", region_name="us-east-1")
+    runtime = module.bedrock_agent_runtime
+    original_save_cards = module._save_career_cards
+
+    def failing_save(*args, **kwargs):
+        raise RuntimeError("DynamoDB 일시 장애")
+
+    monkeypatch.setattr(module, "_save_career_cards", failing_save)
+    module.handler(dict(EVENT), None)
+
+    assert ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]["status"] == "error"
+    assert _stages(ddb.Table("analysis_checkpoints")) == {"retrieval", "generation", "skill_risks"}
+
+    monkeypatch.setattr(module, "_save_career_cards", original_save_cards)
+    module.handler(dict(EVENT), None)
+
+    assert len(runtime.calls) == 1
+    survey = ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert survey["status"] == "completed"
+    cards = ddb.Table("career_cards").query(KeyConditionExpression=Key("session_id").eq("sid-1"))["Items"]
+    assert len(cards) == 3
+
+
+def test_changed_input_discards_checkpoints(module):
+    """입력이 바뀌면 기존 체크포인트를 버리고 처음부터 다시 생성한다."""
+    runtime = module.bedrock_agent_runtime
+    module.handler(dict(EVENT), None)
+    module.handler(dict(EVENT, job_title="디자이너"), None)
+
+    assert len(runtime.calls) == 2
+
+
+def test_retrieval_checkpoint_is_injected_into_prompt(module):
+    """retrieval 체크포인트만 있으면 검색 결과를 프롬프트에 포함해 재검색을 생략한다."""
+    from services.checkpoint import CheckpointStore
+    from services.speculation import retrieval_input_hash
+
+    ddb = boto3.resource("dynamodb", region_name="us-east-1")
+    CheckpointStore(ddb.Table("analysis_checkpoints")).save(
+        "sid-1", "retrieval", retrieval_input_hash(EVENT["job_title"], EVENT["strengths"]),
+        [{"text": "AI specialists: fastest growing", "source": ""}],
+    )
+
+    module.handler(dict(EVENT), None)
+
+    prompt = module.bedrock_agent_runtime.calls[0]["inputText"]
+    assert "AI specialists: fastest growing" in prompt
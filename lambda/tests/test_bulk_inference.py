@@ -0,0 +1,120 @@
+"""Bedrock 배치 추론 대량 사전 분석과 분석 캐시 재사용 테스트."""
+
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from services.bulk_inference import (
+    AnalysisCache,
+    BulkJobFailed,
+    Combination,
+    build_record,
+    combination_key,
+    iter_output_records,
+    job_output_prefix,
+    submit_job,
+    top_combinations,
+    wait_for_job,
+    write_input_jsonl,
+)
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime, FakeBatchJobRunner, create_analysis_tables
+
+
+def test_combination_key_ignores_case_order_and_duplicates():
+    assert combination_key("Data  Analyst", "SQL, python, SQL") == combination_key("data analyst", "Python, sql")
+    assert combination_key("Data Analyst", "SQL") != combination_key("Data Analyst", "SQL, Excel")
+
+
+def test_combination_key_separates_age_group_and_prompt_version():
+    """프롬프트에 들어가는 연령대와 템플릿 버전이 다르면 다른 결과이므로 키도 다르다."""
+    key = combination_key("Data Analyst", "SQL", "30s", "v1")
+    assert key == combination_key("data analyst", "sql", "30s ", "v1")
+    assert key != combination_key("Data Analyst", "SQL", "50s", "v1")
+    assert key != combination_key("Data Analyst", "SQL", "30s", "v2")
+
+
+def test_top_combinations_orders_by_frequency():
+    items = [
+        {"job_title": "개발자", "strengths": "Python, SQL"},
+        {"job_title": "디자이너", "strengths": "Figma"},
+        {"job_title": "개발자", "strengths": "sql, python"},
+        {"job_title": "", "strengths": "Figma"},
+    ]
+    combos = top_combinations(items, 5)
+    assert [c.job_title for c in combos] == ["개발자", "디자이너"]
+    assert combos[0].strengths == "Python, SQL"
+
+
+def _respond(model_input):
+    """레코드마다 응답 형식을 바꾼다: 정상 / 형식 오류 / 모델 오류."""
+    content = model_input["messages"][0]["content"]
+    record_id = content.split("### User session_id: ", 1)[1].split("\n", 1)[0]
+    if "Figma" in content:
+        return "not json"
+    if "Excel" in content:
+        raise ValueError("ValidationException")
+    return json.dumps([{"session_id": record_id, **SAMPLE_ANALYSIS}])
+
+
+def test_bulk_job_round_trip_fills_cache():
+    """입력 업로드 → 제출 → 폴링 → 출력 스트림 적재까지 수행하고 실패 레코드는 건너뛴다."""
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="bulk")
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        combos = [Combination("개발자", "Python"), Combination("디자이너", "Figma"), Combination("회계사", "Excel")]
+
+        count = write_input_jsonl(s3, "s3://bulk/in/job.jsonl", (build_record(c) for c in combos))
+        runner = FakeBatchJobRunner(s3, _respond, polls_until_complete=3)
+        job_arn = submit_job(runner, "job", "role", "model", "s3://bulk/in/job.jsonl", "s3://bulk/out/")
+        sleeps = []
+        job = wait_for_job(runner, job_arn, poll_seconds=5, sleep=sleeps.append)
+        bucket, prefix = job_output_prefix("s3://bulk/out/", job_arn)
+        stats = AnalysisCache(ddb.Table("analysis_cache")).ingest(iter_output_records(s3, bucket, prefix), "model")
+
+        assert count == 3
+        assert job["status"] == "Completed" and sleeps == [5, 5]
+        assert (stats.records, stats.cached, stats.failed) == (3, 1, 2)
+        cache = AnalysisCache(ddb.Table("analysis_cache"))
+        assert json.loads(cache.get("개발자", "python")) == SAMPLE_ANALYSIS
+        assert cache.get("디자이너", "Figma") is None
+
+
+def test_wait_for_job_raises_on_failure_and_timeout():
+    class Jobs:
+        def __init__(self, status):
+            self.status = status
+
+        def get_model_invocation_job(self, jobIdentifier):
+            return {"status": self.status, "message": "quota"}
+
+    with pytest.raises(BulkJobFailed, match="Failed quota"):
+        wait_for_job(Jobs("Failed"), "arn/job", sleep=lambda s: None)
+
+    ticks = iter(range(100))
+    with pytest.raises(BulkJobFailed, match="InProgress"):
+        wait_for_job(Jobs("InProgress"), "arn/job", poll_seconds=1, timeout_seconds=3,
+                     sleep=lambda s: None, clock=lambda: next(ticks))
+
+
+@pytest.mark.parametrize("analyze_module", [{"ANALYSIS_CACHE_TABLE_NAME": "analysis_cache"}], indirect=True)
+def test_analyze_reuses_precomputed_analysis(analyze_module, monkeypatch):
+    """같은 직업/스킬 조합의 캐시가 있으면 Agent를 호출하지 않고 저장한다."""
+    module, ddb = analyze_module
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing"})
+    ddb.Table("analysis_cache").put_item(Item={
+        "cache_key": combination_key("개발자", "Communication, Python"),
+        "analysis": json.dumps(SAMPLE_ANALYSIS),
+    })
+    agent = FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS))
+    monkeypatch.setattr(module, "bedrock_agent_runtime", agent)
+
+    module.handler({"session_id": "sid-1", "name": "테스트", "job_title": "개발자",
+                    "strengths": "Python, Communication"}, None)
+
+    item = ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert item["status"] == "completed"
+    assert agent.calls == []
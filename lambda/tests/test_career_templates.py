@@ -0,0 +1,77 @@
+"""커리어 카드 템플릿 라이브러리 테스트."""
+
+import json
+
+from boto3.dynamodb.conditions import Key
+
+from services.career_templates import (
+    TEMPLATES,
+    personalize_cards,
+    render_cards,
+    select_templates,
+)
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+
+def test_library_ids_are_unique():
+    """템플릿 ID는 카드 항목에 저장되므로 중복되지 않는다."""
+    ids = [t.template_id for t in TEMPLATES]
+    assert len(ids) == len(set(ids))
+
+
+def test_select_templates_by_job_and_skill_cluster():
+    """직업/스킬 클러스터가 겹치는 템플릿을 우선 고르고, 알 수 없는 입력도 3개를 채운다."""
+    developer = [t.template_id for t in select_templates("백엔드 개발자", ["Python", "데이터 분석"])]
+    nurse = [t.template_id for t in select_templates("Nurse", ["Communication"])]
+    unknown = select_templates("우주 해적", [])
+
+    assert developer[0] == "mlops_engineer"
+    assert "clinical_ai_specialist" in nurse
+    assert len(developer) == len(set(developer)) == 3
+    assert len(unknown) == 3
+
+
+def test_render_and_personalize_cards():
+    """조합 공식은 사용자 직업/일치 스킬로 채우고, 생성된 reason만 반영한다."""
+    templates = select_templates("개발자", ["Python", "요리"])
+    cards = render_cards(templates, "개발자", ["Python", "요리"])
+
+    assert cards[0]["combo_formula"] == f"[개발자] + [Python] = [{templates[0].title}]"
+    assert [c["card_index"] for c in cards] == [0, 1, 2]
+
+    personalized = personalize_cards(cards, [
+        {"card_index": 1, "reason": "맞춤 이유", "combo_formula": "[무시] = [무시]"},
+        {"card_index": "x", "reason": "잘못된 인덱스"},
+        {"card_index": 2, "reason": "   "},
+    ])
+    assert personalized[1]["reason"] == "맞춤 이유"
+    assert personalized[1]["combo_formula"] == cards[1]["combo_formula"]
+    assert personalized[0]["reason"] == cards[0]["reason"]
+    assert personalized[2]["reason"] == cards[2]["reason"]
+
+
+def test_analyze_saves_template_cards_before_generation(analyze_module, monkeypatch):
+    """Agent 호출 전에 템플릿 카드를 저장하고, 프롬프트는 reason만 요청한다."""
+    module, ddb = analyze_module
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing"})
+    cards_seen_during_generation = []
+
+    class ObservingRuntime(FakeAgentRuntime):
+        def invoke_agent(self, **kwargs):
+            items = ddb.Table("career_cards").query(KeyConditionExpression=Key("session_id").eq("sid-1"))
+            cards_seen_during_generation.extend(items["Items"])
+            return super().invoke_agent(**kwargs)
+
+    runtime = ObservingRuntime(json.dumps(SAMPLE_ANALYSIS))
+    monkeypatch.setattr(module, "bedrock_agent_runtime", runtime)
+
+    module.handler({
+        "session_id": "sid-1", "name": "테스트", "job_title": "개발자",
+        "age_group": "30s", "strengths": "Python, Communication",
+    }, None)
+
+    assert len(cards_seen_during_generation) == 3
+    assert "Career Cards (pre-selected" in runtime.calls[0]["inputText"]
+    cards = ddb.Table("career_cards").query(KeyConditionExpression=Key("session_id").eq("sid-1"))["Items"]
+    assert [c["reason"] for c in cards] == ["성장 직군"] * 3
+    assert all(c["template_id"] and c["combo_formula"].startswith("[개발자]") for c in cards)
@@ -0,0 +1,156 @@
+"""Bedrock 서킷 브레이커 단위 테스트.
+
+두 CircuitBreaker 인스턴스가 같은 system_state 항목을 공유하는 상황으로
+컨테이너 간 상태 공유와 half-open 단일 프로브를 검증한다.
+"""
+
+import json
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError, EventStreamError
+from moto import mock_aws
+
+from services.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    is_tripping_error,
+)
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime, create_analysis_tables
+
+
+class FakeClock:
+    """수동으로 진행하는 시계."""
+
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _access_denied() -> EventStreamError:
+    return EventStreamError(
+        {"Error": {"Code": "accessDeniedException", "Message": "Access denied when calling Bedrock."}},
+        "InvokeAgent",
+    )
+
+
+def _fail():
+    raise _access_denied()
+
+
+@pytest.fixture
+def state_table():
+    """moto로 system_state 테이블을 생성한다."""
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        yield ddb.Table("system_state")
+
+
+def test_tripping_error_classification():
+    """권한/검증 오류는 회로 실패, 일반 클라이언트 오류는 제외한다."""
+    assert is_tripping_error(_access_denied())
+    assert not is_tripping_error(ClientError({"Error": {"Code": "ResourceNotFoundException"}}, "InvokeAgent"))
+    assert not is_tripping_error(json.JSONDecodeError("bad", "", 0))
+
+
+def test_opens_after_threshold_and_shares_state(state_table):
+    """한 컨테이너에서 임계치만큼 실패하면 다른 컨테이너도 즉시 거부한다."""
+    clock = FakeClock()
+    container_a = CircuitBreaker("bedrock", state_table, failure_threshold=3, cooldown_seconds=60,
+                                 sync_interval_seconds=0, clock=clock)
+    container_b = CircuitBreaker("bedrock", state_table, failure_threshold=3, cooldown_seconds=60,
+                                 sync_interval_seconds=0, clock=clock)
+
+    for _ in range(3):
+        with pytest.raises(EventStreamError):
+            container_a.call(_fail)
+
+    assert container_a.state == STATE_OPEN
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        container_b.call(lambda: calls.append(1))
+    assert calls == []
+
+
+def test_half_open_allows_single_probe_and_recovers(state_table):
+    """cooldown 후 한 컨테이너만 프로브하고, 성공하면 회로가 닫힌다."""
+    clock = FakeClock()
+    container_a = CircuitBreaker("bedrock", state_table, failure_threshold=1, cooldown_seconds=60,
+                                 sync_interval_seconds=0, clock=clock)
+    container_b = CircuitBreaker("bedrock", state_table, failure_threshold=1, cooldown_seconds=60,
+                                 sync_interval_seconds=0, clock=clock)
+    with pytest.raises(EventStreamError):
+        container_a.call(_fail)
+
+    clock.now += 61
+    assert container_a.allow_request() is True
+    assert container_b.allow_request() is False
+
+    container_a.record_success()
+    assert container_a.state == STATE_CLOSED
+    assert container_b.allow_request() is True
+
+
+def test_failed_probe_reopens(state_table):
+    """프로브가 실패하면 cooldown을 다시 시작한다."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("bedrock", state_table, failure_threshold=1, cooldown_seconds=60,
+                             sync_interval_seconds=0, clock=clock)
+    with pytest.raises(EventStreamError):
+        breaker.call(_fail)
+
+    clock.now += 61
+    with pytest.raises(EventStreamError):
+        breaker.call(_fail)
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.allow_request() is False
+
+
+def test_analyze_fast_fails_when_open(state_table, monkeypatch):
+    """회로가 열려 있으면 analyze는 Agent를 호출하지 않고 즉시 error를 기록한다."""
+    import functions.analyze.handler as analyze_module
+
+    ddb = boto3.resource("dynamodb", region_name="us-east-1")
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing"})
+    runtime = FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS))
+    breaker = CircuitBreaker("bedrock", state_table, failure_threshold=1, cooldown_seconds=60)
+    breaker.record_failure()
+
+    monkeypatch.setattr(analyze_module, "SURVEY_TABLE_NAME", "survey")
+    monkeypatch.setattr(analyze_module, "bedrock_agent_runtime", runtime)
+    monkeypatch.setattr(analyze_module, "bedrock_breaker", breaker)
+
+    analyze_module.handler({"session_id": "sid-1", "job_title": "개발자"}, None)
+
+    survey = ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert survey["status"] == "error"
+    assert survey["error_code"] == "bedrock_unavailable"
+    assert runtime.calls == []
+
+
+def test_sweeper_reads_breaker_with_analyze_settings(state_table, monkeypatch):
+    """스위퍼는 analyze와 같은 cooldown 설정으로 공유 회로를 읽어 open 판단이 일치한다."""
+    import importlib
+    import time
+
+    import functions.sweeper.handler as sweeper
+
+    # analyze가 2분 전에 연 회로: 기본 cooldown(60초)이면 닫힌 것으로 보인다
+    CircuitBreaker("bedrock", state_table, failure_threshold=1, cooldown_seconds=300,
+                   clock=FakeClock(time.time() - 120)).record_failure()
+
+    monkeypatch.setenv("STATE_TABLE_NAME", "system_state")
+    monkeypatch.setenv("BREAKER_COOLDOWN_SECONDS", "300")
+    try:
+        sweeper = importlib.reload(sweeper)
+        assert sweeper.bedrock_breaker.cooldown_seconds == 300
+        assert sweeper.handler({}, None) == {"scanned": 0, "retried": 0, "failed": 0, "restored": 0}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(sweeper)
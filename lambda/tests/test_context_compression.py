@@ -0,0 +1,122 @@
+"""검색 결과 압축(직업/스킬 관련 문장·표 행만 토큰 예산 안에서 유지) 테스트."""
+
+import json
+
+import pytest
+
+from services.context_compression import compress_references, estimate_tokens, leading_references, split_units
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+SOURCE = "s3://kb/pdfdata/WEF_Industry_Information_and_Technology_Services.pdf"
+INDUSTRY_CHUNK = (
+    "NET GROWTH     1. 2. 3.     Software and Applications Developers     132 57 138     "
+    "Data Entry Clerks -30 -26 30     CORE SKILLS OF 2025     Analytical thinking 83%     "
+    "AI and big data 66%     Leadership and social influence 59%"
+)
+REPORT_CHUNK = (
+    "# FIGURE 2.2\n| Fastest-growing jobs | Net growth |\n| Nurses | 12% |\n| Software developers | 17% |\n"
+    "Figure 2.2 shows that software roles lead the growth in technology jobs. "
+    "Farmworkers remain the largest absolute growth category. Delivery drivers follow."
+)
+REFERENCES = [{"text": INDUSTRY_CHUNK, "source": SOURCE},
+              {"text": REPORT_CHUNK, "source": "s3://kb/pdfdata/WEF_Future_of_Jobs_Report_2025.pdf"}]
+
+
+def test_split_units_rebuilds_table_rows_with_labels():
+    units = split_units(REFERENCES)
+    texts = {unit.text: unit.label for unit in units}
+
+    assert texts["Software and Applications Developers 132 57 138"] == "Industry Information and Technology Services · NET GROWTH"
+    assert "Data Entry Clerks -30 -26 30" in texts
+    assert texts["AI and big data 66%"].endswith("CORE SKILLS OF 2025")
+    assert texts["Nurses 12%"] == "Future of Jobs Report 2025 · FIGURE 2.2"
+    assert "Farmworkers remain the largest absolute growth category." in texts
+
+
+def test_compress_keeps_relevant_facts_within_budget():
+    compressed, stats = compress_references(REFERENCES, "소프트웨어 개발자", ["Python", "Data analysis"], 60)
+    text = "\n".join(ref["text"] for ref in compressed)
+
+    assert "Software and Applications Developers 132 57 138" in text
+    # 표 행은 도표 번호 라벨과 함께 남는다
+    assert "[Future of Jobs Report 2025 · FIGURE 2.2] Software developers 17%" in text
+    assert "Farmworkers" not in text and "Leadership" not in text
+    assert stats.output_tokens <= 60 < stats.input_tokens
+    assert stats.output_tokens == sum(estimate_tokens(ref["text"]) for ref in compressed)
+
+    assert compress_references(REFERENCES, "Software developer", [], 5)[0] == []
+    assert compress_references([{"text": "Farmworkers remain common.", "source": ""}], "Nurse", [], 100)[0] == []
+
+
+def test_leading_references_keeps_document_order_within_budget():
+    """관련 단위가 없을 때의 대체 결과는 원래 순서의 앞 단위를 예산만큼 담는다."""
+    leading = leading_references(REFERENCES, 30)
+    text = "\n".join(ref["text"] for ref in leading)
+
+    assert leading[0]["text"].startswith("[Industry Information and Technology Services · NET GROWTH] Software")
+    assert "Farmworkers" not in text
+    assert sum(estimate_tokens(ref["text"]) for ref in leading) <= 30
+
+
+class RetrievingAgentRuntime(FakeAgentRuntime):
+    """Retrieve API도 흉내 낸다 (검색 결과는 REFERENCES)."""
+
+    def __init__(self, completion: str, references=REFERENCES) -> None:
+        super().__init__(completion)
+        self.references = references
+        self.retrieve_calls = []
+
+    def retrieve(self, **kwargs):
+        self.retrieve_calls.append(kwargs)
+        return {"retrievalResults": [{"content": {"text": ref["text"]}, "location": {"s3Location": {"uri": ref["source"]}}}
+                                     for ref in self.references]}
+
+
+@pytest.mark.parametrize("analyze_module", [{"KNOWLEDGE_BASE_ID": "kb", "CONTEXT_TOKEN_BUDGET": 60}], indirect=True)
+def test_analyze_prefetches_and_sends_compressed_references(analyze_module, monkeypatch):
+    analyze, ddb = analyze_module
+    runtime = RetrievingAgentRuntime(json.dumps(SAMPLE_ANALYSIS))
+    monkeypatch.setattr(analyze, "bedrock_agent_runtime", runtime)
+    ddb.Table("survey").put_item(Item={"session_id": "sid-ctx", "status": "analyzing"})
+    analyze.handler({"session_id": "sid-ctx", "name": "ctx", "job_title": "소프트웨어 개발자",
+                     "strengths": "Python, Data analysis"}, None)
+
+    item = ddb.Table("survey").get_item(Key={"session_id": "sid-ctx"})["Item"]
+    assert item["status"] == "completed"
+    assert len(runtime.retrieve_calls) == 1
+    prompt = runtime.calls[0]["inputText"]
+    assert "Software and Applications Developers 132 57 138" in prompt
+    assert "Farmworkers" not in prompt and "Leadership and social influence" not in prompt
+
+
+@pytest.mark.parametrize("analyze_module", [{"KNOWLEDGE_BASE_ID": "kb", "CONTEXT_TOKEN_BUDGET": 60}], indirect=True)
+def test_analyze_sends_leading_references_when_nothing_relevant(analyze_module, monkeypatch):
+    """관련 항목이 없어도 참고 자료 블록을 붙여 Agent가 다시 검색하지 않게 한다."""
+    analyze, ddb = analyze_module
+    runtime = RetrievingAgentRuntime(json.dumps(SAMPLE_ANALYSIS), [{"text": REPORT_CHUNK, "source": SOURCE}])
+    monkeypatch.setattr(analyze, "bedrock_agent_runtime", runtime)
+    ddb.Table("survey").put_item(Item={"session_id": "sid-ctx", "status": "analyzing"})
+    analyze.handler({"session_id": "sid-ctx", "name": "ctx", "job_title": "목수", "strengths": "목공"}, None)
+
+    prompt = runtime.calls[0]["inputText"]
+    assert "Reference Data" in prompt
+    assert "Fastest-growing jobs" in prompt and "Delivery drivers" not in prompt
+
+
+@pytest.mark.parametrize("analyze_module", [{"KNOWLEDGE_BASE_ID": "kb", "CONTEXT_TOKEN_BUDGET": 60}], indirect=True)
+def test_analyze_falls_back_to_agent_search_when_retrieve_fails(analyze_module, monkeypatch):
+    """사전 검색이 실패해도 분석은 계속되고 Agent가 직접 검색한다 (참고 자료 블록 없음)."""
+    analyze, ddb = analyze_module
+    runtime = RetrievingAgentRuntime(json.dumps(SAMPLE_ANALYSIS))
+
+    def failing_retrieve(**kwargs):
+        raise RuntimeError("retrieve unavailable")
+
+    runtime.retrieve = failing_retrieve
+    monkeypatch.setattr(analyze, "bedrock_agent_runtime", runtime)
+    ddb.Table("survey").put_item(Item={"session_id": "sid-ctx", "status": "analyzing"})
+    analyze.handler({"session_id": "sid-ctx", "name": "ctx", "job_title": "소프트웨어 개발자",
+                     "strengths": "Python"}, None)
+
+    assert ddb.Table("survey").get_item(Key={"session_id": "sid-ctx"})["Item"]["status"] == "completed"
+    assert "Reference Data" not in runtime.calls[0]["inputText"]
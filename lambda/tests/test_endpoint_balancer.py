@@ -0,0 +1,117 @@
+"""Bedrock 엔드포인트 밸런서 단위 테스트.
+
+지연 시간/오류 동작을 설정한 로컬 스텁 엔드포인트로
+건강 점수 기반 선택, 스로틀 전환, 비정상 엔드포인트 제외를 검증한다.
+"""
+
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.agent_stream import collect_agent_stream
+from services.endpoint_balancer import Endpoint, EndpointBalancer, load_endpoints
+from tests.helpers import StubEndpointRuntime
+
+
+class FakeClock:
+    """스텁의 sleep과 연동되는 가짜 시계."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _balancer(runtimes, clock, **kwargs):
+    endpoints = [Endpoint(name=name, agent_id="agent", agent_alias_id=name) for name in runtimes]
+    return EndpointBalancer(endpoints, clock=clock, **kwargs)
+
+
+def _invoke(balancer, runtimes):
+    def call(endpoint):
+        response = runtimes[endpoint.name].invoke_agent(agentId=endpoint.agent_id)
+        return collect_agent_stream(response["completion"]).completion
+
+    return balancer.invoke(call)
+
+
+def test_load_endpoints_defaults_to_single_agent():
+    """설정이 비어 있으면 기본 Agent/alias 단일 엔드포인트를 사용한다."""
+    endpoints = load_endpoints("", "AGENT", "ALIAS")
+    assert endpoints == [Endpoint(name="default", agent_id="AGENT", agent_alias_id="ALIAS")]
+
+    raw = json.dumps([{"name": "west", "agent_alias_id": "W", "region": "us-west-2"}])
+    west = load_endpoints(raw, "AGENT", "ALIAS")[0]
+    assert (west.agent_id, west.agent_alias_id, west.region) == ("AGENT", "W", "us-west-2")
+
+
+def test_prefers_lower_latency_endpoint():
+    """관측 후에는 EWMA 지연 시간이 낮은 엔드포인트로 트래픽이 몰린다."""
+    clock = FakeClock()
+    runtimes = {
+        "fast": StubEndpointRuntime("ok", latency_seconds=1.0, sleep=clock.sleep),
+        "slow": StubEndpointRuntime("ok", latency_seconds=5.0, sleep=clock.sleep),
+    }
+    balancer = _balancer(runtimes, clock)
+
+    for _ in range(20):
+        assert _invoke(balancer, runtimes) == "ok"
+
+    # 처음 두 번은 미관측 엔드포인트 탐색, 이후는 빠른 쪽만 사용
+    assert runtimes["slow"].calls == 1
+    assert runtimes["fast"].calls == 19
+
+
+def test_throttle_fails_over_and_cools_down():
+    """스로틀된 엔드포인트는 즉시 다른 엔드포인트로 전환되고 cooldown 동안 제외된다."""
+    clock = FakeClock()
+    runtimes = {
+        "throttled": StubEndpointRuntime("ok", latency_seconds=0.1, throttle_rate=1.0, sleep=clock.sleep),
+        "healthy": StubEndpointRuntime("ok", latency_seconds=2.0, sleep=clock.sleep),
+    }
+    balancer = _balancer(runtimes, clock, cooldown_seconds=30)
+
+    results = [_invoke(balancer, runtimes) for _ in range(5)]
+
+    assert results == ["ok"] * 5
+    assert runtimes["throttled"].calls == 1
+    assert runtimes["healthy"].calls == 5
+    assert not balancer.is_healthy(balancer.endpoints[0])
+
+
+def test_unhealthy_endpoint_is_excluded_until_cooldown_expires():
+    """오류 비율이 임계치를 넘은 엔드포인트는 cooldown 후 다시 후보가 된다."""
+    clock = FakeClock()
+    runtimes = {"only": StubEndpointRuntime("ok", error_rate=1.0, sleep=clock.sleep)}
+    balancer = _balancer(runtimes, clock, min_samples=2, unhealthy_error_rate=0.4, cooldown_seconds=30)
+    endpoint = balancer.endpoints[0]
+
+    for _ in range(2):
+        with pytest.raises(ClientError):
+            _invoke(balancer, runtimes)
+
+    assert not balancer.is_healthy(endpoint)
+    clock.now += 31
+    runtimes["only"].error_rate = 0.0
+    assert _invoke(balancer, runtimes) == "ok"
+    assert balancer.health["only"].in_flight == 0
+
+
+def test_non_endpoint_errors_are_not_retried():
+    """권한 오류처럼 엔드포인트와 무관한 오류는 전환 없이 그대로 전파한다."""
+    clock = FakeClock()
+    balancer = _balancer({"a": None, "b": None}, clock)
+    calls = []
+
+    def denied(endpoint):
+        calls.append(endpoint.name)
+        raise ClientError({"Error": {"Code": "accessDeniedException"}}, "InvokeAgent")
+
+    with pytest.raises(ClientError):
+        balancer.invoke(denied)
+    assert len(calls) == 1
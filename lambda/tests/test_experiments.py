@@ -0,0 +1,105 @@
+"""프롬프트/모델 실험 프레임워크 테스트."""
+
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from benchmarks.experiment_report import build_report, group_runs, wilson_interval
+from services.experiments import RunMetrics, Variant, assign_variant, emf_record, load_variants
+from services.trace_replay import ReplayAgentRuntime
+from tests.helpers import FakeAgentRuntime
+
+RECORDING = Path(__file__).resolve().parents[2] / "bedrock-agent-tracing-file.txt"
+
+VARIANTS = json.dumps([
+    {"variant_id": "control", "weight": 0.5},
+    {"variant_id": "concise", "prompt_version": "v2-concise", "agent_alias_id": "ALIAS2", "weight": 0.5},
+])
+
+
+def test_assignment_is_deterministic_and_weighted():
+    """같은 세션은 항상 같은 변형을 받고, 배정 비율은 가중치를 따른다."""
+    variants = [Variant("a", weight=3), Variant("b", weight=1)]
+    counts = Counter(assign_variant("exp", f"s-{i}", variants).variant_id for i in range(4000))
+
+    assert assign_variant("exp", "s-1", variants) == assign_variant("exp", "s-1", variants)
+    assert 0.70 < counts["a"] / 4000 < 0.80
+
+
+def test_load_variants_validates_prompt_version():
+    """설정이 없으면 기준 변형 하나, 없는 템플릿 버전은 거부한다."""
+    assert load_variants("") == [Variant("control")]
+    with pytest.raises(ValueError):
+        load_variants('[{"variant_id": "x", "prompt_version": "v99"}]')
+
+
+def test_emf_record_dimensions():
+    """EMF 레코드는 Experiment × Variant 차원으로 지표를 내보낸다."""
+    record = emf_record("exp", Variant("concise"), RunMetrics(latency_ms=1200, parse_failed=True), timestamp_ms=0)
+
+    assert record["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Experiment", "Variant"]]
+    assert (record["Variant"], record["Latency"], record["ParseFailure"]) == ("concise", 1200, 1)
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {"experiment_variants": load_variants(VARIANTS)}
+
+
+def _session_for(variant_id: str) -> str:
+    variants = load_variants(VARIANTS)
+    return next(f"sid-{i}" for i in range(100)
+                if assign_variant("default", f"sid-{i}", variants).variant_id == variant_id)
+
+
+def test_analyze_records_variant_metrics(analyze_module, monkeypatch):
+    """배정된 변형의 프롬프트/alias로 호출하고, 토큰·지연 지표를 survey 항목에 남긴다."""
+    module, ddb = analyze_module
+    runtime = ReplayAgentRuntime.from_file(str(RECORDING), time_scale=0)
+    monkeypatch.setattr(module, "bedrock_agent_runtime", runtime)
+    session_id = _session_for("concise")
+    ddb.Table("survey").put_item(Item={"session_id": session_id, "status": "analyzing"})
+
+    module.handler({"session_id": session_id, "job_title": "개발자", "strengths": "Python"}, None)
+
+    assert "one sentence" in runtime.calls[0]["inputText"]
+    assert runtime.calls[0]["agentAliasId"] == "ALIAS2"
+    experiment = ddb.Table("survey").get_item(Key={"session_id": session_id})["Item"]["experiment"]
+    assert experiment["variant_id"] == "concise"
+    assert (experiment["input_tokens"], experiment["output_tokens"]) == (53442, 3318)
+    assert experiment["parse_failed"] == 0
+
+
+def test_parse_failure_is_recorded(analyze_module, monkeypatch):
+    """파싱 실패도 변형 지표로 기록한다."""
+    module, ddb = analyze_module
+    monkeypatch.setattr(module, "bedrock_agent_runtime", FakeAgentRuntime("not json"))
+    session_id = _session_for("control")
+    ddb.Table("survey").put_item(Item={"session_id": session_id, "status": "analyzing"})
+
+    module.handler({"session_id": session_id, "job_title": "개발자", "strengths": "Python"}, None)
+
+    item = ddb.Table("survey").get_item(Key={"session_id": session_id})["Item"]
+    assert item["status"] == "error"
+    assert item["experiment"]["parse_failed"] == 1
+
+
+def test_report_flags_only_significant_differences():
+    """지연 차이가 충분하면 구간이 0을 제외하고, 파싱 실패율은 Wilson 구간으로 보고한다."""
+    items = (
+        [{"experiment": {"experiment_id": "e", "variant_id": "control", "latency_ms": 30000 + i % 7 * 100,
+                         "output_tokens": 3000 + (i + 1) % 3, "parse_failed": int(i % 10 == 0)}} for i in range(50)]
+        + [{"experiment": {"experiment_id": "e", "variant_id": "concise", "latency_ms": 24000 + i % 7 * 100,
+                           "output_tokens": 3000 + i % 3, "parse_failed": 0}} for i in range(50)]
+        + [{"session_id": "no-experiment"}]
+    )
+
+    rows = {row["variant_id"]: row for row in build_report(group_runs(items, "e"))}
+
+    assert rows["concise"]["latency_ms_diff"].excludes_zero()
+    assert rows["concise"]["latency_ms_diff"].value == pytest.approx(-6000)
+    assert not rows["concise"]["output_tokens_diff"].excludes_zero()
+    assert rows["control"]["parse_failure_rate"].value == pytest.approx(0.1)
+    assert wilson_interval(0, 50).low == 0.0
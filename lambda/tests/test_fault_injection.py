@@ -0,0 +1,89 @@
+"""Bedrock 장애/지연 주입 시뮬레이터 및 카오스 스위트 테스트."""
+
+import json
+import random
+
+import pytest
+from botocore.exceptions import ClientError, EventStreamError, ReadTimeoutError
+
+from services.agent_stream import collect_agent_stream
+from services.fault_injection import (
+    DIST_FIXED,
+    DIST_LOGNORMAL,
+    DIST_UNIFORM,
+    FaultInjectingRuntime,
+    FaultProfile,
+    LatencyDistribution,
+)
+from tests.helpers import SAMPLE_ANALYSIS
+
+COMPLETION = json.dumps(SAMPLE_ANALYSIS, ensure_ascii=False)
+
+
+def test_latency_distributions_respect_bounds():
+    """분포 표본은 범위와 상한을 지킨다."""
+    rng = random.Random(1)
+    uniform = LatencyDistribution(DIST_UNIFORM, low=1.0, high=2.0)
+    capped = LatencyDistribution(DIST_LOGNORMAL, value=10.0, sigma=2.0, max_value=15.0)
+
+    assert all(1.0 <= uniform.sample(rng) <= 2.0 for _ in range(100))
+    assert all(capped.sample(rng) <= 15.0 for _ in range(100))
+    assert LatencyDistribution(DIST_FIXED, value=3.0).sample(rng) == 3.0
+
+
+def test_healthy_stream_sleeps_first_byte_and_per_chunk():
+    """정상 응답은 첫 바이트 + 청크별 지연만큼 대기하고 전체 텍스트를 돌려준다."""
+    waits = []
+    profile = FaultProfile(first_byte=LatencyDistribution(value=5.0), inter_chunk=LatencyDistribution(value=0.1))
+    runtime = FaultInjectingRuntime(COMPLETION, profile, chunk_chars=100, sleep=waits.append)
+
+    result = collect_agent_stream(runtime.invoke_agent()["completion"])
+
+    assert result.completion == COMPLETION
+    assert sum(waits) == pytest.approx(5.0 + 0.1 * len(runtime._chunks(COMPLETION)))
+
+
+def test_injected_faults_match_failure_modes():
+    """스로틀, 첫 바이트 타임아웃, 스트림 도중 오류, 잘린 JSON을 각각 재현한다."""
+    def runtime(**kwargs):
+        return FaultInjectingRuntime(COMPLETION, FaultProfile(**kwargs), chunk_chars=50, seed=3, sleep=lambda s: None)
+
+    with pytest.raises(ClientError) as throttled:
+        runtime(throttle_rate=1.0).invoke_agent()
+    assert throttled.value.response["Error"]["Code"] == "throttlingException"
+
+    with pytest.raises(ReadTimeoutError):
+        runtime(first_byte=LatencyDistribution(value=200.0), read_timeout_seconds=120).invoke_agent()
+
+    with pytest.raises(EventStreamError):
+        collect_agent_stream(runtime(mid_stream_error_rate=1.0).invoke_agent()["completion"])
+
+    truncated = collect_agent_stream(runtime(truncation_rate=1.0).invoke_agent()["completion"]).completion
+    assert COMPLETION.startswith(truncated) and len(truncated) < len(COMPLETION)
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(truncated)
+
+
+def test_invoke_model_truncation_sets_max_tokens():
+    """invoke_model 잘림은 stop_reason=max_tokens로 표시된다."""
+    runtime = FaultInjectingRuntime(COMPLETION, FaultProfile(truncation_rate=1.0), seed=1, sleep=lambda s: None)
+
+    body = json.loads(runtime.invoke_model(modelId="m", body="{}")["body"].read())
+
+    assert body["stop_reason"] == "max_tokens"
+    assert len(body["content"][0]["text"]) < len(COMPLETION)
+
+
+def test_chaos_suite_resilience_improves_success_rate():
+    """스트림 도중 오류 시나리오에서 전환+스위퍼 설정이 기본 설정보다 성공률이 높다."""
+    from benchmarks.chaos_analyze import RESILIENCE_SETTINGS, run_setting, scenarios
+
+    profile = scenarios()["mid_stream_error"]
+    settings = {setting.name: setting for setting in RESILIENCE_SETTINGS}
+
+    baseline = run_setting(profile, settings["baseline"], sessions=8, seed=11)
+    resilient = run_setting(profile, settings["failover+sweeper"], sessions=8, seed=11)
+
+    assert baseline["success_rate"] < 1.0
+    assert resilient["success_rate"] > baseline["success_rate"]
+    assert resilient["p50"] > 0
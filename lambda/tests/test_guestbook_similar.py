@@ -0,0 +1,116 @@
+"""방명록 유사 프로필 검색(IVF 인덱스, 스트림 점진 갱신, GET /guestbook/similar) 테스트."""
+
+import json
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from benchmarks.guestbook_index import synthetic_entries
+from services.guestbook_index import embed_entry, entry_key, load_index, save_index
+from services.ivf_index import IVFIndex, MmapIVFIndex, exact_search
+from services.profile_embedding import DEFAULT_DIM, cosine, embed_profile
+
+
+def test_embedding_ranks_similar_profiles_higher():
+    query = embed_profile("백엔드 개발자", "Java, Spring")
+    assert cosine(query, embed_profile("백엔드 개발자", "Java, Spring Boot")) > 0.8
+    assert cosine(query, embed_profile("서버 개발자", "Java")) > cosine(query, embed_profile("간호사", "Communication"))
+
+
+def test_ivf_matches_exact_search_and_mmap_round_trip(tmp_path):
+    entries = [(entry_key(item), embed_entry(item)) for item in synthetic_entries(400)]
+    index = IVFIndex.build(entries, DEFAULT_DIM)
+    path = tmp_path / "index.ivf"
+    path.write_bytes(index.to_bytes())
+    mapped = MmapIVFIndex(str(path))
+
+    query = embed_profile("데이터 분석가", "Python, SQL")
+    exact = exact_search(entries, query, 5)
+    assert [score for score, _ in mapped.search(query, 5, nprobe=index.nlist)] == pytest.approx([s for s, _ in exact])
+    assert mapped.search(query, 5, nprobe=4) == index.search(query, 5, nprobe=4)
+    assert len(IVFIndex.from_bytes(path.read_bytes())) == len(mapped) == 400
+    mapped.close()
+
+
+def test_incremental_add_is_searchable_and_triggers_rebuild():
+    index = IVFIndex(DEFAULT_DIM)
+    index.add("a", embed_profile("교사", "Teaching"))
+    assert index.needs_rebuild()
+    index = index.rebuilt()
+    assert index.trained_count == 1 and not index.needs_rebuild()
+    index.add("b", embed_profile("세무사", "Accounting"))
+    assert index.search(embed_profile("세무사", "Accounting"), 1)[0][1] == "b"
+    assert index.needs_rebuild()
+
+
+def _create_guestbook_table(ddb):
+    ddb.create_table(
+        TableName="guestbook",
+        KeySchema=[{"AttributeName": "entry_id", "KeyType": "HASH"},
+                   {"AttributeName": "created_at", "KeyType": "RANGE"}],
+        AttributeDefinitions=[{"AttributeName": "entry_id", "AttributeType": "S"},
+                              {"AttributeName": "created_at", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def _stream_event(items):
+    serializer = TypeSerializer()
+    return {"Records": [
+        {"eventName": "INSERT", "dynamodb": {"NewImage": {k: serializer.serialize(v) for k, v in item.items()}}}
+        for item in items
+    ]}
+
+
+def test_indexer_stream_and_similar_handler(monkeypatch, tmp_path):
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        _create_guestbook_table(ddb)
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="models")
+
+        import functions.guestbook_indexer.handler as indexer
+        import functions.guestbook_similar.handler as similar
+
+        monkeypatch.setattr(indexer, "s3", s3)
+        monkeypatch.setattr(indexer, "GUESTBOOK_INDEX_BUCKET", "models")
+        for name, value in (("s3", s3), ("dynamodb", ddb), ("GUESTBOOK_TABLE_NAME", "guestbook"),
+                            ("GUESTBOOK_INDEX_BUCKET", "models"), ("INDEX_DIR", str(tmp_path)),
+                            ("INDEX_REFRESH_SECONDS", 0), ("_loader", None)):
+            monkeypatch.setattr(similar, name, value)
+
+        items = [
+            {"entry_id": "e1", "created_at": "2026-01-01T00:00:01", "session_id": "s1",
+             "job_title": "백엔드 개발자", "skills": "Java, Spring", "message": "나", "remaining_years": "8"},
+            {"entry_id": "e2", "created_at": "2026-01-01T00:00:02", "session_id": "s2",
+             "job_title": "백엔드 개발자", "skills": "Java, Spring Boot", "message": "비슷", "remaining_years": "9"},
+            {"entry_id": "e3", "created_at": "2026-01-01T00:00:03", "session_id": "s3",
+             "job_title": "간호사", "skills": "Communication", "message": "다름", "remaining_years": "20"},
+        ]
+        for item in items:
+            ddb.Table("guestbook").put_item(Item=item)
+        assert indexer.handler(_stream_event(items[:2]), None) == {"indexed": 2}
+        # 재시도로 같은 레코드가 다시 와도 중복 색인하지 않는다
+        assert indexer.handler(_stream_event(items), None) == {"indexed": 1}
+
+        resp = similar.handler({"queryStringParameters": {
+            "job_title": "백엔드 개발자", "skills": "Java, Spring", "session_id": "s1", "limit": "2"}}, None)
+        body = json.loads(resp["body"])
+        assert resp["statusCode"] == 200
+        assert [item["entry_id"] for item in body["items"]] == ["e2", "e3"]
+        assert body["items"][0]["similarity"] > body["items"][1]["similarity"]
+        assert similar.handler({"queryStringParameters": {}}, None)["statusCode"] == 400
+
+
+def test_save_index_rejects_concurrent_write():
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="models")
+        index, etag = load_index(s3, "models", "idx")
+        assert etag is None
+        save_index(s3, "models", "idx", index, etag)
+        with pytest.raises(ClientError):
+            save_index(s3, "models", "idx", index, etag)
@@ -0,0 +1,176 @@
+"""큐 소비자 묶음 생성(micro-batching) 테스트."""
+
+import json
+
+import pytest
+from boto3.dynamodb.conditions import Key
+
+from services.experiments import GENERATION_TOOL, Variant
+from services.micro_batch import group_compatible, parse_batch_response, share_usage
+from services.token_usage import TokenUsage
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime, FakeBatchModelRuntime
+
+
+def test_group_compatible_keeps_order_and_size():
+    """같은 키끼리 도착 순서대로 max_size 이하 그룹을 만든다."""
+    items = ["a1", "b1", "a2", "a3", "b2"]
+    assert group_compatible(items, key=lambda s: s[0], max_size=2) == [["a1", "a2"], ["a3"], ["b1", "b2"]]
+
+
+def test_parse_batch_response_keeps_only_requested_valid_sessions():
+    """요청하지 않은 세션, 형식이 틀린 항목, 중복은 버린다."""
+    text = "```json\n" + json.dumps([
+        {"session_id": "s1", **SAMPLE_ANALYSIS},
+        {"session_id": "s2", "remaining_years": 3},
+        {"session_id": "other", **SAMPLE_ANALYSIS},
+        {"session_id": "s1", **SAMPLE_ANALYSIS, "remaining_years": 99},
+    ]) + "\n```"
+
+    results = parse_batch_response(text, ["s1", "s2"])
+
+    assert list(results) == ["s1"]
+    assert results["s1"]["remaining_years"] == SAMPLE_ANALYSIS["remaining_years"]
+    assert "session_id" not in results["s1"]
+    assert parse_batch_response("no json here", ["s1"]) == {}
+
+
+def test_share_usage_splits_counters():
+    usage = TokenUsage("m", input_tokens=9001, output_tokens=300, model_invocations=1, kb_queries=2)
+    assert share_usage(usage, 3) == TokenUsage("m", input_tokens=3000, output_tokens=100, kb_queries=0)
+
+
+def _sqs_event(payloads):
+    return {"Records": [
+        {"messageId": f"m-{p['session_id']}", "body": json.dumps(p), "attributes": {}} for p in payloads
+    ]}
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {"STATE_TABLE_NAME": "system_state", "KNOWLEDGE_BASE_ID": "", "FUNCTION_NAME": ""}
+
+
+def test_queue_batch_groups_generates_and_falls_back(analyze_module, monkeypatch):
+    """묶음당 모델 요청 1회로 저장하고, 응답에서 빠진 세션은 단건 Agent 경로로 처리한다."""
+    module, ddb = analyze_module
+    payloads = [
+        {"session_id": f"sid-{i}", "name": "테스트", "job_title": "개발자",
+         "age_group": f"{20 + 10 * i}s", "strengths": "Python, Communication", "hobbies": ""}
+        for i in range(3)
+    ]
+    for p in payloads:
+        ddb.Table("survey").put_item(Item={"session_id": p["session_id"], "status": "analyzing"})
+
+    model = FakeBatchModelRuntime(skip_sessions={"sid-1"})
+    agent = FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS))
+    monkeypatch.setattr(module, "MICRO_BATCH_MODEL_ID", "us.anthropic.claude-sonnet-4-5-20250929-v1:0")
+    monkeypatch.setattr(module, "MICRO_BATCH_SIZE", 2)
+    monkeypatch.setattr(module, "bedrock_runtime", model)
+    monkeypatch.setattr(module, "bedrock_agent_runtime", agent)
+
+    resp = module.handler(_sqs_event(payloads), None)
+
+    assert resp == {"batchItemFailures": []}
+    assert len(model.calls) == 2
+    assert len(agent.calls) == 1 and "sid-1" not in agent.calls[0]["inputText"]
+    for p in payloads:
+        sid = p["session_id"]
+        item = ddb.Table("survey").get_item(Key={"session_id": sid})["Item"]
+        risks = ddb.Table("skill_graph").query(KeyConditionExpression=Key("session_id").eq(sid))["Items"]
+        assert item["status"] == "completed"
+        assert len(risks) == 2
+    batched = ddb.Table("survey").get_item(Key={"session_id": "sid-0"})["Item"]
+    assert batched["usage_input_tokens"] == (8000 + 400 * 2) // 2
+
+
+def test_queue_batch_filters_before_grouping(analyze_module, monkeypatch):
+    """형식이 틀린 메시지만 실패로 돌리고, 같은 프로필은 follower로 합치며, 캐시가 있는 세션은 묶지 않는다."""
+    module, ddb = analyze_module
+    profile = {"name": "테스트", "job_title": "개발자", "age_group": "30s", "strengths": "Python, Communication"}
+    payloads = [{"session_id": sid, **profile} for sid in ("sid-0", "sid-1")]
+    payloads.append({"session_id": "sid-cached", **profile, "name": "캐시", "job_title": "디자이너"})
+    for p in payloads:
+        ddb.Table("survey").put_item(Item={"session_id": p["session_id"], "status": "analyzing"})
+
+    model = FakeBatchModelRuntime()
+    dispatched = []
+    monkeypatch.setattr(module, "MICRO_BATCH_MODEL_ID", "model")
+    monkeypatch.setattr(module, "bedrock_runtime", model)
+    monkeypatch.setattr(module, "_dispatch_single", lambda payload: dispatched.append(payload["session_id"]))
+    monkeypatch.setattr(module, "_cached_analysis",
+                        lambda job_title, *_: json.dumps(SAMPLE_ANALYSIS) if job_title == "디자이너" else None)
+
+    event = _sqs_event(payloads)
+    event["Records"].insert(1, {"messageId": "m-bad", "body": "{not json", "attributes": {}})
+    resp = module.handler(event, None)
+
+    assert resp == {"batchItemFailures": [{"itemIdentifier": "m-bad"}]}
+    assert dispatched == ["sid-cached"]
+    assert len(model.calls) == 1 and "sid-1" not in json.dumps(model.calls[0])
+    for sid in ("sid-0", "sid-1"):
+        assert ddb.Table("survey").get_item(Key={"session_id": sid})["Item"]["status"] == "completed"
+        risks = ddb.Table("skill_graph").query(KeyConditionExpression=Key("session_id").eq(sid))["Items"]
+        assert len(risks) == 2
+
+
+def test_queue_batch_keeps_variant_settings_and_budget(analyze_module, monkeypatch):
+    """alias/생성 방식을 바꾼 변형과 예산을 다 쓴 세션은 단건으로 넘기고, 묶은 세션은 실험 지표를 남긴다."""
+    module, ddb = analyze_module
+    variants = {
+        "sid-plain": Variant("control"),
+        "sid-alias": Variant("agent-v2", agent_alias_id="ALIAS2"),
+        "sid-tool": Variant("tool", generation_mode=GENERATION_TOOL),
+        "sid-spent": Variant("control"),
+    }
+    payloads = [{"session_id": sid, "name": sid, "job_title": "개발자", "strengths": "Python, Communication"}
+                for sid in variants]
+    for p in payloads:
+        ddb.Table("survey").put_item(Item={"session_id": p["session_id"], "status": "analyzing"})
+    ddb.Table("survey").update_item(Key={"session_id": "sid-spent"}, UpdateExpression="SET usage_input_tokens = :t",
+                                    ExpressionAttributeValues={":t": 10 ** 6})
+
+    model = FakeBatchModelRuntime()
+    dispatched = []
+    monkeypatch.setattr(module, "MICRO_BATCH_MODEL_ID", "model")
+    monkeypatch.setattr(module, "SESSION_TOKEN_BUDGET", 1000)
+    monkeypatch.setattr(module, "bedrock_runtime", model)
+    monkeypatch.setattr(module, "_dispatch_single", lambda payload: dispatched.append(payload["session_id"]))
+    monkeypatch.setattr(module, "assign_variant", lambda _experiment, sid, _variants: variants[sid])
+
+    assert module.handler(_sqs_event(payloads), None) == {"batchItemFailures": []}
+
+    assert dispatched == ["sid-alias", "sid-tool", "sid-spent"]
+    assert len(model.calls) == 1
+    experiment = ddb.Table("survey").get_item(Key={"session_id": "sid-plain"})["Item"]["experiment"]
+    assert experiment["variant_id"] == "control"
+    assert experiment["input_tokens"] == 8000 + 400
+
+
+def test_queue_batch_model_failure_dispatches_all_singly(monkeypatch):
+    """묶음 요청이 실패하면 그룹 전체를 단건 경로로 넘기고, 전달 실패만 SQS로 돌려보낸다."""
+    import functions.analyze.handler as module
+
+    class BrokenModel:
+        def invoke_model(self, **kwargs):
+            raise RuntimeError("model down")
+
+    dispatched = []
+
+    def dispatch(payload):
+        if payload["session_id"] == "sid-b":
+            raise RuntimeError("invoke failed")
+        dispatched.append(payload["session_id"])
+
+    monkeypatch.setattr(module, "KNOWLEDGE_BASE_ID", "")
+    monkeypatch.setattr(module, "SESSION_TOKEN_BUDGET", 0)
+    monkeypatch.setattr(module, "MICRO_BATCH_MODEL_ID", "model")
+    monkeypatch.setattr(module, "bedrock_runtime", BrokenModel())
+    monkeypatch.setattr(module, "_dispatch_single", dispatch)
+
+    resp = module.handler(_sqs_event([
+        {"session_id": "sid-a", "job_title": "개발자"},
+        {"session_id": "sid-b", "job_title": "개발자"},
+    ]), None)
+
+    assert dispatched == ["sid-a"]
+    assert resp == {"batchItemFailures": [{"itemIdentifier": "m-sid-b"}]}
@@ -98,6 +98,25 @@ def test_analyzing_status_returns_202(aws_env, dynamodb_tables):
     assert body["status"] == "analyzing"
 
 
+def test_analyzing_includes_template_card_preview(aws_env, dynamodb_tables):
+    """분석 중 템플릿 카드가 먼저 저장되어 있으면 202 응답에 미리보기로 포함한다."""
+    dynamodb_tables.Table("survey").put_item(Item={"session_id": "test-sid", "status": "analyzing"})
+    dynamodb_tables.Table("career_cards").put_item(Item={
+        "session_id": "test-sid",
+        "card_index": Decimal("0"),
+        "combo_formula": "[개발자] + [Python] = [MLOps Engineer]",
+        "reason": "템플릿 사유",
+        "roadmap": [],
+    })
+
+    from handlers.result_handler import handler
+
+    resp = handler(_make_event("test-sid"), None)
+    assert resp["statusCode"] == 202
+    body = json.loads(resp["body"])
+    assert body["career_cards"][0]["combo_formula"] == "[개발자] + [Python] = [MLOps Engineer]"
+
+
 def test_completed_returns_full_result(aws_env, dynamodb_tables):
     """분석 완료 시 스킬 위험도 + 커리어 카드를 200으로 반환한다. (Requirements 7.1)"""
     # survey 데이터 삽입
@@ -152,3 +171,15 @@ def test_missing_sid_returns_400(aws_env, dynamodb_tables):
 
     resp = handler({"pathParameters": {}}, None)
     assert resp["statusCode"] == 400
+
+
+def test_failed_status_returns_410(aws_env, dynamodb_tables):
+    """재시도를 소진한 terminal 세션은 410을 반환해 폴링을 멈추게 한다."""
+    table = dynamodb_tables.Table("survey")
+    table.put_item(Item={"session_id": "test-sid", "status": "failed"})
+
+    from handlers.result_handler import handler
+
+    resp = handler(_make_event("test-sid"), None)
+    assert resp["statusCode"] == 410
+    assert json.loads(resp["body"])["status"] == "failed"
@@ -0,0 +1,120 @@
+"""의미 기반 분석 재사용(정확 일치 캐시 미스 뒤 최근접 캐시 항목) 테스트."""
+
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from benchmarks.semantic_reuse_eval import evaluate, split_holdout, synthetic_sessions
+from services.bulk_inference import AnalysisCache, Combination, combination_key
+from services.semantic_reuse import adapt_analysis, build_index, nearest, remap_skill_risks
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime, create_analysis_tables
+
+CACHE_ITEMS = [
+    {"cache_key": "dev", "job_title": "개발자", "strengths": "Python, Communication"},
+    {"cache_key": "nurse", "job_title": "간호사", "strengths": "Communication, Writing"},
+    # 원문 프로필 없이 적재된 항목은 인덱스에 넣지 않는다
+    {"cache_key": "legacy"},
+]
+
+
+def test_nearest_finds_reworded_profile_with_distance():
+    index = build_index(CACHE_ITEMS)
+    assert len(index) == 2
+
+    match = nearest(index, "소프트웨어 개발자", "Python, Communication")
+    assert match.cache_key == "dev"
+    assert match.distance == pytest.approx(1.0 - match.similarity)
+    assert match.similarity > nearest(index, "Software developer", "python, 커뮤니케이션").similarity > 0.5
+    assert nearest(index, "", "") is None
+
+
+def test_ingest_stores_profile_text():
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        combo = Combination("개발자", "Python, Communication", "30s")
+        text = json.dumps([{"session_id": combo.cache_key, **SAMPLE_ANALYSIS}])
+        record = {"recordId": combo.cache_key, "modelOutput": {"content": [{"type": "text", "text": text}]}}
+        cache = AnalysisCache(ddb.Table("analysis_cache"))
+        assert cache.ingest([record], "model", profiles={combo.cache_key: combo}).cached == 1
+
+        item = ddb.Table("analysis_cache").get_item(Key={"cache_key": combo.cache_key})["Item"]
+        assert (item["job_title"], item["strengths"], item["age_group"], item["prompt_version"]) == (
+            "개발자", "Python, Communication", "30s", "v1"
+        )
+        assert cache.get_by_key(combo.cache_key) == cache.get("개발자", "python,  communication", "30s")
+        assert cache.get("개발자", "Python, Communication") is None
+
+
+def test_remap_skill_risks_uses_user_skill_names():
+    risks = SAMPLE_ANALYSIS["skill_risks"]
+    remapped = remap_skill_risks(risks, ["python", "커뮤니케이션"])
+    assert [(r["skill_name"], r["replacement_prob"]) for r in remapped] == [("python", 60), ("커뮤니케이션", 20)]
+    # 이웃 결과에 대응하는 스킬이 없으면 재사용하지 않는다
+    assert remap_skill_risks(risks, ["Python", "Figma"]) is None
+
+
+def test_adapt_analysis_requires_same_template_cards():
+    dev = {"job_title": "개발자", "strengths": "Python, Communication", "age_group": "", "prompt_version": "v1"}
+    analysis = json.dumps(SAMPLE_ANALYSIS)
+
+    adapted = json.loads(adapt_analysis(analysis, dev, "소프트웨어 개발자", "python, 커뮤니케이션"))
+    assert [r["skill_name"] for r in adapted["skill_risks"]] == ["python", "커뮤니케이션"]
+    assert adapted["career_cards"] == SAMPLE_ANALYSIS["career_cards"]
+    # 다른 클러스터의 이웃은 카드 card_index가 다른 템플릿을 가리킨다
+    assert adapt_analysis(analysis, dev, "간호사", "Python, Communication") is None
+    assert adapt_analysis(analysis, {"strengths": "Python"}, "개발자", "Python") is None
+    # 연령대나 프롬프트 버전이 다른 결과, 버전 없이 적재된 이전 항목은 쓰지 않는다
+    assert adapt_analysis(analysis, dev, "개발자", "Python, Communication", age_group="50s") is None
+    assert adapt_analysis(analysis, dev, "개발자", "Python, Communication", prompt_version="v2") is None
+    legacy = {key: value for key, value in dev.items() if key != "prompt_version"}
+    assert adapt_analysis(analysis, legacy, "개발자", "Python, Communication") is None
+
+
+@pytest.fixture
+def analyze_overrides(tmp_path):
+    return {"ANALYSIS_CACHE_TABLE_NAME": "analysis_cache", "SEMANTIC_INDEX_BUCKET": "models",
+            "INDEX_DIR": str(tmp_path), "_semantic_loader": None}
+
+
+def _run_analyze(analyze_module, monkeypatch, s3, threshold: float, sid: str):
+    analyze, ddb = analyze_module
+    runtime = FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS))
+    for name, value in (("SEMANTIC_REUSE_THRESHOLD", threshold), ("s3", s3), ("bedrock_agent_runtime", runtime)):
+        monkeypatch.setattr(analyze, name, value)
+    ddb.Table("survey").put_item(Item={"session_id": sid, "status": "analyzing"})
+    analyze.handler({"session_id": sid, "name": sid, "job_title": "소프트웨어 개발자",
+                     "strengths": "Python, Communication"}, None)
+    assert ddb.Table("survey").get_item(Key={"session_id": sid})["Item"]["status"] == "completed"
+    return runtime
+
+
+def test_analyze_reuses_nearest_cached_analysis_above_threshold(analyze_module, monkeypatch):
+    _, ddb = analyze_module
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="models")
+    key = combination_key("개발자", "Python, Communication")
+    ddb.Table("analysis_cache").put_item(Item={
+        "cache_key": key, "job_title": "개발자", "strengths": "Python, Communication",
+        "age_group": "", "prompt_version": "v1", "analysis": json.dumps(SAMPLE_ANALYSIS),
+    })
+    index = build_index([{"cache_key": key, "job_title": "개발자", "strengths": "Python, Communication"}])
+    s3.put_object(Bucket="models", Key="analysis/semantic.ivf", Body=index.to_bytes())
+
+    assert _run_analyze(analyze_module, monkeypatch, s3, 0.9, "sid-hit").calls == []
+    # 임계값보다 멀면 Agent를 호출한다
+    assert len(_run_analyze(analyze_module, monkeypatch, s3, 0.99, "sid-miss").calls) == 1
+
+
+def test_holdout_eval_reports_hit_rate_and_drift():
+    reference, heldout = split_holdout(synthetic_sessions(600), 0.2)
+    assert split_holdout(synthetic_sessions(600), 0.2)[1] == heldout
+
+    rows = evaluate(reference, heldout, [0.95, 0.8])
+    exact, loose, strict = rows
+    assert [row["label"] for row in rows] == ["exact", ">=0.80", ">=0.95"]
+    assert exact["hit_rate"] <= strict["hit_rate"] <= loose["hit_rate"] <= 1.0
+    assert loose["reused"] >= strict["reused"] > 0
+    assert loose["years_mae"] is not None and 0 < loose["coverage"] <= 1.0
@@ -0,0 +1,124 @@
+"""같은 프로필 동시 분석 합치기(single-flight) 테스트."""
+
+import json
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+from moto import mock_aws
+
+from services.single_flight import ROLE_FOLLOWER, ROLE_LEADER, ROLE_SOLO, SingleFlight, flight_key
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime, create_analysis_tables
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_flight_key_ignores_skill_order_and_names_and_separates_variants():
+    key = flight_key("control", "개발자", "30s", "Python, SQL")
+    assert key == flight_key("control", "개발자", "30s", "sql, python")
+    assert key != flight_key("concise", "개발자", "30s", "Python, SQL")
+    assert key != flight_key("control", "개발자", "40s", "Python, SQL")
+
+
+def test_leader_follower_and_takeover_after_lease_expiry():
+    """임대가 만료되면 다음 실행이 기다리던 follower와 함께 flight를 이어받는다."""
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        clock = Clock()
+        flight = SingleFlight(ddb.Table("system_state"), lease_seconds=180, clock=clock)
+
+        assert flight.join("flight#k", "a") == ROLE_LEADER
+        assert flight.join("flight#k", "b") == ROLE_FOLLOWER
+        assert flight.join("flight#k", "c") == ROLE_FOLLOWER
+        assert flight.join("flight#k", "a") == ROLE_SOLO
+
+        clock.now += 181
+        assert flight.join("flight#k", "b") == ROLE_LEADER
+        assert flight.complete("flight#k", "a") == []
+        assert flight.complete("flight#k", "b") == ["c"]
+        assert flight.join("flight#k", "d") == ROLE_LEADER
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {"STATE_TABLE_NAME": "system_state", "SINGLE_FLIGHT": True,
+            "bedrock_agent_runtime": FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS))}
+
+
+EVENT = {"name": "테스트", "job_title": "개발자", "age_group": "30s", "strengths": "Python, Communication"}
+
+
+def _event_flight_key(module):
+    variant = module.assign_variant(module.EXPERIMENT_ID, "leader", module.experiment_variants)
+    return flight_key(variant.variant_id, EVENT["job_title"], EVENT["age_group"], EVENT["strengths"])
+
+
+def _join_with_followers(monkeypatch, followers):
+    """리더가 flight를 시작한 직후 followers가 도착한 상황을 만든다."""
+    real_join = SingleFlight.join
+
+    def join(self, key, session_id):
+        role = real_join(self, key, session_id)
+        if role == ROLE_LEADER:
+            for follower in followers:
+                assert real_join(self, key, follower) == ROLE_FOLLOWER
+        return role
+
+    monkeypatch.setattr(SingleFlight, "join", join)
+
+
+def test_followers_skip_agent_while_leader_running(analyze_module):
+    """같은 프로필의 리더가 진행 중이면 이름이 달라도 follower는 Agent를 호출하지 않고 analyzing으로 남는다."""
+    module, ddb = analyze_module
+    ddb.Table("survey").put_item(Item={"session_id": "f1", "status": "analyzing"})
+    SingleFlight(ddb.Table("system_state")).join(_event_flight_key(module), "leader")
+
+    module.handler({"session_id": "f1", **EVENT, "name": "다른 참가자"}, None)
+
+    assert module.bedrock_agent_runtime.calls == []
+    assert ddb.Table("survey").get_item(Key={"session_id": "f1"})["Item"]["status"] == "analyzing"
+
+
+def test_leader_fans_out_result_to_followers(analyze_module, monkeypatch):
+    """리더 완료 시 follower 세션에도 결과를 저장하고 flight를 지운다."""
+    module, ddb = analyze_module
+    survey = ddb.Table("survey")
+    for sid in ("leader", "f1", "f2"):
+        survey.put_item(Item={"session_id": sid, "status": "analyzing"})
+    _join_with_followers(monkeypatch, ["f1", "f2"])
+
+    module.handler({"session_id": "leader", **EVENT}, None)
+
+    [call] = module.bedrock_agent_runtime.calls
+    # follower에게 리더의 이름이 들어간 결과가 가지 않도록 이름 없는 프롬프트로 생성한다
+    assert EVENT["name"] not in call["inputText"]
+    for sid in ("leader", "f1", "f2"):
+        item = survey.get_item(Key={"session_id": sid})["Item"]
+        risks = ddb.Table("skill_graph").query(KeyConditionExpression=Key("session_id").eq(sid))["Items"]
+        cards = ddb.Table("career_cards").query(KeyConditionExpression=Key("session_id").eq(sid))["Items"]
+        assert item["status"] == "completed"
+        assert item["remaining_years"] == SAMPLE_ANALYSIS["remaining_years"]
+        assert len(risks) == 2 and len(cards) == 3
+    assert "Item" not in ddb.Table("system_state").get_item(Key={"state_key": _event_flight_key(module)})
+
+
+def test_leader_failure_is_passed_to_followers(analyze_module, monkeypatch):
+    """리더가 실패하면 follower도 같은 상태로 표시해 스위퍼가 다시 넣게 한다."""
+    module, ddb = analyze_module
+    survey = ddb.Table("survey")
+    for sid in ("leader", "f1"):
+        survey.put_item(Item={"session_id": sid, "status": "analyzing"})
+    monkeypatch.setattr(module, "bedrock_agent_runtime", FakeAgentRuntime("not json at all"))
+    _join_with_followers(monkeypatch, ["f1"])
+
+    module.handler({"session_id": "leader", **EVENT}, None)
+
+    assert survey.get_item(Key={"session_id": "leader"})["Item"]["status"] == "error"
+    assert survey.get_item(Key={"session_id": "f1"})["Item"]["status"] == "error"
@@ -0,0 +1,139 @@
+"""설문 초안 사전 분석(POST /survey/draft) 테스트.
+
+초안 → 사전 분석 → 최종 제출의 세 가지 경로를 검증한다.
+    - 사전 분석이 끝난 뒤 같은 입력으로 제출: 체크포인트에서 재개 (Agent 재호출 없음)
+    - 사전 분석 진행 중 같은 입력으로 제출: 연결되어 사전 분석 실행이 분석을 마무리
+    - 다른 입력으로 제출: 사전 분석 취소, 새 입력으로 다시 분석
+"""
+
+import json
+
+import pytest
+
+from services.speculation import SPEC_STAGE_GENERATION, SPEC_STAGE_RETRIEVAL, plan_speculation
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+SURVEY = {
+    "session_id": "sid-1",
+    "name": "테스트",
+    "job_title": "개발자",
+    "age_group": "30s",
+    "strengths": "Python, Communication",
+    "hobbies": "Python, Communication",
+}
+
+
+class FakeLambdaClient:
+    """비동기 Lambda 호출 페이로드를 기록한다 (테스트가 직접 analyze에 전달)."""
+
+    def __init__(self) -> None:
+        self.payloads = []
+
+    def invoke(self, **kwargs):
+        self.payloads.append(json.loads(kwargs["Payload"]))
+        return {"StatusCode": 202}
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {
+        "CHECKPOINT_TABLE_NAME": "analysis_checkpoints",
+        "bedrock_agent_runtime": FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS)),
+    }
+
+
+@pytest.fixture
+def modules(analyze_module, monkeypatch):
+    """가짜 Lambda 클라이언트로 draft/survey 모듈을 analyze 모듈과 같은 테이블에 연결한다."""
+    analyze, ddb = analyze_module
+    import functions.survey.handler as survey
+    import functions.survey_draft.handler as draft
+
+    lambda_client = FakeLambdaClient()
+    for module in (survey, draft):
+        monkeypatch.setattr(module, "SURVEY_TABLE_NAME", "survey")
+        monkeypatch.setattr(module, "lambda_client", lambda_client)
+    return {"ddb": ddb, "analyze": analyze, "survey": survey, "draft": draft, "lambda": lambda_client}
+
+
+def _post(module, body):
+    return module.handler({"body": json.dumps(body)}, None)
+
+
+def _status(ddb):
+    return ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]["status"]
+
+
+def test_plan_speculation_stages():
+    """직업+스킬이면 retrieval, 프롬프트 입력이 모두 있으면 generation."""
+    assert plan_speculation({"job_title": "개발자"}) is None
+    assert plan_speculation({"job_title": "개발자", "strengths": "Python"}) == SPEC_STAGE_RETRIEVAL
+    assert plan_speculation(SURVEY) == SPEC_STAGE_GENERATION
+
+
+def test_repeated_draft_does_not_restart(modules):
+    """같은 초안을 다시 보내면 사전 분석을 새로 시작하지 않는다."""
+    first = _post(modules["draft"], SURVEY)
+    second = _post(modules["draft"], SURVEY)
+
+    assert json.loads(first["body"])["speculation"] == SPEC_STAGE_GENERATION
+    assert json.loads(second["body"])["speculation"] is None
+    assert len(modules["lambda"].payloads) == 1
+    assert _status(modules["ddb"]) == "draft"
+
+
+def test_submit_after_speculation_resumes_from_checkpoint(modules):
+    """사전 분석이 끝난 뒤 제출하면 Agent를 다시 호출하지 않고 완료된다."""
+    runtime = modules["analyze"].bedrock_agent_runtime
+    _post(modules["draft"], SURVEY)
+    modules["analyze"].handler(modules["lambda"].payloads.pop(), None)
+    assert _status(modules["ddb"]) == "draft"
+
+    _post(modules["survey"], SURVEY)
+    modules["analyze"].handler(modules["lambda"].payloads.pop(), None)
+
+    assert _status(modules["ddb"]) == "completed"
+    assert len(runtime.calls) == 1
+
+
+def test_submit_during_speculation_attaches(modules):
+    """사전 분석 진행 중 제출하면 새로 호출하지 않고, 사전 분석 실행이 분석을 마무리한다."""
+    runtime = modules["analyze"].bedrock_agent_runtime
+    _post(modules["draft"], SURVEY)
+    speculative_event = modules["lambda"].payloads.pop()
+
+    resp = _post(modules["survey"], SURVEY)
+    assert resp["statusCode"] == 200
+    assert modules["lambda"].payloads == []
+    assert _status(modules["ddb"]) == "analyzing"
+
+    modules["analyze"].handler(speculative_event, None)
+
+    assert _status(modules["ddb"]) == "completed"
+    assert modules["ddb"].Table("career_cards").scan()["Count"] == 3
+    assert len(runtime.calls) == 1
+
+
+def test_submit_with_different_inputs_cancels_speculation(modules):
+    """다른 입력으로 제출하면 사전 분석 결과를 버리고 새 입력으로 다시 분석한다."""
+    runtime = modules["analyze"].bedrock_agent_runtime
+    _post(modules["draft"], SURVEY)
+    speculative_event = modules["lambda"].payloads.pop()
+
+    _post(modules["survey"], {**SURVEY, "job_title": "디자이너"})
+    final_event = modules["lambda"].payloads.pop()
+
+    modules["analyze"].handler(speculative_event, None)
+    assert _status(modules["ddb"]) == "analyzing"
+
+    modules["analyze"].handler(final_event, None)
+    assert _status(modules["ddb"]) == "completed"
+    assert len(runtime.calls) == 2
+    assert "디자이너" in runtime.calls[1]["inputText"]
+
+
+def test_draft_after_submit_is_rejected(modules):
+    """최종 제출 이후의 초안은 409로 거부한다."""
+    _post(modules["survey"], SURVEY)
+
+    assert _post(modules["draft"], SURVEY)["statusCode"] == 409
@@ -0,0 +1,111 @@
+"""스트림 소비/저장 겹치기 파이프라인 테스트."""
+
+import json
+import threading
+
+from boto3.dynamodb.conditions import Key
+
+from services.stream_pipeline import STREAM_RESTART, IncrementalJsonScanner, run_streaming_persist
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_scanner_finds_elements_across_chunk_boundaries():
+    """조각 경계가 문자열/이스케이프 중간이어도 배열 원소를 순서대로 찾고, 코드 블록 표시는 무시한다."""
+    analysis = {**SAMPLE_ANALYSIS, "remaining_years_reason": 'say "hi" \\ {not [a] key}'}
+    text = "```json\n" + json.dumps(analysis, ensure_ascii=False, indent=2) + "\n```"
+    scanner = IncrementalJsonScanner(["skill_risks", "career_cards"])
+
+    found = []
+    for chunk in _chunks(text, 7):
+        found.extend(scanner.feed(chunk))
+
+    assert [key for key, _ in found] == ["skill_risks"] * 2 + ["career_cards"] * 3
+    assert [element for _, element in found] == analysis["skill_risks"] + analysis["career_cards"]
+
+
+def test_writes_start_before_stream_ends_and_restart_discards_attempt():
+    """원소 저장은 스트림이 끝나기 전에 시작되고, 재시작 이전 시도의 원소는 집계에서 빠진다."""
+    text = json.dumps(SAMPLE_ANALYSIS)
+    first_written = threading.Event()
+
+    def produce(on_chunk):
+        on_chunk(STREAM_RESTART)
+        on_chunk(text[: len(text) // 3])  # 중단된 첫 시도
+        on_chunk(STREAM_RESTART)
+        for chunk in _chunks(text, 40):
+            on_chunk(chunk)
+        # 저장이 스트림 종료를 기다린다면 여기서 시간 초과로 실패한다
+        assert first_written.wait(5)
+        return "done"
+
+    def on_element(key, element):
+        first_written.set()
+
+    result, written = run_streaming_persist(produce, on_element, ["skill_risks", "career_cards"])
+
+    assert result == "done"
+    assert written == {"skill_risks": SAMPLE_ANALYSIS["skill_risks"], "career_cards": SAMPLE_ANALYSIS["career_cards"]}
+
+
+def test_analyze_streaming_persist_matches_batch_result(analyze_module, monkeypatch):
+    """스트리밍 저장을 켜도 꺼진 경우와 같은 항목이 저장되고, 최종 응답 스트리밍을 요청한다."""
+    module, ddb = analyze_module
+
+    def run(session_id, streaming):
+        ddb.Table("survey").put_item(Item={"session_id": session_id, "status": "analyzing"})
+        runtime = FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS), chunk_size=16)
+        monkeypatch.setattr(module, "STREAMING_PERSIST", streaming)
+        monkeypatch.setattr(module, "bedrock_agent_runtime", runtime)
+
+        module.handler({
+            "session_id": session_id, "name": "테스트", "job_title": "개발자",
+            "age_group": "30s", "strengths": "Python, Communication",
+        }, None)
+
+        by_session = Key("session_id").eq(session_id)
+        return (
+            runtime.calls[0].get("streamingConfigurations"),
+            ddb.Table("survey").get_item(Key={"session_id": session_id})["Item"]["status"],
+            [{**r, "session_id": ""} for r in ddb.Table("skill_graph").query(KeyConditionExpression=by_session)["Items"]],
+            [{**c, "session_id": ""} for c in ddb.Table("career_cards").query(KeyConditionExpression=by_session)["Items"]],
+        )
+
+    streaming_config, status, risks, cards = run("sid-1", True)
+    _, _, batch_risks, batch_cards = run("sid-2", False)
+
+    assert streaming_config == {"streamFinalResponse": True}
+    assert status == "completed"
+    assert risks == batch_risks and len(risks) == 2
+    assert cards == batch_cards and [c["reason"] for c in cards] == ["성장 직군"] * 3
+
+
+def test_analyze_removes_rows_from_abandoned_stream_attempts(analyze_module, monkeypatch):
+    """중단된 시도가 스트리밍으로 쓴 스킬 행은 최종 저장 뒤 지우고, 파싱 실패면 모두 지운다."""
+    module, ddb = analyze_module
+    monkeypatch.setattr(module, "STREAMING_PERSIST", True)
+    event = {"name": "테스트", "job_title": "개발자", "age_group": "30s", "strengths": "Python, Communication"}
+    stale = {"skill_name": "Obsolete", "category": "Technology", "replacement_prob": 90,
+             "time_horizon": 1, "justification": "이전 시도"}
+
+    def skills(session_id):
+        rows = ddb.Table("skill_graph").query(KeyConditionExpression=Key("session_id").eq(session_id))["Items"]
+        return sorted(row["skill_name"] for row in rows)
+
+    # 엔드포인트 전환 전 시도가 쓴 행
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing"})
+    module._save_skill_risks("sid-1", [stale])
+    monkeypatch.setattr(module, "bedrock_agent_runtime", FakeAgentRuntime(json.dumps(SAMPLE_ANALYSIS), chunk_size=16))
+    module.handler({"session_id": "sid-1", **event}, None)
+    assert skills("sid-1") == ["Communication", "Python"]
+
+    # 원소는 완성됐지만 전체 응답이 JSON이 아닌 경우
+    ddb.Table("survey").put_item(Item={"session_id": "sid-2", "status": "analyzing"})
+    broken = json.dumps({"skill_risks": [stale]})[:-1] + ", oops"
+    monkeypatch.setattr(module, "bedrock_agent_runtime", FakeAgentRuntime(broken, chunk_size=16))
+    module.handler({"session_id": "sid-2", **event}, None)
+    assert ddb.Table("survey").get_item(Key={"session_id": "sid-2"})["Item"]["status"] == "error"
+    assert skills("sid-2") == []
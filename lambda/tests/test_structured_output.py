@@ -0,0 +1,88 @@
+"""도구 호출 강제 생성 모드(generation_mode="tool") 테스트."""
+
+import json
+
+import pytest
+
+from services.experiments import assign_variant, load_variants
+from services.structured_output import ANALYSIS_TOOL, StructuredOutputError, ToolUseGenerator, check_analysis
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+VARIANTS = json.dumps([
+    {"variant_id": "control", "weight": 0.5},
+    {"variant_id": "tool", "generation_mode": "tool", "weight": 0.5},
+])
+
+
+class FakeConverseRuntime:
+    """converse 호출을 기록하고 tool_input을 toolUse 블록으로 돌려준다 (None이면 텍스트만)."""
+
+    def __init__(self, tool_input=SAMPLE_ANALYSIS) -> None:
+        self.tool_input = tool_input
+        self.calls = []
+
+    def converse(self, **kwargs):
+        self.calls.append(kwargs)
+        content = [{"text": "Here is the verdict."}]
+        if self.tool_input is not None:
+            content.append({"toolUse": {"toolUseId": "t-1", "name": ANALYSIS_TOOL, "input": self.tool_input}})
+        return {
+            "output": {"message": {"role": "assistant", "content": content}},
+            "stopReason": "tool_use",
+            "usage": {"inputTokens": 1200, "outputTokens": 800, "totalTokens": 2000},
+        }
+
+
+def test_generator_forces_tool_and_reads_input():
+    runtime = FakeConverseRuntime()
+    tool_input, usage = ToolUseGenerator(runtime, "model").generate("prompt")
+
+    config = runtime.calls[0]["toolConfig"]
+    assert config["toolChoice"] == {"tool": {"name": ANALYSIS_TOOL}}
+    assert config["tools"][0]["toolSpec"]["inputSchema"]["json"]["required"][0] == "remaining_years"
+    assert tool_input == SAMPLE_ANALYSIS
+    assert (usage.input_tokens, usage.output_tokens, usage.model_invocations) == (1200, 800, 1)
+
+    assert ToolUseGenerator(FakeConverseRuntime(None), "model").generate("prompt")[0] is None
+    with pytest.raises(StructuredOutputError):
+        check_analysis({"remaining_years": 3, "skill_risks": []})
+    with pytest.raises(ValueError):
+        load_variants('[{"variant_id": "x", "generation_mode": "json"}]')
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {"STRUCTURED_OUTPUT_MODEL_ID": "model", "experiment_variants": load_variants(VARIANTS)}
+
+
+def _run(module, ddb, monkeypatch, converse: FakeConverseRuntime):
+    agent = FakeAgentRuntime("not json")
+    monkeypatch.setattr(module, "bedrock_agent_runtime", agent)
+    monkeypatch.setattr(module, "bedrock_runtime", converse)
+    variants = load_variants(VARIANTS)
+    session_id = next(f"sid-{i}" for i in range(100)
+                      if assign_variant("default", f"sid-{i}", variants).variant_id == "tool")
+    ddb.Table("survey").put_item(Item={"session_id": session_id, "status": "analyzing"})
+    module.handler({"session_id": session_id, "job_title": "개발자", "strengths": "Python, Communication"}, None)
+    assert agent.calls == []
+    return ddb.Table("survey").get_item(Key={"session_id": session_id})["Item"]
+
+
+def test_tool_variant_uses_tool_input_without_parsing(analyze_module, monkeypatch):
+    module, ddb = analyze_module
+    converse = FakeConverseRuntime()
+    item = _run(module, ddb, monkeypatch, converse)
+
+    assert item["status"] == "completed"
+    assert item["remaining_years"] == SAMPLE_ANALYSIS["remaining_years"]
+    assert "Career Cards" in converse.calls[0]["messages"][0]["content"][0]["text"]
+    experiment = item["experiment"]
+    assert (experiment["generation_mode"], experiment["parse_failed"], experiment["input_tokens"]) == ("tool", 0, 1200)
+
+
+def test_tool_variant_counts_malformed_input_as_parse_failure(analyze_module, monkeypatch):
+    module, ddb = analyze_module
+    item = _run(module, ddb, monkeypatch, FakeConverseRuntime({"remaining_years": 3}))
+
+    assert item["status"] == "error"
+    assert item["experiment"]["parse_failed"] == 1
@@ -0,0 +1,95 @@
+"""what-if 대리 모델 학습과 POST /whatif 테스트."""
+
+import json
+from decimal import Decimal
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from benchmarks.train_surrogate import synthetic_sessions
+from services.surrogate import SurrogateModel, build_examples, fit_ridge, save_model, train
+from tests.helpers import create_analysis_tables
+
+
+@pytest.fixture(scope="module")
+def model():
+    sessions, rows = synthetic_sessions(600)
+    return train(*build_examples(sessions, rows), max_iter=100)
+
+
+def test_fit_ridge_recovers_linear_target():
+    rows = [{0: 1.0}, {1: 1.0}, {0: 1.0, 1: 1.0}] * 20
+    targets = [3.0, -1.0, 2.0] * 20
+    head = fit_ridge(rows, targets, l2=1e-3)
+    assert head.predict({0: 1.0}) == pytest.approx(3.0, abs=0.05)
+    assert head.predict({0: 1.0, 1: 1.0}) == pytest.approx(2.0, abs=0.05)
+
+
+def test_model_learns_skill_and_job_effects(model):
+    # 합성 데이터: Excel 85, Communication 20 / 간호사 18년, 회계사 4년
+    assert model.predict_skill("개발자", "30s", "Excel") > model.predict_skill("개발자", "30s", "Communication") + 40
+    assert model.predict_years("간호사", "30s", ["Python"]) > model.predict_years("회계사", "30s", ["Python"]) + 8
+    assert model.meta["skill_mae"] < 8 and model.meta["years_mae"] < 2
+
+
+def test_artifact_round_trip(model):
+    restored = SurrogateModel.from_json(model.to_json())
+    assert restored.predict_skill("교사", "40s", "Kubernetes") == pytest.approx(model.predict_skill("교사", "40s", "Kubernetes"))
+    with pytest.raises(ValueError):
+        SurrogateModel.from_json(json.dumps({"format": 99}))
+
+
+def test_build_examples_reads_shared_records():
+    sessions = [
+        {"session_id": "a", "status": "completed", "job_title": "개발자", "strengths": "Python", "remaining_years": 7},
+        {"session_id": "b", "status": "completed", "job_title": "개발자", "strengths": "Excel", "analysis_ref": "r1"},
+        {"session_id": "c", "status": "analyzing", "job_title": "개발자", "strengths": "SQL"},
+    ]
+    rows = [{"session_id": "a", "skill_name": "Python", "replacement_prob": 30},
+            {"session_id": "c", "skill_name": "SQL", "replacement_prob": 50}]
+    record = {"remaining_years": 3, "skill_risks": [{"skill_name": "Excel", "replacement_prob": 80}]}
+    skills, profiles = build_examples(sessions, rows, {"r1": record}.get)
+    assert sorted(e.skill_name for e in skills) == ["Excel", "Python"]
+    assert sorted(p.remaining_years for p in profiles) == [3.0, 7.0]
+
+
+def test_whatif_handler_mixes_actual_and_predicted(monkeypatch, model):
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="models")
+        save_model(s3, "models", "surrogate/model.json", model)
+        ddb.Table("survey").put_item(Item={
+            "session_id": "sid-1", "status": "completed", "job_title": "개발자", "age_group": "30s",
+            "strengths": "Python, Excel", "remaining_years": Decimal("9"),
+        })
+        for skill, prob in (("Python", 33), ("Excel", 90)):
+            ddb.Table("skill_graph").put_item(Item={"session_id": "sid-1", "skill_name": skill, "replacement_prob": prob})
+
+        import functions.whatif.handler as whatif
+
+        monkeypatch.setattr(whatif, "SURVEY_TABLE_NAME", "survey")
+        monkeypatch.setattr(whatif, "SKILL_GRAPH_TABLE_NAME", "skill_graph")
+        monkeypatch.setattr(whatif, "SURROGATE_BUCKET", "models")
+        monkeypatch.setattr(whatif, "s3", s3)
+        monkeypatch.setattr(whatif, "_model", None)
+
+        def ask(**body):
+            resp = whatif.handler({"body": json.dumps({"session_id": "sid-1", **body})}, None)
+            return resp["statusCode"], json.loads(resp["body"])
+
+        status, body = ask(add_skills=["Kubernetes"], remove_skills="Excel")
+        assert status == 200
+        risks = {r["skill_name"]: r for r in body["skill_risks"]}
+        assert risks["Python"] == {"skill_name": "Python", "replacement_prob": 33, "source": "analysis"}
+        assert risks["Kubernetes"]["source"] == "model" and "Excel" not in risks
+        # 위험도 높은 Excel을 빼고 낮은 Kubernetes를 더하면 D-Day가 늘어난다
+        assert body["baseline_remaining_years"] == 9 and body["delta_years"] > 0
+        assert body["remaining_years"] == pytest.approx(9 + body["delta_years"], abs=0.1)
+
+        assert ask()[0] == 400
+        monkeypatch.setattr(whatif, "_model", None)
+        monkeypatch.setattr(whatif, "SURROGATE_KEY", "missing.json")
+        assert ask(add_skills=["SQL"])[0] == 503
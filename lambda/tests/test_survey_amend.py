@@ -0,0 +1,171 @@
+"""완료된 세션의 직업/스킬 수정(POST /survey/amend)과 부분 재분석 테스트."""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Key
+
+from services.amendment import diff_inputs, is_material
+from services.analysis_records import AnalysisRecordStore, shared_content
+from services.sweeper import SweepConfig, plan_action
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+SQL_RISK = {
+    "skill_name": "SQL", "category": "Technology", "replacement_prob": 70,
+    "time_horizon": 3, "justification": "질의 생성 AI가 대체한다.",
+}
+REGENERATED = {**SAMPLE_ANALYSIS, "remaining_years": 4, "skill_risks": [SQL_RISK],
+               "career_cards": [{"card_index": i, "reason": "새 직업 기준"} for i in range(3)]}
+
+
+class FakeLambdaClient:
+    def __init__(self) -> None:
+        self.payloads = []
+
+    def invoke(self, **kwargs):
+        self.payloads.append(json.loads(kwargs["Payload"]))
+        return {"StatusCode": 202}
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {
+        "ANALYSIS_RECORDS_TABLE_NAME": "analysis_records",
+        "bedrock_agent_runtime": FakeAgentRuntime(json.dumps(REGENERATED)),
+    }
+
+
+@pytest.fixture
+def modules(analyze_module, monkeypatch):
+    """완료된 세션(스킬 4개) 하나와 amend/analyze 모듈을 구성한다."""
+    analyze, ddb = analyze_module
+    ddb.Table("survey").put_item(Item={
+        "session_id": "sid-1", "status": "completed", "name": "테스트", "job_title": "개발자",
+        "age_group": "30s", "strengths": "Python, Communication, Excel, Figma", "hobbies": "",
+        "remaining_years": Decimal("7"), "remaining_years_reason": "기존 근거",
+    })
+    with ddb.Table("skill_graph").batch_writer() as batch:
+        for skill in ("Python", "Communication", "Excel", "Figma"):
+            batch.put_item(Item={"session_id": "sid-1", "skill_name": skill, "replacement_prob": 50})
+    for i in range(3):
+        ddb.Table("career_cards").put_item(Item={"session_id": "sid-1", "card_index": i, "reason": "기존 카드"})
+
+    import functions.survey_amend.handler as amend
+
+    lambda_client = FakeLambdaClient()
+    monkeypatch.setattr(amend, "SURVEY_TABLE_NAME", "survey")
+    monkeypatch.setattr(amend, "lambda_client", lambda_client)
+    monkeypatch.setattr(amend, "AMEND_MATERIAL_RATIO", 0.75)
+    return {"ddb": ddb, "analyze": analyze, "amend": amend, "lambda": lambda_client,
+            "agent": analyze.bedrock_agent_runtime}
+
+
+def _amend(m, **fields):
+    resp = m["amend"].handler({"body": json.dumps({"session_id": "sid-1", **fields})}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def _rows(ddb, table):
+    items = ddb.Table(table).query(KeyConditionExpression=Key("session_id").eq("sid-1"))["Items"]
+    return {item.get("skill_name", item.get("card_index")): item for item in items}
+
+
+def test_diff_and_materiality_rule():
+    diff = diff_inputs("개발자", "Python, SQL, Excel, Figma", "개발자 ", "python, SQL, Excel, Go")
+    assert (diff.added, diff.removed, diff.kept) == (["Go"], ["Figma"], ["python", "SQL", "Excel"])
+    assert not is_material(diff, 0.75) and is_material(diff, 0.5)
+    assert is_material(diff_inputs("개발자", "Python", "디자이너", "Python"), 0.75)
+
+
+def test_minor_amend_reanalyzes_only_added_skill(modules):
+    """중대하지 않은 변경은 추가 스킬만 분석하고 제거 스킬 행을 지우며 카드와 D-Day는 유지한다."""
+    status, body = _amend(modules, strengths="Python, Communication, Excel, SQL")
+    assert status == 202
+    assert (body["version"], body["added"], body["removed"], body["material"]) == (1, ["SQL"], ["Figma"], False)
+
+    modules["analyze"].handler(modules["lambda"].payloads[0], None)
+
+    ddb = modules["ddb"]
+    skills = _rows(ddb, "skill_graph")
+    assert sorted(skills) == ["Communication", "Excel", "Python", "SQL"]
+    assert skills["Python"]["replacement_prob"] == 50 and skills["SQL"]["replacement_prob"] == 70
+    assert _rows(ddb, "career_cards")[0]["reason"] == "기존 카드"
+    item = ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert (item["status"], item["version"], item["remaining_years"]) == ("completed", 1, 7)
+    assert "pending_amend" not in item
+
+
+def test_material_amend_regenerates_cards_and_remaining_years(modules):
+    status, body = _amend(modules, job_title="데이터 분석가")
+    assert status == 202 and body["material"] is True
+
+    modules["analyze"].handler(modules["lambda"].payloads[0], None)
+
+    item = modules["ddb"].Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert item["job_title"] == "데이터 분석가" and item["remaining_years"] == 4
+    assert _rows(modules["ddb"], "career_cards")[0]["reason"] == "새 직업 기준"
+    assert _rows(modules["ddb"], "skill_graph")["Python"]["replacement_prob"] == 50
+
+
+def test_amend_rejected_while_analyzing_and_stale_retry_ignored(modules):
+    _amend(modules, strengths="Python, Communication, Excel, SQL")
+    assert _amend(modules, strengths="Python")[0] == 409
+
+    modules["analyze"].handler({"session_id": "sid-1", "amend_version": 7}, None)
+    assert modules["agent"].calls == []
+    assert modules["ddb"].Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]["status"] == "analyzing"
+
+
+def test_amend_materializes_shared_record(modules):
+    """공유 레코드를 가리키던 세션은 세션별 행으로 풀어 쓴 뒤 수정하고 포인터를 지운다."""
+    ddb = modules["ddb"]
+    for table, key in (("skill_graph", "skill_name"), ("career_cards", "card_index")):
+        for row in _rows(ddb, table).values():
+            ddb.Table(table).delete_item(Key={"session_id": "sid-1", key: row[key]})
+    record_cards = [{**card, "reason": "공유 카드"} for card in SAMPLE_ANALYSIS["career_cards"]]
+    ref = AnalysisRecordStore(ddb.Table("analysis_records")).put(shared_content(SAMPLE_ANALYSIS, record_cards))
+    ddb.Table("survey").update_item(
+        Key={"session_id": "sid-1"},
+        UpdateExpression="SET strengths = :s, analysis_ref = :r REMOVE remaining_years",
+        ExpressionAttributeValues={":s": "Python, Communication", ":r": ref},
+    )
+
+    _amend(modules, strengths="Python")
+    modules["analyze"].handler(modules["lambda"].payloads[0], None)
+
+    item = ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert "analysis_ref" not in item and item["remaining_years"] == SAMPLE_ANALYSIS["remaining_years"]
+    assert sorted(_rows(ddb, "skill_graph")) == ["Python"]
+    assert _rows(ddb, "career_cards")[0]["reason"] == "공유 카드"
+    assert modules["agent"].calls == []
+
+
+def test_amend_resets_sweeper_clock_and_attempts(modules):
+    """오래된 세션을 수정해도 스위퍼가 바로 멈춤/만료로 보지 않도록 시각과 재시도 횟수를 새로 센다."""
+    modules["ddb"].Table("survey").update_item(
+        Key={"session_id": "sid-1"},
+        UpdateExpression="SET created_at = :c, last_attempt_at = :c, attempts = :a",
+        ExpressionAttributeValues={":c": "2026-01-01T00:00:00+00:00", ":a": 3},
+    )
+    _amend(modules, strengths="Python, Communication, Excel, SQL")
+
+    item = modules["ddb"].Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert item["attempts"] == 0 and item["amended_at"] == item["last_attempt_at"]
+    assert plan_action(item, datetime.now(timezone.utc), SweepConfig()) is None
+
+
+def test_amend_over_token_budget_keeps_previous_results(modules):
+    """예산 초과로 재분석을 못 해도 세션을 failed로 만들지 않고 수정 전 결과로 되돌린다."""
+    modules["ddb"].Table("survey").update_item(
+        Key={"session_id": "sid-1"}, UpdateExpression="SET usage_input_tokens = :u",
+        ExpressionAttributeValues={":u": modules["analyze"].SESSION_TOKEN_BUDGET},
+    )
+    _amend(modules, strengths="Python, Communication, Excel, SQL")
+    modules["analyze"].handler(modules["lambda"].payloads[0], None)
+
+    item = modules["ddb"].Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]
+    assert (item["status"], item["error_code"]) == ("completed", "token_budget_exceeded")
+    assert "pending_amend" not in item and item["remaining_years"] == 7
+    assert modules["agent"].calls == []
@@ -0,0 +1,139 @@
+"""세션 스위퍼 단위 테스트.
+
+moto로 status-created_at-index GSI가 있는 survey 테이블을 모킹한다.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from services.sweeper import ACTION_FAIL, ACTION_RETRY, SweepConfig, backoff_seconds, plan_action, sweep
+
+NOW = datetime(2026, 3, 5, 12, 0, tzinfo=timezone.utc)
+CONFIG = SweepConfig(stuck_threshold_seconds=300, base_backoff_seconds=30, max_attempts=3)
+
+
+@pytest.fixture
+def survey_table():
+    """moto로 survey 테이블(status-created_at-index 포함)을 생성한다."""
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = ddb.create_table(
+            TableName="survey",
+            KeySchema=[{"AttributeName": "session_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "session_id", "AttributeType": "S"},
+                {"AttributeName": "status", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "status-created_at-index",
+                    "KeySchema": [
+                        {"AttributeName": "status", "KeyType": "HASH"},
+                        {"AttributeName": "created_at", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+def _session(session_id: str, status: str, age_seconds: int, **extra) -> dict:
+    return {
+        "session_id": session_id,
+        "status": status,
+        "created_at": (NOW - timedelta(seconds=age_seconds)).isoformat(),
+        "name": "테스트",
+        "job_title": "개발자",
+        "age_group": "30대",
+        "strengths": "Python",
+        "hobbies": "Python",
+        **extra,
+    }
+
+
+class TestPlanAction:
+    """plan_action 결정 로직 테스트."""
+
+    def test_recent_analyzing_is_left_alone(self):
+        assert plan_action(_session("s", "analyzing", 60), NOW, CONFIG) is None
+
+    def test_stuck_analyzing_is_retried(self):
+        assert plan_action(_session("s", "analyzing", 400), NOW, CONFIG) == ACTION_RETRY
+
+    def test_error_waits_for_backoff(self):
+        last_attempt = (NOW - timedelta(seconds=45)).isoformat()
+        item = _session("s", "error", 500, attempts=1, last_attempt_at=last_attempt)
+        # attempts=1 → 60초 백오프
+        assert backoff_seconds(1, CONFIG) == 60
+        assert plan_action(item, NOW, CONFIG) is None
+
+    def test_exhausted_attempts_become_terminal(self):
+        item = _session("s", "error", 900, attempts=3, last_attempt_at=(NOW - timedelta(seconds=900)).isoformat())
+        assert plan_action(item, NOW, CONFIG) == ACTION_FAIL
+
+    def test_too_old_session_becomes_terminal(self):
+        assert plan_action(_session("s", "error", 7200), NOW, CONFIG) == ACTION_FAIL
+
+    def test_amended_session_age_counts_from_amend(self):
+        amended_at = (NOW - timedelta(seconds=400)).isoformat()
+        item = _session("s", "analyzing", 7200, amended_at=amended_at, last_attempt_at=amended_at, attempts=0)
+        assert plan_action(item, NOW, CONFIG) == ACTION_RETRY
+
+
+def test_sweep_retries_and_marks_terminal(survey_table):
+    """스위프 1회가 재시도 등록과 terminal 처리를 함께 수행한다."""
+    survey_table.put_item(Item=_session("stuck", "analyzing", 400))
+    survey_table.put_item(Item=_session("fresh", "analyzing", 10))
+    survey_table.put_item(Item=_session("done", "completed", 400))
+    survey_table.put_item(Item=_session(
+        "exhausted", "error", 900, attempts=3, last_attempt_at=(NOW - timedelta(seconds=900)).isoformat(),
+    ))
+
+    enqueued, failed = [], []
+    counts = sweep(survey_table, enqueue=enqueued.append, config=CONFIG, now=NOW, on_failed=failed.append)
+
+    assert counts == {"scanned": 2, "retried": 1, "failed": 1, "restored": 0}
+    assert [p["session_id"] for p in enqueued] == ["stuck"]
+    assert enqueued[0]["job_title"] == "개발자"
+    assert failed == ["exhausted"]
+
+    stuck = survey_table.get_item(Key={"session_id": "stuck"})["Item"]
+    assert stuck["status"] == "analyzing"
+    assert int(stuck["attempts"]) == 1
+    assert survey_table.get_item(Key={"session_id": "exhausted"})["Item"]["status"] == "failed"
+
+
+def test_sweep_does_not_double_enqueue(survey_table):
+    """같은 시각에 스위프가 겹쳐도 재시도는 한 번만 등록된다."""
+    survey_table.put_item(Item=_session("stuck", "analyzing", 400))
+
+    enqueued = []
+    sweep(survey_table, enqueue=enqueued.append, config=CONFIG, now=NOW)
+    sweep(survey_table, enqueue=enqueued.append, config=CONFIG, now=NOW)
+
+    assert len(enqueued) == 1
+
+
+def test_sweep_restores_abandoned_amend_to_completed(survey_table):
+    """수정 재분석을 포기한 세션은 이미 완료된 결과가 있으므로 failed 대신 completed로 되돌린다."""
+    last_attempt = (NOW - timedelta(seconds=900)).isoformat()
+    survey_table.put_item(Item=_session(
+        "amended", "error", 900, attempts=3, last_attempt_at=last_attempt, amended_at=last_attempt,
+        version=2, pending_amend={"version": 2, "added": ["SQL"], "removed": [], "material": False},
+    ))
+
+    failed, restored = [], []
+    counts = sweep(survey_table, enqueue=lambda payload: None, config=CONFIG, now=NOW,
+                   on_failed=failed.append, on_restored=restored.append)
+
+    assert (counts["failed"], counts["restored"]) == (0, 1)
+    assert (failed, restored) == ([], ["amended"])
+    item = survey_table.get_item(Key={"session_id": "amended"})["Item"]
+    assert (item["status"], item["error_code"]) == ("completed", "amend_failed")
+    assert "pending_amend" not in item
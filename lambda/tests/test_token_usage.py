@@ -0,0 +1,126 @@
+"""세션별 토큰/비용 집계와 예산 적용 테스트."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from services.agent_stream import collect_agent_stream
+from services.token_usage import (
+    TokenBudgetExceeded,
+    TokenUsage,
+    estimated_cost_usd,
+    load_daily_rollups,
+    record_daily_rollup,
+)
+from services.trace_replay import ReplayAgentRuntime, load_recording
+from tests.helpers import create_analysis_tables
+
+RECORDING = Path(__file__).resolve().parents[2] / "bedrock-agent-tracing-file.txt"
+
+
+def test_collect_aggregates_usage_kb_queries_and_model():
+    """녹화 트레이스에서 모델 호출 토큰, KB 검색 횟수, 모델 ID를 합산한다."""
+    runtime = ReplayAgentRuntime(load_recording(str(RECORDING)), time_scale=0)
+    usage = collect_agent_stream(runtime.invoke_agent()["completion"]).usage
+
+    assert (usage.model_invocations, usage.input_tokens, usage.output_tokens) == (5, 53442, 3318)
+    assert usage.kb_queries == 8
+    assert usage.model_id == "anthropic.claude-sonnet-4-5-20250929-v1:0"
+    assert estimated_cost_usd(usage) == pytest.approx((53442 * 3.0 + 3318 * 15.0) / 1_000_000)
+
+
+def test_budget_exceeded_closes_stream_with_partial_usage():
+    """예산을 넘는 즉시 스트림을 닫고 그때까지의 사용량을 담아 중단한다."""
+    runtime = ReplayAgentRuntime(load_recording(str(RECORDING)), time_scale=0)
+    completion = runtime.invoke_agent()["completion"]
+
+    with pytest.raises(TokenBudgetExceeded) as exc_info:
+        collect_agent_stream(completion, token_budget=20000)
+
+    assert exc_info.value.usage.model_invocations < 5
+    assert exc_info.value.usage.total_tokens > 20000
+    assert next(completion, None) is None
+
+
+def test_daily_rollup_accumulates_per_model():
+    """같은 날짜·모델의 사용량은 한 항목에 누적되고 모델별로 나뉜다."""
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        table = ddb.Table("system_state")
+        now = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+        for _ in range(2):
+            record_daily_rollup(table, TokenUsage("model-a", input_tokens=100, output_tokens=10, kb_queries=2), now)
+        record_daily_rollup(table, TokenUsage("model-b", input_tokens=5), now)
+        table.put_item(Item={"state_key": "circuit#bedrock", "state": "closed"})
+
+        rollups = load_daily_rollups(table, since_day="2026-10-19")
+
+    assert [(r["model_id"], r["runs"], r["input_tokens"], r["kb_queries"]) for r in rollups] == [
+        ("model-a", 2, 200, 4),
+        ("model-b", 1, 5, 0),
+    ]
+
+
+@pytest.fixture
+def analyze_overrides():
+    return {"STATE_TABLE_NAME": "system_state",
+            "bedrock_agent_runtime": ReplayAgentRuntime.from_file(str(RECORDING), time_scale=0)}
+
+
+def _run_analyze(analyze_module, **prior_usage):
+    module, ddb = analyze_module
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing", **prior_usage})
+    module.handler({
+        "session_id": "sid-1", "name": "테스트", "job_title": "개발자",
+        "age_group": "30s", "strengths": "Python",
+    }, None)
+    return ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"], load_daily_rollups(
+        ddb.Table("system_state")
+    )
+
+
+@pytest.mark.parametrize("analyze_module", [{"SESSION_TOKEN_BUDGET": 0}], indirect=True)
+def test_analyze_records_session_usage_and_rollup(analyze_module):
+    """분석 완료 시 survey 항목과 일별 집계에 사용량을 남긴다."""
+    item, rollups = _run_analyze(analyze_module)
+
+    assert item["status"] == "completed"
+    assert (item["usage_input_tokens"], item["usage_kb_queries"], item["usage_model_invocations"]) == (53442, 8, 5)
+    assert item["usage_cost_microusd"] > 0
+    assert [(r["model_id"], r["runs"]) for r in rollups] == [("anthropic.claude-sonnet-4-5-20250929-v1:0", 1)]
+
+
+@pytest.mark.parametrize("analyze_module", [{"SESSION_TOKEN_BUDGET": 20000}], indirect=True)
+def test_analyze_budget_exceeded_marks_session_failed(analyze_module):
+    """예산 초과는 재시도 대상이 아닌 terminal(failed)로 표시하고 소비한 사용량은 기록한다."""
+    item, _ = _run_analyze(analyze_module)
+
+    assert item["status"] == "failed"
+    assert item["error_code"] == "token_budget_exceeded"
+    assert 20000 < item["usage_input_tokens"] + item["usage_output_tokens"] < 53442 + 3318
+
+
+@pytest.mark.parametrize("analyze_module", [{"SESSION_TOKEN_BUDGET": 80000}], indirect=True)
+def test_analyze_budget_counts_prior_session_usage(analyze_module):
+    """예산은 호출마다 새로 시작하지 않고 이전 시도(재시도/사전 분석)가 누적한 사용량을 뺀 만큼만 허용한다."""
+    item, _ = _run_analyze(analyze_module, usage_input_tokens=50000)
+
+    assert item["status"] == "failed"
+    assert item["error_code"] == "token_budget_exceeded"
+    assert 80000 < item["usage_input_tokens"] + item["usage_output_tokens"] < 50000 + 53442 + 3318
+
+
+@pytest.mark.parametrize("analyze_module", [{"SESSION_TOKEN_BUDGET": 80000}], indirect=True)
+def test_analyze_budget_spent_fails_without_invoking(analyze_module):
+    """이미 예산을 다 쓴 세션은 Agent를 호출하지 않고 바로 terminal 처리한다."""
+    module, _ = analyze_module
+    item, _ = _run_analyze(analyze_module, usage_input_tokens=80000)
+
+    assert (item["status"], item["error_code"]) == ("failed", "token_budget_exceeded")
+    assert item["usage_input_tokens"] == 80000
+    assert module.bedrock_agent_runtime.calls == []
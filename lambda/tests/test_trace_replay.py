@@ -0,0 +1,63 @@
+"""녹화 스트림 재생 백엔드 테스트.
+
+저장소의 bedrock-agent-tracing-file.txt를 재생하여 invoke_agent와 같은
+completion 이터레이터 인터페이스, 원본 간격(배율 적용), analyze 종단 처리를 검증한다.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from services.agent_stream import collect_agent_stream
+from services.trace_replay import ReplayAgentRuntime, load_recording, parse_recording
+
+RECORDING = Path(__file__).resolve().parents[2] / "bedrock-agent-tracing-file.txt"
+
+
+def test_replay_emits_traces_and_final_response_chunks():
+    """트레이스의 KB 검색 결과·토큰 사용량과 finalResponse 청크가 그대로 수집된다."""
+    runtime = ReplayAgentRuntime(load_recording(str(RECORDING), chunk_chars=100), time_scale=0)
+    response = runtime.invoke_agent(agentId="A", agentAliasId="B", sessionId="s", inputText="x")
+
+    result = collect_agent_stream(response["completion"])
+
+    assert result.trace_event_count == 28
+    assert result.retrieved_references
+    assert (result.model_invocation_count, result.input_tokens, result.output_tokens) == (5, 53442, 3318)
+    assert '"skill_risks"' in result.completion
+    assert runtime.calls[0]["sessionId"] == "s"
+
+
+def test_replay_preserves_scaled_inter_event_timing():
+    """이벤트 간 대기 시간 합계는 원본 녹화 구간 × time_scale과 같다."""
+    waits = []
+    runtime = ReplayAgentRuntime(load_recording(str(RECORDING)), time_scale=0.5, sleep=waits.append)
+
+    list(runtime.invoke_agent()["completion"])
+
+    assert sum(waits) == pytest.approx(runtime.events[-1].offset_seconds * 0.5)
+    assert runtime.duration_seconds == pytest.approx(58.687 * 0.5)
+
+
+def test_explicit_chunk_entries_are_not_synthesized_again():
+    """녹화에 청크 항목이 있으면 finalResponse로 청크를 만들지 않는다."""
+    events = parse_recording([
+        {"eventTime": "2026-03-05T01:35:22.000Z",
+         "trace": {"orchestrationTrace": {"observation": {"finalResponse": {"text": "{}"}}}}},
+        {"eventTime": "2026-03-05T01:35:23.500Z", "chunk": {"text": "{\"a\": 1}"}},
+    ])
+
+    assert [e.offset_seconds for e in events] == [0.0, 1.5]
+    assert events[1].event == {"chunk": {"bytes": b"{\"a\": 1}"}}
+
+
+def test_analyze_completes_against_replay(analyze_module, monkeypatch):
+    """재생 백엔드로 analyze 파싱/저장이 끝까지 수행된다."""
+    module, ddb = analyze_module
+    monkeypatch.setattr(module, "bedrock_agent_runtime", ReplayAgentRuntime.from_file(str(RECORDING), time_scale=0))
+    ddb.Table("survey").put_item(Item={"session_id": "sid-1", "status": "analyzing"})
+
+    module.handler({"session_id": "sid-1", "job_title": "개발자", "strengths": "Python"}, None)
+
+    assert ddb.Table("survey").get_item(Key={"session_id": "sid-1"})["Item"]["status"] == "completed"
+    assert ddb.Table("skill_graph").scan()["Count"] == 5
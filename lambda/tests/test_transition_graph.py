@@ -0,0 +1,125 @@
+"""스킬 → 직무 전환 그래프(CSR 인접 배열, Yen k-최단 경로)와 로드맵 시드 테스트."""
+
+import boto3
+import pytest
+
+from services.transition_graph import (
+    DEFAULT_GRAPH_KEY,
+    GraphBuilder,
+    TransitionGraph,
+    apply_roadmaps,
+    parse_duration,
+    parse_formula,
+    save_graph,
+)
+
+
+def _card(steps, formula="[백엔드 개발자] + [Python] + [SQL] = [MLOps Engineer]"):
+    return {"combo_formula": formula, "roadmap": [{"step": s, "duration": d} for s, d in steps]}
+
+
+DOCKER = [("Learn Docker", "2 months"), ("Automate ML pipelines", "3 months"), ("Operate models", "4 months")]
+CERT = [("Cloud certification", "1 month"), ("Automate ML pipelines", "3 months"), ("Operate models", "4 months")]
+
+
+def test_parse_duration_and_formula():
+    assert parse_duration("2 months") == 2
+    assert parse_duration("1-2 years") == 18
+    assert parse_duration("6주") == 1.5
+    assert parse_duration("약 3개월") == 3
+    assert parse_formula("[간호사] + [Communication] = [Clinical AI Workflow Specialist]") == (
+        "간호사", ["Communication"], "Clinical AI Workflow Specialist")
+    assert parse_formula("no formula")[2] == ""
+
+
+def test_k_shortest_paths_are_distinct_and_ordered():
+    builder = GraphBuilder()
+    for _ in range(3):
+        builder.add_card(_card(DOCKER))
+    builder.add_card(_card(CERT))
+    graph = builder.build()
+
+    paths = graph.roadmaps("백엔드 개발자", ["python"], "MLOps Engineer", k=3)
+    assert [p.steps[0][0] for p in paths] == ["Learn Docker", "Cloud certification"]
+    assert paths[0].cost <= paths[1].cost
+    assert paths[0].roadmap() == [{"step": "Learn Docker", "duration": "2 months"},
+                                  {"step": "Automate ML pipelines", "duration": "3 months"},
+                                  {"step": "Operate models", "duration": "4 months"}]
+    # 같은 스킬이 없어도 클러스터(programming)에서 출발한다
+    assert graph.roadmaps("", ["Java"], "MLOps Engineer")[0].steps == paths[0].steps
+    assert graph.roadmaps("간호사", ["Figma"], "MLOps Engineer") == []
+
+    restored = TransitionGraph.from_bytes(graph.to_bytes())
+    assert restored.roadmaps("백엔드 개발자", ["python"], "MLOps Engineer", k=3) == paths
+    with pytest.raises(ValueError):
+        TransitionGraph.from_bytes(b"XXXX" + graph.to_bytes()[4:])
+
+
+def test_wef_growth_discounts_steps():
+    builder = GraphBuilder()
+    builder.add_card(_card([("Learn Excel macros", "3 months"), ("Operate models", "1 month")]))
+    builder.add_card(_card([("Learn AI tooling", "3.5 months"), ("Operate models", "1 month")]))
+    assert builder.build().roadmaps("", ["Python"], "MLOps Engineer")[0].steps[0][0] == "Learn Excel macros"
+
+    builder.add_wef_skills([{"skill": "AI and big data", "growth": 0.9, "keywords": ["ai"]}])
+    assert builder.build().roadmaps("", ["Python"], "MLOps Engineer")[0].steps[0][0] == "Learn AI tooling"
+
+
+def test_templates_seed_roadmaps_and_analyze_uses_graph(monkeypatch):
+    import functions.analyze.handler as analyze
+
+    builder = GraphBuilder()
+    builder.add_templates()
+    builder.add_card(_card(DOCKER))
+    graph = builder.build()
+
+    cards = [{"card_index": 0, "combo_formula": "[개발자] + [Python] = [MLOps Engineer]", "roadmap": []},
+             {"card_index": 1, "combo_formula": "[개발자] + [Python] = [Unknown Role]", "roadmap": [{"step": "x"}]}]
+    seeded = apply_roadmaps(graph, cards, "개발자", ["Python"])
+    assert seeded[0]["roadmap"][0]["step"] == "Learn Docker"
+    assert seeded[1]["roadmap"] == [{"step": "x"}]
+
+    monkeypatch.setattr(analyze, "TRANSITION_GRAPH_BUCKET", "models")
+    monkeypatch.setattr(analyze, "_get_transition_graph", lambda: graph)
+    template_cards = analyze._template_cards("간호사", "Communication, Data analysis")
+    assert len(template_cards) == 3
+    assert all(card["roadmap"] and all(step["duration"].endswith(("month", "months")) for step in card["roadmap"])
+               for card in template_cards)
+
+
+class CountingS3:
+    """head_object 호출 수를 세는 S3 클라이언트 래퍼."""
+
+    def __init__(self, client):
+        self.client = client
+        self.heads = 0
+
+    def head_object(self, **kwargs):
+        self.heads += 1
+        return self.client.head_object(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def test_analyze_caches_missing_graph_then_loads_it(analyze_module, monkeypatch, tmp_path):
+    analyze, _ = analyze_module
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket="models")
+    s3 = CountingS3(client)
+    for name, value in (("TRANSITION_GRAPH_BUCKET", "models"), ("TRANSITION_GRAPH_KEY", DEFAULT_GRAPH_KEY),
+                        ("INDEX_DIR", str(tmp_path)), ("s3", s3), ("_transition_loader", None)):
+        monkeypatch.setattr(analyze, name, value)
+
+    # 아직 올리지 않은 그래프: 템플릿 로드맵을 쓰고 갱신 주기 동안 S3를 다시 부르지 않는다
+    templates = analyze._template_cards("개발자", "Python")
+    assert analyze._template_cards("개발자", "Python") == templates
+    assert s3.heads == 1
+
+    builder = GraphBuilder()
+    builder.add_card(_card(DOCKER, "[개발자] + [Python] = [MLOps Engineer]"))
+    save_graph(client, "models", DEFAULT_GRAPH_KEY, builder.build())
+    monkeypatch.setattr(analyze, "_transition_loader", None)
+    graph = analyze._get_transition_graph()
+    assert graph is not None and graph.path.startswith(str(tmp_path))
+    assert analyze._get_transition_graph() is graph and s3.heads == 2
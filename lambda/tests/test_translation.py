@@ -0,0 +1,140 @@
+"""분석 결과 현지화(번역 캐시) 테스트."""
+
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from services.translation import TranslationCache, localize_result, negotiate_language
+
+
+class FakeTranslator:
+    """번역 요청을 기록하고 접두어를 붙여 돌려준다."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.requests = []
+        self.fail = fail
+
+    def translate(self, texts, language):
+        self.requests.append(list(texts))
+        if self.fail:
+            raise ValueError("번역 응답 형식 오류")
+        return [f"[{language}] {text}" for text in texts]
+
+
+RESULT = {
+    "remaining_years": 7,
+    "remaining_years_reason": "High share of routine work.",
+    "skill_risks": [
+        {"skill_name": "Python", "category": "Technology", "replacement_prob": 60,
+         "time_horizon": 5, "justification": "Code generation replaces simple implementation."},
+    ],
+    "career_cards": [
+        {"card_index": i, "combo_formula": "[Developer] + [Python] = [ML Engineer]",
+         "reason": "Growing field", "roadmap": [{"step": "Learn basics", "duration": "3 months"}]}
+        for i in range(2)
+    ],
+}
+
+
+@pytest.fixture
+def cache():
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        ddb.create_table(
+            TableName="translation_cache",
+            KeySchema=[
+                {"AttributeName": "text_hash", "KeyType": "HASH"},
+                {"AttributeName": "language", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "text_hash", "AttributeType": "S"},
+                {"AttributeName": "language", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield TranslationCache(ddb.Table("translation_cache"))
+
+
+def test_negotiate_language():
+    """q 값 순서로 지원 언어를 고르고, 없으면 정규 언어로 응답한다."""
+    assert negotiate_language("ko-KR,ko;q=0.9,en-US;q=0.8") == "ko"
+    assert negotiate_language("fr-FR,en;q=0.5,ko;q=0.7") == "ko"
+    assert negotiate_language("fr, de") == "en"
+    assert negotiate_language("ko;q=0, en") == "en"
+    assert negotiate_language(None) == "en"
+
+
+def test_localize_translates_text_only_and_caches(cache):
+    """텍스트 필드만 번역하고, 같은 문장은 캐시에서 재사용한다."""
+    translator = FakeTranslator()
+
+    localized, language = localize_result(RESULT, "ko", cache, translator.translate)
+
+    assert language == "ko"
+    assert localized["remaining_years"] == 7
+    assert localized["skill_risks"][0]["skill_name"] == "Python"
+    assert localized["skill_risks"][0]["replacement_prob"] == 60
+    assert localized["career_cards"][1]["reason"] == "[ko] Growing field"
+    assert localized["career_cards"][0]["roadmap"][0]["duration"] == "[ko] 3 months"
+    assert RESULT["career_cards"][0]["reason"] == "Growing field"
+    # 두 카드의 같은 문장은 한 번만 번역
+    assert len(translator.requests[0]) == len(set(translator.requests[0])) == 6
+
+    again, _ = localize_result(RESULT, "ko", cache, translator.translate)
+    assert again == localized
+    assert len(translator.requests) == 1
+
+
+def test_canonical_language_skips_translation(cache):
+    """정규 언어 요청은 번역기를 호출하지 않는다."""
+    translator = FakeTranslator()
+
+    localized, language = localize_result(RESULT, "en", cache, translator.translate)
+
+    assert (localized, language) == (RESULT, "en")
+    assert translator.requests == []
+
+
+def test_translation_failure_falls_back_to_canonical(cache):
+    """번역이 실패하면 원문과 정규 언어로 응답한다."""
+    localized, language = localize_result(RESULT, "ko", cache, FakeTranslator(fail=True).translate)
+
+    assert (localized, language) == (RESULT, "en")
+
+
+def test_result_handler_honors_accept_language(monkeypatch):
+    """결과 조회는 Accept-Language에 맞춰 현지화하고 Content-Language를 표시한다."""
+    from services.fault_injection import FaultInjectingRuntime, FaultProfile
+    from tests.helpers import create_analysis_tables
+
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        create_analysis_tables(ddb)
+        ddb.Table("survey").put_item(Item={
+            "session_id": "sid-1", "status": "completed",
+            "remaining_years": 7, "remaining_years_reason": "High share of routine work.",
+        })
+
+        import functions.result.handler as module
+
+        monkeypatch.setattr(module, "SURVEY_TABLE_NAME", "survey")
+        monkeypatch.setattr(module, "SKILL_GRAPH_TABLE_NAME", "skill_graph")
+        monkeypatch.setattr(module, "CAREER_CARDS_TABLE_NAME", "career_cards")
+        monkeypatch.setattr(module, "TRANSLATION_MODEL_ID", "haiku")
+        monkeypatch.setattr(module, "bedrock_runtime", FaultInjectingRuntime(
+            json.dumps(["반복 업무 비중이 높다."]), FaultProfile(), sleep=lambda s: None,
+        ))
+
+        event = {"pathParameters": {"sid": "sid-1"}, "headers": {"accept-language": "ko-KR,ko;q=0.9"}}
+        resp = module.handler(event, None)
+
+        body = json.loads(resp["body"])
+        assert resp["headers"]["Content-Language"] == "ko"
+        assert body["language"] == "ko"
+        assert body["remaining_years_reason"] == "반복 업무 비중이 높다."
+
+        english = json.loads(module.handler({"pathParameters": {"sid": "sid-1"}}, None)["body"])
+        assert english["language"] == "en"
+        assert english["remaining_years_reason"] == "High share of routine work."
@@ -0,0 +1,159 @@
+"""WEF 사실 테이블(mmap)과 Agent RETURN_CONTROL 액션 그룹 처리 테스트."""
+
+import json
+
+import boto3
+import pytest
+
+from services.agent_actions import FINAL_ANSWER_NOTE, function_results, max_rounds, session_state
+from services.wef_facts import WEFFactStore, build_fact_table
+from tests.helpers import SAMPLE_ANALYSIS, FakeAgentRuntime
+
+FACTS = [
+    {"kind": "job", "name": "Software and Applications Developers", "aliases": ["소프트웨어 개발자", "개발자"],
+     "figures": {"net_growth_pct": 17}, "source": "Figure 2.7"},
+    {"kind": "job", "name": "Data Entry Clerks", "figures": {"net_growth_pct": -26}, "source": "Figure 2.8"},
+    {"kind": "skill", "name": "AI and big data", "aliases": ["AI"], "figures": {"growth_rank": 1},
+     "source": "Figure 3.4"},
+]
+
+
+def _store(tmp_path, facts=FACTS) -> WEFFactStore:
+    path = tmp_path / "facts.bin"
+    path.write_bytes(build_fact_table(facts))
+    return WEFFactStore(str(path))
+
+
+def test_lookup_exact_alias_partial_and_missing(tmp_path):
+    store = _store(tmp_path)
+    assert len(store) == 3
+
+    record, matched = store.lookup("job", "Data entry clerks")
+    assert (record["figures"], record["source"], matched) == ({"net_growth_pct": -26}, "Figure 2.8", "data entry clerks")
+    assert store.lookup("job", "개발자")[0]["name"] == "Software and Applications Developers"
+    # 부분 일치는 단어 단위로 가장 긴 키를 고른다
+    assert store.lookup("job", "시니어 소프트웨어 개발자")[1] == "소프트웨어 개발자"
+    assert store.lookup("skill", "ai")[0]["figures"] == {"growth_rank": 1}
+    assert store.lookup("skill", "Data Entry Clerks") is None
+    assert store.lookup("job", "aid worker") is None
+    assert store.lookup("job", "") is None
+    store.close()
+
+    with pytest.raises(ValueError):
+        build_fact_table([{"kind": "region", "name": "Korea"}])
+    (tmp_path / "bad.bin").write_bytes(b"XXXX" + build_fact_table(FACTS)[4:])
+    with pytest.raises(ValueError):
+        WEFFactStore(str(tmp_path / "bad.bin"))
+
+
+def _return_control(function="get_job_outlook", name="job", value="개발자"):
+    return {"invocationId": "inv-1", "invocationInputs": [{"functionInvocationInput": {
+        "actionGroup": "wef_facts", "function": function,
+        "parameters": [{"name": name, "type": "string", "value": value}],
+    }}]}
+
+
+def test_function_results_answer_from_store(tmp_path):
+    store = _store(tmp_path)
+    [found] = function_results(_return_control(), store)
+    body = json.loads(found["functionResult"]["responseBody"]["TEXT"]["body"])
+    assert found["functionResult"]["function"] == "get_job_outlook"
+    assert (body["found"], body["figures"]) == (True, {"net_growth_pct": 17})
+
+    [missing] = function_results(_return_control("get_skill_outlook", "skill", "Knitting"), None)
+    assert json.loads(missing["functionResult"]["responseBody"]["TEXT"]["body"])["found"] is False
+    [unknown] = function_results(_return_control("get_salary"), store)
+    assert unknown["functionResult"]["responseState"] == "REPROMPT"
+    assert session_state({"invocationId": "inv-2", "invocationInputs": []}, store) is None
+
+
+class ReturnControlRuntime(FakeAgentRuntime):
+    """첫 호출은 returnControl로 멈추고, sessionState를 받은 다음 호출에서 completion을 낸다."""
+
+    def invoke_agent(self, **kwargs):
+        if not self.calls:
+            self.calls.append(kwargs)
+            return {"completion": iter([{"returnControl": _return_control()}])}
+        return super().invoke_agent(**kwargs)
+
+
+def test_analyze_answers_return_control_in_lambda(analyze_module, monkeypatch, tmp_path):
+    analyze, ddb = analyze_module
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="models")
+    s3.put_object(Bucket="models", Key="wef/facts.bin", Body=build_fact_table(FACTS))
+
+    runtime = ReturnControlRuntime(json.dumps(SAMPLE_ANALYSIS))
+    for name, value in (("WEF_FACTS_BUCKET", "models"), ("INDEX_DIR", str(tmp_path)), ("s3", s3),
+                        ("_fact_loader", None), ("bedrock_agent_runtime", runtime)):
+        monkeypatch.setattr(analyze, name, value)
+    ddb.Table("survey").put_item(Item={"session_id": "sid-wef", "status": "analyzing"})
+    analyze.handler({"session_id": "sid-wef", "name": "wef", "job_title": "개발자",
+                     "strengths": "Python, Communication"}, None)
+
+    assert ddb.Table("survey").get_item(Key={"session_id": "sid-wef"})["Item"]["status"] == "completed"
+    first, second = runtime.calls
+    assert first["inputText"] and "inputText" not in second
+    assert second["sessionId"] == first["sessionId"]
+    [result] = second["sessionState"]["returnControlInvocationResults"]
+    body = json.loads(result["functionResult"]["responseBody"]["TEXT"]["body"])
+    assert body["figures"] == {"net_growth_pct": 17}
+
+
+class LoopingRuntime(FakeAgentRuntime):
+    """sessionState를 받는 동안 stop_after번까지 returnControl을 내고, 그 뒤에는 completion을 낸다.
+
+    stop_after가 None이면 끝까지 함수 호출만 반복한다 (마지막 답변 요청 포함).
+    """
+
+    def __init__(self, completion, stop_after=None):
+        super().__init__(completion)
+        self.stop_after = stop_after
+
+    def invoke_agent(self, **kwargs):
+        if self.stop_after is None or len(self.calls) < self.stop_after:
+            self.calls.append(kwargs)
+            return {"completion": iter([{"returnControl": _return_control("get_skill_outlook", "skill", "AI")}])}
+        return super().invoke_agent(**kwargs)
+
+
+def _run_looping(analyze, ddb, monkeypatch, runtime, session_id):
+    monkeypatch.setattr(analyze, "bedrock_agent_runtime", runtime)
+    ddb.Table("survey").put_item(Item={"session_id": session_id, "status": "analyzing"})
+    analyze.handler({"session_id": session_id, "name": "wef", "job_title": "개발자",
+                     "strengths": "Python, SQL, AI, Excel, Communication"}, None)
+    return ddb.Table("survey").get_item(Key={"session_id": session_id})["Item"]
+
+
+def test_return_control_rounds_follow_skill_count(analyze_module, monkeypatch):
+    analyze, ddb = analyze_module
+    # 직업 1 + 스킬 5개를 한 턴에 하나씩 호출: 예전 고정 상한(4)을 넘어도 모두 답하고 완료된다
+    runtime = LoopingRuntime(json.dumps(SAMPLE_ANALYSIS), stop_after=6)
+    item = _run_looping(analyze, ddb, monkeypatch, runtime, "sid-rounds")
+
+    assert item["status"] == "completed"
+    assert len(runtime.calls) == 7
+    assert len({call["sessionId"] for call in runtime.calls}) == 1
+    assert all("sessionState" in call for call in runtime.calls[1:])
+
+
+def test_return_control_exhaustion_asks_for_final_answer(analyze_module, monkeypatch):
+    analyze, ddb = analyze_module
+    rounds = max_rounds(5)
+    runtime = LoopingRuntime(json.dumps(SAMPLE_ANALYSIS), stop_after=rounds + 1)
+    item = _run_looping(analyze, ddb, monkeypatch, runtime, "sid-final")
+
+    assert item["status"] == "completed"
+    final = runtime.calls[-1]
+    assert final["inputText"].endswith(FINAL_ANSWER_NOTE)
+    assert final["sessionId"] != runtime.calls[0]["sessionId"]
+
+
+def test_return_control_exhaustion_fails_terminally(analyze_module, monkeypatch):
+    analyze, ddb = analyze_module
+    runtime = LoopingRuntime(json.dumps(SAMPLE_ANALYSIS))
+    item = _run_looping(analyze, ddb, monkeypatch, runtime, "sid-loop")
+
+    # 빈 completion을 파서에 넘기지 않고 재시도하지 않을 실패로 끝낸다
+    assert (item["status"], item["error_code"]) == ("failed", "return_control_exhausted")
+    assert len(runtime.calls) == max_rounds(5) + 2
@@ -0,0 +1,119 @@
+"""WebSocket 연결 레지스트리 및 완료 알림 단위 테스트.
+
+moto로 연결 테이블을 모킹하고, Management API는 LocalManagementApi로 대체한다.
+"""
+
+import time
+
+import boto3
+import pytest
+from moto import mock_aws
+
+
+@pytest.fixture
+def aws_env(monkeypatch):
+    """연결 테이블 이름 환경변수를 설정한다."""
+    monkeypatch.setenv("CONNECTIONS_TABLE_NAME", "ws_connections")
+
+
+@pytest.fixture
+def connections_table():
+    """moto로 ws_connections 테이블(GSI connection_id-index 포함)을 생성한다."""
+    with mock_aws():
+        ddb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = ddb.create_table(
+            TableName="ws_connections",
+            KeySchema=[
+                {"AttributeName": "session_id", "KeyType": "HASH"},
+                {"AttributeName": "connection_id", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "session_id", "AttributeType": "S"},
+                {"AttributeName": "connection_id", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "connection_id-index",
+                    "KeySchema": [{"AttributeName": "connection_id", "KeyType": "HASH"}],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+def _ws_event(connection_id: str, session_id: str | None = None) -> dict:
+    """API Gateway WebSocket 이벤트를 생성한다."""
+    event = {"requestContext": {"connectionId": connection_id}}
+    if session_id is not None:
+        event["queryStringParameters"] = {"session_id": session_id}
+    return event
+
+
+class TestConnectHandlers:
+    """$connect / $disconnect 핸들러 테스트."""
+
+    def test_connect_registers_mapping_with_ttl(self, aws_env, connections_table):
+        from handlers.ws_connect_handler import handler
+
+        resp = handler(_ws_event("conn-1", "sid-1"), None)
+        assert resp["statusCode"] == 200
+
+        item = connections_table.get_item(Key={"session_id": "sid-1", "connection_id": "conn-1"})["Item"]
+        assert int(item["expires_at"]) > int(time.time())
+
+    def test_connect_without_session_id_is_rejected(self, aws_env, connections_table):
+        from handlers.ws_connect_handler import handler
+
+        resp = handler(_ws_event("conn-1"), None)
+        assert resp["statusCode"] == 400
+
+    def test_disconnect_removes_mapping(self, aws_env, connections_table):
+        from handlers.ws_connect_handler import handler as connect_handler
+        from handlers.ws_disconnect_handler import handler as disconnect_handler
+
+        connect_handler(_ws_event("conn-1", "sid-1"), None)
+        resp = disconnect_handler(_ws_event("conn-1"), None)
+        assert resp["statusCode"] == 200
+        assert "Item" not in connections_table.get_item(Key={"session_id": "sid-1", "connection_id": "conn-1"})
+
+
+class TestNotifySession:
+    """notify_session 푸시 로직 테스트."""
+
+    def test_pushes_to_all_connections(self, connections_table):
+        from services.notifier import ConnectionRegistry, LocalManagementApi, notify_session
+
+        registry = ConnectionRegistry(connections_table)
+        registry.register("sid-1", "conn-a")
+        registry.register("sid-1", "conn-b")
+        registry.register("sid-2", "conn-c")
+        api = LocalManagementApi()
+
+        sent = notify_session(registry, api, "sid-1", {"status": "completed"})
+
+        assert sent == 2
+        assert api.messages["conn-a"] == [{"status": "completed"}]
+        assert "conn-c" not in api.messages
+
+    def test_gone_connection_is_cleaned_up(self, connections_table):
+        from services.notifier import ConnectionRegistry, LocalManagementApi, notify_session
+
+        registry = ConnectionRegistry(connections_table)
+        registry.register("sid-1", "conn-alive")
+        registry.register("sid-1", "conn-gone")
+        api = LocalManagementApi(gone_connections={"conn-gone"})
+
+        sent = notify_session(registry, api, "sid-1", {"status": "error"})
+
+        assert sent == 1
+        assert registry.connections_for("sid-1") == ["conn-alive"]
+
+    def test_expired_connection_is_skipped(self, connections_table):
+        from services.notifier import ConnectionRegistry, LocalManagementApi, notify_session
+
+        ConnectionRegistry(connections_table, ttl_seconds=-1).register("sid-1", "conn-old")
+        api = LocalManagementApi()
+
+        assert notify_session(ConnectionRegistry(connections_table), api, "sid-1", {"status": "completed"}) == 0